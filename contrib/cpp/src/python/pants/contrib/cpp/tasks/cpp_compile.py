@@ -5,17 +5,70 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import hashlib
 import os
+import re
+from multiprocessing import cpu_count
 
 from pants.base.build_environment import get_buildroot
+from pants.base.hash_utils import hash_file
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnitLabel
-from pants.util.dirutil import safe_mkdir_for
+from pants.util.dirutil import safe_delete, safe_mkdir_for
 
 from pants.contrib.cpp.tasks.cpp_task import CppTask
 
 
+def parse_depfile(path):
+  """Returns the prerequisites listed in a makefile-style depfile, as written by `gcc -MD`.
+
+  :param string path: The path of a depfile containing a single rule.
+  :returns: The paths of the prerequisites of the rule, in order.
+  :rtype: list of string
+  """
+  with open(path, 'r') as fp:
+    contents = fp.read().decode('utf-8')
+  # Join continuation lines, and drop the rule's target.
+  contents = contents.replace('\\\n', ' ')
+  _, _, prerequisites = contents.partition(': ')
+  # Spaces within paths are escaped with backslashes.
+  return [path.replace('\\ ', ' ') for path in re.findall(r'(?:\\ |\S)+', prerequisites)]
+
+
+def _update_length_prefixed(digest, value):
+  # Length-prefix each value, so that distinct sequences of values never hash the same.
+  encoded = value.encode('utf-8')
+  digest.update('{}:'.format(len(encoded)).encode('utf-8'))
+  digest.update(encoded)
+
+
+def object_fingerprint(compile_flags, source, headers):
+  """Returns a fingerprint of the inputs to the compilation of an object file.
+
+  :param list compile_flags: The flags that the object file is compiled with.
+  :param string source: The path of the source file compiled to the object file.
+  :param list headers: The paths of the headers included by the source file.
+  :returns: A fingerprint, or None if any of the headers no longer exist.
+  """
+  digest = hashlib.sha1()
+  _update_length_prefixed(digest, '{}'.format(len(compile_flags)))
+  for flag in compile_flags:
+    _update_length_prefixed(digest, flag)
+  _update_length_prefixed(digest, hash_file(source))
+  for header in sorted(headers):
+    if not os.path.isfile(header):
+      return None
+    _update_length_prefixed(digest, header)
+    _update_length_prefixed(digest, hash_file(header))
+  return digest.hexdigest()
+
+
 class CppCompile(CppTask):
-  """Compile C++ sources into object files."""
+  """Compile C++ sources into object files.
+
+  Each object file is recompiled only if the content of its source file, the compiler flags, or
+  the content of any of the headers that the compiler reported it to depend on have changed.
+  """
 
   @classmethod
   def register_options(cls, register):
@@ -26,6 +79,9 @@ class CppCompile(CppTask):
              default=['.cc', '.cxx', '.cpp'],
              help=('The list of extensions to consider when determining if a file is a '
                    'C++ source file.'))
+    register('--worker-count', advanced=True, type=int, default=cpu_count(),
+             help='The number of source files to compile concurrently. Defaults to the current '
+                  'machine\'s CPU count.')
 
   @classmethod
   def product_types(cls):
@@ -35,6 +91,11 @@ class CppCompile(CppTask):
   def cache_target_dirs(self):
     return True
 
+  @property
+  def incremental(self):
+    # The previous results_dir is cloned so that unchanged objects can be reused.
+    return True
+
   def execute(self):
     """Compile all sources in a given target to object files."""
 
@@ -47,19 +108,26 @@ class CppCompile(CppTask):
     # Compile source files to objects.
     with self.invalidated(targets, invalidate_dependents=True) as invalidation_check:
       obj_mapping = self.context.products.get('objs')
+      to_compile = []
       for vt in invalidation_check.all_vts:
         for source in vt.target.sources_relative_to_buildroot():
           if is_cc(source):
             if not vt.valid:
-              with self.context.new_workunit(name='cpp-compile', labels=[WorkUnitLabel.MULTITOOL]):
-                # TODO: Parallelise the compilation.
-                # TODO: Only recompile source files that have changed since the
-                #       object file was last written. Also use the output from
-                #       gcc -M to track dependencies on headers.
-                self._compile(vt.target, vt.results_dir, source)
+              to_compile.append((vt.target, vt.results_dir, source))
             objpath = self._objpath(vt.target, vt.results_dir, source)
             obj_mapping.add(vt.target, vt.results_dir).append(objpath)
 
+      if to_compile:
+        with self.context.new_workunit(name='cpp-compile',
+                                       labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+          worker_pool = WorkerPool(workunit,
+                                   self.context.run_tracker,
+                                   min(self.get_options().worker_count, len(to_compile)))
+          try:
+            worker_pool.submit_work_and_wait(Work(self._compile_if_changed, to_compile))
+          finally:
+            worker_pool.shutdown()
+
   def _objpath(self, target, results_dir, source):
     abs_source_root = os.path.join(get_buildroot(), target.target_base)
     abs_source = os.path.join(get_buildroot(), source)
@@ -69,26 +137,65 @@ class CppCompile(CppTask):
 
     return os.path.join(results_dir, obj_name)
 
-  def _compile(self, target, results_dir, source):
-    """Compile given source to an object file."""
-    obj = self._objpath(target, results_dir, source)
-    safe_mkdir_for(obj)
-
-    abs_source = os.path.join(get_buildroot(), source)
-
+  def _include_dirs(self, target):
     # TODO: include dir should include dependent work dir when headers are copied there.
     include_dirs = []
     for dep in target.dependencies:
       if self.is_library(dep):
         include_dirs.extend([os.path.join(get_buildroot(), dep.target_base)])
+    return include_dirs
+
+  def _compile_if_changed(self, target, results_dir, source):
+    """Compile the given source to an object file, unless an up to date object already exists.
+
+    The object file for a source is accompanied by a depfile listing the headers it includes, and
+    by a fingerprint of its inputs. Both were cloned from the previous results_dir, if any.
+    """
+    obj = self._objpath(target, results_dir, source)
+    depfile = obj + '.d'
+    fingerprint_file = obj + '.fingerprint'
+    abs_source = os.path.join(get_buildroot(), source)
+    compile_flags = ([self.cpp_toolchain.compiler] +
+                     ['-I{0}'.format(i) for i in self._include_dirs(target)] +
+                     self.get_options().cc_options)
+
+    if all(os.path.isfile(f) for f in (obj, depfile, fingerprint_file)):
+      with open(fingerprint_file, 'r') as fp:
+        previous_fingerprint = fp.read().strip()
+      headers = [h for h in parse_depfile(depfile) if h != abs_source]
+      if previous_fingerprint == object_fingerprint(compile_flags, abs_source, headers):
+        self.context.log.debug('Reusing unchanged c++ object: {0}'.format(obj))
+        return
+
+    # Any fingerprint is stale from here on, so remove it in case the compilation fails.
+    safe_delete(fingerprint_file)
+    self._compile(target, results_dir, source, depfile=depfile)
+
+    headers = [h for h in parse_depfile(depfile) if h != abs_source]
+    fingerprint = object_fingerprint(compile_flags, abs_source, headers)
+    if fingerprint:
+      with open(fingerprint_file, 'w') as fp:
+        fp.write(fingerprint)
+
+  def _compile(self, target, results_dir, source, depfile=None):
+    """Compile given source to an object file.
+
+    If a `depfile` path is given, the headers that the source depends on are written to it.
+    """
+    obj = self._objpath(target, results_dir, source)
+    safe_mkdir_for(obj)
+
+    abs_source = os.path.join(get_buildroot(), source)
 
     cmd = [self.cpp_toolchain.compiler]
     cmd.extend(['-c'])
-    cmd.extend(('-I{0}'.format(i) for i in include_dirs))
+    cmd.extend(('-I{0}'.format(i) for i in self._include_dirs(target)))
     cmd.extend(['-o' + obj, abs_source])
     cmd.extend(self.get_options().cc_options)
+    if depfile:
+      # Only user headers are listed, since system headers are not expected to change.
+      cmd.extend(['-MMD', '-MF', depfile])
 
-    # TODO: submit_async_work with self.run_command, [(cmd)] as a Work object.
     with self.context.new_workunit(name='cpp-compile', labels=[WorkUnitLabel.COMPILER]) as workunit:
       self.run_command(cmd, workunit)
 
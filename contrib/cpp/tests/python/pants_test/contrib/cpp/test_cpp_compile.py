@@ -0,0 +1,57 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_delete, safe_file_dump
+
+from pants.contrib.cpp.tasks.cpp_compile import object_fingerprint, parse_depfile
+
+
+class CppCompileTest(unittest.TestCase):
+  def test_parse_depfile(self):
+    with temporary_dir() as tmpdir:
+      depfile = os.path.join(tmpdir, 'a.o.d')
+      safe_file_dump(depfile, 'a.o: /src/a.cc /src/a.h \\\n /src/dir\\ with\\ spaces/b.h\n')
+      self.assertEqual(['/src/a.cc', '/src/a.h', '/src/dir with spaces/b.h'],
+                       parse_depfile(depfile))
+
+  def test_object_fingerprint(self):
+    with temporary_dir() as tmpdir:
+      source = os.path.join(tmpdir, 'a.cc')
+      header = os.path.join(tmpdir, 'a.h')
+      safe_file_dump(source, '#include "a.h"\n')
+      safe_file_dump(header, 'int a();\n')
+
+      fingerprint = object_fingerprint(['g++', '-O2'], source, [header])
+      self.assertEqual(fingerprint, object_fingerprint(['g++', '-O2'], source, [header]))
+      self.assertNotEqual(fingerprint, object_fingerprint(['g++', '-O0'], source, [header]))
+
+      # Flags are delimited from one another.
+      self.assertNotEqual(object_fingerprint(['g++', '-O2'], source, [header]),
+                          object_fingerprint(['g++-O', '2'], source, [header]))
+
+      safe_file_dump(header, 'int a(int);\n')
+      self.assertNotEqual(fingerprint, object_fingerprint(['g++', '-O2'], source, [header]))
+
+      safe_delete(header)
+      self.assertIsNone(object_fingerprint(['g++', '-O2'], source, [header]))
+
+  def test_object_fingerprint_delimits_headers(self):
+    with temporary_dir() as tmpdir:
+      source = os.path.join(tmpdir, 'a.cc')
+      safe_file_dump(source, '#include "a.h"\n')
+      safe_file_dump(os.path.join(tmpdir, 'a.h'), 'b.h')
+      safe_file_dump(os.path.join(tmpdir, 'a.hb.h'), '')
+      safe_file_dump(os.path.join(tmpdir, 'b.h'), '')
+
+      # The same bytes, split differently between header paths and contents.
+      self.assertNotEqual(
+        object_fingerprint([], source, [os.path.join(tmpdir, 'a.h'), os.path.join(tmpdir, 'b.h')]),
+        object_fingerprint([], source, [os.path.join(tmpdir, 'a.hb.h'), os.path.join(tmpdir, 'b.h')]))
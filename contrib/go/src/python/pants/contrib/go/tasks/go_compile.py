@@ -7,8 +7,11 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import functools
 import os
+from multiprocessing import cpu_count
 
 from pants.base.exceptions import TaskError
+from pants.base.execution_graph import ExecutionFailure, ExecutionGraph, Job
+from pants.base.worker_pool import WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.util.dirutil import safe_mkdir
 from pants.util.memo import memoized_method
@@ -36,6 +39,10 @@ class GoCompile(GoWorkspaceTask):
     # Build flags fingerprint is handled by a custom strategy to enable
     # merging with task-specific flags.
     register('--build-flags', default='', help='Build flags to pass to Go compiler.')
+    register('--worker-count', advanced=True, type=int, default=cpu_count(),
+             help='The number of concurrent `go install` processes to run. Packages are installed '
+                  'once the packages they depend on have been installed. Defaults to the current '
+                  'machine\'s CPU count.')
 
   @classmethod
   def product_types(cls):
@@ -53,25 +60,69 @@ class GoCompile(GoWorkspaceTask):
                           topological_order=True) as invalidation_check:
       # Maps each local/remote library target to its compiled binary.
       lib_binary_map = {}
+      go_vts = [vt for vt in invalidation_check.all_vts if isinstance(vt.target, GoTarget)]
+      for vt in go_vts:
+        if not self.is_binary(vt.target):
+          lib_binary_map[vt.target] = os.path.join(self.get_gopath(vt.target), 'pkg',
+                                                   self.goos_goarch, vt.target.import_path + '.a')
+
+      self._install([vt for vt in go_vts if not vt.valid], lib_binary_map, get_build_flags_func)
+
       go_exec_binary = self.context.products.get_data('exec_binary')
       go_deployable_archive = self.context.products.get('deployable_archives')
-      for vt in invalidation_check.all_vts:
-        gopath = self.get_gopath(vt.target)
-        if not isinstance(vt.target, GoTarget):
-          continue
-        if not vt.valid:
-          self.ensure_workspace(vt.target)
-          self._sync_binary_dep_links(vt.target, gopath, lib_binary_map)
-          build_flags = get_build_flags_func(vt.target)
-          self._go_install(vt.target, gopath, build_flags)
+      for vt in go_vts:
         if self.is_binary(vt.target):
+          gopath = self.get_gopath(vt.target)
           subdir, extension = self._get_cross_compiling_subdir_and_extension(gopath)
           binary_path = os.path.join(gopath, 'bin', subdir, os.path.basename(vt.target.address.spec_path) + extension)
           go_exec_binary[vt.target] = binary_path
           go_deployable_archive.add(vt.target, os.path.dirname(binary_path)).append(os.path.basename(binary_path))
-        else:
-          lib_binary_map[vt.target] = os.path.join(gopath, 'pkg', self.goos_goarch,
-                                                   vt.target.import_path + '.a')
+
+  def _install(self, invalid_vts, lib_binary_map, get_build_flags_func):
+    """Runs `go install` for each of the given invalid targets on a pool of workers.
+
+    Each target is installed once all of the invalid targets it depends on have been installed, and
+    its vts are updated as soon as it succeeds.
+    """
+    jobs = self._create_install_jobs(invalid_vts, lib_binary_map, get_build_flags_func)
+    if not jobs:
+      return
+
+    with self.context.new_workunit('go-install-pool-bootstrap') as workunit:
+      worker_pool = WorkerPool(workunit.parent,
+                               self.context.run_tracker,
+                               self.get_options().worker_count)
+    try:
+      ExecutionGraph(jobs).execute(worker_pool, self.context.log)
+    except ExecutionFailure as e:
+      raise TaskError('Go install failure: {}'.format(e))
+    finally:
+      worker_pool.shutdown()
+
+  def _create_install_jobs(self, invalid_vts, lib_binary_map, get_build_flags_func):
+    invalid_targets = set(vt.target for vt in invalid_vts)
+    jobs = []
+    for vt in invalid_vts:
+      # Build flags are computed here on the main thread, since they are memoized.
+      work = functools.partial(self._install_target,
+                               vt.target,
+                               lib_binary_map,
+                               get_build_flags_func(vt.target))
+      dependencies = [dep.address.spec for dep in vt.target.closure()
+                      if dep != vt.target and dep in invalid_targets]
+      jobs.append(Job(vt.target.address.spec,
+                      work,
+                      dependencies,
+                      on_success=vt.update,
+                      on_failure=vt.force_invalidate))
+    return jobs
+
+  def _install_target(self, target, lib_binary_map, build_flags):
+    gopath = self.get_gopath(target)
+    self.ensure_workspace(target)
+    # The binaries of the target's dependencies have all been installed by now.
+    self._sync_binary_dep_links(target, gopath, lib_binary_map)
+    self._go_install(target, gopath, build_flags)
 
   @classmethod
   @memoized_method
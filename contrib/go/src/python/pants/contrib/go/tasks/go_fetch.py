@@ -5,11 +5,19 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import Queue as queue
 import os
 import shutil
-from collections import defaultdict
+import sys
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import six
+from contextlib2 import ExitStack
 
 from pants.base.exceptions import TaskError
+from pants.base.worker_pool import Work, WorkerPool
 from pants.build_graph.address import Address
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.util.contextutil import temporary_dir
@@ -20,6 +28,49 @@ from pants.contrib.go.targets.go_remote_library import GoRemoteLibrary
 from pants.contrib.go.tasks.go_task import GoTask
 
 
+class _ImportRootMap(object):
+  """A map from remote import paths to their roots, shared by concurrent fetches."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._roots = {}
+
+  def get(self, import_path):
+    with self._lock:
+      return self._roots.get(import_path)
+
+  def update(self, roots):
+    with self._lock:
+      self._roots.update(roots)
+
+  def copy(self):
+    with self._lock:
+      return self._roots.copy()
+
+
+class _HostConnectionLimiter(object):
+  """Bounds the number of concurrent connections to each remote host.
+
+  The host of a remote import path is taken to be its first path component (e.g. `github.com`).
+  """
+
+  def __init__(self, max_connections_per_host):
+    self._max_connections_per_host = max_connections_per_host
+    self._lock = threading.Lock()
+    self._semaphores = {}
+
+  @contextmanager
+  def connection(self, import_path):
+    host = import_path.split('/', 1)[0]
+    with self._lock:
+      semaphore = self._semaphores.get(host)
+      if semaphore is None:
+        semaphore = threading.BoundedSemaphore(self._max_connections_per_host)
+        self._semaphores[host] = semaphore
+    with semaphore:
+      yield
+
+
 class GoFetch(GoTask):
   """Fetches third-party Go libraries."""
 
@@ -37,7 +88,20 @@ class GoFetch(GoTask):
 
   @classmethod
   def register_options(cls, register):
-    pass
+    super(GoFetch, cls).register_options(register)
+    register('--worker-count', type=int, default=8, advanced=True,
+             help='The maximum number of remote libraries to fetch concurrently. The dependencies '
+                  'of each library are fetched as soon as it has been fetched.')
+    register('--max-connections-per-host', type=int, default=4, advanced=True,
+             help='The maximum number of concurrent connections to make to any one remote host, '
+                  'to fetch archives or to look up import path meta tags.')
+
+  def __init__(self, *args, **kwargs):
+    super(GoFetch, self).__init__(*args, **kwargs)
+    self._connection_limiter = _HostConnectionLimiter(self.get_options().max_connections_per_host)
+    # Guards the creation of the per-root locks used to fetch each remote root only once.
+    self._root_dir_locks_lock = threading.Lock()
+    self._root_dir_locks = defaultdict(threading.Lock)
 
   @property
   def cache_target_dirs(self):
@@ -71,17 +135,22 @@ class GoFetch(GoTask):
   def _fetch_pkg(self, gopath, pkg, rev):
     """Fetch the package and setup symlinks."""
     fetcher = self._get_fetcher(pkg)
-    root = fetcher.root()
+    with self._connection_limiter.connection(pkg):
+      root = fetcher.root()
     root_dir = os.path.join(self.workdir, 'fetches', root, rev)
 
-    # Only fetch each remote root once.
-    if not os.path.exists(root_dir):
-      with temporary_dir() as tmp_fetch_root:
-        with self.context.new_workunit('fetch {}'.format(pkg)):
-          fetcher.fetch(dest=tmp_fetch_root, rev=rev)
-          safe_mkdir(root_dir)
-          for path in os.listdir(tmp_fetch_root):
-            shutil.move(os.path.join(tmp_fetch_root, path), os.path.join(root_dir, path))
+    # Only fetch each remote root once: concurrent fetches of packages sharing a root wait here.
+    with self._root_dir_locks_lock:
+      root_dir_lock = self._root_dir_locks[root_dir]
+    with root_dir_lock:
+      if not os.path.exists(root_dir):
+        with temporary_dir() as tmp_fetch_root:
+          with self.context.new_workunit('fetch {}'.format(pkg)):
+            with self._connection_limiter.connection(root):
+              fetcher.fetch(dest=tmp_fetch_root, rev=rev)
+            safe_mkdir(root_dir)
+            for path in os.listdir(tmp_fetch_root):
+              shutil.move(os.path.join(tmp_fetch_root, path), os.path.join(root_dir, path))
 
     # TODO(John Sirois): Circle back and get get rid of this symlink tree.
     # GoWorkspaceTask will further symlink a single package from the tree below into a
@@ -99,8 +168,11 @@ class GoFetch(GoTask):
       os.symlink(os.path.join(root_dir, path), os.path.join(dest_dir, path))
 
   # Note: Will update import_root_map.
-  def _map_fetched_remote_source(self, go_remote_lib, gopath, all_known_remote_libs,
-                                 resolved_remote_libs, undeclared_deps, import_root_map):
+  def _get_remote_import_roots(self, go_remote_lib, gopath, import_root_map):
+    """Returns a list of (remote import path, remote root) tuples for a fetched remote library.
+
+    Safe to call from a worker thread.
+    """
     # See if we've computed the remote import paths for this rev of this lib in a previous run.
     remote_import_paths_cache = os.path.join(os.path.dirname(gopath), 'remote_import_paths.txt')
     if os.path.exists(remote_import_paths_cache):
@@ -114,13 +186,20 @@ class GoFetch(GoTask):
           for path in remote_import_paths:
             fp.write('{}\n'.format(path).encode('utf8'))
 
+    remote_import_roots = []
     for remote_import_path in remote_import_paths:
       remote_root = import_root_map.get(remote_import_path)
       if remote_root is None:
         fetcher = self._get_fetcher(remote_import_path)
-        remote_root = fetcher.root()
-        import_root_map[remote_import_path] = remote_root
-
+        with self._connection_limiter.connection(remote_import_path):
+          remote_root = fetcher.root()
+        import_root_map.update({remote_import_path: remote_root})
+      remote_import_roots.append((remote_import_path, remote_root))
+    return remote_import_roots
+
+  def _map_fetched_remote_source(self, go_remote_lib, remote_import_roots, all_known_remote_libs,
+                                 resolved_remote_libs, undeclared_deps):
+    for remote_import_path, remote_root in remote_import_roots:
       spec_path = os.path.join(go_remote_lib.target_base, remote_root)
 
       package_path = GoRemoteLibrary.remote_package_path(remote_root, remote_import_path)
@@ -131,8 +210,9 @@ class GoFetch(GoTask):
         try:
           # If we've already resolved a package from this remote root, its ok to define an
           # implicit synthetic remote target for all other packages in the same remote root.
-          same_remote_libs = [lib for lib in all_known_remote_libs
-                              if spec_path == lib.address.spec_path]
+          same_remote_libs = sorted((lib for lib in all_known_remote_libs
+                                     if spec_path == lib.address.spec_path),
+                                    key=lambda lib: lib.address.spec)
           implicit_ok = any(same_remote_libs)
 
           # If we're creating a synthetic remote target, we should pin it to the same
@@ -161,6 +241,14 @@ class GoFetch(GoTask):
     can only be determined _after_ it has been downloaded, a transitive dependency of an undeclared
     remote library will never be detected.
 
+    Libraries are downloaded (and their imports listed) concurrently on a pool of workers, and the
+    dependencies of each library are scheduled as soon as it and the libraries scheduled before it
+    have been downloaded, rather than once all of the libraries at its depth have been. Resolving
+    dependencies mutates the build graph, so it happens on the main thread, and in the order the
+    libraries were scheduled: whether a dependency may be synthesized depends on the libraries
+    resolved before it (see `_map_fetched_remote_source`), so this keeps the result independent of
+    the order in which downloads complete.
+
     Because go_remote_libraries do not declare dependencies (rather, they are inferred), injects
     all successfully resolved transitive dependencies into the build graph.
     """
@@ -170,47 +258,88 @@ class GoFetch(GoTask):
     all_known_remote_libs = all_known_remote_libs or set()
     all_known_remote_libs.update(go_remote_libs)
 
-    resolved_remote_libs = set()
     undeclared_deps = defaultdict(set)
     go_remote_lib_src = self.context.products.get_data('go_remote_lib_src')
 
-    with self.invalidated(go_remote_libs) as invalidation_check:
-      # We accumulate mappings from import path to root (e.g., example.org/pkg/foo -> example.org)
-      # from all targets in this map, so that targets share as much of this information as
-      # possible during this run.
-      # We cache these mappings. to avoid repeatedly fetching them over the network via the
-      # meta tag protocol. Note that this mapping is unversioned: It's defined as "whatever meta
-      # tag is currently being served at the relevant URL", which is inherently independent of
-      # the rev of the remote library.  We (and the entire Go ecosystem) assume that this mapping
-      # never changes, in practice.
-      import_root_map = {}
-      for vt in invalidation_check.all_vts:
-        import_root_map_path = os.path.join(vt.results_dir, 'pkg_root_map.txt')
-        import_root_map.update(self._read_import_root_map_file(import_root_map_path))
-
-        go_remote_lib = vt.target
-        gopath = os.path.join(vt.results_dir, 'gopath')
+    # We accumulate mappings from import path to root (e.g., example.org/pkg/foo -> example.org)
+    # from all targets in this map, so that targets share as much of this information as
+    # possible during this run.
+    # We cache these mappings. to avoid repeatedly fetching them over the network via the
+    # meta tag protocol. Note that this mapping is unversioned: It's defined as "whatever meta
+    # tag is currently being served at the relevant URL", which is inherently independent of
+    # the rev of the remote library.  We (and the entire Go ecosystem) assume that this mapping
+    # never changes, in practice.
+    import_root_map = _ImportRootMap()
+    finished_queue = queue.Queue()
+
+    def fetch(vt, gopath):
+      try:
         if not vt.valid:
-          self._fetch_pkg(gopath, go_remote_lib.import_path, go_remote_lib.rev)
-        # _map_fetched_remote_source() will modify import_root_map.
-        self._map_fetched_remote_source(go_remote_lib, gopath, all_known_remote_libs,
-                                        resolved_remote_libs, undeclared_deps, import_root_map)
-        go_remote_lib_src[go_remote_lib] = os.path.join(gopath, 'src', go_remote_lib.import_path)
-
-        # Cache the mapping against this target's key.  Note that because we accumulate
-        # mappings across targets, the file may contain mappings that this target doesn't
-        # need or care about (although it will contain all the mappings this target does need).
-        # But the file is small, so there's no harm in this redundancy.
-        self._write_import_root_map_file(import_root_map_path, import_root_map)
-
-    # Recurse after the invalidated block, so the libraries we downloaded are now "valid"
-    # and thus we don't try to download a library twice.
-    trans_undeclared_deps = self._transitive_download_remote_libs(resolved_remote_libs,
-                                                                  all_known_remote_libs)
-    undeclared_deps.update(trans_undeclared_deps)
+          self._fetch_pkg(gopath, vt.target.import_path, vt.target.rev)
+        result = (vt, gopath, self._get_remote_import_roots(vt.target, gopath, import_root_map),
+                  None)
+      except Exception:
+        # Keep the traceback, so that the error is re-raised on the main thread as it occurred.
+        result = (vt, gopath, None, sys.exc_info())
+      finished_queue.put(result)
+
+    with self.context.new_workunit('go-fetch-pool-bootstrap') as workunit:
+      worker_pool = WorkerPool(workunit.parent,
+                               self.context.run_tracker,
+                               self.get_options().worker_count)
+
+    # Each set of newly resolved libraries is invalidated separately, and the vts of all of them
+    # are updated only once every fetch has succeeded.
+    with ExitStack() as invalidation_stack:
+      submitted = deque()
+      finished = {}
+
+      def submit(remote_libs):
+        invalidation_check = invalidation_stack.enter_context(self.invalidated(remote_libs))
+        for vt in invalidation_check.all_vts:
+          import_root_map.update(self._read_import_root_map_file(self._import_root_map_path(vt)))
+          gopath = os.path.join(vt.results_dir, 'gopath')
+          submitted.append(vt)
+          worker_pool.submit_async_work(Work(fetch, [(vt, gopath)]))
+
+      try:
+        submit(go_remote_libs)
+        while submitted:
+          while submitted[0] not in finished:
+            # NB: An explicit timeout allows the wait to be interrupted.
+            vt, gopath, remote_import_roots, exc_info = finished_queue.get(timeout=1000000000)
+            if exc_info is not None:
+              six.reraise(*exc_info)
+            finished[vt] = (gopath, remote_import_roots)
+          vt = submitted.popleft()
+          gopath, remote_import_roots = finished.pop(vt)
+
+          go_remote_lib = vt.target
+          resolved_remote_libs = set()
+          self._map_fetched_remote_source(go_remote_lib, remote_import_roots,
+                                          all_known_remote_libs, resolved_remote_libs,
+                                          undeclared_deps)
+          go_remote_lib_src[go_remote_lib] = os.path.join(gopath, 'src', go_remote_lib.import_path)
+
+          # Cache the mapping against this target's key.  Note that because we accumulate
+          # mappings across targets, the file may contain mappings that this target doesn't
+          # need or care about (although it will contain all the mappings this target does need).
+          # But the file is small, so there's no harm in this redundancy.
+          self._write_import_root_map_file(self._import_root_map_path(vt), import_root_map.copy())
+
+          if resolved_remote_libs:
+            submit(resolved_remote_libs)
+      except BaseException:
+        worker_pool.abort()
+        raise
+      worker_pool.shutdown()
 
     return undeclared_deps
 
+  @staticmethod
+  def _import_root_map_path(vt):
+    return os.path.join(vt.results_dir, 'pkg_root_map.txt')
+
   class UndeclaredRemoteLibError(Exception):
     def __init__(self, address):
       self.address = address
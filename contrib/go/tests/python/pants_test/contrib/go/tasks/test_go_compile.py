@@ -86,6 +86,28 @@ class GoCompileTest(TaskTestBase):
     # Make sure c's link was untouched, while b's link was refreshed.
     self.assertLessEqual(mtime(c), mtime(b) - 1)
 
+  def test_create_install_jobs(self):
+    class FakeVersionedTarget(object):
+      def __init__(self, target):
+        self.target = target
+
+      def update(self):
+        pass
+
+      def force_invalidate(self):
+        pass
+
+    c = self.make_target(spec='libC', target_type=GoLibrary)
+    b = self.make_target(spec='libB', target_type=GoLibrary, dependencies=[c])
+    a = self.make_target(spec='libA', target_type=GoLibrary, dependencies=[b])
+    d = self.make_target(spec='libD', target_type=GoLibrary)
+
+    # `b` is valid, so `a` should depend directly on `c`.
+    invalid_vts = [FakeVersionedTarget(t) for t in (c, a, d)]
+    jobs = self.go_compile._create_install_jobs(invalid_vts, {}, lambda target: [])
+    self.assertEqual({'libC:libC': [], 'libA:libA': ['libC:libC'], 'libD:libD': []},
+                     {job.key: job.dependencies for job in jobs})
+
   def test_split_build_flags_simple(self):
     actual = GoCompile._split_build_flags("-v -race")
     expected = ['-v', '-race']
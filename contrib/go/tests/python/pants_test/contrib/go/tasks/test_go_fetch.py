@@ -7,15 +7,20 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import os
 import shutil
+import sys
+import threading
+import time
+import traceback
 from collections import defaultdict
 
+from pants.base.exceptions import TaskError
 from pants.build_graph.address import Address
 from pants.util.contextutil import temporary_dir
 from pants_test.task_test_base import TaskTestBase
 
 from pants.contrib.go.subsystems.fetcher import ArchiveFetcher
 from pants.contrib.go.targets.go_remote_library import GoRemoteLibrary
-from pants.contrib.go.tasks.go_fetch import GoFetch
+from pants.contrib.go.tasks.go_fetch import GoFetch, _HostConnectionLimiter
 
 
 class GoFetchTest(TaskTestBase):
@@ -191,6 +196,82 @@ class GoFetchTest(TaskTestBase):
         expected[r2] = {('localzip/r4', self.address('3rdparty/go/localzip/r4'))}
         self.assertEqual(undeclared_deps, expected)
 
+  def test_transitive_download_remote_libs_concurrent(self):
+    with temporary_dir() as src:
+      with temporary_dir() as zipdir:
+
+        dep_graph = {
+          'r1': ['r2', 'r3', 'r4', 'r5'],
+          'r2': ['r6'],
+          'r3': ['r6', 'r7'],
+          'r4': ['r7'],
+          'r5': [],
+          'r6': ['r8'],
+          'r7': ['r8'],
+          'r8': [],
+        }
+        self._init_dep_graph_files(src, zipdir, dep_graph)
+
+        r1 = self.target('3rdparty/go/localzip/r1')
+
+        self.set_options(worker_count=4, max_connections_per_host=2)
+        context = self._create_fetch_context(zipdir)
+        go_fetch = self.create_task(context)
+        undeclared_deps = go_fetch._transitive_download_remote_libs({r1})
+        self.assertEqual(undeclared_deps, {})
+
+        self._assert_dependency_graph(r1, dep_graph)
+        go_remote_lib_src = context.products.get_data('go_remote_lib_src')
+        self.assertEqual(set('3rdparty/go/localzip/r{}'.format(i) for i in range(1, 9)),
+                         set(t.address.spec_path for t in go_remote_lib_src))
+
+  def test_transitive_download_remote_libs_error_traceback(self):
+    with temporary_dir() as src:
+      with temporary_dir() as zipdir:
+        self._init_dep_graph_files(src, zipdir, {'r1': [], 'r2': []})
+        r1 = self.target('3rdparty/go/localzip/r1')
+        r2 = self.target('3rdparty/go/localzip/r2')
+
+        self.set_options(worker_count=2)
+        go_fetch = self.create_task(self._create_fetch_context(zipdir))
+
+        def failing_fetch_pkg(gopath, pkg, rev):
+          raise TaskError('Failed to fetch {}'.format(pkg))
+        go_fetch._fetch_pkg = failing_fetch_pkg
+
+        try:
+          go_fetch._transitive_download_remote_libs({r1, r2})
+          self.fail('Expected the fetch failure to be raised.')
+        except TaskError:
+          # The traceback is that of the worker which failed, rather than of the re-raise.
+          function_names = [name for _, _, name, _ in traceback.extract_tb(sys.exc_info()[2])]
+          self.assertEqual('failing_fetch_pkg', function_names[-1])
+
+  def test_host_connection_limiter(self):
+    limiter = _HostConnectionLimiter(2)
+    lock = threading.Lock()
+    active = defaultdict(int)
+    max_active = defaultdict(int)
+
+    def connect(import_path):
+      host = import_path.split('/')[0]
+      with limiter.connection(import_path):
+        with lock:
+          active[host] += 1
+          max_active[host] = max(max_active[host], active[host])
+        time.sleep(0.05)
+        with lock:
+          active[host] -= 1
+
+    threads = [threading.Thread(target=connect, args=('{}/u/r{}'.format(host, i),))
+               for host in ('github.com', 'bitbucket.org') for i in range(5)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual({'github.com': 2, 'bitbucket.org': 2}, dict(max_active))
+
   def test_issues_2616(self):
     go_fetch = self.create_task(self.context())
     self.create_file('src/github.com/u/a/a.go', contents="""
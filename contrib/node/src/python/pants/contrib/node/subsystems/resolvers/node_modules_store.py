@@ -0,0 +1,142 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+from pants.base.hash_utils import hash_file
+from pants.util.dirutil import safe_rmtree
+
+from pants.contrib.node.subsystems.package_managers import (PACKAGE_MANAGER_NPM,
+                                                            PACKAGE_MANAGER_YARNPKG)
+
+
+def copy_tree(src, dst):
+  """Copies the directory tree at `src` to `dst`, recreating symlinks verbatim."""
+  safe_rmtree(dst)
+  shutil.copytree(src, dst, symlinks=True)
+
+
+class NodeModulesStore(object):
+  """A content-addressed store of installed `node_modules` trees, shared between node modules.
+
+  A tree is keyed by a fingerprint of the inputs that fully determine an install: the package
+  manager, the node version, the package's `package.json` and lockfile, and whether optional
+  dependencies are installed. Modules with identical inputs have their `node_modules` materialized
+  by copying a single stored tree, so each unique tree is only downloaded and installed once.
+
+  Materializing a tree skips the install entirely, so packages whose install runs lifecycle scripts
+  of their own (which may have effects outside of `node_modules`) are never stored.
+  """
+
+  _LOCKFILES = {
+    PACKAGE_MANAGER_NPM: 'npm-shrinkwrap.json',
+    PACKAGE_MANAGER_YARNPKG: 'yarn.lock',
+  }
+
+  # Files which may change how a package manager resolves or installs packages.
+  _CONFIG_FILES = ('.npmrc', '.yarnrc')
+
+  # The scripts of a package that its own install runs.
+  _INSTALL_SCRIPTS = ('preinstall', 'install', 'postinstall', 'prepublish', 'prepare')
+
+  def __init__(self, root):
+    """
+    :param string root: The directory to store trees under.
+    """
+    self._root = root
+    self._locks_lock = threading.Lock()
+    self._locks = defaultdict(threading.Lock)
+
+  @classmethod
+  def fingerprint(cls, package_dir, package_manager, node_version, install_optional):
+    """Returns the key of the tree that installing the given package would produce.
+
+    :param string package_dir: The directory containing the package's `package.json`.
+    :param string package_manager: The name of the package manager that installs the package.
+    :param string node_version: The version of node that the package is installed with.
+    :param bool install_optional: Whether optional dependencies are installed.
+    :returns: A key, or None if the package has no lockfile, and so its install is not
+              reproducible, or if its install runs scripts of its own.
+    """
+    lockfile = cls._LOCKFILES.get(package_manager)
+    if not lockfile or not os.path.isfile(os.path.join(package_dir, lockfile)):
+      return None
+    if cls._has_install_scripts(package_dir):
+      return None
+    digest = hashlib.sha1()
+    for s in (package_manager, node_version, str(install_optional)):
+      digest.update(s.encode('utf-8'))
+      digest.update(b'\0')
+    for name in ('package.json', lockfile) + cls._CONFIG_FILES:
+      path = os.path.join(package_dir, name)
+      if os.path.isfile(path):
+        digest.update(name.encode('utf-8'))
+        hash_file(path, digest=digest)
+    return digest.hexdigest()
+
+  @classmethod
+  def _has_install_scripts(cls, package_dir):
+    try:
+      with open(os.path.join(package_dir, 'package.json'), 'r') as fp:
+        scripts = json.load(fp).get('scripts') or {}
+    except (IOError, ValueError, AttributeError):
+      # A package.json that can't be read is treated conservatively, and left to the install.
+      return True
+    return any(script in scripts for script in cls._INSTALL_SCRIPTS)
+
+  def _entry(self, key):
+    return os.path.join(self._root, key)
+
+  @contextmanager
+  def locked(self, key):
+    """Holds an in-process lock for the given key.
+
+    Holding the lock while installing prevents concurrent installs of identical trees, so that all
+    but the first can be materialized from the store instead.
+    """
+    with self._locks_lock:
+      lock = self._locks[key]
+    with lock:
+      yield
+
+  def materialize(self, key, package_dir):
+    """Copies the stored tree for the given key to `package_dir/node_modules`.
+
+    :returns: True if the tree was present in the store, and False otherwise.
+    """
+    stored = os.path.join(self._entry(key), 'node_modules')
+    if not os.path.isdir(stored):
+      return False
+    copy_tree(stored, os.path.join(package_dir, 'node_modules'))
+    return True
+
+  def add(self, key, package_dir):
+    """Stores the tree installed at `package_dir/node_modules` under the given key.
+
+    The tree is written atomically: if another process stores the same key concurrently, the first
+    tree written wins.
+    """
+    node_modules = os.path.join(package_dir, 'node_modules')
+    if not os.path.isdir(node_modules) or os.path.isdir(self._entry(key)):
+      return
+    tmp_entry = '{}.tmp.{}'.format(self._entry(key), uuid.uuid4().hex)
+    try:
+      copy_tree(node_modules, os.path.join(tmp_entry, 'node_modules'))
+      os.rename(tmp_entry, self._entry(key))
+    except OSError as e:
+      if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+        raise
+    finally:
+      safe_rmtree(tmp_entry)
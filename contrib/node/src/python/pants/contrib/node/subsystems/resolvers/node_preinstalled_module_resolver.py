@@ -23,12 +23,17 @@ from pants.contrib.node.tasks.node_resolve import NodeResolve
 
 class NodePreinstalledModuleResolver(Subsystem, NodeResolverBase):
   options_scope = 'node-preinstalled-module-resolver'
+  options_registration_is_pure = True
 
   @classmethod
   def register_options(cls, register):
     register('--fetch-timeout-secs', type=int, advanced=True, default=10,
              help='Timeout the fetch if the connection is idle for longer than this value.')
     super(NodePreinstalledModuleResolver, cls).register_options(register)
+
+  @classmethod
+  def options_registered(cls):
+    super(NodePreinstalledModuleResolver, cls).options_registered()
     NodeResolve.register_resolver_for_type(NodePreinstalledModule, cls)
 
   def resolve_target(self, node_task, target, results_dir, node_paths):
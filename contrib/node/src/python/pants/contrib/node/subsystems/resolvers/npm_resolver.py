@@ -11,10 +11,10 @@ import os
 from pants.base.exceptions import TaskError
 from pants.base.workunit import WorkUnitLabel
 from pants.subsystem.subsystem import Subsystem
-from pants.util.contextutil import pushd
 
 from pants.contrib.node.subsystems.package_managers import (PACKAGE_MANAGER_NPM,
                                                             PACKAGE_MANAGER_YARNPKG)
+from pants.contrib.node.subsystems.resolvers.node_modules_store import NodeModulesStore
 from pants.contrib.node.subsystems.resolvers.node_resolver_base import NodeResolverBase
 from pants.contrib.node.targets.node_module import NodeModule
 from pants.contrib.node.tasks.node_resolve import NodeResolve
@@ -22,6 +22,7 @@ from pants.contrib.node.tasks.node_resolve import NodeResolve
 
 class NpmResolver(Subsystem, NodeResolverBase):
   options_scope = 'npm-resolver'
+  options_registration_is_pure = True
 
   @classmethod
   def register_options(cls, register):
@@ -29,38 +30,90 @@ class NpmResolver(Subsystem, NodeResolverBase):
     register(
       '--install-optional', type=bool, default=False, fingerprint=True,
       help='If enabled, install optional dependencies.')
+    register(
+      '--use-node-modules-store', type=bool, advanced=True, default=False,
+      help='If enabled, the node_modules of modules which have a lockfile are installed once per '
+           'unique set of dependencies into a shared store, and copied from there into each '
+           'module. Modules with install lifecycle scripts of their own are always installed.')
+    register(
+      '--node-modules-store-dir', advanced=True, default=None,
+      help='The directory of the shared node_modules store. Defaults to a directory under the '
+           'pants workdir.')
+
+  @classmethod
+  def options_registered(cls):
+    super(NpmResolver, cls).options_registered()
     NodeResolve.register_resolver_for_type(NodeModule, cls)
 
+  def __init__(self, *args, **kwargs):
+    super(NpmResolver, self).__init__(*args, **kwargs)
+    # The store is created eagerly, since targets are resolved concurrently.
+    self._node_modules_store = None
+    if self.get_options().use_node_modules_store:
+      store_dir = (self.get_options().node_modules_store_dir or
+                   os.path.join(self.get_options().pants_workdir, self.options_scope,
+                                'node_modules_store'))
+      self._node_modules_store = NodeModulesStore(store_dir)
+
   def resolve_target(self, node_task, target, results_dir, node_paths):
     self._copy_sources(target, results_dir)
-    with pushd(results_dir):
-      if not os.path.exists('package.json'):
+    if not os.path.exists(os.path.join(results_dir, 'package.json')):
+      raise TaskError(
+        'Cannot find package.json. Did you forget to put it in target sources?')
+    # TODO: remove/remodel the following section when node_module dependency is fleshed out.
+    package_manager = node_task.get_package_manager(target=target).name
+    if package_manager == PACKAGE_MANAGER_NPM:
+      if os.path.exists(os.path.join(results_dir, 'npm-shrinkwrap.json')):
+        node_task.context.log.info('Found npm-shrinkwrap.json, will not inject package.json')
+      else:
+        node_task.context.log.warn(
+          'Cannot find npm-shrinkwrap.json. Did you forget to put it in target sources? '
+          'This package will fall back to inject package.json with pants BUILD dependencies '
+          'including node_remote_module and other node dependencies. However, this is '
+          'not fully supported.')
+        self._emit_package_descriptor(node_task, target, results_dir, node_paths)
+    elif package_manager == PACKAGE_MANAGER_YARNPKG:
+      if not os.path.exists(os.path.join(results_dir, 'yarn.lock')):
         raise TaskError(
-          'Cannot find package.json. Did you forget to put it in target sources?')
-      # TODO: remove/remodel the following section when node_module dependency is fleshed out.
-      package_manager = node_task.get_package_manager(target=target).name
-      if package_manager == PACKAGE_MANAGER_NPM:
-        if os.path.exists('npm-shrinkwrap.json'):
-          node_task.context.log.info('Found npm-shrinkwrap.json, will not inject package.json')
-        else:
-          node_task.context.log.warn(
-            'Cannot find npm-shrinkwrap.json. Did you forget to put it in target sources? '
-            'This package will fall back to inject package.json with pants BUILD dependencies '
-            'including node_remote_module and other node dependencies. However, this is '
-            'not fully supported.')
-          self._emit_package_descriptor(node_task, target, results_dir, node_paths)
-      elif package_manager == PACKAGE_MANAGER_YARNPKG:
-        if not os.path.exists('yarn.lock'):
-          raise TaskError(
-            'Cannot find yarn.lock. Did you forget to put it in target sources?')
-
-      result, command = node_task.install_module(
-        target=target, install_optional=self.get_options().install_optional,
-        workunit_name=target.address.reference(),
-        workunit_labels=[WorkUnitLabel.COMPILER])
-      if result != 0:
-        raise TaskError('Failed to resolve dependencies for {}:\n\t{} failed with exit code {}'
-                        .format(target.address.reference(), command, result))
+          'Cannot find yarn.lock. Did you forget to put it in target sources?')
+
+    store_key = self._node_modules_store_key(node_task, target, results_dir, package_manager)
+    if store_key is None:
+      self._install(node_task, target, results_dir)
+      return
+
+    with self._node_modules_store.locked(store_key):
+      if self._node_modules_store.materialize(store_key, results_dir):
+        node_task.context.log.debug('Copied node_modules for {} from the store.'
+                                    .format(target.address.reference()))
+      else:
+        self._install(node_task, target, results_dir)
+        self._node_modules_store.add(store_key, results_dir)
+
+  def _node_modules_store_key(self, node_task, target, results_dir, package_manager):
+    """Returns the key of the target's node_modules in the store, or None if it is not storable.
+
+    A target that depends on other node modules installs them from their chroots, which are
+    specific to this workspace, so its node_modules may not be shared.
+    """
+    if self._node_modules_store is None:
+      return None
+    if any(node_task.is_node_module(dep) for dep in target.dependencies):
+      return None
+    return NodeModulesStore.fingerprint(results_dir,
+                                        package_manager,
+                                        node_task.node_distribution.version(),
+                                        self.get_options().install_optional)
+
+  def _install(self, node_task, target, results_dir):
+    result, command = node_task.install_module(
+      target=target, install_optional=self.get_options().install_optional,
+      workunit_name=target.address.reference(),
+      workunit_labels=[WorkUnitLabel.COMPILER],
+      cwd=results_dir)
+    if result != 0:
+      raise TaskError('Failed to resolve dependencies for {}:\n\t{} failed with exit code {}'
+                      .format(target.address.reference(), command, result))
 
   @staticmethod
   def _emit_package_descriptor(node_task, target, results_dir, node_paths):
@@ -5,6 +5,12 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import functools
+from multiprocessing import cpu_count
+
+from pants.base.exceptions import TaskError
+from pants.base.execution_graph import ExecutionFailure, ExecutionGraph, Job
+from pants.base.worker_pool import WorkerPool
 from pants.base.workunit import WorkUnitLabel
 
 from pants.contrib.node.tasks.node_paths import NodePaths
@@ -20,6 +26,13 @@ class NodeResolve(NodeTask):
   def product_types(cls):
     return [NodePaths]
 
+  @classmethod
+  def register_options(cls, register):
+    super(NodeResolve, cls).register_options(register)
+    register('--worker-count', advanced=True, type=int, default=cpu_count(),
+             help='The number of node packages to resolve concurrently. A package is only resolved '
+                  'once all of the node packages it depends on have been resolved.')
+
   @classmethod
   def prepare(cls, options, round_manager):
     """Allow each resolver to declare additional product requirements."""
@@ -75,15 +88,46 @@ class NodeResolve(NodeTask):
     node_paths = self.context.products.get_data(NodePaths, init_func=NodePaths)
 
     # We must have copied local sources into place and have node_modules directories in place for
-    # internal dependencies before installing dependees, so `topological_order=True` is critical.
+    # internal dependencies before installing dependees, so each package is only resolved once all
+    # of the invalid packages it depends on have been.
     with self.invalidated(targets,
                           topological_order=True,
                           invalidate_dependents=True) as invalidation_check:
+      # The chroot of each package is known up front, so all of them are registered before any are
+      # resolved: resolvers may refer to the chroots of the dependencies of their package.
+      for vt in invalidation_check.all_vts:
+        node_paths.resolved(vt.target, vt.results_dir)
+      self._resolve([vt for vt in invalidation_check.all_vts if not vt.valid], node_paths)
+
+  def _resolve(self, invalid_vts, node_paths):
+    """Resolves the given invalid packages on a pool of workers."""
+    jobs = self._create_resolve_jobs(invalid_vts, node_paths)
+    if not jobs:
+      return
 
-      with self.context.new_workunit(name='install', labels=[WorkUnitLabel.MULTITOOL]):
-        for vt in invalidation_check.all_vts:
-          target = vt.target
-          if not vt.valid:
-            resolver_for_target_type = self._resolver_for_target(target).global_instance()
-            resolver_for_target_type.resolve_target(self, target, vt.results_dir, node_paths)
-          node_paths.resolved(target, vt.results_dir)
+    with self.context.new_workunit(name='install', labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+      worker_pool = WorkerPool(workunit,
+                               self.context.run_tracker,
+                               min(self.get_options().worker_count, len(jobs)))
+      try:
+        ExecutionGraph(jobs).execute(worker_pool, self.context.log)
+      except ExecutionFailure as e:
+        raise TaskError('Node resolve failure: {}'.format(e))
+      finally:
+        worker_pool.shutdown()
+
+  def _create_resolve_jobs(self, invalid_vts, node_paths):
+    invalid_targets = set(vt.target for vt in invalid_vts)
+    jobs = []
+    for vt in invalid_vts:
+      # Resolver instances are looked up here on the main thread.
+      resolver = self._resolver_for_target(vt.target).global_instance()
+      work = functools.partial(resolver.resolve_target, self, vt.target, vt.results_dir, node_paths)
+      dependencies = [dep.address.spec for dep in vt.target.closure()
+                      if dep != vt.target and dep in invalid_targets]
+      jobs.append(Job(vt.target.address.spec,
+                      work,
+                      dependencies,
+                      on_success=vt.update,
+                      on_failure=vt.force_invalidate))
+    return jobs
@@ -97,8 +97,11 @@ class NodeTask(Task):
   def install_module(
     self, target=None, package_manager=None, 
     install_optional=False, production_only=False, force=False, 
-    node_paths=None, workunit_name=None, workunit_labels=None):
-    """Installs node module using requested package_manager."""
+    node_paths=None, workunit_name=None, workunit_labels=None, cwd=None):
+    """Installs node module using requested package_manager.
+
+    The module is installed into the current directory, or into `cwd` if it is given.
+    """
     package_manager = package_manager or self.get_package_manager(target=target)
     command = package_manager.install_module(
       install_optional=install_optional,
@@ -107,7 +110,7 @@ class NodeTask(Task):
       node_paths=node_paths,
     )
     return self._execute_command(
-      command, workunit_name=workunit_name, workunit_labels=workunit_labels)
+      command, workunit_name=workunit_name, workunit_labels=workunit_labels, cwd=cwd)
 
   def run_script(
     self, script_name, target=None, package_manager=None, script_args=None, node_paths=None,
@@ -128,12 +131,13 @@ class NodeTask(Task):
     return self._execute_command(
       command, workunit_name=workunit_name, workunit_labels=workunit_labels)
 
-  def _execute_command(self, command, workunit_name=None, workunit_labels=None):
+  def _execute_command(self, command, workunit_name=None, workunit_labels=None, cwd=None):
     """Executes a node or npm command via self._run_node_distribution_command.
 
     :param NodeDistribution.Command command: The command to run.
     :param string workunit_name: A name for the execution's work unit; default command.executable.
     :param list workunit_labels: Any extra :class:`pants.base.workunit.WorkUnitLabel`s to apply.
+    :param string cwd: The directory to run the command in; defaults to the current directory.
     :returns: A tuple of (returncode, command).
     :rtype: A tuple of (int,
             :class:`pants.contrib.node.subsystems.node_distribution.NodeDistribution.Command`)
@@ -143,11 +147,12 @@ class NodeTask(Task):
     with self.context.new_workunit(name=workunit_name,
                                    labels=workunit_labels,
                                    cmd=str(command)) as workunit:
-      returncode = self._run_node_distribution_command(command, workunit)
+      run_kwargs = {'cwd': cwd} if cwd else {}
+      returncode = self._run_node_distribution_command(command, workunit, **run_kwargs)
       workunit.set_outcome(WorkUnit.SUCCESS if returncode == 0 else WorkUnit.FAILURE)
       return returncode, command
 
-  def _run_node_distribution_command(self, command, workunit):
+  def _run_node_distribution_command(self, command, workunit, **kwargs):
     """Runs a NodeDistribution.Command for _execute_command and returns its return code.
 
     Passes any additional kwargs to command.run (which passes them, modified, to subprocess.Popen).
@@ -160,5 +165,6 @@ class NodeTask(Task):
     :rtype: int
     """
     process = command.run(stdout=workunit.output('stdout'),
-                          stderr=workunit.output('stderr'))
+                          stderr=workunit.output('stderr'),
+                          **kwargs)
     return process.wait()
@@ -35,7 +35,7 @@ class NodeTest(TestRunnerTaskMixin, NodeTask):
   def supports_passthru_args(cls):
     return True
 
-  def _run_node_distribution_command(self, command, workunit):
+  def _run_node_distribution_command(self, command, workunit, **kwargs):
     """Overrides NodeTask._run_node_distribution_command.
 
     This is what is ultimately used to run the Command.
@@ -43,7 +43,7 @@ class NodeTest(TestRunnerTaskMixin, NodeTask):
     command.run immediately. We override here to invoke TestRunnerTaskMixin._spawn_and_wait,
     which ultimately invokes _spawn, which finally calls command.run.
     """
-    return self._spawn_and_wait(command, workunit)
+    return self._spawn_and_wait(command, workunit, **kwargs)
 
   def _get_test_targets_for_spawn(self):
     """Overrides TestRunnerTaskMixin._get_test_targets_for_spawn.
@@ -81,10 +81,11 @@ class NodeTest(TestRunnerTaskMixin, NodeTask):
                           '\t{} failed with exit code {}'.format(test_command, result))
     self._currently_executing_test_targets = []
 
-  def _spawn(self, command, workunit):
+  def _spawn(self, command, workunit, **kwargs):
     """Implements abstract TestRunnerTaskMixin._spawn."""
     process = command.run(stdout=workunit.output('stdout'),
-                          stderr=workunit.output('stderr'))
+                          stderr=workunit.output('stderr'),
+                          **kwargs)
     return SubprocessProcessHandler(process)
 
   def _test_target_filter(self):
@@ -0,0 +1,91 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump, touch
+
+from pants.contrib.node.subsystems.resolvers.node_modules_store import NodeModulesStore
+
+
+class NodeModulesStoreTest(unittest.TestCase):
+
+  def _package(self, package_dir, lockfile='yarn.lock', lockfile_contents=''):
+    safe_file_dump(os.path.join(package_dir, 'package.json'), '{"name": "util"}')
+    if lockfile:
+      safe_file_dump(os.path.join(package_dir, lockfile), lockfile_contents)
+    return package_dir
+
+  def _fingerprint(self, package_dir, package_manager='yarnpkg', install_optional=False):
+    return NodeModulesStore.fingerprint(package_dir, package_manager, 'v6.9.1', install_optional)
+
+  def test_fingerprint_requires_lockfile(self):
+    with temporary_dir() as package_dir:
+      self._package(package_dir, lockfile=None)
+      self.assertIsNone(self._fingerprint(package_dir))
+      self.assertIsNone(self._fingerprint(package_dir, package_manager='npm'))
+
+  def test_fingerprint(self):
+    with temporary_dir() as a, temporary_dir() as b:
+      self._package(a)
+      self._package(b)
+      self.assertIsNotNone(self._fingerprint(a))
+      self.assertEqual(self._fingerprint(a), self._fingerprint(b))
+      self.assertNotEqual(self._fingerprint(a), self._fingerprint(a, install_optional=True))
+
+      safe_file_dump(os.path.join(b, 'yarn.lock'), 'typ@0.6.3')
+      self.assertNotEqual(self._fingerprint(a), self._fingerprint(b))
+
+  def test_fingerprint_excludes_install_scripts(self):
+    with temporary_dir() as package_dir:
+      self._package(package_dir)
+      for script in ('install', 'postinstall'):
+        safe_file_dump(os.path.join(package_dir, 'package.json'),
+                       '{{"name": "util", "scripts": {{"{}": "make"}}}}'.format(script))
+        self.assertIsNone(self._fingerprint(package_dir))
+
+      safe_file_dump(os.path.join(package_dir, 'package.json'),
+                     '{"name": "util", "scripts": {"test": "mocha"}}')
+      self.assertIsNotNone(self._fingerprint(package_dir))
+
+  def test_add_and_materialize(self):
+    with temporary_dir() as store_dir, temporary_dir() as a, temporary_dir() as b:
+      store = NodeModulesStore(store_dir)
+      key = self._fingerprint(self._package(a))
+      self.assertFalse(store.materialize(key, b))
+
+      safe_file_dump(os.path.join(a, 'node_modules', 'typ', 'index.js'), 'module.exports = {}')
+      os.symlink('../typ/index.js', os.path.join(a, 'node_modules', 'typ', 'link.js'))
+      touch(os.path.join(a, 'node_modules', '.bin', 'typ'))
+      store.add(key, a)
+
+      self.assertTrue(store.materialize(key, b))
+      # The tree is copied, so that an install that modifies its own files can't corrupt the store.
+      index = os.path.join(b, 'node_modules', 'typ', 'index.js')
+      self.assertNotEqual(os.stat(os.path.join(a, 'node_modules', 'typ', 'index.js')).st_ino,
+                          os.stat(index).st_ino)
+      with open(index, 'r') as fp:
+        self.assertEqual('module.exports = {}', fp.read())
+      self.assertEqual('../typ/index.js',
+                       os.readlink(os.path.join(b, 'node_modules', 'typ', 'link.js')))
+      self.assertTrue(os.path.isfile(os.path.join(b, 'node_modules', '.bin', 'typ')))
+
+  def test_add_first_wins(self):
+    with temporary_dir() as store_dir, temporary_dir() as a, temporary_dir() as b:
+      store = NodeModulesStore(store_dir)
+      key = self._fingerprint(self._package(a))
+      safe_file_dump(os.path.join(a, 'node_modules', 'first.js'), '')
+      safe_file_dump(os.path.join(b, 'node_modules', 'second.js'), '')
+      store.add(key, a)
+      store.add(key, b)
+
+      with temporary_dir() as c:
+        self.assertTrue(store.materialize(key, c))
+        self.assertEqual(['first.js'], os.listdir(os.path.join(c, 'node_modules')))
+      self.assertEqual([key], os.listdir(store_dir))
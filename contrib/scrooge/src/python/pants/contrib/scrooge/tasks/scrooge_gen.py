@@ -18,7 +18,7 @@ from pants.base.exceptions import TargetDefinitionException, TaskError
 from pants.build_graph.address import Address
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.task.simple_codegen_task import SimpleCodegenTask
-from pants.util.dirutil import safe_mkdir, safe_open
+from pants.util.dirutil import safe_delete, safe_mkdir, safe_open
 from pants.util.memo import memoized_method, memoized_property
 from twitter.common.collections import OrderedSet
 
@@ -29,6 +29,9 @@ from pants.contrib.scrooge.tasks.thrift_util import calculate_compile_sources
 
 class ScroogeGen(SimpleCodegenTask, NailgunTask):
 
+  # Concurrent invocations of scrooge are run in subprocesses: see `_gen`.
+  runs_concurrent_workers_in_subprocesses = True
+
   DepInfo = namedtuple('DepInfo', ['service', 'structs'])
   PartialCmd = namedtuple('PartialCmd', [
     'language',
@@ -131,22 +134,41 @@ class ScroogeGen(SimpleCodegenTask, NailgunTask):
       raise TaskError('More than one target type registered for language `{0}`'.format(language))
     return next(iter(target_types))
 
-  def execute_codegen(self, target, target_workdir):
-    self._validate_compiler_configs(target)
-    self._must_have_sources(target)
-
+  def _partial_cmd(self, target):
     namespace_map = self._thrift_defaults.namespace_map(target)
-    partial_cmd = self.PartialCmd(
+    return self.PartialCmd(
       language=self._validate_language(target),
       namespace_map=tuple(sorted(namespace_map.items())) if namespace_map else (),
       default_java_namespace=self._thrift_defaults.default_java_namespace(target),
-      include_paths=target.include_paths,
-      compiler_args=(self._thrift_defaults.compiler_args(target)))
+      include_paths=tuple(target.include_paths or ()),
+      compiler_args=tuple(self._thrift_defaults.compiler_args(target)))
 
-    self.gen(partial_cmd, target, target_workdir)
+  def execute_codegen(self, target, target_workdir):
+    self._validate_compiler_configs(target)
+    self._must_have_sources(target)
+
+    self.gen(self._partial_cmd(target), target, target_workdir)
+
+  def codegen_batch_key(self, target):
+    return self._partial_cmd(target)
+
+  def execute_codegen_batch(self, targets, batch_workdir):
+    for target in targets:
+      self._validate_compiler_configs(target)
+      self._must_have_sources(target)
+
+    gen_file_map = self._gen(self._partial_cmd(targets[0]), targets, batch_workdir)
+    return {target: [cls
+                     for source in target.sources_relative_to_buildroot()
+                     for cls in gen_file_map.get(source, ())]
+            for target in targets}
 
   def gen(self, partial_cmd, target, target_workdir):
-    import_paths, _ = calculate_compile_sources([target], self.is_gentarget)
+    self._gen(partial_cmd, [target], target_workdir)
+
+  def _gen(self, partial_cmd, targets, target_workdir):
+    """Runs scrooge for the given targets, and returns its map of sources to generated files."""
+    import_paths, _ = calculate_compile_sources(targets, self.is_gentarget)
 
     args = list(partial_cmd.compiler_args)
 
@@ -176,7 +198,8 @@ class ScroogeGen(SimpleCodegenTask, NailgunTask):
     gen_file_map_path = os.path.relpath(self._tempname())
     args.extend(['--gen-file-map', gen_file_map_path])
 
-    args.extend(target.sources_relative_to_buildroot())
+    for target in targets:
+      args.extend(target.sources_relative_to_buildroot())
 
     classpath = self.tool_classpath('scrooge-gen')
     jvm_options = list(self.get_options().jvm_options)
@@ -185,9 +208,17 @@ class ScroogeGen(SimpleCodegenTask, NailgunTask):
                               main='com.twitter.scrooge.Main',
                               jvm_options=jvm_options,
                               args=args,
-                              workunit_name='scrooge-gen')
+                              workunit_name='scrooge-gen',
+                              # Concurrent invocations can't share the nailgun server, which
+                              # runs each tool main in one JVM.
+                              force_subprocess=self.get_options().worker_count > 1)
     if 0 != returncode:
-      raise TaskError('Scrooge compiler exited non-zero for {} ({})'.format(target, returncode))
+      raise TaskError('Scrooge compiler exited non-zero for {} ({})'
+                      .format(', '.join(t.address.spec for t in targets), returncode))
+    try:
+      return self.parse_gen_file_map(gen_file_map_path, target_workdir)
+    finally:
+      safe_delete(gen_file_map_path)
 
   @staticmethod
   def _declares_exception(source):
@@ -12,7 +12,7 @@ from mock import MagicMock
 from pants.backend.codegen.thrift.java.java_thrift_library import JavaThriftLibrary
 from pants.backend.jvm.targets.java_library import JavaLibrary
 from pants.backend.jvm.targets.scala_library import ScalaLibrary
-from pants.base.exceptions import TargetDefinitionException
+from pants.base.exceptions import TargetDefinitionException, TaskError
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.goal.context import Context
 from pants.source.wrapped_globs import EagerFilesetWithSpec
@@ -65,6 +65,21 @@ class ScroogeGenTest(NailgunTaskTestBase):
     task._validate_compiler_configs(self.target('test_validate:one'))
     task._validate_compiler_configs(self.target('test_validate:two'))
 
+  def test_concurrent_workers_run_in_subprocesses(self):
+    self.create_file(relpath='test_workers/a.thrift', contents='struct A {}')
+    self.add_to_build_file('test_workers', self._test_create_build_str('scala', []))
+    target = self.target('test_workers:a')
+
+    for worker_count, force_subprocess in ((1, False), (2, True)):
+      self.set_options(worker_count=worker_count)
+      task = self.prepare_execute(self.context(target_roots=[target]))
+      task.tool_classpath = MagicMock(return_value=[])
+      task.runjava = MagicMock(return_value=1)
+      with self.assertRaises(TaskError):
+        task.execute_codegen_batch([target], self.test_workdir)
+      _, call_kwargs = task.runjava.call_args
+      self.assertEquals(force_subprocess, call_kwargs['force_subprocess'])
+
   def test_scala(self):
     sources = [os.path.join(self.test_workdir, 'org/pantsbuild/example/Example.scala')]
     self._test_help('scala', ScalaLibrary, [GEN_ADAPT], sources)
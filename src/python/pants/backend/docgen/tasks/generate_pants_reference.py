@@ -32,6 +32,11 @@ class GeneratePantsReference(Task):
   def product_types(cls):
     return [cls.PANTS_REFERENCE_PRODUCT, cls.BUILD_DICTIONARY_PRODUCT]
 
+  @classmethod
+  def requires_other_goals(cls):
+    # The reference documents all goals and their options.
+    return True
+
   @classmethod
   def register_options(cls, register):
     register('--pants-reference-template', default='reference/pants_reference.html',
@@ -9,6 +9,8 @@ import json
 from collections import defaultdict
 
 from pants.base.specs import DescendantAddresses
+from pants.engine.legacy.dependee_index import DependeeIndex
+from pants.engine.legacy.graph import target_types_from_build_file_aliases
 from pants.task.console_task import ConsoleTask
 
 
@@ -33,15 +35,10 @@ class ReverseDepmap(ConsoleTask):
     self._closed = self.get_options().closed
 
   def console_output(self, _):
-    dependees_by_target = defaultdict(set)
-    for address in self.context.build_graph.inject_specs_closure([DescendantAddresses('')]):
-      target = self.context.build_graph.get_target(address)
-      # TODO(John Sirois): tighten up the notion of targets written down in a BUILD by a
-      # user vs. targets created by pants at runtime.
-      concrete_target = self.get_concrete_target(target)
-      for dependency in concrete_target.dependencies:
-        dependency = self.get_concrete_target(dependency)
-        dependees_by_target[dependency].add(concrete_target)
+    if self.context.options.for_global_scope().dependee_index:
+      dependees_of = self._indexed_dependees_of()
+    else:
+      dependees_of = self._hydrated_dependees_of()
 
     roots = set(self.context.target_roots)
     if self.get_options().output_format == 'json':
@@ -49,8 +46,8 @@ class ReverseDepmap(ConsoleTask):
       for root in roots:
         if self._closed:
           deps[root.address.spec].append(root.address.spec)
-        for dependent in self.get_dependents(dependees_by_target, [root]):
-          deps[root.address.spec].append(dependent.address.spec)
+        for dependent in dependees_of([root]):
+          deps[root.address.spec].append(dependent.spec)
       for address in deps.keys():
         deps[address].sort()
       yield json.dumps(deps, indent=4, separators=(',', ': '), sort_keys=True)
@@ -59,8 +56,43 @@ class ReverseDepmap(ConsoleTask):
         for root in roots:
           yield root.address.spec
 
-      for dependent in self.get_dependents(dependees_by_target, roots):
-        yield dependent.address.spec
+      for dependent in dependees_of(roots):
+        yield dependent.spec
+
+  def _indexed_dependees_of(self):
+    """Returns a function from root targets to dependee addresses, backed by a DependeeIndex."""
+    global_options = self.context.options.for_global_scope()
+    target_types = target_types_from_build_file_aliases(
+      self.context.build_file_parser.registered_aliases())
+    index = DependeeIndex(self.context.scheduler,
+                          target_types,
+                          build_ignore_patterns=global_options.build_ignore,
+                          path=DependeeIndex.path_for_workdir(global_options.pants_workdir),
+                          subproject_roots=global_options.subproject_roots)
+    index.refresh()
+
+    def dependees_of(roots):
+      addresses = [self.get_concrete_target(root).address for root in roots]
+      if self._transitive:
+        return index.transitive_dependees_of_addresses(addresses)
+      return index.dependees_of_addresses(addresses)
+    return dependees_of
+
+  def _hydrated_dependees_of(self):
+    """Returns a function from root targets to dependee addresses, backed by the BuildGraph."""
+    dependees_by_target = defaultdict(set)
+    for address in self.context.build_graph.inject_specs_closure([DescendantAddresses('')]):
+      target = self.context.build_graph.get_target(address)
+      # TODO(John Sirois): tighten up the notion of targets written down in a BUILD by a
+      # user vs. targets created by pants at runtime.
+      concrete_target = self.get_concrete_target(target)
+      for dependency in concrete_target.dependencies:
+        dependency = self.get_concrete_target(dependency)
+        dependees_by_target[dependency].add(concrete_target)
+
+    def dependees_of(roots):
+      return [t.address for t in self.get_dependents(dependees_by_target, roots)]
+    return dependees_of
 
   def get_dependents(self, dependees_by_target, roots):
     check = set(roots)
@@ -10,6 +10,7 @@ import json
 from pants.base.deprecated import deprecated
 from pants.base.exceptions import TaskError
 from pants.build_graph.source_mapper import LazySourceMapper
+from pants.engine.legacy.source_owner_index import SourceOwnerIndex
 from pants.task.console_task import ConsoleTask
 
 
@@ -36,11 +37,11 @@ class ListOwners(ConsoleTask):
     sources = self.get_passthru_args()
     if not sources:
       raise TaskError('No source was specified')
-    lazy_source_mapper = LazySourceMapper(self.context.address_mapper, self.context.build_graph)
+    source_mapper = self._source_mapper()
     owner_info = {}
     for source in sources:
       owner_info[source] = []
-      target_addresses_for_source = lazy_source_mapper.target_addresses_for_source(source)
+      target_addresses_for_source = source_mapper.target_addresses_for_source(source)
       for address in target_addresses_for_source:
         owner_info[source].append(address.spec)
     if self.get_options().output_format == 'json':
@@ -53,6 +54,14 @@ class ListOwners(ConsoleTask):
         for address_spec in owner_info.values()[0]:
           yield address_spec
 
+  def _source_mapper(self):
+    global_options = self.context.options.for_global_scope()
+    if global_options.owner_index:
+      return SourceOwnerIndex(self.context.scheduler,
+                              build_ignore_patterns=global_options.build_ignore,
+                              path=SourceOwnerIndex.path_for_workdir(global_options.pants_workdir))
+    return LazySourceMapper(self.context.address_mapper, self.context.build_graph)
+
   @deprecated("1.10.0.dev0", "Run './pants --owner-of=<file> list' instead")
   def execute(self):
     super(ListOwners, self).execute()
@@ -30,44 +30,6 @@ from pants.backend.jvm.targets.scala_jar_dependency import ScalaJarDependency
 from pants.backend.jvm.targets.scala_library import ScalaLibrary
 from pants.backend.jvm.targets.scalac_plugin import ScalacPlugin
 from pants.backend.jvm.targets.unpacked_jars import UnpackedJars
-from pants.backend.jvm.tasks.analysis_extraction import AnalysisExtraction
-from pants.backend.jvm.tasks.benchmark_run import BenchmarkRun
-from pants.backend.jvm.tasks.binary_create import BinaryCreate
-from pants.backend.jvm.tasks.bootstrap_jvm_tools import BootstrapJvmTools
-from pants.backend.jvm.tasks.bundle_create import BundleCreate
-from pants.backend.jvm.tasks.check_published_deps import CheckPublishedDeps
-from pants.backend.jvm.tasks.checkstyle import Checkstyle
-from pants.backend.jvm.tasks.classmap import ClassmapTask
-from pants.backend.jvm.tasks.consolidate_classpath import ConsolidateClasspath
-from pants.backend.jvm.tasks.coursier_resolve import CoursierResolve
-from pants.backend.jvm.tasks.detect_duplicates import DuplicateDetector
-from pants.backend.jvm.tasks.ivy_imports import IvyImports
-from pants.backend.jvm.tasks.ivy_outdated import IvyOutdated
-from pants.backend.jvm.tasks.ivy_resolve import IvyResolve
-from pants.backend.jvm.tasks.jar_create import JarCreate
-from pants.backend.jvm.tasks.jar_publish import JarPublish
-from pants.backend.jvm.tasks.javadoc_gen import JavadocGen
-from pants.backend.jvm.tasks.junit_run import JUnitRun
-from pants.backend.jvm.tasks.jvm_compile.javac.javac_compile import JavacCompile
-from pants.backend.jvm.tasks.jvm_compile.jvm_classpath_publisher import RuntimeClasspathPublisher
-from pants.backend.jvm.tasks.jvm_compile.zinc.zinc_compile import ZincCompile
-from pants.backend.jvm.tasks.jvm_dependency_check import JvmDependencyCheck
-from pants.backend.jvm.tasks.jvm_dependency_usage import JvmDependencyUsage
-from pants.backend.jvm.tasks.jvm_platform_analysis import JvmPlatformExplain, JvmPlatformValidate
-from pants.backend.jvm.tasks.jvm_run import JvmRun
-from pants.backend.jvm.tasks.nailgun_task import NailgunKillall
-from pants.backend.jvm.tasks.prepare_resources import PrepareResources
-from pants.backend.jvm.tasks.prepare_services import PrepareServices
-from pants.backend.jvm.tasks.provide_tools_jar import ProvideToolsJar
-from pants.backend.jvm.tasks.run_jvm_prep_command import (RunBinaryJvmPrepCommand,
-                                                          RunCompileJvmPrepCommand,
-                                                          RunTestJvmPrepCommand)
-from pants.backend.jvm.tasks.scala_repl import ScalaRepl
-from pants.backend.jvm.tasks.scaladoc_gen import ScaladocGen
-from pants.backend.jvm.tasks.scalafix import ScalaFixCheck, ScalaFixFix
-from pants.backend.jvm.tasks.scalafmt import ScalaFmtCheckFormat, ScalaFmtFormat
-from pants.backend.jvm.tasks.scalastyle import Scalastyle
-from pants.backend.jvm.tasks.unpack_jars import UnpackJars
 from pants.base.deprecated import warn_or_error
 from pants.build_graph.app_base import Bundle, DirectoryReMapper
 from pants.build_graph.build_file_aliases import BuildFileAliases
@@ -77,6 +39,56 @@ from pants.java.jar.exclude import Exclude
 from pants.java.jar.jar_dependency import JarDependencyParseContextWrapper
 
 
+def _lazy_task(name):
+  return 'pants.backend.jvm.tasks.{}'.format(name)
+
+
+# Task types are named rather than imported, so that each is only imported if its goal is used (see
+# `TaskRegistrar`).
+AnalysisExtraction = _lazy_task('analysis_extraction:AnalysisExtraction')
+BenchmarkRun = _lazy_task('benchmark_run:BenchmarkRun')
+BinaryCreate = _lazy_task('binary_create:BinaryCreate')
+BootstrapJvmTools = _lazy_task('bootstrap_jvm_tools:BootstrapJvmTools')
+BundleCreate = _lazy_task('bundle_create:BundleCreate')
+CheckPublishedDeps = _lazy_task('check_published_deps:CheckPublishedDeps')
+Checkstyle = _lazy_task('checkstyle:Checkstyle')
+ClassmapTask = _lazy_task('classmap:ClassmapTask')
+ConsolidateClasspath = _lazy_task('consolidate_classpath:ConsolidateClasspath')
+CoursierResolve = _lazy_task('coursier_resolve:CoursierResolve')
+DuplicateDetector = _lazy_task('detect_duplicates:DuplicateDetector')
+IvyImports = _lazy_task('ivy_imports:IvyImports')
+IvyOutdated = _lazy_task('ivy_outdated:IvyOutdated')
+IvyResolve = _lazy_task('ivy_resolve:IvyResolve')
+JUnitRun = _lazy_task('junit_run:JUnitRun')
+JarCreate = _lazy_task('jar_create:JarCreate')
+JarPublish = _lazy_task('jar_publish:JarPublish')
+JavacCompile = _lazy_task('jvm_compile.javac.javac_compile:JavacCompile')
+JavadocGen = _lazy_task('javadoc_gen:JavadocGen')
+JvmDependencyCheck = _lazy_task('jvm_dependency_check:JvmDependencyCheck')
+JvmDependencyUsage = _lazy_task('jvm_dependency_usage:JvmDependencyUsage')
+JvmPlatformExplain = _lazy_task('jvm_platform_analysis:JvmPlatformExplain')
+JvmPlatformValidate = _lazy_task('jvm_platform_analysis:JvmPlatformValidate')
+JvmRun = _lazy_task('jvm_run:JvmRun')
+NailgunKillall = _lazy_task('nailgun_task:NailgunKillall')
+PrepareResources = _lazy_task('prepare_resources:PrepareResources')
+PrepareServices = _lazy_task('prepare_services:PrepareServices')
+ProvideToolsJar = _lazy_task('provide_tools_jar:ProvideToolsJar')
+RunBinaryJvmPrepCommand = _lazy_task('run_jvm_prep_command:RunBinaryJvmPrepCommand')
+RunCompileJvmPrepCommand = _lazy_task('run_jvm_prep_command:RunCompileJvmPrepCommand')
+RunTestJvmPrepCommand = _lazy_task('run_jvm_prep_command:RunTestJvmPrepCommand')
+RuntimeClasspathPublisher = _lazy_task(
+  'jvm_compile.jvm_classpath_publisher:RuntimeClasspathPublisher')
+ScalaFixCheck = _lazy_task('scalafix:ScalaFixCheck')
+ScalaFixFix = _lazy_task('scalafix:ScalaFixFix')
+ScalaFmtCheckFormat = _lazy_task('scalafmt:ScalaFmtCheckFormat')
+ScalaFmtFormat = _lazy_task('scalafmt:ScalaFmtFormat')
+ScalaRepl = _lazy_task('scala_repl:ScalaRepl')
+ScaladocGen = _lazy_task('scaladoc_gen:ScaladocGen')
+Scalastyle = _lazy_task('scalastyle:Scalastyle')
+UnpackJars = _lazy_task('unpack_jars:UnpackJars')
+ZincCompile = _lazy_task('jvm_compile.zinc.zinc_compile:ZincCompile')
+
+
 class DeprecatedJavaTests(JUnitTests):
   def __init__(self, *args, **kwargs):
     super(DeprecatedJavaTests, self).__init__(*args, **kwargs)
@@ -5,6 +5,7 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import hashlib
 import logging
 import os
 import re
@@ -13,11 +14,13 @@ from contextlib import contextmanager
 
 from pants.backend.jvm.subsystems.jvm_tool_mixin import JvmToolMixin
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
+from pants.base.hash_utils import hash_file
 from pants.java.distribution.distribution import DistributionLocator
 from pants.java.executor import SubprocessExecutor
 from pants.java.jar.jar_dependency import JarDependency
 from pants.subsystem.subsystem import Subsystem, SubsystemError
 from pants.util.contextutil import temporary_file
+from pants.util.memo import memoized_property
 
 
 logger = logging.getLogger(__name__)
@@ -342,6 +345,20 @@ class Shader(object):
     self._executor = executor
     self._binary_package_excludes = binary_package_excludes
 
+  @memoized_property
+  def fingerprint(self):
+    """A fingerprint of this shader's configuration: its jarjar classpath and binary excludes.
+
+    Together with a jar and the rules it is shaded with, this determines the shaded jar.
+    """
+    hasher = hashlib.sha1()
+    for path in self._jarjar_classpath:
+      hash_file(path, digest=hasher)
+    for package in self._binary_package_excludes:
+      hasher.update(package.encode('utf-8'))
+      hasher.update(b'\0')
+    return hasher.hexdigest()
+
   def assemble_binary_rules(self, main, jar, custom_rules=None):
     """Creates an ordered list of rules suitable for fully shading the given binary.
 
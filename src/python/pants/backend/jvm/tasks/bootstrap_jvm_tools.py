@@ -11,6 +11,7 @@ import shutil
 import textwrap
 import threading
 from collections import defaultdict
+from multiprocessing import cpu_count
 from textwrap import dedent
 
 from pants.backend.jvm.subsystems.jvm_tool_mixin import JvmToolMixin
@@ -18,7 +19,11 @@ from pants.backend.jvm.subsystems.shader import Shader
 from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.backend.jvm.tasks.ivy_task_mixin import IvyResolveFingerprintStrategy, IvyTaskMixin
 from pants.backend.jvm.tasks.jar_task import JarTask
+from pants.backend.jvm.tasks.shaded_jar_store import ShadedJarStore
+from pants.base.build_environment import get_pants_cachedir
 from pants.base.exceptions import TaskError
+from pants.base.worker_pool import Work, WorkerPool
+from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.address import Address
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.build_graph.target import Target
@@ -26,7 +31,7 @@ from pants.invalidation.cache_manager import VersionedTargetSet
 from pants.ivy.ivy_subsystem import IvySubsystem
 from pants.java import util
 from pants.java.executor import Executor
-from pants.util.dirutil import safe_mkdir_for
+from pants.util.dirutil import safe_delete, safe_mkdir_for
 from pants.util.memo import memoized_property
 
 
@@ -86,6 +91,15 @@ class BootstrapJvmTools(IvyTaskMixin, JarTask):
     # (indirectly, via NailgunTask).
     register('--shader-jvm-options', type=list, metavar='<option>...',
              help='Run the tool shader with these extra jvm options.')
+    register('--worker-count', advanced=True, type=int, default=cpu_count(),
+             help='The number of tools to bootstrap concurrently when bootstrapping eagerly. '
+                  'Tool resolves are serialized, and only their shading runs concurrently. '
+                  'Defaults to the current machine\'s CPU count.')
+    register('--shaded-jar-store-dir', advanced=True, metavar='<dir>',
+             default=os.path.join(get_pants_cachedir(), 'shaded_jvm_tools'),
+             help='Store shaded tool jars in this directory, keyed by the contents of the tool '
+                  'classpath and the shading rules, so that each tool is shaded only once even '
+                  'when bootstrapped from multiple workdirs.')
 
   @classmethod
   def subsystem_dependencies(cls):
@@ -176,6 +190,9 @@ class BootstrapJvmTools(IvyTaskMixin, JarTask):
   def __init__(self, *args, **kwargs):
     super(BootstrapJvmTools, self).__init__(*args, **kwargs)
     self._tool_cache_path = os.path.join(self.workdir, 'tool_cache')
+    # Guards invalidation and resolves, which share this task's cache manager and ivy state, when
+    # tools are bootstrapped concurrently. Only shading runs concurrently.
+    self._resolve_lock = threading.RLock()
 
   def execute(self):
     registered_tools = JvmToolMixin.get_registered_tools()
@@ -195,14 +212,26 @@ class BootstrapJvmTools(IvyTaskMixin, JarTask):
         callback = self.cached_bootstrap_classpath_callback(dep_spec, jvm_tool)
         callback_product_map[jvm_tool.scope][jvm_tool.key] = callback
       if self.get_options().eager:
-        with self.context.new_workunit('eager'):
-          for scope, callbacks_by_key in callback_product_map.items():
-            for key, callback in callbacks_by_key.items():
-              try:
-                callback()
-              except self.ToolUnderspecified:
-                pass  # We don't want to fail for placeholder registrations
-                      # (e.g., custom scala platform).
+        callbacks = [callback
+                     for callbacks_by_key in callback_product_map.values()
+                     for callback in callbacks_by_key.values()]
+        with self.context.new_workunit('eager', labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+          # Independent tools are resolved and shaded concurrently.
+          worker_pool = WorkerPool(workunit,
+                                   self.context.run_tracker,
+                                   min(self.get_options().worker_count, len(callbacks)))
+          try:
+            worker_pool.submit_work_and_wait(Work(self._eager_bootstrap,
+                                                  [(callback,) for callback in callbacks]))
+          finally:
+            worker_pool.shutdown()
+
+  def _eager_bootstrap(self, callback):
+    try:
+      callback()
+    except self.ToolUnderspecified:
+      pass  # We don't want to fail for placeholder registrations
+            # (e.g., custom scala platform).
 
   def _resolve_tool_targets(self, dep_spec, jvm_tool):
     try:
@@ -235,76 +264,103 @@ class BootstrapJvmTools(IvyTaskMixin, JarTask):
   def _bootstrap_classpath(self, jvm_tool, targets):
     self._check_underspecified_tools(jvm_tool, targets)
     workunit_name = 'bootstrap-{}'.format(jvm_tool.key)
-    return self.ivy_classpath(targets, silent=True, workunit_name=workunit_name)
+    with self._resolve_lock:
+      return self.ivy_classpath(targets, silent=True, workunit_name=workunit_name)
 
   @memoized_property
   def shader(self):
     return Shader.Factory.create(self.context)
 
+  @memoized_property
+  def shaded_jar_store(self):
+    return ShadedJarStore(self.get_options().shaded_jar_store_dir)
+
   def _bootstrap_shaded_jvm_tool(self, jvm_tool, targets):
     fingerprint_strategy = ShadedToolFingerprintStrategy(jvm_tool.main,
                                                          custom_rules=jvm_tool.custom_rules)
 
-    with self.invalidated(targets,
-                          # We're the only dependent in reality since we shade.
-                          invalidate_dependents=False,
-                          fingerprint_strategy=fingerprint_strategy) as invalidation_check:
-
-      # If there are no vts, then there are no resolvable targets, so we exit early with an empty
-      # classpath.  This supports the optional tool classpath case.
-      if not invalidation_check.all_vts:
-        return []
-
-      tool_vts = self.tool_vts(invalidation_check)
-      jar_name = '{main}-{hash}.jar'.format(main=jvm_tool.main, hash=tool_vts.cache_key.hash)
-      shaded_jar = os.path.join(self._tool_cache_path, 'shaded_jars', jar_name)
-
-      if not invalidation_check.invalid_vts and os.path.exists(shaded_jar):
-        return [shaded_jar]
-
-      # Ensure we have a single binary jar we can shade.
-      binary_jar = os.path.join(self._tool_cache_path, 'binary_jars', jar_name)
-      safe_mkdir_for(binary_jar)
-
-      classpath = self._bootstrap_classpath(jvm_tool, targets)
-      if len(classpath) == 1:
-        shutil.copy(classpath[0], binary_jar)
-      else:
-        with self.open_jar(binary_jar) as jar:
-          for classpath_jar in classpath:
-            jar.writejar(classpath_jar)
-          jar.main(jvm_tool.main)
-
-      # Now shade the binary jar and return that single jar as the safe tool classpath.
-      safe_mkdir_for(shaded_jar)
-      with self.shader.binary_shader(shaded_jar,
-                                     jvm_tool.main,
-                                     binary_jar,
-                                     custom_rules=jvm_tool.custom_rules,
-                                     jvm_options=self.get_options().jvm_options) as shader:
-        try:
-          result = util.execute_runner(shader,
-                                       workunit_factory=self.context.new_workunit,
-                                       workunit_name='shade-{}'.format(jvm_tool.key))
-          if result != 0:
-            raise TaskError("Shading of tool '{key}' with main class {main} for {scope} failed "
-                            "with exit code {result}, command run was:\n\t{cmd}"
-                            .format(key=jvm_tool.key,
-                                    main=jvm_tool.main,
-                                    scope=jvm_tool.scope,
-                                    result=result,
-                                    cmd=shader.cmd))
-        except Executor.Error as e:
-          raise TaskError("Shading of tool '{key}' with main class {main} for {scope} failed "
-                          "with: {exception}".format(key=jvm_tool.key,
-                                                     main=jvm_tool.main,
-                                                     scope=jvm_tool.scope,
-                                                     exception=e))
-
-      if self.artifact_cache_writes_enabled():
+    with self._resolve_lock:
+      with self.invalidated(targets,
+                            # We're the only dependent in reality since we shade.
+                            invalidate_dependents=False,
+                            fingerprint_strategy=fingerprint_strategy) as invalidation_check:
+
+        # If there are no vts, then there are no resolvable targets, so we exit early with an
+        # empty classpath.  This supports the optional tool classpath case.
+        if not invalidation_check.all_vts:
+          return []
+
+        tool_vts = self.tool_vts(invalidation_check)
+        jar_name = '{main}-{hash}.jar'.format(main=jvm_tool.main, hash=tool_vts.cache_key.hash)
+        shaded_jar = os.path.join(self._tool_cache_path, 'shaded_jars', jar_name)
+
+        if not invalidation_check.invalid_vts and os.path.exists(shaded_jar):
+          return [shaded_jar]
+
+        classpath = self._bootstrap_classpath(jvm_tool, targets)
+
+    # The targets are now marked valid, but since the shaded jar does not exist until it is shaded
+    # below, a failure to shade is still retried by the next bootstrap.
+    store_key = ShadedJarStore.key(classpath,
+                                   jvm_tool.main,
+                                   jvm_tool.custom_rules,
+                                   self.shader.fingerprint)
+    if self.shaded_jar_store.materialize(store_key, shaded_jar):
+      self.context.log.debug('Using stored shaded jar for {}.'.format(jvm_tool.key))
+    else:
+      try:
+        self._shade(jvm_tool, jar_name, classpath, shaded_jar)
+      except Exception:
+        safe_delete(shaded_jar)
+        raise
+      self.shaded_jar_store.add(store_key, shaded_jar)
+
+    if self.artifact_cache_writes_enabled():
+      with self._resolve_lock:
         self.update_artifact_cache([(tool_vts, [shaded_jar])])
 
-      return [shaded_jar]
+    return [shaded_jar]
+
+  def _shade(self, jvm_tool, jar_name, classpath, shaded_jar):
+    # Ensure we have a single binary jar we can shade.
+    binary_jar = os.path.join(self._tool_cache_path, 'binary_jars', jar_name)
+    safe_mkdir_for(binary_jar)
+
+    if len(classpath) == 1:
+      shutil.copy(classpath[0], binary_jar)
+    else:
+      with self.open_jar(binary_jar) as jar:
+        for classpath_jar in classpath:
+          jar.writejar(classpath_jar)
+        jar.main(jvm_tool.main)
+
+    # Now shade the binary jar into the single jar that is the safe tool classpath. Any existing
+    # jar may be linked into the shaded jar store, so it is replaced rather than overwritten.
+    safe_delete(shaded_jar)
+    safe_mkdir_for(shaded_jar)
+    with self.shader.binary_shader(shaded_jar,
+                                   jvm_tool.main,
+                                   binary_jar,
+                                   custom_rules=jvm_tool.custom_rules,
+                                   jvm_options=self.get_options().jvm_options) as shader:
+      try:
+        result = util.execute_runner(shader,
+                                     workunit_factory=self.context.new_workunit,
+                                     workunit_name='shade-{}'.format(jvm_tool.key))
+        if result != 0:
+          raise TaskError("Shading of tool '{key}' with main class {main} for {scope} failed "
+                          "with exit code {result}, command run was:\n\t{cmd}"
+                          .format(key=jvm_tool.key,
+                                  main=jvm_tool.main,
+                                  scope=jvm_tool.scope,
+                                  result=result,
+                                  cmd=shader.cmd))
+      except Executor.Error as e:
+        raise TaskError("Shading of tool '{key}' with main class {main} for {scope} failed "
+                        "with: {exception}".format(key=jvm_tool.key,
+                                                   main=jvm_tool.main,
+                                                   scope=jvm_tool.scope,
+                                                   exception=e))
 
   def check_artifact_cache_for(self, invalidation_check):
     tool_vts = self.tool_vts(invalidation_check)
@@ -5,6 +5,7 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import functools
 import os
 
 from twitter.common.collections import OrderedSet
@@ -12,6 +13,7 @@ from twitter.common.collections import OrderedSet
 from pants.backend.jvm.subsystems.shader import Shader
 from pants.backend.jvm.tasks.nailgun_task import NailgunTask
 from pants.base.exceptions import TaskError
+from pants.base.workunit import WorkUnitLabel
 from pants.java.jar.jar_dependency import JarDependency
 from pants.option.custom_types import dict_with_files_option, file_option
 from pants.process.xargs import Xargs
@@ -43,6 +45,12 @@ class Checkstyle(LintTaskMixin, NailgunTask):
              help='One or more ivy configurations to resolve for this target.')
     register('--include-user-classpath', type=bool, fingerprint=True,
              help='Add the user classpath to the checkstyle classpath')
+    register('--worker-count', advanced=True, type=int, default=1,
+             help='The number of checkstyle invocations to run concurrently. Concurrent '
+                  'invocations each run in their own subprocess, rather than in the nailgun '
+                  'server.')
+    register('--max-sources-per-invocation', advanced=True, type=int, default=1000,
+             help='The maximum number of sources to pass to a single checkstyle invocation.')
     cls.register_jvm_tool(register,
                           'checkstyle',
                           # Note that checkstyle 7.0 does not run on Java 7 runtimes or below.
@@ -125,7 +133,14 @@ class Checkstyle(LintTaskMixin, NailgunTask):
     def call(xargs):
       return self.runjava(classpath=union_classpath, main=self._CHECKSTYLE_MAIN,
                           jvm_options=self.get_options().jvm_options,
-                          args=args + xargs, workunit_name='checkstyle')
-    checks = Xargs(call)
-
-    return checks.execute(sources)
+                          args=args + xargs, workunit_name='checkstyle',
+                          force_subprocess=self.get_options().worker_count > 1)
+
+    with self.context.new_workunit(name='checkstyle-chunks',
+                                   labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+      checks = Xargs(call,
+                     max_args=self.get_options().max_sources_per_invocation,
+                     parallelism=self.get_options().worker_count,
+                     initializer=functools.partial(self.context.run_tracker.register_thread,
+                                                   workunit))
+      return checks.execute(sorted(sources))
@@ -5,10 +5,12 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import functools
 import hashlib
 import itertools
 import json
 import os
+import re
 import urllib
 from collections import defaultdict
 
@@ -23,11 +25,12 @@ from pants.backend.jvm.tasks.coursier.coursier_subsystem import CoursierSubsyste
 from pants.backend.jvm.tasks.nailgun_task import NailgunTask
 from pants.base.exceptions import TaskError
 from pants.base.fingerprint_strategy import FingerprintStrategy
+from pants.base.worker_pool import Work, WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.invalidation.cache_manager import VersionedTargetSet
 from pants.java.jar.jar_dependency_utils import M2Coordinate, ResolvedJar
 from pants.util.contextutil import temporary_file
-from pants.util.dirutil import safe_mkdir
+from pants.util.dirutil import safe_concurrent_creation, safe_mkdir, safe_open
 
 
 class CoursierResultNotFound(Exception):
@@ -59,6 +62,12 @@ class CoursierMixin(NailgunTask):
              help='Whether global excludes are allowed.')
     register('--report', type=bool, advanced=False, default=False,
              help='Show the resolve output. This would also force a resolve even if the resolve task is validated.')
+    register('--cache-resolution-results', type=bool, advanced=True, default=True,
+             help='Cache the result of each coursier invocation in the workdir, keyed by the jars, '
+                  'excludes, pinned coordinates and coursier options that it resolved, so that an '
+                  'unchanged set of external dependencies is not re-resolved when the targets that '
+                  'declare them change. Resolves of dynamic revs (such as SNAPSHOTs, latest.* and '
+                  'ranges) and of jars with urls are never cached.')
 
   @staticmethod
   def _compute_jars_to_resolve_and_pin(raw_jars, artifact_set, manager):
@@ -110,6 +119,8 @@ class CoursierMixin(NailgunTask):
 
     Caching: (TODO): https://github.com/pantsbuild/pants/issues/5187
     Currently it is disabled due to absolute paths in the coursier results.
+    Independently, the result of each coursier invocation is cached in the workdir, keyed by its
+    external dependencies (see `--cache-resolution-results`).
 
     :param targets: a collection of targets to do 3rdparty resolve against
     :param compile_classpath: classpath product that holds the resolution result. IMPORTANT: this parameter will be changed.
@@ -263,17 +274,39 @@ class CoursierMixin(NailgunTask):
     coursier_work_temp_dir = os.path.join(pants_workdir, 'tmp')
     safe_mkdir(coursier_work_temp_dir)
 
-    results_by_conf = self._get_default_conf_results(common_args, coursier_jar, global_excludes, jars_to_resolve,
-                                                     coursier_work_temp_dir,
-                                                     pinned_coords)
+    resolves = [
+      functools.partial(self._get_default_conf_results, common_args, coursier_jar, global_excludes,
+                        jars_to_resolve, coursier_work_temp_dir, pinned_coords)
+    ]
     if sources or javadoc:
-      non_default_conf_results = self._get_non_default_conf_results(common_args, coursier_jar, global_excludes,
-                                                                    jars_to_resolve, coursier_work_temp_dir,
-                                                                    pinned_coords, sources, javadoc)
-      results_by_conf.update(non_default_conf_results)
-
+      resolves.append(
+        functools.partial(self._get_non_default_conf_results, common_args, coursier_jar,
+                          global_excludes, jars_to_resolve, coursier_work_temp_dir, pinned_coords,
+                          sources, javadoc))
+
+    results_by_conf = {}
+    for conf_results in self._run_resolves(resolves):
+      results_by_conf.update(conf_results)
     return results_by_conf
 
+  def _run_resolves(self, resolves):
+    """Runs the given independent resolves, returning their results in order.
+
+    The resolves run concurrently only if each coursier invocation runs in its own subprocess: the
+    nailgun server is shared by all of this task's invocations.
+    """
+    if len(resolves) == 1 or self.get_options().use_nailgun:
+      return [resolve() for resolve in resolves]
+
+    with self.context.new_workunit(name='coursier-confs',
+                                   labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+      worker_pool = WorkerPool(workunit, self.context.run_tracker, len(resolves))
+      try:
+        return worker_pool.submit_work_and_wait(Work(lambda resolve: resolve(),
+                                                     [(resolve,) for resolve in resolves]))
+      finally:
+        worker_pool.shutdown()
+
   def _get_default_conf_results(self, common_args, coursier_jar, global_excludes, jars_to_resolve,
                                 coursier_work_temp_dir,
                                 pinned_coords):
@@ -283,14 +316,18 @@ class CoursierMixin(NailgunTask):
     with temporary_file(coursier_work_temp_dir, cleanup=False) as f:
       output_fn = f.name
 
+    global_excludes = global_excludes if self.get_options().allow_global_excludes else []
     cmd_args = self._construct_cmd_args(jars_to_resolve,
                                         common_args,
-                                        global_excludes if self.get_options().allow_global_excludes else [],
+                                        global_excludes,
                                         pinned_coords,
                                         coursier_work_temp_dir,
                                         output_fn)
+    resolution_key = self._resolution_key(coursier_jar, common_args, jars_to_resolve,
+                                          global_excludes, pinned_coords)
 
-    results['default'].append(self._call_coursier(cmd_args, coursier_jar, output_fn))
+    results['default'].append(self._call_coursier_with_cache(resolution_key, cmd_args,
+                                                             coursier_jar, output_fn))
 
     return results
 
@@ -323,18 +360,103 @@ class CoursierMixin(NailgunTask):
       new_pinned_coords.extend(c.copy(classifier='javadoc') for c in pinned_coords)
       new_jars_to_resolve.extend(c.copy(classifier='javadoc') for c in jars_to_resolve)
 
+    global_excludes = global_excludes if self.get_options().allow_global_excludes else []
     cmd_args = self._construct_cmd_args(new_jars_to_resolve,
                                         common_args,
-                                        global_excludes if self.get_options().allow_global_excludes else [],
+                                        global_excludes,
                                         new_pinned_coords,
                                         coursier_work_temp_dir,
                                         output_fn)
     cmd_args.extend(special_args)
+    resolution_key = self._resolution_key(coursier_jar, common_args + special_args,
+                                          new_jars_to_resolve, global_excludes, new_pinned_coords)
 
     # sources and/or javadoc share the same conf
-    results['src_doc'] = [self._call_coursier(cmd_args, coursier_jar, output_fn)]
+    results['src_doc'] = [self._call_coursier_with_cache(resolution_key, cmd_args, coursier_jar,
+                                                         output_fn)]
     return results
 
+  # Revs whose resolution may change over time, such as SNAPSHOTs, `latest.release` and ranges.
+  _DYNAMIC_REV_RE = re.compile(r'SNAPSHOT|^latest\.|[\[\](),+]')
+
+  @classmethod
+  def _is_dynamic(cls, coordinate):
+    return bool(coordinate.rev and cls._DYNAMIC_REV_RE.search(coordinate.rev))
+
+  @classmethod
+  def _resolution_key(cls, coursier_jar, common_args, jars, global_excludes, pinned_coords):
+    """Returns a key for the result of a coursier invocation, given all of its inputs.
+
+    The key is independent of the order that jars, excludes and pinned coordinates are given in, so
+    that it is stable as long as the set of external dependencies is unchanged.
+
+    :returns: The key, or None if the result may change even though the inputs do not, because a
+              jar or pinned coordinate has a dynamic rev, or a jar is fetched from a url.
+    """
+    if (any(jar.get_url() or cls._is_dynamic(jar.coordinate) for jar in jars) or
+        any(cls._is_dynamic(coord) for coord in pinned_coords)):
+      return None
+
+    def exclude_key(exclude):
+      return '{}:{}'.format(exclude.org, exclude.name or '*')
+
+    key = {
+      'coursier_jar': coursier_jar,
+      # The repos, cache location and fetch options (note that results refer to the cache).
+      'args': common_args,
+      'jars': sorted([str(jar.coordinate),
+                      jar.intransitive,
+                      jar.force,
+                      sorted(exclude_key(ex) for ex in jar.excludes)]
+                     for jar in jars),
+      'global_excludes': sorted(exclude_key(ex) for ex in global_excludes),
+      'pinned_coords': sorted(str(coord) for coord in pinned_coords),
+    }
+    return hashlib.sha1(json.dumps(key, sort_keys=True)).hexdigest()
+
+  def _call_coursier_with_cache(self, resolution_key, cmd_args, coursier_jar, output_fn):
+    """Calls coursier, unless a result for the same inputs was cached by an earlier call.
+
+    Results are not read from the cache if a report was requested, but are always written to it.
+    Results without a `resolution_key` are never cached.
+    """
+    cache_results = self.get_options().cache_resolution_results and resolution_key is not None
+    if not cache_results:
+      return self._call_coursier(cmd_args, coursier_jar, output_fn)
+
+    result_file = os.path.join(self.get_options().pants_workdir, 'coursier', 'results',
+                               '{}.json'.format(resolution_key))
+
+    if not self.get_options().report:
+      result = self._load_cached_result(result_file)
+      if result is not None:
+        self.context.log.debug('Using cached coursier result {}'.format(result_file))
+        return result
+
+    result = self._call_coursier(cmd_args, coursier_jar, output_fn)
+    with safe_concurrent_creation(result_file) as tmp_result_file:
+      with safe_open(tmp_result_file, 'w') as f:
+        json.dump(result, f)
+    return result
+
+  @staticmethod
+  def _load_cached_result(result_file):
+    """Returns the cached result in the given file, or None if there is no valid result.
+
+    A result is only valid while all of the files that it resolved to are still in the coursier
+    cache.
+    """
+    try:
+      with open(result_file) as f:
+        result = json.load(f)
+    except (IOError, ValueError):
+      return None
+    for dependency in result.get('dependencies', []):
+      path = dependency.get('file')
+      if path and not os.path.exists(path):
+        return None
+    return result
+
   def _call_coursier(self, cmd_args, coursier_jar, output_fn):
 
     labels = [WorkUnitLabel.COMPILER] if self.get_options().report else [WorkUnitLabel.TOOL]
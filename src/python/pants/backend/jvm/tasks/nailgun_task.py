@@ -53,13 +53,17 @@ class NailgunTaskBase(JvmToolTaskMixin, TaskBase):
     self._executor_workdir = os.path.join(self.context.options.for_global_scope().pants_workdir,
                                           *id_tuple)
 
-  def create_java_executor(self, dist=None):
+  def create_java_executor(self, dist=None, force_subprocess=False):
     """Create java executor that uses this task's ng daemon, if allowed.
 
     Call only in execute() or later. TODO: Enforce this.
+
+    :param bool force_subprocess: True to use a subprocess even if nailgun is allowed. The ng daemon
+                                  is shared by all of this task's executors, so this is required
+                                  for invocations that may run concurrently.
     """
     dist = dist or self.dist
-    if self.get_options().use_nailgun:
+    if self.get_options().use_nailgun and not force_subprocess:
       classpath = os.pathsep.join(self.tool_classpath('nailgun-server'))
       return NailgunExecutor(self._identity,
                              self._executor_workdir,
@@ -71,21 +75,21 @@ class NailgunTaskBase(JvmToolTaskMixin, TaskBase):
       return SubprocessExecutor(dist)
 
   def runjava(self, classpath, main, jvm_options=None, args=None, workunit_name=None,
-              workunit_labels=None, workunit_log_config=None, dist=None):
+              workunit_labels=None, workunit_log_config=None, dist=None, force_subprocess=False):
     """Runs the java main using the given classpath and args.
 
-    If --no-use-nailgun is specified then the java main is run in a freshly spawned subprocess,
-    otherwise a persistent nailgun server dedicated to this Task subclass is used to speed up
-    amortized run times.
+    If --no-use-nailgun (or `force_subprocess`) is specified then the java main is run in a freshly
+    spawned subprocess, otherwise a persistent nailgun server dedicated to this Task subclass is
+    used to speed up amortized run times.
 
     :API: public
     """
-    executor = self.create_java_executor(dist=dist)
+    executor = self.create_java_executor(dist=dist, force_subprocess=force_subprocess)
 
     # Creating synthetic jar to work around system arg length limit is not necessary
     # when `NailgunExecutor` is used because args are passed through socket, therefore turning off
     # creating synthetic jar if nailgun is used.
-    create_synthetic_jar = not self.get_options().use_nailgun
+    create_synthetic_jar = force_subprocess or not self.get_options().use_nailgun
     try:
       return util.execute_java(classpath=classpath,
                                main=main,
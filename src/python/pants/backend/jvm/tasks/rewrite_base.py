@@ -5,12 +5,14 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import functools
 import os
 from abc import abstractmethod, abstractproperty
 
 from pants.backend.jvm.tasks.nailgun_task import NailgunTask
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import TaskError
+from pants.base.workunit import WorkUnitLabel
 from pants.process.xargs import Xargs
 from pants.util.memo import memoized_property
 from pants.util.meta import AbstractClass
@@ -26,6 +28,11 @@ class RewriteBase(NailgunTask, AbstractClass):
              default=cls.target_types(),
              advanced=True, type=list,
              help='The target types to apply formatting to.')
+    register('--worker-count', advanced=True, type=int, default=1,
+             help='The number of tool invocations to run concurrently. Concurrent invocations '
+                  'each run in their own subprocess, rather than in the nailgun server.')
+    register('--max-sources-per-invocation', advanced=True, type=int, default=1000,
+             help='The maximum number of sources to pass to a single tool invocation.')
 
   @classmethod
   def target_types(cls):
@@ -66,11 +73,24 @@ class RewriteBase(NailgunTask, AbstractClass):
     if not target_sources:
       return
 
-    result = Xargs(self._invoke_tool_in_place).execute(target_sources)
+    with self.context.new_workunit(name='{}-chunks'.format(self.options_scope),
+                                   labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+      xargs = Xargs(self._invoke_tool_in_place,
+                    max_args=self.get_options().max_sources_per_invocation,
+                    parallelism=self.get_options().worker_count,
+                    initializer=functools.partial(self.context.run_tracker.register_thread,
+                                                  workunit))
+      result = xargs.execute(target_sources)
     if result != 0:
       raise TaskError('{} is improperly implemented: a failed process '
                       'should raise an exception earlier.'.format(type(self).__name__))
 
+  def runjava(self, *args, **kwargs):
+    # Concurrent invocations can't share the nailgun server, which runs each tool main in one JVM.
+    if self.get_options().worker_count > 1:
+      kwargs['force_subprocess'] = True
+    return super(RewriteBase, self).runjava(*args, **kwargs)
+
   def _invoke_tool_in_place(self, target_sources):
     # Invoke in place.
     result = self.invoke_tool(get_buildroot(), target_sources)
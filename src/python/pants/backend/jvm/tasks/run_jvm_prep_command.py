@@ -38,13 +38,9 @@ class RunJvmPrepCommandBase(Task):
     JvmPrepCommand.add_goal(self.goal)
 
   @classmethod
-  def register_options(cls, register):
-    """Register options for this optionable.
-
-    In this case, there are no special options, but we want to use this opportunity to setup
-    goal validation in JvmPrepCommand before the build graph is parsed.
-    """
-    super(RunJvmPrepCommandBase, cls).register_options(register)
+  def options_registered(cls):
+    """Set up goal validation in JvmPrepCommand before the build graph is parsed."""
+    super(RunJvmPrepCommandBase, cls).options_registered()
     JvmPrepCommand.add_goal(cls.goal)
 
   @classmethod
@@ -5,12 +5,14 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import functools
 import os
 import re
 
 from pants.backend.jvm.subsystems.scala_platform import ScalaPlatform
 from pants.backend.jvm.tasks.nailgun_task import NailgunTask
 from pants.base.exceptions import TaskError
+from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.target import Target
 from pants.option.custom_types import file_option
 from pants.process.xargs import Xargs
@@ -79,6 +81,12 @@ class Scalastyle(LintTaskMixin, NailgunTask):
     # TODO: Use the task's log level instead of this separate verbosity knob.
     register('--verbose', type=bool,
              help='Enable verbose scalastyle output.')
+    register('--worker-count', advanced=True, type=int, default=1,
+             help='The number of scalastyle invocations to run concurrently. Concurrent '
+                  'invocations each run in their own subprocess, rather than in the nailgun '
+                  'server.')
+    register('--max-sources-per-invocation', advanced=True, type=int, default=1000,
+             help='The maximum number of sources to pass to a single scalastyle invocation.')
 
   @classmethod
   def get_non_synthetic_scala_targets(cls, targets):
@@ -157,9 +165,17 @@ class Scalastyle(LintTaskMixin, NailgunTask):
           return self.runjava(classpath=cp,
                               main=self._MAIN,
                               jvm_options=self.get_options().jvm_options,
-                              args=scalastyle_args + srcs)
-
-        result = Xargs(call).execute(scala_sources)
+                              args=scalastyle_args + srcs,
+                              force_subprocess=self.get_options().worker_count > 1)
+
+        with self.context.new_workunit(name='scalastyle-chunks',
+                                       labels=[WorkUnitLabel.MULTITOOL]) as workunit:
+          xargs = Xargs(call,
+                        max_args=self.get_options().max_sources_per_invocation,
+                        parallelism=self.get_options().worker_count,
+                        initializer=functools.partial(self.context.run_tracker.register_thread,
+                                                      workunit))
+          result = xargs.execute(scala_sources)
         if result != 0:
           raise TaskError('java {entry} ... exited non-zero ({exit_code})'.format(
             entry=Scalastyle._MAIN, exit_code=result))
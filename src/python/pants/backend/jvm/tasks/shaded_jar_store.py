@@ -0,0 +1,82 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import hashlib
+import os
+import shutil
+import uuid
+
+from pants.base.hash_utils import hash_file
+from pants.util.dirutil import safe_delete, safe_mkdir, safe_mkdir_for
+
+
+def _link_or_copy(src, dst):
+  try:
+    os.link(src, dst)
+  except OSError:
+    shutil.copy2(src, dst)
+
+
+class ShadedJarStore(object):
+  """A content-addressed store of shaded JVM tool jars, shared between workdirs.
+
+  A shaded jar is keyed by a digest of the inputs that fully determine it: the contents of the
+  tool's classpath, its main class, its custom shading rules, and the shader that shades it. So a
+  tool is shaded once per store no matter how many workdirs (or invalidations) bootstrap it.
+  """
+
+  def __init__(self, root):
+    """
+    :param string root: The directory to store shaded jars under.
+    """
+    self._root = root
+
+  @staticmethod
+  def key(classpath, main, custom_rules, shader_fingerprint):
+    """Returns the key of the jar that shading the given inputs would produce.
+
+    :param list classpath: The paths of the tool's classpath jars, in order.
+    :param string main: The tool's main class.
+    :param list custom_rules: The tool's custom `Shader.Rule`s, if any.
+    :param string shader_fingerprint: The fingerprint of the `Shader` that shades the tool.
+    """
+    hasher = hashlib.sha1()
+    for s in [main, shader_fingerprint] + [rule.render() for rule in custom_rules or ()]:
+      hasher.update(s.encode('utf-8'))
+      hasher.update(b'\0')
+    for path in classpath:
+      hash_file(path, digest=hasher)
+    return hasher.hexdigest()
+
+  def _entry(self, key):
+    return os.path.join(self._root, '{}.jar'.format(key))
+
+  def materialize(self, key, jar):
+    """Links the stored jar for the given key to the path `jar`.
+
+    :returns: True if the jar was present in the store, and False otherwise.
+    """
+    entry = self._entry(key)
+    if not os.path.isfile(entry):
+      return False
+    safe_delete(jar)
+    safe_mkdir_for(jar)
+    _link_or_copy(entry, jar)
+    return True
+
+  def add(self, key, jar):
+    """Stores the shaded jar at the path `jar` under the given key.
+
+    The jar is stored atomically, so concurrent readers never see a partially written jar.
+    """
+    safe_mkdir(self._root)
+    tmp_entry = '{}.tmp.{}'.format(self._entry(key), uuid.uuid4().hex)
+    try:
+      _link_or_copy(jar, tmp_entry)
+      os.rename(tmp_entry, self._entry(key))
+    finally:
+      safe_delete(tmp_entry)
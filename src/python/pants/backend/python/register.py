@@ -15,26 +15,34 @@ from pants.backend.python.targets.python_distribution import PythonDistribution
 from pants.backend.python.targets.python_library import PythonLibrary
 from pants.backend.python.targets.python_requirement_library import PythonRequirementLibrary
 from pants.backend.python.targets.python_tests import PythonTests
-from pants.backend.python.tasks.build_local_python_distributions import \
-  BuildLocalPythonDistributions
-from pants.backend.python.tasks.gather_sources import GatherSources
-from pants.backend.python.tasks.local_python_distribution_artifact import \
-  LocalPythonDistributionArtifact
-from pants.backend.python.tasks.pytest_prep import PytestPrep
-from pants.backend.python.tasks.pytest_run import PytestRun
-from pants.backend.python.tasks.python_binary_create import PythonBinaryCreate
-from pants.backend.python.tasks.python_bundle import PythonBundle
-from pants.backend.python.tasks.python_isort import IsortPythonTask
-from pants.backend.python.tasks.python_repl import PythonRepl
-from pants.backend.python.tasks.python_run import PythonRun
-from pants.backend.python.tasks.resolve_requirements import ResolveRequirements
-from pants.backend.python.tasks.select_interpreter import SelectInterpreter
 from pants.backend.python.tasks.setup_py import SetupPy, create_setup_py_rules
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.build_graph.resources import Resources
 from pants.goal.task_registrar import TaskRegistrar as task
 
 
+def _lazy_task(name):
+  return 'pants.backend.python.tasks.{}'.format(name)
+
+
+# Task types are named rather than imported, so that each is only imported if its goal is used (see
+# `TaskRegistrar`).
+BuildLocalPythonDistributions = _lazy_task(
+  'build_local_python_distributions:BuildLocalPythonDistributions')
+GatherSources = _lazy_task('gather_sources:GatherSources')
+IsortPythonTask = _lazy_task('python_isort:IsortPythonTask')
+LocalPythonDistributionArtifact = _lazy_task(
+  'local_python_distribution_artifact:LocalPythonDistributionArtifact')
+PytestPrep = _lazy_task('pytest_prep:PytestPrep')
+PytestRun = _lazy_task('pytest_run:PytestRun')
+PythonBinaryCreate = _lazy_task('python_binary_create:PythonBinaryCreate')
+PythonBundle = _lazy_task('python_bundle:PythonBundle')
+PythonRepl = _lazy_task('python_repl:PythonRepl')
+PythonRun = _lazy_task('python_run:PythonRun')
+ResolveRequirements = _lazy_task('resolve_requirements:ResolveRequirements')
+SelectInterpreter = _lazy_task('select_interpreter:SelectInterpreter')
+
+
 def build_file_aliases():
   return BuildFileAliases(
     targets={
@@ -8,8 +8,12 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import logging
 import sys
 
+from twitter.common.collections import OrderedSet
+
 from pants.base.cmd_line_spec_parser import CmdLineSpecParser
 from pants.base.workunit import WorkUnit, WorkUnitLabel
+from pants.binaries.binary_tool import BinaryToolBase
+from pants.binaries.binary_util import BinaryUtil
 from pants.build_graph.build_file_parser import BuildFileParser
 from pants.engine.native import Native
 from pants.engine.round_engine import RoundEngine
@@ -55,6 +59,8 @@ class GoalRunnerFactory(object):
     self._build_file_parser = BuildFileParser(self._build_config, self._root_dir)
     self._build_graph = None
     self._address_mapper = None
+    # The LegacyGraphScheduler constructed for this run, if the daemon didn't provide a graph.
+    self._graph_scheduler = None
 
     self._global_options = options.for_global_scope()
     self._tag = self._global_options.tag
@@ -81,10 +87,10 @@ class GoalRunnerFactory(object):
     if not graph_helper:
       native = Native.create(self._global_options)
       native.set_panic_handler()
-      graph_scheduler_helper = EngineInitializer.setup_legacy_graph(native,
-                                                                    self._global_options,
-                                                                    self._build_config)
-      graph_helper = graph_scheduler_helper.new_session()
+      self._graph_scheduler = EngineInitializer.setup_legacy_graph(native,
+                                                                   self._global_options,
+                                                                   self._build_config)
+      graph_helper = self._graph_scheduler.new_session()
     target_roots = target_roots or TargetRootsCalculator.create(
       options=self._options,
       session=graph_helper.scheduler_session,
@@ -168,7 +174,8 @@ class GoalRunnerFactory(object):
                       goals=goals,
                       run_tracker=self._run_tracker,
                       kill_nailguns=self._kill_nailguns,
-                      exiter=self._exiter)
+                      exiter=self._exiter,
+                      graph_scheduler=self._graph_scheduler)
 
 
 class GoalRunner(object):
@@ -176,19 +183,23 @@ class GoalRunner(object):
 
   Factory = GoalRunnerFactory
 
-  def __init__(self, context, goals, run_tracker, kill_nailguns, exiter=sys.exit):
+  def __init__(self, context, goals, run_tracker, kill_nailguns, exiter=sys.exit,
+               graph_scheduler=None):
     """
     :param Context context: The global, pre-initialized Context as created by GoalRunnerFactory.
     :param list[Goal] goals: The list of goals to act on.
     :param Runtracker run_tracker: The global, pre-initialized/running RunTracker instance.
     :param bool kill_nailguns: Whether or not to kill nailguns after the run.
     :param func exiter: A function that accepts an exit code value and exits (for tests, Optional).
+    :param LegacyGraphScheduler graph_scheduler: A LegacyGraphScheduler owned by this run, to be
+                                                 closed when the run ends. (Optional)
     """
     self._context = context
     self._goals = goals
     self._run_tracker = run_tracker
     self._kill_nailguns = kill_nailguns
     self._exiter = exiter
+    self._graph_scheduler = graph_scheduler
 
   def _execute_engine(self):
     workdir = self._context.options.for_global_scope().pants_workdir
@@ -202,6 +213,9 @@ class GoalRunner(object):
       self._context.log.error('Unknown goal(s): {}\n'.format(' '.join(unknown_goals)))
       return 1
 
+    if self._context.options.for_global_scope().binaries_prefetch:
+      self._prefetch_binaries()
+
     engine = RoundEngine()
 
     sorted_goal_infos = engine.sort_goals(self._context, self._goals)
@@ -214,6 +228,28 @@ class GoalRunner(object):
 
     return result
 
+  def _prefetch_binaries(self):
+    """Concurrently fetches the binary tools of the subsystems used by the goals' tasks."""
+    binary_tools = OrderedSet()
+    for goal in self._goals:
+      for task_type in goal.task_types():
+        for scope_info in task_type.known_scope_infos():
+          optionable_cls = scope_info.optionable_cls
+          # Only global instances are prefetched: a scoped instance may never be created.
+          if (issubclass(optionable_cls, BinaryToolBase) and
+              scope_info.scope == optionable_cls.options_scope):
+            binary_tools.add(optionable_cls.global_instance())
+    if not binary_tools:
+      return
+
+    with self._context.new_workunit(name='prefetch-binaries', labels=[WorkUnitLabel.BOOTSTRAP]):
+      try:
+        binary_requests = [tool.binary_request(self._context) for tool in binary_tools]
+        BinaryUtil.Factory.create().prefetch(binary_requests)
+      except BinaryUtil.BinaryResolutionError as e:
+        # The run only fails if a binary that could not be fetched is actually used.
+        self._context.log.warn('Failed to prefetch binaries: {}'.format(e))
+
   def run(self):
     should_kill_nailguns = self._kill_nailguns
 
@@ -239,5 +275,7 @@ class GoalRunner(object):
         # TODO: Make this more selective? Only kill nailguns that affect state?
         # E.g., checkstyle may not need to be killed.
         NailgunProcessGroup().killall()
+      if self._graph_scheduler is not None:
+        self._graph_scheduler.close()
 
     return result
@@ -7,7 +7,9 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 from pants.base.build_environment import get_buildroot
 from pants.bin.goal_runner import GoalRunner
+from pants.goal.goal import Goal
 from pants.goal.run_tracker import RunTracker
+from pants.goal.sampling_profiler import maybe_sampling_profiled
 from pants.init.logging import setup_logging_from_options
 from pants.init.options_initializer import BuildConfigInitializer, OptionsInitializer
 from pants.init.repro import Reproducer
@@ -63,41 +65,54 @@ class LocalPantsRunner(object):
     for scope in options.scope_to_flags.keys():
       options.for_scope(scope)
 
-    # Verify the configs here.
+    # Verify the configs here. Sections for the scopes of goals and tasks that were not loaded for
+    # this run can't be verified.
     if global_options.verify_config:
-      options_bootstrapper.verify_configs_against_options(options)
+      verify_options = options
+      if not Goal.all_loaded() and options_bootstrapper.unknown_config_scopes(
+          options, ignore_unknown_scope=Goal.is_unloaded_scope):
+        # Other sections may belong to subsystems of the unloaded tasks, which are only known once
+        # those tasks are loaded.
+        Goal.load()
+        verify_options = OptionsInitializer.create(options_bootstrapper, build_config,
+                                                   init_subsystems=False)
+      options_bootstrapper.verify_configs_against_options(
+        verify_options, ignore_unknown_scope=Goal.is_unloaded_scope)
 
     # Launch RunTracker as early as possible (just after Subsystem options are initialized).
     run_tracker = RunTracker.global_instance()
     reporting = Reporting.global_instance()
     reporting.initialize(run_tracker, self._run_start_time)
 
-    try:
-      # Determine the build root dir.
-      root_dir = get_buildroot()
-
-      # Capture a repro of the 'before' state for this build, if needed.
-      repro = Reproducer.global_instance().create_repro()
-      if repro:
-        repro.capture(run_tracker.run_info.get_as_dict())
-
-      # Setup and run GoalRunner.
-      goal_runner = GoalRunner.Factory(root_dir,
-                                       options,
-                                       build_config,
-                                       run_tracker,
-                                       reporting,
-                                       self._target_roots,
-                                       self._daemon_build_graph,
-                                       self._exiter).setup()
-
-      goal_runner_result = goal_runner.run()
-
-      if repro:
-        # TODO: Have Repro capture the 'after' state (as a diff) as well?
-        repro.log_location_of_repro_file()
-    finally:
-      run_tracker_result = run_tracker.end()
+    # Sample the run, attributing samples to workunits, if requested.
+    sampling_profile_dir = self._env.get('PANTS_SAMPLING_PROFILE')
+    with maybe_sampling_profiled(run_tracker, sampling_profile_dir):
+      try:
+        # Determine the build root dir.
+        root_dir = get_buildroot()
+
+        # Capture a repro of the 'before' state for this build, if needed.
+        repro = Reproducer.global_instance().create_repro()
+        if repro:
+          repro.capture(run_tracker.run_info.get_as_dict())
+
+        # Setup and run GoalRunner.
+        goal_runner = GoalRunner.Factory(root_dir,
+                                         options,
+                                         build_config,
+                                         run_tracker,
+                                         reporting,
+                                         self._target_roots,
+                                         self._daemon_build_graph,
+                                         self._exiter).setup()
+
+        goal_runner_result = goal_runner.run()
+
+        if repro:
+          # TODO: Have Repro capture the 'after' state (as a diff) as well?
+          repro.log_location_of_repro_file()
+      finally:
+        run_tracker_result = run_tracker.end()
 
     # Take the exit code with higher abs value in case of negative values.
     final_exit_code = goal_runner_result if abs(goal_runner_result) > abs(run_tracker_result) else run_tracker_result
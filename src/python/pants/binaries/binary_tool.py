@@ -148,6 +148,16 @@ class BinaryToolBase(Subsystem):
                     'context!'.format(self._get_name(), self.replaces_name, self.replaces_scope))
     return self.get_options().version
 
+  def binary_request(self, context=None):
+    """Returns the request for the specified binary tool, e.g. to prefetch it with.
+
+    If replaces_scope and replaces_name are defined, then the caller must pass in
+    a context, otherwise no context should be passed.
+
+    :API: public
+    """
+    return self._make_binary_request(self.version(context))
+
   @memoized_property
   def _binary_util(self):
     return BinaryUtil.Factory.create()
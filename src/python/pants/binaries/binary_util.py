@@ -9,17 +9,21 @@ import logging
 import os
 import posixpath
 import shutil
+import threading
 from abc import abstractmethod
+from collections import defaultdict
 from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 
 from twitter.common.collections import OrderedSet
 
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import TaskError
 from pants.net.http.fetcher import Fetcher
+from pants.process.lock import OwnerPrintingInterProcessFileLock
 from pants.subsystem.subsystem import Subsystem
 from pants.util.contextutil import temporary_file
-from pants.util.dirutil import chmod_plus_x, safe_concurrent_creation, safe_open
+from pants.util.dirutil import chmod_plus_x, safe_concurrent_creation, safe_mkdir_for, safe_open
 from pants.util.memo import memoized_method, memoized_property
 from pants.util.objects import datatype
 from pants.util.osutil import SUPPORTED_PLATFORM_NORMALIZED_NAMES
@@ -175,6 +179,9 @@ class BinaryToolFetcher(object):
     self._timeout_secs = timeout_secs
     self._fetcher = fetcher or self._default_http_fetcher()
     self._ignore_cached_download = ignore_cached_download
+    # Download path -> a lock held while fetching to that path.
+    self._fetch_locks_lock = threading.Lock()
+    self._fetch_locks = defaultdict(threading.Lock)
 
   class BinaryNotFound(TaskError):
 
@@ -220,6 +227,23 @@ class BinaryToolFetcher(object):
         with safe_open(downloadpath, 'wb') as bootstrapped_binary:
           shutil.copyfileobj(binary_tool_stream, bootstrapped_binary)
 
+  @contextmanager
+  def _fetch_lock(self, download_path):
+    """Holds a lock for fetching to the given path, both within this process and between processes.
+
+    File locks are held per process, so threads in this process also take an in-process lock.
+    """
+    with self._fetch_locks_lock:
+      lock = self._fetch_locks[download_path]
+    with lock:
+      safe_mkdir_for(download_path)
+      file_lock = OwnerPrintingInterProcessFileLock('{}.lock'.format(download_path))
+      file_lock.acquire(message_fn=logger.info)
+      try:
+        yield
+      finally:
+        file_lock.release()
+
   def fetch_binary(self, fetch_request):
     """Fulfill a binary fetch request."""
     bootstrap_dir = os.path.realpath(os.path.expanduser(self._bootstrap_dir))
@@ -229,7 +253,10 @@ class BinaryToolFetcher(object):
     urls = fetch_request.urls
 
     if self._ignore_cached_download or not os.path.exists(bootstrapped_binary_path):
-      self._do_fetch(bootstrapped_binary_path, file_name, urls)
+      with self._fetch_lock(bootstrapped_binary_path):
+        # Another thread or process may have fetched the binary while we waited for the lock.
+        if self._ignore_cached_download or not os.path.exists(bootstrapped_binary_path):
+          self._do_fetch(bootstrapped_binary_path, file_name, urls)
 
     logger.debug('Selected {binary} binary bootstrapped to: {path}'
                  .format(binary=file_name, path=bootstrapped_binary_path))
@@ -263,7 +290,8 @@ class BinaryUtil(object):
         baseurls=options.binaries_baseurls,
         binary_tool_fetcher=binary_tool_fetcher,
         path_by_id=options.binaries_path_by_id,
-        allow_external_binary_tool_downloads=options.allow_external_binary_tool_downloads)
+        allow_external_binary_tool_downloads=options.allow_external_binary_tool_downloads,
+        fetch_concurrency=options.binaries_fetch_concurrency)
 
   class MissingMachineInfo(TaskError):
     """Indicates that pants was unable to map this machine's OS to a binary path prefix."""
@@ -282,7 +310,7 @@ class BinaryUtil(object):
         base_exception)
 
   def __init__(self, baseurls, binary_tool_fetcher, path_by_id=None,
-               allow_external_binary_tool_downloads=True, uname_func=None):
+               allow_external_binary_tool_downloads=True, uname_func=None, fetch_concurrency=1):
     """Creates a BinaryUtil with the given settings to define binary lookup behavior.
 
     This constructor is primarily used for testing.  Production code will usually initialize
@@ -299,6 +327,8 @@ class BinaryUtil(object):
                                                       all binaries, regardless of whether an
                                                       external_url_generator field is provided.
     :param function uname_func: method to use to emulate os.uname() in testing
+    :param int fetch_concurrency: The maximum number of binaries to fetch concurrently in
+                                  `prefetch`.
     """
     self._baseurls = baseurls
     self._binary_tool_fetcher = binary_tool_fetcher
@@ -309,6 +339,7 @@ class BinaryUtil(object):
 
     self._allow_external_binary_tool_downloads = allow_external_binary_tool_downloads
     self._uname_func = uname_func or os.uname
+    self._fetch_concurrency = fetch_concurrency
 
   _ID_BY_OS = {
     'linux': lambda release, machine: ('linux', machine),
@@ -415,6 +446,27 @@ class BinaryUtil(object):
       archiver.extract(downloaded_file, unpacked_dirname, concurrency_safe=True)
     return unpacked_dirname
 
+  def prefetch(self, binary_requests):
+    """Fetches the given binaries concurrently, unpacking them if necessary.
+
+    Binaries that have already been fetched are not fetched again, and requests for the same
+    binary are only fetched once, even if made concurrently by multiple processes.
+
+    :param list binary_requests: The :class:`BinaryRequest`s to fetch.
+    :returns: The result of `select` for each request, in order.
+    :raises: :class:`BinaryUtil.BinaryResolutionError` for the first request that failed, after
+             all the other requests have completed.
+    """
+    binary_requests = list(binary_requests)
+    if not binary_requests:
+      return []
+    pool = ThreadPool(processes=min(self._fetch_concurrency, len(binary_requests)))
+    try:
+      return pool.map(self.select, binary_requests)
+    finally:
+      pool.terminate()
+      pool.join()
+
   def _make_deprecated_binary_request(self, supportdir, version, name):
     return BinaryRequest(
       supportdir=supportdir,
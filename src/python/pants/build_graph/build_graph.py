@@ -8,12 +8,13 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import itertools
 import logging
 from abc import abstractmethod
-from collections import OrderedDict, defaultdict, deque
+from collections import defaultdict, deque
 
 from twitter.common.collections import OrderedSet
 
 from pants.build_graph.address import Address
 from pants.build_graph.address_lookup_error import AddressLookupError
+from pants.build_graph.compact_graph import Bitset, CompactGraph
 from pants.build_graph.injectables_mixin import InjectablesMixin
 from pants.build_graph.target import Target
 from pants.util.meta import AbstractClass
@@ -100,7 +101,7 @@ class BuildGraph(AbstractClass):
     self.reset()
 
   def __len__(self):
-    return len(self._target_by_address)
+    return len(self._injected_ids)
 
   def target_file_count(self):
     """Returns a count of source files owned by all Targets in the BuildGraph."""
@@ -125,18 +126,51 @@ class BuildGraph(AbstractClass):
 
     :API: public
     """
-    self._target_by_address = OrderedDict()
-    self._target_dependencies_by_address = defaultdict(OrderedSet)
-    self._target_dependees_by_address = defaultdict(set)
+    # Addresses are nodes in the graph, and Targets are stored by node id. An address may be a node
+    # before its Target has been injected, if it is the address of an injected dependency.
+    self._graph = CompactGraph()
+    self._targets = []  # Node id -> Target, or None.
+    self._injected_ids = []  # The node ids of injected Targets, in injection order.
     self._derived_from_by_derivative = {}  # Address -> Address.
     self._derivatives_by_derived_from = defaultdict(list)   # Address -> list of Address.
     self.synthetic_addresses = set()
 
+  def _node_id(self, address):
+    """Returns the node id for the given address, adding a node if necessary."""
+    node_id = self._graph.add_node(address)
+    if node_id == len(self._targets):
+      self._targets.append(None)
+    return node_id
+
+  def _target_of(self, node_id):
+    """Returns the injected Target for the given node id.
+
+    :raises: `KeyError` if no Target has been injected for the node.
+    """
+    target = self._targets[node_id]
+    if target is None:
+      raise KeyError(self._graph.node(node_id))
+    return target
+
+  def _add_target(self, address, target):
+    """Stores the given Target at the given address, without validation."""
+    node_id = self._node_id(address)
+    self._targets[node_id] = target
+    self._injected_ids.append(node_id)
+
+  def _add_dependency(self, dependent, dependency):
+    """Adds a dependency edge between the given addresses, without validation.
+
+    :returns: True if the edge was added, or False if it already existed.
+    """
+    return self._graph.add_edge(self._node_id(dependent), self._node_id(dependency))
+
   def contains_address(self, address):
     """
     :API: public
     """
-    return address in self._target_by_address
+    node_id = self._graph.maybe_node_id(address)
+    return node_id is not None and self._targets[node_id] is not None
 
   def get_target_from_spec(self, spec, relative_to=''):
     """Converts `spec` into an address and returns the result of `get_target`
@@ -150,7 +184,8 @@ class BuildGraph(AbstractClass):
 
     :API: public
     """
-    return self._target_by_address.get(address, None)
+    node_id = self._graph.maybe_node_id(address)
+    return None if node_id is None else self._targets[node_id]
 
   def dependencies_of(self, address):
     """Returns the dependencies of the Target at `address`.
@@ -158,12 +193,16 @@ class BuildGraph(AbstractClass):
     This method asserts that the address given is actually in the BuildGraph.
 
     :API: public
+
+    :returns: The addresses of the dependencies, in the order they were injected.
+    :rtype: tuple of :class:`pants.build_graph.address.Address`
     """
-    assert address in self._target_by_address, (
+    assert self.contains_address(address), (
       'Cannot retrieve dependencies of {address} because it is not in the BuildGraph.'
       .format(address=address)
     )
-    return self._target_dependencies_by_address[address]
+    node = self._graph.node
+    return tuple(node(i) for i in self._graph.successors(self._graph.node_id(address)))
 
   def dependents_of(self, address):
     """Returns the addresses of the targets that depend on the target at `address`.
@@ -171,12 +210,16 @@ class BuildGraph(AbstractClass):
     This method asserts that the address given is actually in the BuildGraph.
 
     :API: public
+
+    :returns: The addresses of the dependents, in the order they were injected.
+    :rtype: tuple of :class:`pants.build_graph.address.Address`
     """
-    assert address in self._target_by_address, (
+    assert self.contains_address(address), (
       'Cannot retrieve dependents of {address} because it is not in the BuildGraph.'
       .format(address=address)
     )
-    return self._target_dependees_by_address[address]
+    node = self._graph.node
+    return tuple(node(i) for i in self._graph.predecessors(self._graph.node_id(address)))
 
   def get_derived_from(self, address):
     """Get the target the specified target was derived from.
@@ -251,10 +294,10 @@ class BuildGraph(AbstractClass):
     dependencies = dependencies or frozenset()
     address = target.address
 
-    if address in self._target_by_address:
+    if self.contains_address(address):
       raise ValueError('A Target {existing_target} already exists in the BuildGraph at address'
                        ' {address}.  Failed to insert {target}.'
-                       .format(existing_target=self._target_by_address[address],
+                       .format(existing_target=self.get_target(address),
                                address=address,
                                target=target))
 
@@ -272,7 +315,7 @@ class BuildGraph(AbstractClass):
     if derived_from or synthetic:
       self.synthetic_addresses.add(address)
 
-    self._target_by_address[address] = target
+    self._add_target(address, target)
 
     for dependency_address in dependencies:
       self.inject_dependency(dependent=address, dependency=dependency_address)
@@ -289,7 +332,7 @@ class BuildGraph(AbstractClass):
       is being added.
     :param Address dependency: The dependency to be injected.
     """
-    if dependent not in self._target_by_address:
+    if not self.contains_address(dependent):
       raise ValueError('Cannot inject dependency from {dependent} on {dependency} because the'
                        ' dependent is not in the BuildGraph.'
                        .format(dependent=dependent, dependency=dependency))
@@ -302,19 +345,16 @@ class BuildGraph(AbstractClass):
     # data structure of the topologically sorted graph which would have acceptable amortized
     # performance for inserting new nodes, and also cycle detection on each insert.
 
-    if dependency not in self._target_by_address:
+    if not self.contains_address(dependency):
       logger.warning('Injecting dependency from {dependent} on {dependency}, but the dependency'
                      ' is not in the BuildGraph.  This probably indicates a dependency cycle, but'
                      ' it is not an error until sort_targets is called on a subgraph containing'
                      ' the cycle.'
                      .format(dependent=dependent, dependency=dependency))
 
-    if dependency in self.dependencies_of(dependent):
+    if not self._add_dependency(dependent, dependency):
       logger.debug('{dependent} already depends on {dependency}'
                    .format(dependent=dependent, dependency=dependency))
-    else:
-      self._target_dependencies_by_address[dependent].add(dependency)
-      self._target_dependees_by_address[dependency].add(dependent)
 
   def targets(self, predicate=None):
     """Returns all the targets in the graph in no particular order.
@@ -323,7 +363,8 @@ class BuildGraph(AbstractClass):
 
     :param predicate: A target predicate that will be used to filter the targets returned.
     """
-    return filter(predicate, self._target_by_address.values())
+    targets = self._targets
+    return filter(predicate, [targets[i] for i in self._injected_ids])
 
   def sorted_targets(self):
     """
@@ -368,30 +409,41 @@ class BuildGraph(AbstractClass):
     """
     walk = self._walk_factory(dep_predicate)
 
-    def _walk_rec(addr, level=0):
-      # If we've followed an edge to this address, stop recursing.
-      if not walk.expand_once(addr, level):
-        return
+    def enter(node_id, level):
+      """Returns a stack frame for the given node, or None if it should not be expanded."""
+      # If we've followed an edge to this node, don't expand it again.
+      if not walk.expand_once(node_id, level):
+        return None
 
-      target = self._target_by_address[addr]
+      target = self._target_of(node_id)
 
       if predicate and not predicate(target):
-        return
+        return None
 
-      if not postorder and walk.do_work_once(addr):
+      if not postorder and walk.do_work_once(node_id):
         work(target)
 
-      for dep_address in self._target_dependencies_by_address[addr]:
-        if walk.expanded_or_worked(dep_address):
-          continue
-        if walk.dep_predicate(target, self._target_by_address[dep_address], level):
-          _walk_rec(dep_address, level + 1)
-
-      if postorder and walk.do_work_once(addr):
-        work(target)
+      return node_id, target, level, iter(self._graph.successors(node_id))
 
+    # NB: This is a depth first walk with an explicit stack, rather than a recursive one, so that
+    # it is not limited by the depth of the graph.
     for address in addresses:
-      _walk_rec(address)
+      frame = enter(self._graph.node_id(address), 0)
+      stack = [frame] if frame else []
+      while stack:
+        node_id, target, level, dep_ids = stack[-1]
+        for dep_id in dep_ids:
+          if walk.expanded_or_worked(dep_id):
+            continue
+          if walk.dep_predicate(target, self._target_of(dep_id), level):
+            frame = enter(dep_id, level + 1)
+            if frame:
+              stack.append(frame)
+              break
+        else:
+          stack.pop()
+          if postorder and walk.do_work_once(node_id):
+            work(target)
 
   def walk_transitive_dependee_graph(self, addresses, work, predicate=None, postorder=False):
     """Identical to `walk_transitive_dependency_graph`, but walks dependees preorder (or postorder
@@ -404,19 +456,32 @@ class BuildGraph(AbstractClass):
     """
     walked = set()
 
-    def _walk_rec(addr):
-      if addr not in walked:
-        walked.add(addr)
-        target = self._target_by_address[addr]
-        if not predicate or predicate(target):
-          if not postorder:
-            work(target)
-          for dep_address in self._target_dependees_by_address[addr]:
-            _walk_rec(dep_address)
+    def enter(node_id):
+      """Returns a stack frame for the given node, or None if it should not be expanded."""
+      if node_id in walked:
+        return None
+      walked.add(node_id)
+      target = self._target_of(node_id)
+      if predicate and not predicate(target):
+        return None
+      if not postorder:
+        work(target)
+      return target, iter(self._graph.predecessors(node_id))
+
+    for address in addresses:
+      frame = enter(self._graph.node_id(address))
+      stack = [frame] if frame else []
+      while stack:
+        target, dependee_ids = stack[-1]
+        for dependee_id in dependee_ids:
+          frame = enter(dependee_id)
+          if frame:
+            stack.append(frame)
+            break
+        else:
+          stack.pop()
           if postorder:
             work(target)
-    for address in addresses:
-      _walk_rec(address)
 
   def transitive_dependees_of_addresses(self, addresses, predicate=None, postorder=False):
     """Returns all transitive dependees of `address`.
@@ -485,25 +550,66 @@ class BuildGraph(AbstractClass):
     walk = self._walk_factory(dep_predicate)
 
     ordered_closure = OrderedSet()
-    to_walk = deque((0, addr) for addr in addresses)
+    to_walk = deque((0, self._graph.node_id(addr)) for addr in addresses)
     while len(to_walk) > 0:
-      level, address = to_walk.popleft()
+      level, node_id = to_walk.popleft()
 
-      if not walk.expand_once(address, level):
+      if not walk.expand_once(node_id, level):
         continue
 
-      target = self._target_by_address[address]
+      target = self._target_of(node_id)
       if predicate and not predicate(target):
         continue
-      if walk.do_work_once(address):
+      if walk.do_work_once(node_id):
         ordered_closure.add(target)
-      for dep_address in self._target_dependencies_by_address[address]:
-        if walk.expanded_or_worked(dep_address):
+      for dep_id in self._graph.successors(node_id):
+        if walk.expanded_or_worked(dep_id):
           continue
-        if walk.dep_predicate(target, self._target_by_address[dep_address], level):
-          to_walk.append((level + 1, dep_address))
+        if walk.dep_predicate(target, self._target_of(dep_id), level):
+          to_walk.append((level + 1, dep_id))
     return ordered_closure
 
+  def transitive_closure_bitset(self, addresses, dependees=False):
+    """Returns the transitive closure of `addresses` as a Bitset of node ids.
+
+    Unlike the walk methods, this applies no predicates and does not preserve any order, but is
+    much cheaper to compute and to combine: closures of different roots may be intersected or
+    unioned as Bitsets, and then converted with `addresses_of_bitset` or `targets_of_bitset`.
+
+    :API: public
+
+    :param list<Address> addresses: The root addresses to transitively close over. The roots are
+      included in the closure.
+    :param bool dependees: If True, close over dependees rather than dependencies.
+    :rtype: :class:`pants.build_graph.compact_graph.Bitset`
+    """
+    return self._graph.closure((self._graph.node_id(a) for a in addresses), reverse=dependees)
+
+  def bitset_of_addresses(self, addresses):
+    """Returns a Bitset of the node ids of the given (injected) addresses.
+
+    :API: public
+    """
+    return Bitset.from_ids(self._graph.node_id(a) for a in addresses)
+
+  def addresses_of_bitset(self, bitset):
+    """Returns the addresses of the node ids in the given Bitset, in node id order.
+
+    This includes the addresses of dependencies which have not (yet) been injected.
+
+    :API: public
+    """
+    node = self._graph.node
+    return [node(i) for i in bitset]
+
+  def targets_of_bitset(self, bitset):
+    """Returns the injected targets for the node ids in the given Bitset, in node id order.
+
+    :API: public
+    """
+    targets = self._targets
+    return [targets[i] for i in bitset if targets[i] is not None]
+
   @abstractmethod
   def inject_synthetic_target(self,
                               address,
@@ -0,0 +1,276 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+from array import array
+
+
+# NB: `array` requires a native string typecode under python 2.
+_ID_TYPECODE = str('i')
+
+# Maps 0/1 bytes to the ascii digits '0'/'1', for packing marks into an int.
+_MARK_DIGITS = bytearray(b'0' * 256)
+_MARK_DIGITS[1] = ord('1')
+
+
+class Bitset(object):
+  """An immutable set of non-negative integer ids, represented by the bits of an int.
+
+  Unions, intersections and differences of Bitsets are single operations on machine words, which
+  makes them cheap to compute even for closures of many thousands of ids.
+  """
+
+  __slots__ = ('_bits',)
+
+  @classmethod
+  def from_marks(cls, marks):
+    """Creates a Bitset containing the indexes of the non-zero entries of a bytearray of 0s and 1s.
+
+    :param bytearray marks: A bytearray in which each entry is either 0 or 1.
+    """
+    if not marks:
+      return cls(0)
+    return cls(int(bytes(marks[::-1].translate(_MARK_DIGITS)), 2))
+
+  @classmethod
+  def from_ids(cls, ids):
+    """Creates a Bitset containing the given ids.
+
+    :param ids: An iterable of non-negative ints.
+    """
+    marks = bytearray()
+    for i in ids:
+      if i >= len(marks):
+        marks.extend(bytearray(i + 1 - len(marks)))
+      marks[i] = 1
+    return cls.from_marks(marks)
+
+  def __init__(self, bits=0):
+    self._bits = bits
+
+  def __contains__(self, i):
+    return i >= 0 and (self._bits >> i) & 1 == 1
+
+  def __iter__(self):
+    """Yields the ids in this Bitset in ascending order."""
+    if not self._bits:
+      return
+    for i, digit in enumerate(reversed(bin(self._bits))):
+      if digit == '1':
+        yield i
+      elif digit == 'b':
+        return
+
+  def __len__(self):
+    return bin(self._bits).count('1')
+
+  def __nonzero__(self):
+    return self._bits != 0
+
+  __bool__ = __nonzero__
+
+  def __or__(self, other):
+    return Bitset(self._bits | other._bits)
+
+  def __and__(self, other):
+    return Bitset(self._bits & other._bits)
+
+  def __sub__(self, other):
+    return Bitset(self._bits & ~other._bits)
+
+  def __eq__(self, other):
+    return type(self) == type(other) and self._bits == other._bits
+
+  def __ne__(self, other):
+    return not self == other
+
+  def __hash__(self):
+    return hash(self._bits)
+
+  def __repr__(self):
+    return 'Bitset({})'.format(list(self))
+
+
+class _AdjacencyArrays(object):
+  """Rows of integer ids, stored as compressed sparse rows plus a buffer of recently added ids.
+
+  Appended ids are buffered per row, and merged into the compressed rows once the buffer grows as
+  large as the compressed rows themselves, so the cost of merging is amortized over appends.
+
+  If `indexed`, rows with more than a few ids are additionally indexed by a set of their ids, so
+  that `contains` need not copy and scan them.
+  """
+
+  # The number of buffered ids below which the buffer is never merged.
+  _MIN_BUFFERED = 1024
+
+  # The number of ids above which an indexed row is indexed by a set.
+  _MAX_SCANNED = 32
+
+  def __init__(self, indexed=False):
+    self._offsets = array(_ID_TYPECODE, [0])
+    self._ids = array(_ID_TYPECODE)
+    self._buffered = {}
+    self._buffered_count = 0
+    self._row_sets = {} if indexed else None
+
+  def row(self, i):
+    """Returns the ids in row `i`, in the order they were appended.
+
+    :rtype: :class:`array.array`
+    """
+    if i + 1 < len(self._offsets):
+      compressed = self._ids[self._offsets[i]:self._offsets[i + 1]]
+      buffered = self._buffered.get(i)
+      return compressed + buffered if buffered else compressed
+    return self._buffered.get(i) or array(_ID_TYPECODE)
+
+  def _row_length(self, i):
+    compressed = self._offsets[i + 1] - self._offsets[i] if i + 1 < len(self._offsets) else 0
+    return compressed + len(self._buffered.get(i, ()))
+
+  def contains(self, i, j):
+    """Returns True if row `i` contains id `j`."""
+    if self._row_sets is not None:
+      row_set = self._row_sets.get(i)
+      if row_set is not None:
+        return j in row_set
+    # Unless indexed, the row is scanned.
+    return j in self.row(i)
+
+  def append(self, i, j):
+    """Appends id `j` to row `i`."""
+    buffered = self._buffered.get(i)
+    if buffered is None:
+      self._buffered[i] = array(_ID_TYPECODE, [j])
+    else:
+      buffered.append(j)
+    self._buffered_count += 1
+    if self._row_sets is not None:
+      row_set = self._row_sets.get(i)
+      if row_set is not None:
+        row_set.add(j)
+      elif self._row_length(i) > self._MAX_SCANNED:
+        self._row_sets[i] = set(self.row(i))
+    if self._buffered_count > max(self._MIN_BUFFERED, len(self._ids)):
+      self.compress()
+
+  def compress(self):
+    """Merges all buffered ids into the compressed rows."""
+    if not self._buffered:
+      return
+    compressed_rows = len(self._offsets) - 1
+    rows = max(compressed_rows, max(self._buffered) + 1)
+    offsets = array(_ID_TYPECODE, [0])
+    ids = array(_ID_TYPECODE)
+    for i in range(rows):
+      if i < compressed_rows:
+        ids.extend(self._ids[self._offsets[i]:self._offsets[i + 1]])
+      buffered = self._buffered.get(i)
+      if buffered:
+        ids.extend(buffered)
+      offsets.append(len(ids))
+    self._offsets = offsets
+    self._ids = ids
+    self._buffered = {}
+    self._buffered_count = 0
+
+  def __len__(self):
+    """Returns the total number of ids in all rows."""
+    return len(self._ids) + self._buffered_count
+
+
+class CompactGraph(object):
+  """A directed graph of hashable nodes, with edges stored in arrays of integer node ids.
+
+  Each node is assigned a dense integer id when it is first added. Outgoing and incoming edges are
+  stored as compressed sparse rows of ids (see `_AdjacencyArrays`), which is far more compact
+  than a set of neighbors per node: only the outgoing edges of nodes with many successors are
+  also indexed by a set, to detect duplicate edges cheaply. All traversals are iterative, so they are not limited by the
+  depth of the graph.
+
+  Edges may not be removed, and the ids of nodes never change.
+  """
+
+  def __init__(self):
+    self._node_ids = {}
+    self._nodes = []
+    self._successors = _AdjacencyArrays(indexed=True)
+    self._predecessors = _AdjacencyArrays()
+
+  def __len__(self):
+    return len(self._nodes)
+
+  def __contains__(self, node):
+    return node in self._node_ids
+
+  @property
+  def edge_count(self):
+    return len(self._successors)
+
+  def add_node(self, node):
+    """Adds the node if it is not already present, and returns its id."""
+    node_id = self._node_ids.get(node)
+    if node_id is None:
+      node_id = len(self._nodes)
+      self._node_ids[node] = node_id
+      self._nodes.append(node)
+    return node_id
+
+  def node_id(self, node):
+    """Returns the id of the given node.
+
+    :raises: `KeyError` if the node is not present.
+    """
+    return self._node_ids[node]
+
+  def maybe_node_id(self, node):
+    """Returns the id of the given node, or None if the node is not present."""
+    return self._node_ids.get(node)
+
+  def node(self, node_id):
+    """Returns the node with the given id."""
+    return self._nodes[node_id]
+
+  def add_edge(self, src_id, dst_id):
+    """Adds an edge between the given node ids.
+
+    :returns: True if the edge was added, or False if it was already present.
+    """
+    if self._successors.contains(src_id, dst_id):
+      return False
+    self._successors.append(src_id, dst_id)
+    self._predecessors.append(dst_id, src_id)
+    return True
+
+  def successors(self, node_id):
+    """Returns the ids of the targets of edges from the given node, in the order they were added."""
+    return self._successors.row(node_id)
+
+  def predecessors(self, node_id):
+    """Returns the ids of the sources of edges to the given node, in the order they were added."""
+    return self._predecessors.row(node_id)
+
+  def closure(self, node_ids, reverse=False):
+    """Returns the ids of the nodes reachable from the given node ids, including those ids.
+
+    :param node_ids: An iterable of node ids to compute the closure of.
+    :param bool reverse: If True, follow edges backwards rather than forwards.
+    :rtype: :class:`Bitset`
+    """
+    adjacency = self._predecessors if reverse else self._successors
+    marks = bytearray(len(self._nodes))
+    to_visit = []
+    for node_id in node_ids:
+      if not marks[node_id]:
+        marks[node_id] = 1
+        to_visit.append(node_id)
+    while to_visit:
+      for adjacent_id in adjacency.row(to_visit.pop()):
+        if not marks[adjacent_id]:
+          marks[adjacent_id] = 1
+          to_visit.append(adjacent_id)
+    return Bitset.from_marks(marks)
@@ -22,6 +22,11 @@ from pants.task.task import TaskBase
 class BashCompletion(ConsoleTask):
   """Generate a Bash shell script that teaches Bash how to autocomplete pants command lines."""
 
+  @classmethod
+  def requires_other_goals(cls):
+    # Completions are generated for the options of all goals.
+    return True
+
   @staticmethod
   def _get_all_cmd_line_scopes():
     """Return all scopes that may be explicitly specified on the cmd line, in no particular order.
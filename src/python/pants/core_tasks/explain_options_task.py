@@ -24,6 +24,11 @@ class ExplainOptionsTask(ConsoleTask):
   value and then a cli FLAG value).
   """
 
+  @classmethod
+  def requires_other_goals(cls):
+    # Options are explained for all goals.
+    return True
+
   @classmethod
   def register_options(cls, register):
     super(ExplainOptionsTask, cls).register_options(register)
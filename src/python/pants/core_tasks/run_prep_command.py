@@ -29,13 +29,9 @@ class RunPrepCommandBase(Task):
   goal = None
 
   @classmethod
-  def register_options(cls, register):
-    """Register options for this optionable.
-
-    In this case, there are no special options, but we want to use this opportunity to setup
-    goal validation in PrepCommand before the build graph is parsed.
-    """
-    super(RunPrepCommandBase, cls).register_options(register)
+  def options_registered(cls):
+    """Set up goal validation in PrepCommand before the build graph is parsed."""
+    super(RunPrepCommandBase, cls).options_registered()
     PrepCommand.add_allowed_goal(cls.goal)
 
   @classmethod
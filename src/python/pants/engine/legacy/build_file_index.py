@@ -0,0 +1,166 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import logging
+import os
+from abc import abstractmethod
+from collections import defaultdict
+
+from six.moves import cPickle as pickle
+
+from pants.base.specs import SiblingAddresses, Specs
+from pants.build_graph.address import Address
+from pants.engine.addressable import BuildFileAddresses
+from pants.engine.build_files import UnhydratedStruct
+from pants.engine.fs import PathGlobs, Snapshot
+from pants.util.dirutil import safe_concurrent_creation, safe_delete
+from pants.util.meta import AbstractClass
+from pants.util.objects import datatype
+
+
+logger = logging.getLogger(__name__)
+
+
+class _DirectoryEntry(datatype(['digest', 'records'])):
+  """The records for the targets declared by the BUILD files in a directory, and their digest."""
+
+
+class BuildFileIndex(AbstractClass):
+  """An index of per-target records, incrementally maintained per directory of BUILD files.
+
+  Records are grouped by the directory of the BUILD files that declare their targets, and keyed by
+  the content digest of those BUILD files. Each `refresh` re-indexes only the targets of
+  directories whose BUILD files have been added or changed since the last refresh, so that queries
+  against the index do not require hydrating every target in the repo. Under pantsd, the products
+  requested to do so are served from the daemon's warm product graph.
+
+  Since only the content of BUILD files is tracked, records must be computed only from information
+  that is fully determined by that content: targets are indexed from their UnhydratedStructs, so
+  their sources are never expanded.
+
+  If a `path` is given, the index is persisted there across runs.
+  """
+
+  # Bump this in a subclass to invalidate persisted indexes if its record format changes.
+  _VERSION = 2
+
+  @classmethod
+  def path_for_workdir(cls, workdir):
+    """Returns the path at which to persist this type of index for the given pants workdir."""
+    return os.path.join(workdir, 'build_file_index', '{}.pickle'.format(cls.__name__))
+
+  def __init__(self, scheduler, build_patterns=None, build_ignore_patterns=None, path=None):
+    """
+    :param scheduler: A SchedulerSession able to produce Snapshots, BuildFileAddresses and
+                      UnhydratedStructs.
+    :param tuple build_patterns: Patterns identifying BUILD files.
+    :param tuple build_ignore_patterns: Patterns of BUILD files to ignore.
+    :param string path: An optional path to persist the index to.
+    """
+    self._scheduler = scheduler
+    self._build_patterns = tuple(build_patterns or ('BUILD', 'BUILD.*'))
+    self._build_ignore_patterns = tuple(build_ignore_patterns or ())
+    self._path = path
+    self._entries = self._load()
+
+  @abstractmethod
+  def _record_for(self, build_file_address, struct):
+    """Returns the (picklable) record to index for the given target.
+
+    :param build_file_address: The BuildFileAddress of the target.
+    :param struct: The unhydrated TargetAdaptor for the target: it is not bound to its address, and
+                   its addressable fields (including `dependencies`) hold unresolved specs.
+    """
+
+  def _records_for(self, specs):
+    """Yields a (directory, record) pair for each target matched by the given Specs."""
+    build_file_addresses, = self._scheduler.product_request(BuildFileAddresses, [specs])
+    addresses = [Address(a.spec_path, a.target_name) for a in build_file_addresses.addresses]
+    unhydrated_structs = self._scheduler.product_request(UnhydratedStruct, addresses)
+    for build_file_address, unhydrated_struct in zip(build_file_addresses.addresses,
+                                                     unhydrated_structs):
+      yield build_file_address.spec_path, self._record_for(build_file_address,
+                                                           unhydrated_struct.struct)
+
+  def _invalidated(self):
+    """Called when the set of records changes: subclasses should drop derived structures."""
+
+  def _records(self):
+    """Yields all indexed records."""
+    for entry in self._entries.values():
+      for record in entry.records:
+        yield record
+
+  def _load(self):
+    if not self._path or not os.path.exists(self._path):
+      return {}
+    try:
+      with open(self._path, 'rb') as fp:
+        version, entries = pickle.load(fp)
+      if version == self._VERSION:
+        return entries
+    except Exception as e:
+      logger.debug('Discarding unreadable index {}: {!r}'.format(self._path, e))
+      safe_delete(self._path)
+    return {}
+
+  def _store(self):
+    if not self._path:
+      return
+    try:
+      payload = pickle.dumps((self._VERSION, self._entries), pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+      logger.debug('Not persisting index {}: {!r}'.format(self._path, e))
+      return
+    with safe_concurrent_creation(self._path) as tmp_path:
+      with open(tmp_path, 'wb') as fp:
+        fp.write(payload)
+
+  def _build_file_globs(self, directory):
+    return PathGlobs(include=tuple(os.path.join(directory, p) for p in self._build_patterns),
+                     exclude=self._build_ignore_patterns)
+
+  def _build_file_digests(self):
+    """Returns a dict from each directory containing BUILD files to the digest of those files."""
+    all_build_files = PathGlobs(include=tuple(os.path.join('**', p) for p in self._build_patterns),
+                                exclude=self._build_ignore_patterns)
+    snapshot, = self._scheduler.product_request(Snapshot, [all_build_files])
+    directories = sorted(set(os.path.dirname(f.stat.path) for f in snapshot.files))
+    snapshots = self._scheduler.product_request(Snapshot,
+                                                [self._build_file_globs(d) for d in directories])
+    return {d: s.directory_digest.fingerprint for d, s in zip(directories, snapshots)}
+
+  def refresh(self):
+    """Re-index the targets of any directories whose BUILD files have changed.
+
+    :returns: The number of directories that were re-indexed.
+    :rtype: int
+    """
+    digests = self._build_file_digests()
+    stale = [d for d, digest in sorted(digests.items())
+             if d not in self._entries or self._entries[d].digest != digest]
+    removed = [d for d in self._entries if d not in digests]
+    if not stale and not removed:
+      return 0
+
+    for directory in removed:
+      del self._entries[directory]
+
+    records_by_directory = defaultdict(list)
+    if stale:
+      specs = Specs(dependencies=tuple(SiblingAddresses(d) for d in stale))
+      for directory, record in self._records_for(specs):
+        records_by_directory[directory].append(record)
+    for directory in stale:
+      self._entries[directory] = _DirectoryEntry(digests[directory],
+                                                 tuple(records_by_directory[directory]))
+
+    logger.debug('{}: re-indexed {} and removed {} directories.'
+                 .format(type(self).__name__, len(stale), len(removed)))
+    self._invalidated()
+    self._store()
+    return len(stale)
@@ -0,0 +1,117 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+from collections import defaultdict
+
+from pants.build_graph.address import Address
+from pants.engine.legacy.build_file_index import BuildFileIndex
+from pants.util.objects import datatype
+
+
+class IndexedTarget(datatype(['address', 'type_alias', 'dependencies', 'kwargs'])):
+  """The information about a target required to compute its dependencies.
+
+  :param address: The Address of the target.
+  :param string type_alias: The alias the target was declared with.
+  :param tuple dependencies: The Addresses of the target's declared dependencies.
+  :param dict kwargs: The target's kwargs, less any fields which would be hydrated, used to compute
+                      implicit dependencies via `Target.compute_dependency_specs`.
+  """
+
+
+class DependeeIndex(BuildFileIndex):
+  """A reverse-dependency index of the targets declared in BUILD files.
+
+  The index stores the declared dependencies of each target (see `BuildFileIndex`). Implicit
+  dependencies (see `Target.compute_dependency_specs`) are computed at query time, since they may
+  depend on options rather than only on the content of BUILD files.
+  """
+
+  # Fields which would be replaced by their hydrated values in a HydratedTarget, and which are not
+  # consulted when computing implicit dependencies.
+  _HYDRATED_FIELDS = frozenset(['bundles', 'dependencies', 'resources', 'sources'])
+
+  def __init__(self, scheduler, target_types, build_patterns=None, build_ignore_patterns=None,
+               path=None, subproject_roots=None):
+    """
+    :param dict target_types: A dict from target alias to Target type.
+    :param list subproject_roots: Paths that correspond with embedded build roots, used to resolve
+                                  declared dependencies.
+
+    See `BuildFileIndex` for the remaining parameters.
+    """
+    super(DependeeIndex, self).__init__(scheduler,
+                                        build_patterns=build_patterns,
+                                        build_ignore_patterns=build_ignore_patterns,
+                                        path=path)
+    self._target_types = target_types
+    self._subproject_roots = subproject_roots
+    self._dependees = None
+
+  def _record_for(self, build_file_address, struct):
+    address = Address(build_file_address.spec_path, build_file_address.target_name)
+    dependencies = tuple(Address.parse(spec,
+                                       relative_to=address.spec_path,
+                                       subproject_roots=self._subproject_roots)
+                         for spec in struct.dependencies)
+    kwargs = {k: v for k, v in struct.kwargs().items() if k not in self._HYDRATED_FIELDS}
+    return IndexedTarget(address, struct.type_alias, dependencies, kwargs)
+
+  def _invalidated(self):
+    self._dependees = None
+
+  def _dependencies_of(self, indexed_target):
+    for dependency in indexed_target.dependencies:
+      yield dependency
+    target_type = self._target_types.get(indexed_target.type_alias)
+    if target_type is None:
+      return
+    # As when constructing targets, the kwargs include the address, which some target types use to
+    # resolve relative specs (e.g. `RemoteSources`).
+    kwargs = dict(indexed_target.kwargs, address=indexed_target.address)
+    for spec in target_type.compute_dependency_specs(kwargs=kwargs):
+      yield Address.parse(spec, relative_to=indexed_target.address.spec_path)
+
+  def _dependee_map(self):
+    if self._dependees is None:
+      dependees = defaultdict(set)
+      for indexed_target in self._records():
+        for dependency in self._dependencies_of(indexed_target):
+          dependees[Address(dependency.spec_path, dependency.target_name)].add(
+            indexed_target.address)
+      self._dependees = dependees
+    return self._dependees
+
+  def dependees_of_addresses(self, addresses):
+    """Returns the set of direct dependees of the given addresses, excluding the addresses.
+
+    :param addresses: An iterable of Addresses.
+    :rtype: set of :class:`pants.build_graph.address.Address`
+    """
+    dependee_map = self._dependee_map()
+    roots = set(Address(a.spec_path, a.target_name) for a in addresses)
+    dependees = set()
+    for address in roots:
+      dependees.update(dependee_map.get(address, ()))
+    return dependees - roots
+
+  def transitive_dependees_of_addresses(self, addresses):
+    """Returns the set of transitive dependees of the given addresses, excluding the addresses.
+
+    :param addresses: An iterable of Addresses.
+    :rtype: set of :class:`pants.build_graph.address.Address`
+    """
+    dependee_map = self._dependee_map()
+    roots = set(Address(a.spec_path, a.target_name) for a in addresses)
+    seen = set(roots)
+    to_visit = list(roots)
+    while to_visit:
+      for dependee in dependee_map.get(to_visit.pop(), ()):
+        if dependee not in seen:
+          seen.add(dependee)
+          to_visit.append(dependee)
+    return seen - roots
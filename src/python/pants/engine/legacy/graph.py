@@ -35,7 +35,11 @@ logger = logging.getLogger(__name__)
 
 def target_types_from_symbol_table(symbol_table):
   """Given a LegacySymbolTable, return the concrete target types constructed for each alias."""
-  aliases = symbol_table.aliases()
+  return target_types_from_build_file_aliases(symbol_table.aliases())
+
+
+def target_types_from_build_file_aliases(aliases):
+  """Given BuildFileAliases, return the concrete target types constructed for each alias."""
   target_types = dict(aliases.target_types)
   for alias, factory in aliases.target_macro_factories.items():
     target_type, = factory.target_types
@@ -89,7 +93,7 @@ class LegacyBuildGraph(BuildGraph):
       target_adaptor = hydrated_target.adaptor
       address = target_adaptor.address
       all_addresses.add(address)
-      if address not in self._target_by_address:
+      if not self.contains_address(address):
         new_targets.append(self._index_target(target_adaptor))
 
     # Once the declared dependencies of all targets are indexed, inject their
@@ -124,18 +128,16 @@ class LegacyBuildGraph(BuildGraph):
     # Instantiate the target.
     address = target_adaptor.address
     target = self._instantiate_target(target_adaptor)
-    self._target_by_address[address] = target
+    self._add_target(address, target)
 
     for dependency in target_adaptor.dependencies:
-      if dependency in self._target_dependencies_by_address[address]:
+      # Link its declared dependencies, which will be indexed independently.
+      if not self._add_dependency(address, dependency):
         raise self.DuplicateAddressError(
           'Addresses in dependencies must be unique. '
           "'{spec}' is referenced more than once by target '{target}'."
           .format(spec=dependency.spec, target=address.spec)
         )
-      # Link its declared dependencies, which will be indexed independently.
-      self._target_dependencies_by_address[address].add(dependency)
-      self._target_dependees_by_address[dependency].add(address)
     return target
 
   def _instantiate_target(self, target_adaptor):
@@ -200,7 +202,7 @@ class LegacyBuildGraph(BuildGraph):
     self.inject_addresses_closure([address])
 
   def inject_addresses_closure(self, addresses):
-    addresses = set(addresses) - set(self._target_by_address.keys())
+    addresses = set(a for a in addresses if not self.contains_address(a))
     if not addresses:
       return
     dependencies = tuple(SingleAddress(a.spec_path, a.target_name) for a in addresses)
@@ -0,0 +1,111 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import logging
+import os
+
+import six
+from six.moves import cPickle as pickle
+
+from pants.base.hash_utils import hash_all
+from pants.engine.parser import Parser
+from pants.util.dirutil import safe_concurrent_creation, safe_delete
+
+
+logger = logging.getLogger(__name__)
+
+
+class CachingParser(Parser):
+  """A Parser that persists the objects parsed by an underlying parser to disk.
+
+  Entries are keyed by the path and content of the parsed file, and are partitioned by the
+  `fingerprint` of the underlying parser, so that a change to the registered symbols, aliases or
+  macros transparently invalidates all previous entries. Only the entry for the most recently
+  parsed content of each path is kept, so the cache grows with the number of BUILD files rather
+  than with the number of edits to them. Files whose content the underlying parser deems not
+  cacheable, or whose parsed objects cannot be pickled, are always parsed.
+
+  NB: Logging and deprecation warnings emitted while executing a BUILD file are not replayed when
+  that file is loaded from the cache.
+  """
+
+  # Bump this to invalidate all existing entries if the layout or serialization format changes.
+  _CACHE_VERSION = '2'
+
+  def __init__(self, parser, cache_dir):
+    """
+    :param parser: The underlying parser, which must expose a `fingerprint` property and a
+                   `parse_cacheable(filepath, filecontent)` method.
+    :type parser: :class:`pants.engine.legacy.parser.LegacyPythonCallbacksParser`
+    :param string cache_dir: The directory to store parsed objects in.
+    """
+    super(CachingParser, self).__init__()
+    self._parser = parser
+    self._cache_dir = os.path.join(cache_dir, self._CACHE_VERSION, parser.fingerprint)
+    self.hits = 0
+    self.misses = 0
+
+  def _path_dir(self, filepath):
+    if isinstance(filepath, six.text_type):
+      filepath = filepath.encode('utf-8')
+    key = hash_all([filepath])
+    return os.path.join(self._cache_dir, key[:2], key)
+
+  def _entry_path(self, path_dir, filecontent):
+    return os.path.join(path_dir, hash_all([filecontent]))
+
+  def _load(self, entry_path):
+    try:
+      with open(entry_path, 'rb') as fp:
+        return pickle.load(fp)
+    except (IOError, OSError):
+      return None
+    except Exception as e:
+      # A corrupt or incompatible entry: remove it so that it is re-created by this parse.
+      logger.debug('Discarding unreadable parse cache entry {}: {!r}'.format(entry_path, e))
+      safe_delete(entry_path)
+      return None
+
+  def _store(self, filepath, path_dir, entry_path, objects):
+    try:
+      payload = pickle.dumps(objects, pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+      logger.debug('Not caching the objects parsed from {}: {!r}'.format(filepath, e))
+      return
+    with safe_concurrent_creation(entry_path) as tmp_path:
+      with open(tmp_path, 'wb') as fp:
+        fp.write(payload)
+    self._evict_others(path_dir, entry_path)
+
+  def _evict_others(self, path_dir, entry_path):
+    """Removes the entries for any other content of the path."""
+    try:
+      names = os.listdir(path_dir)
+    except OSError:
+      return
+    for name in names:
+      # N.B. Temporary files are left to the concurrent stores that are creating them.
+      path = os.path.join(path_dir, name)
+      if path != entry_path and '.tmp.' not in name:
+        safe_delete(path)
+
+  def close(self):
+    self._parser.close()
+
+  def parse(self, filepath, filecontent):
+    path_dir = self._path_dir(filepath)
+    entry_path = self._entry_path(path_dir, filecontent)
+    objects = self._load(entry_path)
+    if objects is not None:
+      self.hits += 1
+      return objects
+
+    self.misses += 1
+    objects, cacheable = self._parser.parse_cacheable(filepath, filecontent)
+    if cacheable:
+      self._store(filepath, path_dir, entry_path, objects)
+    return objects
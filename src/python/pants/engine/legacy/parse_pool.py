@@ -0,0 +1,125 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import logging
+import multiprocessing
+import os
+import threading
+
+from six.moves import cPickle as pickle
+
+from pants.engine.parser import ParseError, Parser
+
+
+logger = logging.getLogger(__name__)
+
+
+# The parser used by forked workers: set in the parent immediately before forking, and inherited
+# by the children.
+_worker_parser = None
+
+
+def _parse_in_worker(filepath, filecontent, check_cacheable):
+  """Parses in a worker process, and returns a (pickled objects, cacheable, error message) tuple.
+
+  Objects are pickled explicitly (rather than by the pool) so that an unpicklable parse result can
+  be reported as `(None, None, None)`, in which case the parent parses the file itself. Errors are
+  reported by message, since arbitrary exception types may not survive a round trip. Whether the
+  objects are cacheable is only determined if `check_cacheable` is True.
+  """
+  try:
+    if check_cacheable:
+      objects, cacheable = _worker_parser.parse_cacheable(filepath, filecontent)
+    else:
+      objects, cacheable = _worker_parser.parse(filepath, filecontent), None
+  except Exception as e:
+    return None, None, '{}'.format(e)
+  try:
+    return pickle.dumps(objects, pickle.HIGHEST_PROTOCOL), cacheable, None
+  except Exception:
+    return None, None, None
+
+
+class ProcessPoolParser(Parser):
+  """A Parser that executes an underlying parser in a pool of forked worker processes.
+
+  Parsing BUILD files is GIL-bound, so concurrent requests from the engine for many AddressFamilies
+  are otherwise effectively serialized. The workers are forked when this parser is constructed, and
+  so share the underlying parser's symbol table: this should happen before the engine starts any
+  threads. The workers can only be used by the process that forked them: in any process forked
+  from it, files are parsed in-process.
+
+  Errors raised by the underlying parser are re-raised in the calling process as ParseErrors with
+  the same message. If the objects parsed from a file cannot be shipped back from a worker, the file
+  is parsed in the calling process instead.
+  """
+
+  def __init__(self, parser, workers):
+    """
+    :param parser: The underlying parser.
+    :type parser: :class:`pants.engine.parser.Parser`
+    :param int workers: The number of worker processes to fork.
+    """
+    super(ProcessPoolParser, self).__init__()
+    self._parser = parser
+    self._workers = workers
+    # Parsing in-process (as a fallback) mutates the underlying parser's shared ParseContext.
+    self._local_lock = threading.Lock()
+
+    global _worker_parser
+    _worker_parser = parser
+    try:
+      self._pool = multiprocessing.Pool(processes=workers)
+    finally:
+      _worker_parser = None
+    self._pool_pid = os.getpid()
+
+  @property
+  def fingerprint(self):
+    return self._parser.fingerprint
+
+  def is_cacheable(self, filecontent):
+    return self._parser.is_cacheable(filecontent)
+
+  def parse_cacheable(self, filepath, filecontent):
+    return self._parse(filepath, filecontent, check_cacheable=True)
+
+  def close(self):
+    """Shuts down the worker processes, if they were forked by this process."""
+    if self._pool is not None and self._pool_pid == os.getpid():
+      self._pool.terminate()
+      self._pool.join()
+      self._pool = None
+
+  def _parse_locally(self, filepath, filecontent, check_cacheable):
+    with self._local_lock:
+      if check_cacheable:
+        return self._parser.parse_cacheable(filepath, filecontent)
+      return self._parser.parse(filepath, filecontent)
+
+  def _parse(self, filepath, filecontent, check_cacheable):
+    if self._pool is None or self._pool_pid != os.getpid():
+      # The pool's result handling threads don't survive a fork, so a forked process would wait on
+      # its results forever.
+      return self._parse_locally(filepath, filecontent, check_cacheable)
+
+    pickled_objects, cacheable, error = self._pool.apply(_parse_in_worker,
+                                                         (filepath, filecontent, check_cacheable))
+    if error is not None:
+      raise ParseError(error)
+    if pickled_objects is None:
+      logger.debug('Objects parsed from {} could not be transferred from a parse worker: parsing '
+                   'in-process.'.format(filepath))
+      return self._parse_locally(filepath, filecontent, check_cacheable)
+    objects = pickle.loads(pickled_objects)
+    return (objects, cacheable) if check_cacheable else objects
+
+  def parse(self, filepath, filecontent):
+    return self._parse(filepath, filecontent, check_cacheable=False)
+
+  def __repr__(self):
+    return '{}(parser={!r}, workers={})'.format(type(self).__name__, self._parser, self._workers)
@@ -7,12 +7,15 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import logging
 import os
+import sys
 import tokenize
 from StringIO import StringIO
 
 import six
 
+from pants.base.build_environment import pants_version
 from pants.base.build_file_target_factory import BuildFileTargetFactory
+from pants.base.hash_utils import hash_all
 from pants.base.parse_context import ParseContext
 from pants.engine.legacy.structs import BundleAdaptor, Globs, RGlobs, TargetAdaptor, ZGlobs
 from pants.engine.mapper import UnaddressableObjectError
@@ -48,6 +51,114 @@ class LegacyPythonCallbacksParser(Parser):
     super(LegacyPythonCallbacksParser, self).__init__()
     self._symbols, self._parse_context = self._generate_symbols(symbol_table, aliases)
     self._build_file_imports_behavior = build_file_imports_behavior
+    # Context aware object factories and macros may observe state other than the BUILD file content
+    # (the filesystem, for example), so files that use them are never considered cacheable.
+    self._uncacheable_symbols = (self._UNCACHEABLE_BUILTINS |
+                                 frozenset(aliases.context_aware_object_factories.keys()) |
+                                 frozenset(aliases.target_macro_factories.keys()))
+
+  # Builtins which allow a BUILD file to observe or mutate state outside of its own content.
+  _UNCACHEABLE_BUILTINS = frozenset([
+    '__import__', 'compile', 'eval', 'execfile', 'file', 'globals', 'input', 'open', 'raw_input',
+    'reload', 'vars',
+  ])
+
+  @memoized_property
+  def fingerprint(self):
+    """A stable fingerprint of the symbols and settings that influence the result of a parse.
+
+    Two parsers with equal fingerprints will produce equal objects for equal BUILD file content.
+    Besides the names of the registered symbols, the fingerprint covers the mtimes of the modules
+    that define them, so that edits to in-repo plugins are observed.
+
+    :rtype: string
+    """
+    def symbol_types(symbol):
+      registered_type = getattr(symbol, '_object_type', None)
+      if registered_type is not None:
+        symbol = registered_type
+      return symbol.__mro__ if isinstance(symbol, type) else type(symbol).__mro__
+
+    def symbol_fingerprint(symbol):
+      if isinstance(symbol, type):
+        return '{}.{}'.format(symbol.__module__, symbol.__name__)
+      registered_type = getattr(symbol, '_object_type', None)
+      if registered_type is not None:
+        return '{}:{}'.format(symbol_fingerprint(registered_type), symbol._type_alias)
+      symbol_type = symbol if callable(symbol) and hasattr(symbol, '__name__') else type(symbol)
+      return '{}.{}'.format(getattr(symbol_type, '__module__', ''), symbol_type.__name__)
+
+    entries = sorted('{}={}'.format(alias, symbol_fingerprint(symbol))
+                     for alias, symbol in self._symbols.items()
+                     if isinstance(alias, six.string_types))
+
+    modules = set(getattr(symbol, '__module__', None) for symbol in self._symbols.values())
+    modules.update(t.__module__ for symbol in self._symbols.values() for t in symbol_types(symbol))
+    for module_name in sorted(m for m in modules if m):
+      path = getattr(sys.modules.get(module_name), '__file__', None)
+      if not path:
+        continue
+      if path.endswith(('.pyc', '.pyo')):
+        path = path[:-1]
+      try:
+        entries.append('{}:{}'.format(path, os.path.getmtime(path)))
+      except OSError:
+        # E.g. a module loaded from a zip, which is covered by the pants version.
+        entries.append(path)
+
+    return hash_all(entry.encode('utf-8') for entry in
+                    [pants_version(), self._build_file_imports_behavior] + entries)
+
+  def is_cacheable(self, filecontent):
+    """Returns True if the result of parsing the given content depends only on the content.
+
+    Content which imports modules, calls context aware object factories or macros, or uses builtins
+    that can observe the outside world is not cacheable. Content which fails to compile is also not
+    cacheable: it will fail again (uncached) during `parse`.
+
+    :param bytes filecontent: The raw byte content of a BUILD file.
+    :rtype: bool
+    """
+    try:
+      code = self._compile(filecontent)
+    except (SyntaxError, TypeError, ValueError):
+      return False
+    return self._is_cacheable(filecontent, code)
+
+  def parse_cacheable(self, filepath, filecontent):
+    """Parses the given content, and determines whether the parsed objects may be cached.
+
+    Equivalent to calling both `parse` and `is_cacheable`, but compiles the content only once.
+
+    :returns: A tuple of the parsed objects, and whether they may be cached.
+    """
+    code = self._compile(filecontent)
+    objects = self._parse(filepath, filecontent, code)
+    return objects, self._is_cacheable(filecontent, code)
+
+  @staticmethod
+  def _compile(filecontent):
+    # N.B. Don't inherit this module's `__future__` flags: BUILD files are executed as written.
+    return compile(filecontent, '<string>', 'exec', 0, True)
+
+  def _is_cacheable(self, filecontent, code):
+    if 'import' in filecontent:
+      try:
+        if any(token[1] == 'import'
+               for token in tokenize.generate_tokens(StringIO(filecontent).readline)):
+          return False
+      except (tokenize.TokenError, IndentationError):
+        return False
+
+    # Global names referenced from nested scopes (lambdas, comprehensions, defs) live in the
+    # `co_names` of nested code objects, so walk all of them.
+    pending = [code]
+    while pending:
+      code = pending.pop()
+      if not self._uncacheable_symbols.isdisjoint(code.co_names):
+        return False
+      pending.extend(const for const in code.co_consts if isinstance(const, type(code)))
+    return True
 
   @staticmethod
   def _generate_symbols(symbol_table, aliases):
@@ -127,6 +238,9 @@ class LegacyPythonCallbacksParser(Parser):
     return symbols, parse_context
 
   def parse(self, filepath, filecontent):
+    return self._parse(filepath, filecontent, self._compile(filecontent))
+
+  def _parse(self, filepath, filecontent, code):
     python = filecontent
 
     # Mutate the parse context for the new path, then exec, and copy the resulting objects.
@@ -135,7 +249,7 @@ class LegacyPythonCallbacksParser(Parser):
     # _intentional_ mutation would require a deep clone, which doesn't seem worth the cost at
     # this juncture.
     self._parse_context._storage.clear(os.path.dirname(filepath))
-    six.exec_(python, dict(self._symbols))
+    six.exec_(code, dict(self._symbols))
 
     # Perform this check after successful execution, so we know the python is valid (and should
     # tokenize properly!)
@@ -0,0 +1,131 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import re
+from collections import defaultdict
+
+from pants.build_graph.address import Address
+from pants.build_graph.source_mapper import SourceMapper
+from pants.engine.legacy.build_file_index import BuildFileIndex
+from pants.engine.legacy.structs import SourcesField
+from pants.source.filespec import glob_to_regex
+from pants.util.objects import datatype
+
+
+class OwningTarget(datatype(['address', 'build_file', 'source', 'globs', 'exclude_globs'])):
+  """The information about a target required to determine which files it owns.
+
+  :param address: The Address of the target.
+  :param string build_file: The buildroot-relative path of the BUILD file declaring the target.
+  :param string source: The buildroot-relative path of the target's singular `source`, if any.
+  :param tuple globs: The buildroot-relative globs of the target's `sources`.
+  :param tuple exclude_globs: The buildroot-relative globs excluded from the target's `sources`.
+  """
+
+
+def _literal_prefix(glob):
+  """Returns the longest directory prefix of the given glob that contains no wildcards."""
+  literal = []
+  for component in glob.strip('/').split('/')[:-1]:
+    if any(c in component for c in '*?['):
+      break
+    literal.append(component)
+  return '/'.join(literal)
+
+
+def _ancestor_dirs(path):
+  """Yields the directories containing the given path, up to and including the buildroot."""
+  while path:
+    path = os.path.dirname(path)
+    yield path
+
+
+class SourceOwnerIndex(BuildFileIndex, SourceMapper):
+  """A SourceMapper backed by an index of the files owned by each target declared in BUILD files.
+
+  Rather than hydrating every target declared in the ancestor directories of each queried file, the
+  index buckets the `sources` globs of all targets by the longest directory prefix that contains no
+  wildcards. A query then only matches against the globs bucketed in the file's ancestor
+  directories. Like the `EngineSourceMapper`, matching is against globs rather than against
+  expanded files, so deleted files are still mapped to their owners.
+  """
+
+  def __init__(self, *args, **kwargs):
+    super(SourceOwnerIndex, self).__init__(*args, **kwargs)
+    self._lookup = None
+
+  def _record_for(self, build_file_address, struct):
+    spec_path = build_file_address.spec_path
+    address = Address(spec_path, build_file_address.target_name)
+    # Bind the struct to its address in order to compute the filespecs of its (possibly default)
+    # sources without expanding them.
+    adaptor = type(struct)(address=address, **struct.kwargs())
+
+    source = adaptor.kwargs().get('source')
+    filespec = {}
+    for field in adaptor.field_adaptors:
+      if isinstance(field, SourcesField) and field.arg == 'sources':
+        filespec = field.filespecs
+    exclude_globs = tuple(os.path.join(spec_path, glob)
+                          for exclude_spec in filespec.get('exclude', [])
+                          for glob in exclude_spec.get('globs', []))
+    return OwningTarget(address,
+                        build_file_address.rel_path,
+                        os.path.join(spec_path, source) if source else None,
+                        tuple(os.path.join(spec_path, glob) for glob in filespec.get('globs', [])),
+                        exclude_globs)
+
+  def _invalidated(self):
+    self._lookup = None
+
+  def _build_lookup(self):
+    """Returns a dict of exact paths to owners, and a dict of directories to bucketed globs."""
+    exact = defaultdict(set)
+    buckets = defaultdict(list)
+    for owning_target in self._records():
+      if owning_target.build_file:
+        exact[owning_target.build_file].add(owning_target.address)
+      if owning_target.source:
+        exact[owning_target.source].add(owning_target.address)
+      if not owning_target.globs:
+        continue
+      excludes = ([re.compile(glob_to_regex(g)) for g in owning_target.exclude_globs]
+                  if owning_target.exclude_globs else None)
+      for glob in owning_target.globs:
+        buckets[_literal_prefix(glob)].append((re.compile(glob_to_regex(glob)),
+                                               excludes,
+                                               owning_target.address))
+    return exact, buckets
+
+  def _owners_of(self, source):
+    exact, buckets = self._lookup
+    owners = set(exact.get(source, ()))
+    for directory in _ancestor_dirs(source):
+      for regex, excludes, address in buckets.get(directory, ()):
+        if (address not in owners and regex.match(source) and
+            not (excludes and any(ex.match(source) for ex in excludes))):
+          owners.add(address)
+    return owners
+
+  def target_addresses_for_source(self, source):
+    return list(self.iter_target_addresses_for_sources([source]))
+
+  def iter_target_addresses_for_sources(self, sources):
+    """Bulk, iterable form of `target_addresses_for_source`.
+
+    The index is refreshed before it is queried.
+    """
+    self.refresh()
+    if self._lookup is None:
+      self._lookup = self._build_lookup()
+    seen = set()
+    for source in sources:
+      for address in sorted(self._owners_of(source), key=lambda a: a.spec):
+        if address not in seen:
+          seen.add(address)
+          yield address
@@ -46,3 +46,6 @@ class Parser(AbstractClass):
               raise :class:`ParseError` if there were any problems encountered parsing the filecontent.
     :rtype: :class:`collections.Callable`
     """
+
+  def close(self):
+    """Releases any resources held by this parser."""
@@ -115,6 +115,14 @@ class Context(object):
     """
     return self._source_roots
 
+  @property
+  def scheduler(self):
+    """Returns the SchedulerSession for the current run, or None if the run is not engine-backed.
+
+    :API: public
+    """
+    return self._scheduler
+
   @property
   def target_roots(self):
     """Returns the targets specified on the command line.
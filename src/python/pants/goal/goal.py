@@ -109,9 +109,51 @@ class Goal(object):
     """
     return [goal for _, goal in sorted(Goal._goal_by_name.items()) if goal.active]
 
+  @classmethod
+  def load(cls, goal_names=None):
+    """Loads the task types of the named goals, or of all goals if `goal_names` is None.
+
+    Tasks registered with a lazy action (see `TaskRegistrar`) are only imported when their goal is
+    loaded.
+
+    :API: public
+
+    :param list goal_names: The names of the goals to load, or None for all goals.
+    """
+    for goal in cls.all():
+      if goal_names is None or goal.name in goal_names:
+        goal.load()
+
+  @staticmethod
+  def all_loaded():
+    """Returns True if all active goals are loaded."""
+    return all(goal.loaded for goal in Goal.all())
+
+  @staticmethod
+  def is_unloaded_scope(scope):
+    """Returns True if `scope` is the scope of a goal or task that has not been loaded.
+
+    The scopes of optionables scoped to such a goal or task (e.g. `cache.compile.zinc`) count too.
+    These are determined from the names of the goals and tasks, without loading any of them.
+    """
+    for goal in Goal.all():
+      if goal.loaded:
+        continue
+      scopes = [goal.name] + [Goal.scope(goal.name, task_name)
+                              for task_name in goal.ordered_task_names()]
+      if any(scope == s or scope.endswith('.' + s) for s in scopes):
+        return True
+    return False
+
   @classmethod
   def get_optionables(cls):
+    """Yields the optionables of all loaded goals.
+
+    Goals that have not been loaded (see `load`) contribute no optionables.
+    """
     for goal in cls.all():
+      if not goal.loaded:
+        continue
       if goal._options_registrar_cls:
         yield goal._options_registrar_cls
       for task_type in goal.task_types():
@@ -140,7 +182,8 @@ class _Goal(object):
     self._description = ''
     self._options_registrar_cls = None
     self.serialize = False
-    self._task_type_by_name = {}  # name -> Task subclass.
+    self._task_registrar_by_name = {}  # name -> TaskRegistrar.
+    self._task_type_by_name = {}  # name -> Task subclass, for the loaded tasks.
     self._ordered_task_names = []  # The task names, in the order imposed by registration.
 
   @property
@@ -149,7 +192,8 @@ class _Goal(object):
       return self._description
     # Return the docstring for the Task registered under the same name as this goal, if any.
     # This is a very common case, and therefore a useful idiom.
-    namesake_task = self._task_type_by_name.get(self.name)
+    namesake_task = (self._load_task_type(self.name)
+                     if self.name in self._task_registrar_by_name else None)
     if namesake_task and namesake_task.__doc__:
       # First line of docstring.
       # TODO: This is repetitive of Optionable.get_description(). We should probably just
@@ -179,21 +223,19 @@ class _Goal(object):
 
     otn = self._ordered_task_names
     if replace:
-      for tt in self.task_types():
+      for tt in self._task_type_by_name.values():
         tt.options_scope = None
       del otn[:]
+      self._task_registrar_by_name = {}
       self._task_type_by_name = {}
 
     task_name = task_registrar.name
-    if task_name in self._task_type_by_name:
+    if task_name in self._task_registrar_by_name:
       raise GoalError(
         'Can only specify a task name once per goal, saw multiple values for {} in goal {}'.format(
           task_name,
           self.name))
     Optionable.validate_scope_name_component(task_name)
-    options_scope = Goal.scope(self.name, task_name)
-
-    task_type = _create_stable_task_type(task_registrar.task_type, options_scope)
 
     if first:
       otn.insert(0, task_name)
@@ -204,7 +246,9 @@ class _Goal(object):
     else:
       otn.append(task_name)
 
-    self._task_type_by_name[task_name] = task_type
+    self._task_registrar_by_name[task_name] = task_registrar
+    if task_registrar.loaded:
+      self._load_task_type(task_name)
 
     if task_registrar.serialize:
       self.serialize = True
@@ -221,13 +265,33 @@ class _Goal(object):
 
     :API: public
     """
-    if name in self._task_type_by_name:
-      self._task_type_by_name[name].options_scope = None
-      del self._task_type_by_name[name]
+    if name in self._task_registrar_by_name:
+      task_type = self._task_type_by_name.pop(name, None)
+      if task_type:
+        task_type.options_scope = None
+      del self._task_registrar_by_name[name]
       self._ordered_task_names = [x for x in self._ordered_task_names if x != name]
     else:
       raise GoalError('Cannot uninstall unknown task: {0}'.format(name))
 
+  def _load_task_type(self, name):
+    task_type = self._task_type_by_name.get(name)
+    if task_type is None:
+      task_type = _create_stable_task_type(self._task_registrar_by_name[name].task_type,
+                                           Goal.scope(self.name, name))
+      self._task_type_by_name[name] = task_type
+    return task_type
+
+  @property
+  def loaded(self):
+    """Return `True` if the task types of all of this goal's tasks have been loaded."""
+    return len(self._task_type_by_name) == len(self._task_registrar_by_name)
+
+  def load(self):
+    """Loads the task types of all of this goal's tasks."""
+    for name in self._ordered_task_names:
+      self._load_task_type(name)
+
   def subsystems(self):
     """Returns all subsystem types used by tasks in this goal, in no particular order."""
     ret = set()
@@ -241,13 +305,17 @@ class _Goal(object):
 
   def task_type_by_name(self, name):
     """The task type registered under the given name."""
-    return self._task_type_by_name[name]
+    if name not in self._task_registrar_by_name:
+      raise KeyError(name)
+    return self._load_task_type(name)
 
   def task_types(self):
     """Returns the task types in this goal, unordered."""
+    self.load()
     return self._task_type_by_name.values()
 
   def task_items(self):
+    self.load()
     for name, task_type in self._task_type_by_name.items():
       yield name, task_type
 
@@ -266,7 +334,7 @@ class _Goal(object):
     providing tasks that implement the goal being installed. If no such plugins are installed, the
     goal may be inactive in the repo.
     """
-    return len(self._task_type_by_name) > 0
+    return len(self._task_registrar_by_name) > 0
 
   def __repr__(self):
     return self.name
@@ -13,6 +13,7 @@ import sys
 import threading
 import time
 import uuid
+from collections import defaultdict
 from contextlib import contextmanager
 
 import requests
@@ -24,6 +25,7 @@ from pants.base.workunit import WorkUnit
 from pants.goal.aggregated_timings import AggregatedTimings
 from pants.goal.artifact_cache_stats import ArtifactCacheStats
 from pants.goal.pantsd_stats import PantsDaemonStats
+from pants.goal.stats_spool import StatsSpool
 from pants.reporting.report import Report
 from pants.stats.statsdb import StatsDBFactory
 from pants.subsystem.subsystem import Subsystem
@@ -67,7 +69,15 @@ class RunTracker(Subsystem):
     register('--stats-upload-url', advanced=True, default=None,
              help='Upload stats to this URL on run completion.')
     register('--stats-upload-timeout', advanced=True, type=int, default=2,
-             help='Wait at most this many seconds for the stats upload to complete.')
+             help='Wait at most this many seconds for each attempt to upload stats.')
+    register('--stats-upload-attempts', advanced=True, type=int,
+             default=StatsSpool.DEFAULT_MAX_ATTEMPTS,
+             help='Attempt each stats upload at most this many times per run. Stats that could not '
+                  'be uploaded are retried by later runs (or by pantsd).')
+    register('--stats-upload-max-spooled', advanced=True, type=int,
+             default=StatsSpool.DEFAULT_MAX_ENTRIES,
+             help='Keep the stats of at most this many runs awaiting upload. The stats of older '
+                  'runs are discarded.')
     register('--num-foreground-workers', advanced=True, type=int,
              default=multiprocessing.cpu_count(),
              help='Number of threads for foreground work.')
@@ -115,6 +125,14 @@ class RunTracker(Subsystem):
     # Note that multiple threads may share a name (e.g., all the threads in a pool).
     self._threadlocal = threading.local()
 
+    # The current workunit of each thread, by thread id. Unlike `self._threadlocal`, this is
+    # visible from other threads, e.g. for attributing profiler samples.
+    self._current_workunits = {}
+
+    # The ids of the threads registered under each parent workunit, so that their entries in
+    # `self._current_workunits` can be removed once it ends.
+    self._registered_threads = defaultdict(set)
+
     # For background work.  Created lazily if needed.
     self._background_worker_pool = None
     self._background_root_workunit = None
@@ -147,7 +165,19 @@ class RunTracker(Subsystem):
 
     Multiple threads may have the same parent (e.g., all the threads in a pool).
     """
-    self._threadlocal.current_workunit = parent_workunit
+    self._registered_threads[parent_workunit].add(threading.current_thread().ident)
+    self._set_current_workunit(parent_workunit)
+
+  def _set_current_workunit(self, workunit):
+    self._threadlocal.current_workunit = workunit
+    self._current_workunits[threading.current_thread().ident] = workunit
+
+  def current_workunits(self):
+    """Returns the current workunit of each thread that has one.
+
+    :returns: A dict from thread id (as in `threading.Thread.ident`) to workunit.
+    """
+    return dict(self._current_workunits)
 
   def is_under_main_root(self, workunit):
     """Is the workunit running under the main thread's root."""
@@ -256,11 +286,11 @@ class RunTracker(Subsystem):
     parent = self._threadlocal.current_workunit
     with self.new_workunit_under_parent(name, parent=parent, labels=labels, cmd=cmd,
                                         log_config=log_config) as workunit:
-      self._threadlocal.current_workunit = workunit
+      self._set_current_workunit(workunit)
       try:
         yield workunit
       finally:
-        self._threadlocal.current_workunit = parent
+        self._set_current_workunit(parent)
 
   @contextmanager
   def new_workunit_under_parent(self, name, parent, labels=None, cmd='', log_config=None):
@@ -365,10 +395,17 @@ class RunTracker(Subsystem):
     # Add to local stats db.
     StatsDBFactory.global_instance().get_db().insert_stats(stats)
 
-    # Upload to remote stats db.
-    stats_url = self.get_options().stats_upload_url
-    if stats_url:
-      self.post_stats(stats_url, stats, timeout=self.get_options().stats_upload_timeout)
+    # Upload to remote stats db. Stats are spooled and uploaded (along with any left over from
+    # earlier runs) in the background, so that a slow or unreachable endpoint neither delays the
+    # end of the run nor loses the stats.
+    options = self.get_options()
+    spool = StatsSpool(StatsSpool.default_dir(), self.post_stats,
+                       max_entries=options.stats_upload_max_spooled)
+    if options.stats_upload_url:
+      spool.add(options.stats_upload_url, stats)
+    if spool.entries():
+      spool.drain_in_background(options.stats_upload_timeout,
+                                max_attempts=options.stats_upload_attempts)
 
     # Write stats to local json file.
     stats_json_file_name = self.get_options().stats_local_json_file
@@ -424,6 +461,10 @@ class RunTracker(Subsystem):
     self.report.end_workunit(workunit)
     path, duration, self_time, is_tool = workunit.end()
 
+    # The threads registered under this workunit have no more work to attribute to it.
+    for thread_id in self._registered_threads.pop(workunit, ()):
+      self._current_workunits.pop(thread_id, None)
+
     # These three operations may not be thread-safe, and workunits may run in separate threads
     # and thus end concurrently, so we want to lock these operations.
     with self._stats_lock:
@@ -0,0 +1,179 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import logging
+import os
+import signal
+import sys
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from pants.base.workunit import WorkUnitLabel
+from pants.util.dirutil import safe_mkdir, safe_open
+
+
+logger = logging.getLogger(__name__)
+
+
+class SamplingProfiler(object):
+  """A low overhead statistical profiler that periodically samples the stacks of all threads.
+
+  Each sample of a thread is attributed to the workunit that the thread was running under, as
+  tracked by the RunTracker. Samples are aggregated into "collapsed stacks" (as consumed by e.g.
+  `flamegraph.pl` or speedscope) per task, with the path of the workunit as the outermost frames.
+
+  Samples are taken on a `SIGPROF` interval timer (and so only while the process is using CPU)
+  when started on the main thread, and otherwise on a background thread at a wall-clock interval.
+  """
+
+  # The default interval between samples, in seconds.
+  DEFAULT_INTERVAL_SECS = 0.01
+
+  # The key of samples taken from threads that are not running under any workunit.
+  UNATTRIBUTED = 'unattributed'
+
+  def __init__(self, run_tracker, interval_secs=DEFAULT_INTERVAL_SECS):
+    """
+    :param RunTracker run_tracker: The RunTracker to attribute samples to workunits with.
+    :param float interval_secs: The interval between samples, in seconds.
+    """
+    self._run_tracker = run_tracker
+    self._interval_secs = interval_secs
+    # task key -> collapsed stack -> count.
+    self._samples = defaultdict(Counter)
+    self._previous_handler = None
+    self._sampler_thread = None
+    self._stopped = threading.Event()
+
+  def start(self):
+    """Starts taking samples."""
+    try:
+      self._previous_handler = signal.signal(signal.SIGPROF, self._handle_signal)
+    except ValueError:
+      # Signal handlers can only be installed on the main thread.
+      self._sampler_thread = threading.Thread(target=self._sample_periodically,
+                                              name='sampling-profiler')
+      self._sampler_thread.daemon = True
+      self._sampler_thread.start()
+    else:
+      # Restart, rather than interrupt, system calls that the main thread is blocked in.
+      signal.siginterrupt(signal.SIGPROF, False)
+      signal.setitimer(signal.ITIMER_PROF, self._interval_secs, self._interval_secs)
+
+  def stop(self):
+    """Stops taking samples."""
+    if self._sampler_thread:
+      self._stopped.set()
+      self._sampler_thread.join()
+      self._sampler_thread = None
+    else:
+      signal.setitimer(signal.ITIMER_PROF, 0)
+      signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+  def _handle_signal(self, signum, frame):
+    self.sample(current_frame=frame)
+
+  def _sample_periodically(self):
+    while not self._stopped.wait(self._interval_secs):
+      self.sample()
+
+  def sample(self, current_frame=None):
+    """Takes a sample of the stacks of all threads other than a background sampler thread.
+
+    :param frame current_frame: The frame that the current thread was interrupted in, if sampling
+                                from a signal handler, so that the handler itself is omitted.
+    """
+    frames = sys._current_frames()
+    if current_frame is not None:
+      frames[threading.current_thread().ident] = current_frame
+    elif self._sampler_thread:
+      frames.pop(threading.current_thread().ident, None)
+    workunits = self._run_tracker.current_workunits()
+    for ident, frame in frames.items():
+      workunit = workunits.get(ident)
+      stack = self._workunit_frames(workunit) + self._frames(frame)
+      self._samples[self._task_key(workunit)][';'.join(stack)] += 1
+
+  @staticmethod
+  def _frames(frame):
+    frames = []
+    while frame is not None:
+      code = frame.f_code
+      frames.append('{} ({}:{})'.format(code.co_name, code.co_filename, code.co_firstlineno))
+      frame = frame.f_back
+    frames.reverse()
+    return frames
+
+  @staticmethod
+  def _workunit_frames(workunit):
+    if workunit is None:
+      return []
+    return ['[{}]'.format(w.name) for w in reversed(workunit.ancestors())]
+
+  @classmethod
+  def _task_key(cls, workunit):
+    """Returns the path of the task that the workunit is running under, or else of its goal."""
+    if workunit is None:
+      return cls.UNATTRIBUTED
+    ancestors = workunit.ancestors()
+    for w in ancestors:
+      if w.has_label(WorkUnitLabel.TASK):
+        return w.path()
+    # Outside of a task, attribute the sample to the outermost workunit under the root.
+    return ancestors[-2].path() if len(ancestors) > 1 else ancestors[-1].path()
+
+  def collapsed_stacks(self):
+    """Returns the samples taken so far.
+
+    :returns: A dict from task workunit path (or `UNATTRIBUTED`) to a dict from collapsed stack
+              to the number of times it was sampled.
+    """
+    return {key: dict(stacks) for key, stacks in self._samples.items()}
+
+  def write(self, output_dir):
+    """Writes one collapsed stacks file per task, and one for all tasks, to the given dir.
+
+    :returns: The path of the file for all tasks.
+    """
+    safe_mkdir(output_dir, clean=True)
+    combined = Counter()
+    for key, stacks in self._samples.items():
+      combined.update(stacks)
+      self._write_stacks(os.path.join(output_dir, '{}.folded'.format(key.replace(':', '.'))),
+                         stacks)
+    combined_path = os.path.join(output_dir, 'combined.folded')
+    self._write_stacks(combined_path, combined)
+    return combined_path
+
+  @staticmethod
+  def _write_stacks(path, stacks):
+    with safe_open(path, 'w') as fp:
+      for stack, count in sorted(stacks.items()):
+        fp.write('{} {}\n'.format(stack, count))
+
+
+@contextmanager
+def maybe_sampling_profiled(run_tracker, output_dir):
+  """A sampling profiling context manager.
+
+  :param RunTracker run_tracker: The RunTracker to attribute samples to workunits with.
+  :param string output_dir: The dir to write collapsed stacks to. If `None`, this will no-op.
+  """
+  if not output_dir:
+    yield
+    return
+
+  profiler = SamplingProfiler(run_tracker)
+  profiler.start()
+  try:
+    yield
+  finally:
+    profiler.stop()
+    combined_path = profiler.write(output_dir)
+    logger.info('Dumped sampling profile data to: {}\nUse e.g. flamegraph.pl {} > profile.svg to '
+                'render it.'.format(output_dir, combined_path))
@@ -0,0 +1,187 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import uuid
+
+from fasteners import InterProcessLock
+
+from pants.base.build_environment import get_pants_cachedir
+from pants.util.dirutil import safe_concurrent_creation, safe_delete, safe_mkdir
+from pants.util.process_handler import subprocess
+
+
+logger = logging.getLogger(__name__)
+
+
+class StatsSpool(object):
+  """A durable, bounded spool of run stats awaiting upload.
+
+  Each run's stats are written to the spool before being uploaded, so that they survive a slow or
+  unreachable endpoint and are uploaded by a later drain (by a later run, or by pantsd). Only the
+  most recently spooled runs are kept.
+  """
+
+  # The default number of runs to keep stats for.
+  DEFAULT_MAX_ENTRIES = 100
+
+  # The default number of times to attempt each upload per drain.
+  DEFAULT_MAX_ATTEMPTS = 3
+
+  @staticmethod
+  def default_dir():
+    """Returns the spool dir shared by all runs (and pantsd)."""
+    return os.path.join(get_pants_cachedir(), 'stats', 'spool')
+
+  def __init__(self, spool_dir, post_stats, max_entries=DEFAULT_MAX_ENTRIES):
+    """
+    :param string spool_dir: The directory to spool stats in.
+    :param func post_stats: A function of `(url, stats, timeout)` that uploads stats, returning
+                            True if the upload succeeded.
+    :param int max_entries: The number of runs to keep stats for. The oldest are discarded.
+    """
+    self._spool_dir = spool_dir
+    self._post_stats = post_stats
+    self._max_entries = max_entries
+
+  def entries(self):
+    """Returns the paths of the spooled stats, oldest first."""
+    try:
+      names = os.listdir(self._spool_dir)
+    except OSError:
+      return []
+    return [os.path.join(self._spool_dir, name) for name in sorted(names) if name.endswith('.json')]
+
+  def add(self, url, stats):
+    """Spools the given stats for upload to the given url.
+
+    :returns: The path of the spooled stats.
+    """
+    # Entry names sort by the time they were spooled.
+    entry = os.path.join(self._spool_dir,
+                         '{}-{}.json'.format(int(time.time() * 1000000), uuid.uuid4().hex))
+    with safe_concurrent_creation(entry) as tmp_entry:
+      with open(tmp_entry, 'w') as fp:
+        json.dump({'url': url, 'stats': stats}, fp)
+
+    entries = self.entries()
+    if len(entries) > self._max_entries:
+      discarded = entries[:len(entries) - self._max_entries]
+      logger.warning('Discarding the stats of {} runs that could not be uploaded.'
+                     .format(len(discarded)))
+      for path in discarded:
+        safe_delete(path)
+    return entry
+
+  def drain(self, timeout, max_attempts=DEFAULT_MAX_ATTEMPTS, backoff_secs=1):
+    """Uploads spooled stats, oldest first, removing the stats that are uploaded.
+
+    Each upload is attempted up to `max_attempts` times, with exponential backoff between attempts.
+    Once uploads to a url have failed that many times, the remaining stats for that url are left
+    spooled for a later drain.
+
+    :param int timeout: The timeout in seconds for each upload attempt.
+    :param int max_attempts: The number of times to attempt each upload.
+    :param float backoff_secs: The delay before the first retry, which doubles for each retry.
+    :returns: The number of spooled stats that were uploaded, or None if another process is already
+              draining the spool.
+    """
+    safe_mkdir(self._spool_dir)
+    lock = InterProcessLock(os.path.join(self._spool_dir, '.drain.lock'))
+    if not lock.acquire(blocking=False):
+      return None
+    try:
+      uploaded = 0
+      attempted = set()
+      failed_urls = set()
+      # Stats may be spooled while draining, so continue until there are no new entries.
+      while True:
+        pending = [entry for entry in self.entries() if entry not in attempted]
+        if not pending:
+          return uploaded
+        for entry in pending:
+          attempted.add(entry)
+          spooled = self._read(entry)
+          if spooled is None or spooled['url'] in failed_urls:
+            continue
+          if self._upload(spooled, timeout, max_attempts, backoff_secs):
+            safe_delete(entry)
+            uploaded += 1
+          else:
+            failed_urls.add(spooled['url'])
+    finally:
+      lock.release()
+
+  def _read(self, entry):
+    try:
+      with open(entry, 'r') as fp:
+        return json.load(fp)
+    except (IOError, OSError):
+      # Discarded concurrently.
+      return None
+    except ValueError as e:
+      logger.warning('Discarding unreadable spooled stats {}: {!r}'.format(entry, e))
+      safe_delete(entry)
+      return None
+
+  def _upload(self, spooled, timeout, max_attempts, backoff_secs):
+    for attempt in range(max_attempts):
+      if attempt:
+        time.sleep(backoff_secs * 2 ** (attempt - 1))
+      if self._post_stats(spooled['url'], spooled['stats'], timeout=timeout):
+        return True
+    return False
+
+  def drain_in_background(self, timeout, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """Drains the spool in a detached process, so that uploads can outlive this process.
+
+    The drainer is a fresh python process (see `main`) rather than a fork of this one, since this
+    process may have live threads (e.g. pantsd's services) whose locks a fork would inherit. It
+    uploads via `RunTracker.post_stats`.
+
+    :param int timeout: The timeout in seconds for each upload attempt.
+    :param int max_attempts: The number of times to attempt each upload.
+    """
+    cmd = [sys.executable, '-m', __name__,
+           '--timeout', str(timeout),
+           '--max-attempts', str(max_attempts),
+           self._spool_dir]
+    # Make this process's code (which may be in a pex) importable by the drainer.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    with open(os.devnull, 'r+b') as devnull:
+      try:
+        # N.B. Don't write to (or hold open) the stdio of the run, which may be a pantsd client's,
+        # and start a new session so that the drainer is not signalled along with the run.
+        subprocess.Popen(cmd, env=env, stdin=devnull, stdout=devnull, stderr=devnull,
+                         close_fds=True, start_new_session=True)
+      except OSError as e:
+        logger.debug('Failed to launch a stats spool drainer: {!r}'.format(e))
+
+
+def main(args=None):
+  """Drains a stats spool: the entrypoint of the process launched by `drain_in_background`."""
+  parser = argparse.ArgumentParser(description='Uploads spooled run stats.')
+  parser.add_argument('--timeout', type=int, required=True,
+                      help='The timeout in seconds for each upload attempt.')
+  parser.add_argument('--max-attempts', type=int, default=StatsSpool.DEFAULT_MAX_ATTEMPTS,
+                      help='The number of times to attempt each upload.')
+  parser.add_argument('spool_dir', help='The stats spool dir to drain.')
+  options = parser.parse_args(args)
+
+  # N.B. Imported here since the RunTracker depends on this module.
+  from pants.goal.run_tracker import RunTracker
+  StatsSpool(options.spool_dir, RunTracker.post_stats).drain(options.timeout,
+                                                             max_attempts=options.max_attempts)
+
+
+if __name__ == '__main__':
+  main()
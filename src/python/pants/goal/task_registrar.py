@@ -5,10 +5,13 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import importlib
 import sys
 import traceback
 from textwrap import dedent
 
+import six
+
 from pants.goal.goal import Goal
 
 
@@ -20,7 +23,9 @@ class TaskRegistrar(object):
   def __init__(self, name, action, dependencies=None, serialize=True):
     """
     :param name: the name of the task.
-    :param action: the Task action object to invoke this task.
+    :param action: the Task action object to invoke this task, or the name of one in the form
+      `'<module name>:<class name>'`. A named action is only imported when its goal is loaded, so
+      backends can register tasks without importing their implementations on every run.
     :param dependencies: DEPRECATED
       the names of other goals which must be achieved before invoking this task's goal.
     :param serialize: a flag indicating whether or not the action to achieve this goal requires
@@ -49,11 +54,19 @@ class TaskRegistrar(object):
                                                                           action=self._task,
                                                                           serialize=self.serialize)
 
+  @property
+  def loaded(self):
+    """Returns `True` if the task type has been imported."""
+    return not isinstance(self._task, six.string_types)
+
   @property
   def task_type(self):
     """
     :API: public
     """
+    if not self.loaded:
+      module_name, _, class_name = self._task.partition(':')
+      self._task = getattr(importlib.import_module(module_name), class_name)
     return self._task
 
   def install(self, goal=None, first=False, replace=False, before=None, after=None):
@@ -6,6 +6,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import logging
+import os
 
 from pants.base.build_environment import get_buildroot
 from pants.base.file_system_project_tree import FileSystemProjectTree
@@ -16,6 +17,8 @@ from pants.engine.legacy.address_mapper import LegacyAddressMapper
 from pants.engine.legacy.graph import (LegacyBuildGraph, TransitiveHydratedTargets,
                                        create_legacy_graph_tasks)
 from pants.engine.legacy.options_parsing import create_options_parsing_rules
+from pants.engine.legacy.parse_cache import CachingParser
+from pants.engine.legacy.parse_pool import ProcessPoolParser
 from pants.engine.legacy.parser import LegacyPythonCallbacksParser
 from pants.engine.legacy.structs import (AppAdaptor, GoTargetAdaptor, JavaLibraryAdaptor,
                                          JunitTestsAdaptor, PythonLibraryAdaptor,
@@ -74,13 +77,17 @@ class LegacySymbolTable(SymbolTable):
     return self._table
 
 
-class LegacyGraphScheduler(datatype(['scheduler', 'symbol_table'])):
+class LegacyGraphScheduler(datatype(['scheduler', 'symbol_table', 'parser'])):
   """A thin wrapper around a Scheduler configured with @rules for a symbol table."""
 
   def new_session(self):
     session = self.scheduler.new_session()
     return LegacyGraphSession(session, self.symbol_table)
 
+  def close(self):
+    """Releases the resources (such as BUILD file parse workers) held outside of the Scheduler."""
+    self.parser.close()
+
 
 class LegacyGraphSession(datatype(['scheduler_session', 'symbol_table'])):
   """A thin wrapper around a SchedulerSession configured with @rules for a symbol table."""
@@ -117,6 +124,58 @@ class LegacyGraphSession(datatype(['scheduler_session', 'symbol_table'])):
     logger.debug('address_mapper is: %s', address_mapper)
     return graph, address_mapper
 
+  def with_build_graph(self, target_roots, build_graph, address_mapper):
+    """Returns a session that will use the given BuildGraph for the given target roots.
+
+    :param TargetRoots target_roots: The target roots that `build_graph` was constructed for.
+    :param BuildGraph build_graph: A BuildGraph returned by `create_build_graph`.
+    :param AddressMapper address_mapper: The AddressMapper returned along with `build_graph`.
+    :returns: A `WarmLegacyGraphSession`.
+    """
+    return WarmLegacyGraphSession(self, target_roots, build_graph, address_mapper)
+
+
+class WarmLegacyGraphSession(object):
+  """A LegacyGraphSession with a BuildGraph that was already constructed for some target roots.
+
+  The daemon constructs BuildGraphs before forking runs, so that forked runs for the same target
+  roots needn't construct them again. Since a forked run gets a copy of the BuildGraph, it may
+  freely mutate it.
+  """
+
+  def __init__(self, graph_session, target_roots, build_graph, address_mapper):
+    """
+    :param LegacyGraphSession graph_session: The session to use for anything other than
+                                             constructing the BuildGraph for `target_roots`.
+    :param TargetRoots target_roots: The target roots that `build_graph` was constructed for.
+    :param BuildGraph build_graph: The BuildGraph.
+    :param AddressMapper address_mapper: The AddressMapper that was created with `build_graph`.
+    """
+    self._graph_session = graph_session
+    self._target_roots = target_roots
+    self._build_graph = build_graph
+    self._address_mapper = address_mapper
+
+  @property
+  def scheduler_session(self):
+    return self._graph_session.scheduler_session
+
+  @property
+  def symbol_table(self):
+    return self._graph_session.symbol_table
+
+  def warm_product_graph(self, target_roots):
+    self._graph_session.warm_product_graph(target_roots)
+
+  def create_build_graph(self, target_roots, build_root=None):
+    """Returns the warm BuildGraph if it was constructed for the given target roots.
+
+    See `LegacyGraphSession.create_build_graph`.
+    """
+    if target_roots == self._target_roots:
+      return self._build_graph, self._address_mapper
+    return self._graph_session.create_build_graph(target_roots, build_root)
+
 
 class EngineInitializer(object):
   """Constructs the components necessary to run the v2 engine with v1 BuildGraph compatibility."""
@@ -124,6 +183,13 @@ class EngineInitializer(object):
   @staticmethod
   def setup_legacy_graph(native, bootstrap_options, build_configuration):
     """Construct and return the components necessary for LegacyBuildGraph construction."""
+    build_file_parse_workers = bootstrap_options.build_file_parse_workers
+    if build_file_parse_workers > 0 and bootstrap_options.enable_pantsd:
+      # The daemon and its runners are forked after the Scheduler has started its threads, so the
+      # workers could neither be forked safely for them, nor shared with them.
+      logger.warning('--build-file-parse-workers is not supported with --enable-pantsd: parsing '
+                     'BUILD files in-process.')
+      build_file_parse_workers = 0
     return EngineInitializer.setup_legacy_graph_extended(
       bootstrap_options.pants_ignore,
       bootstrap_options.pants_workdir,
@@ -137,6 +203,9 @@ class EngineInitializer(object):
       subproject_roots=bootstrap_options.subproject_roots,
       include_trace_on_error=bootstrap_options.print_exception_stacktrace,
       execution_options=ExecutionOptions.from_bootstrap_options(bootstrap_options),
+      build_file_cache_dir=(os.path.join(bootstrap_options.pants_workdir, 'build_file_cache')
+                            if bootstrap_options.build_file_cache else None),
+      build_file_parse_workers=build_file_parse_workers,
     )
 
   @staticmethod
@@ -154,6 +223,8 @@ class EngineInitializer(object):
     subproject_roots=None,
     include_trace_on_error=True,
     execution_options=None,
+    build_file_cache_dir=None,
+    build_file_parse_workers=0,
   ):
     """Construct and return the components necessary for LegacyBuildGraph construction.
 
@@ -179,6 +250,10 @@ class EngineInitializer(object):
                 include the graph trace.
     :param execution_options: Option values for (remote) process execution.
     :type execution_options: :class:`pants.option.global_options.ExecutionOptions`
+    :param str build_file_cache_dir: If set, a directory in which to persist parsed BUILD files
+                                     across runs.
+    :param int build_file_parse_workers: If greater than zero, the number of forked worker
+                                         processes to parse BUILD files in.
     :returns: A LegacyGraphScheduler.
     """
 
@@ -199,6 +274,11 @@ class EngineInitializer(object):
       build_file_aliases,
       build_file_imports_behavior
     )
+    # NB: The parse workers are forked here, before the Scheduler (and its threads) is created.
+    if build_file_parse_workers > 0:
+      parser = ProcessPoolParser(parser, build_file_parse_workers)
+    if build_file_cache_dir:
+      parser = CachingParser(parser, build_file_cache_dir)
     address_mapper = AddressMapper(parser=parser,
                                    build_ignore_patterns=build_ignore_patterns,
                                    exclude_target_regexps=exclude_target_regexps,
@@ -231,4 +311,4 @@ class EngineInitializer(object):
       include_trace_on_error=include_trace_on_error,
     )
 
-    return LegacyGraphScheduler(scheduler, symbol_table)
+    return LegacyGraphScheduler(scheduler, symbol_table, parser)
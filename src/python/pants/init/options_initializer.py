@@ -6,6 +6,7 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import logging
+import os
 import sys
 
 import pkg_resources
@@ -15,8 +16,11 @@ from pants.base.exceptions import BuildConfigurationError
 from pants.goal.goal import Goal
 from pants.init.extension_loader import load_backends_and_plugins
 from pants.init.global_subsystems import GlobalSubsystems
+from pants.init.options_registry_snapshot import OptionsRegistrySnapshot
 from pants.init.plugin_resolver import PluginResolver
+from pants.option.arg_splitter import ArgSplitter
 from pants.option.global_options import GlobalOptionsRegistrar
+from pants.option.scope import ScopeInfo
 from pants.subsystem.subsystem import Subsystem
 
 
@@ -75,12 +79,49 @@ class OptionsInitializer(object):
   """Initializes options."""
 
   @staticmethod
-  def _construct_options(options_bootstrapper, build_configuration):
+  def _load_goals(options_bootstrapper):
+    """Loads the goals requested on the command line, or all goals if they may be needed.
+
+    Tasks that backends register lazily are only imported (and so only contribute options) when
+    their goal is loaded. All goals are loaded for help requests, and when any requested task
+    `requires_other_goals`.
+    """
+    if Goal.all_loaded():
+      return
+
+    # Split the command line on just the names of the goals and tasks, which are known without
+    # loading them.
+    scope_infos = []
+    for goal in Goal.all():
+      scope_infos.append(ScopeInfo(goal.name, ScopeInfo.GOAL))
+      scope_infos.extend(ScopeInfo(Goal.scope(goal.name, task_name), ScopeInfo.TASK)
+                         for task_name in goal.ordered_task_names())
+    arg_splitter = ArgSplitter(scope_infos)
+    split_args = arg_splitter.split_args(options_bootstrapper.args)
+    if arg_splitter.help_request:
+      Goal.load()
+      return
+
+    # Goals that are only mentioned by scoped flags are loaded as well, so that those flags remain
+    # valid.
+    goal_names = set(split_args.goals)
+    goal_names.update(scope.partition('.')[0] for scope in split_args.scope_to_flags)
+    Goal.load(goal_names)
+    if any(task_type.requires_other_goals()
+           for goal in Goal.all() if goal.name in goal_names
+           for task_type in goal.task_types()):
+      Goal.load()
+
+  @classmethod
+  def _construct_options(cls, options_bootstrapper, build_configuration):
     """Parse and register options.
 
     :returns: An Options object representing the full set of runtime options.
     """
-    # Now that plugins and backends are loaded, we can gather the known scopes.
+    cls._load_goals(options_bootstrapper)
+
+    # Now that plugins and backends (and the requested goals) are loaded, we can gather the known
+    # scopes.
 
     # Gather the optionables that are not scoped to any other.  All known scopes are reachable
     # via these optionables' known_scope_infos() methods.
@@ -100,8 +141,21 @@ class OptionsInitializer(object):
 
     distinct_optionable_classes = sorted({si.optionable_cls for si in known_scope_infos},
                                          key=lambda o: o.options_scope)
+
+    snapshot, snapshot_key, registrations = None, None, None
+    bootstrap_option_values = options_bootstrapper.get_bootstrap_options().for_global_scope()
+    if bootstrap_option_values.options_registry_snapshot:
+      snapshot = OptionsRegistrySnapshot(
+        os.path.join(bootstrap_option_values.pants_workdir, 'options_registry'))
+      snapshot_key = snapshot.key(bootstrap_option_values, known_scope_infos)
+      registrations = snapshot.load(snapshot_key)
+
     for optionable_cls in distinct_optionable_classes:
-      optionable_cls.register_options_on_scope(options)
+      if registrations is None or not snapshot.restore(options, optionable_cls, registrations):
+        optionable_cls.register_options_on_scope(options)
+
+    if snapshot and registrations is None:
+      snapshot.save(snapshot_key, options, distinct_optionable_classes)
 
     return options
 
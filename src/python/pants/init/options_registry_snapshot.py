@@ -0,0 +1,178 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import sys
+
+from six.moves import cPickle as pickle
+
+from pants.base.build_environment import pants_version
+from pants.util.dirutil import safe_concurrent_creation, safe_delete
+
+
+logger = logging.getLogger(__name__)
+
+
+def _is_registration_pure(optionable_cls):
+  # N.B. Only a class's own declaration counts: a subclass that overrides `register_options` does
+  # not inherit the purity of the implementation it overrides.
+  return all(vars(c).get('options_registration_is_pure', False)
+             for c in optionable_cls.__mro__ if 'register_options' in vars(c))
+
+
+class OptionsRegistrySnapshot(object):
+  """A snapshot of the options registered by each optionable, so that registration can be skipped.
+
+  The options that an optionable registers are determined by its code and by the bootstrap options
+  (which registration code can read via `register.bootstrap`), so snapshots are keyed by the pants
+  version, the bootstrap option values (including `backend_packages`, `plugins` and `pythonpath`),
+  the known scopes, and the mtimes of the modules that define each optionable and its bases.
+
+  Only optionables each of whose `register_options` implementations is declared pure with
+  `options_registration_is_pure = True` are snapshotted; all others, and optionables with
+  registration kwargs that cannot be pickled, are always registered normally. Restoring an
+  optionable's registrations still calls its `options_registered`.
+  """
+
+  # Bump this to invalidate all existing snapshots if the serialization format changes.
+  _SNAPSHOT_VERSION = '1'
+
+  def __init__(self, snapshot_dir):
+    """
+    :param string snapshot_dir: The directory to store snapshots in.
+    """
+    self._snapshot_dir = snapshot_dir
+
+  @classmethod
+  def key(cls, bootstrap_option_values, known_scope_infos):
+    """Returns the key of the snapshot for the given bootstrap options and known scopes.
+
+    :param OptionValueContainer bootstrap_option_values: The global bootstrap option values.
+    :param list known_scope_infos: The ScopeInfos for all known scopes.
+    """
+    hasher = hashlib.sha1()
+
+    def update(s):
+      hasher.update(s.encode('utf-8'))
+      hasher.update(b'\0')
+
+    update(cls._SNAPSHOT_VERSION)
+    update(pants_version())
+    # Several options default to the number of cores.
+    update(str(multiprocessing.cpu_count()))
+    for option in sorted(bootstrap_option_values):
+      update(option)
+      update(repr(bootstrap_option_values[option]))
+
+    modules = set()
+    for scope_info in sorted(known_scope_infos):
+      optionable_cls = scope_info.optionable_cls
+      update(scope_info.scope)
+      update(scope_info.category)
+      if optionable_cls is not None:
+        update('{}.{}'.format(optionable_cls.__module__, optionable_cls.__name__))
+        modules.update(c.__module__ for c in optionable_cls.__mro__)
+    for module_name in sorted(modules):
+      path = getattr(sys.modules.get(module_name), '__file__', None)
+      if not path:
+        continue
+      if path.endswith(('.pyc', '.pyo')):
+        path = path[:-1]
+      try:
+        update('{}:{}'.format(path, os.path.getmtime(path)))
+      except OSError:
+        # E.g. a module loaded from a zip, which is covered by the pants version or plugins.
+        update(path)
+    return hasher.hexdigest()
+
+  def _snapshot_path(self, key):
+    return os.path.join(self._snapshot_dir, self._SNAPSHOT_VERSION, '{}.pickle'.format(key))
+
+  def load(self, key):
+    """Returns the registrations snapshotted under the given key, or None if there are none."""
+    snapshot_path = self._snapshot_path(key)
+    try:
+      with open(snapshot_path, 'rb') as fp:
+        return pickle.load(fp)
+    except (IOError, OSError):
+      return None
+    except Exception as e:
+      # A corrupt or incompatible snapshot: remove it so that it is re-created by this run.
+      logger.debug('Discarding unreadable options registry snapshot {}: {!r}'
+                   .format(snapshot_path, e))
+      safe_delete(snapshot_path)
+      return None
+
+  @staticmethod
+  def restore(options, optionable_cls, registrations):
+    """Registers the options of the given optionable from snapshotted registrations.
+
+    :param Options options: The Options to register on.
+    :param class optionable_cls: The optionable to restore the registrations of.
+    :param dict registrations: Registrations returned by `load`.
+    :returns: True if the options were restored, or False if they must be registered normally.
+    """
+    if not _is_registration_pure(optionable_cls):
+      return False
+    optionable_registrations = registrations.get(optionable_cls.options_scope)
+    if optionable_registrations is None:
+      return False
+    for scope, scope_registrations in optionable_registrations:
+      options.get_parser(scope).restore_registrations(
+        [(args, dict(kwargs, registering_class=optionable_cls))
+         for args, kwargs in scope_registrations])
+    optionable_cls.options_registered()
+    return True
+
+  def save(self, key, options, optionable_classes):
+    """Snapshots the registrations of the given optionables under the given key.
+
+    :param string key: A key returned by `key`.
+    :param Options options: Options on which all the given optionables have registered.
+    :param list optionable_classes: The optionables to snapshot the registrations of.
+    """
+    registrations = {}
+    for optionable_cls in optionable_classes:
+      if not _is_registration_pure(optionable_cls):
+        continue
+      optionable_registrations = self._capture(options, optionable_cls)
+      if optionable_registrations is None:
+        continue
+      try:
+        pickle.dumps(optionable_registrations, pickle.HIGHEST_PROTOCOL)
+      except Exception as e:
+        logger.debug('Not snapshotting the options of {}: {!r}'.format(optionable_cls, e))
+        continue
+      registrations[optionable_cls.options_scope] = optionable_registrations
+
+    payload = pickle.dumps(registrations, pickle.HIGHEST_PROTOCOL)
+    with safe_concurrent_creation(self._snapshot_path(key)) as tmp_path:
+      with open(tmp_path, 'wb') as fp:
+        fp.write(payload)
+
+  @staticmethod
+  def _capture(options, optionable_cls):
+    scope = optionable_cls.options_scope
+    scopes = [scope]
+    deprecated_scope = options.known_scope_to_info[scope].deprecated_scope
+    if deprecated_scope:
+      scopes.append(deprecated_scope)
+
+    optionable_registrations = []
+    for s in scopes:
+      scope_registrations = []
+      for args, kwargs in options.get_parser(s).registrations():
+        if kwargs.get('registering_class') is not optionable_cls:
+          # Registered on the optionable's scope by other code, which would register it again.
+          return None
+        # The class is restored from the optionable, rather than pickled.
+        scope_registrations.append((args, dict(kwargs, registering_class=True)))
+      optionable_registrations.append((s, scope_registrations))
+    return optionable_registrations
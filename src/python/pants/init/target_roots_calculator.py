@@ -16,8 +16,10 @@ from pants.base.cmd_line_spec_parser import CmdLineSpecParser
 from pants.base.specs import DescendantAddresses, SingleAddress, Specs
 from pants.base.target_roots import TargetRoots
 from pants.build_graph.address import Address
+from pants.engine.legacy.dependee_index import DependeeIndex
 from pants.engine.legacy.graph import TransitiveHydratedTargets, target_types_from_symbol_table
 from pants.engine.legacy.source_mapper import EngineSourceMapper
+from pants.engine.legacy.source_owner_index import SourceOwnerIndex
 from pants.goal.workspace import ScmWorkspace
 from pants.scm.subsystems.changed import ChangedRequest
 
@@ -146,9 +148,31 @@ class TargetRootsCalculator(object):
     logger.debug('spec_roots are: %s', spec_roots)
     logger.debug('changed_request is: %s', changed_request)
     logger.debug('owned_files are: %s', owned_files)
+    global_options = options.for_global_scope()
+    dependee_index = None
+    if global_options.dependee_index:
+      dependee_index = DependeeIndex(
+        session,
+        target_types_from_symbol_table(symbol_table),
+        build_ignore_patterns=global_options.build_ignore,
+        path=DependeeIndex.path_for_workdir(global_options.pants_workdir),
+        subproject_roots=global_options.subproject_roots)
+    owner_index = None
+    if global_options.owner_index:
+      owner_index = SourceOwnerIndex(
+        session,
+        build_ignore_patterns=global_options.build_ignore,
+        path=SourceOwnerIndex.path_for_workdir(global_options.pants_workdir))
+
     scm = get_scm()
-    change_calculator = ChangeCalculator(scheduler=session, symbol_table=symbol_table, scm=scm) if scm else None
-    owner_calculator = OwnerCalculator(scheduler=session, symbol_table=symbol_table) if owned_files else None
+    change_calculator = ChangeCalculator(scheduler=session,
+                                         symbol_table=symbol_table,
+                                         scm=scm,
+                                         dependee_index=dependee_index,
+                                         source_mapper=owner_index) if scm else None
+    owner_calculator = OwnerCalculator(scheduler=session,
+                                       symbol_table=symbol_table,
+                                       source_mapper=owner_index) if owned_files else None
     targets_specified = sum(1 for item
                          in (changed_request.is_actionable(), owned_files, spec_roots)
                          if item)
@@ -183,19 +207,24 @@ class ChangeCalculator(object):
   """A ChangeCalculator that finds the target addresses of changed files based on scm."""
 
   def __init__(self, scheduler, symbol_table, scm, workspace=None, changes_since=None,
-               diffspec=None):
+               diffspec=None, dependee_index=None, source_mapper=None):
     """
     :param scheduler: The `Scheduler` instance to use for computing file to target mappings.
     :param symbol_table: The symbol table.
     :param scm: The `Scm` instance to use for change determination.
+    :param dependee_index: An optional `DependeeIndex` to use to compute dependees. If not
+                           provided, all targets are hydrated to compute dependees.
+    :param source_mapper: An optional `SourceMapper` to use to compute the owners of changed
+                          files. Defaults to an `EngineSourceMapper`.
     """
     self._scm = scm or get_scm()
     self._scheduler = scheduler
     self._symbol_table = symbol_table
-    self._mapper = EngineSourceMapper(self._scheduler)
+    self._mapper = source_mapper or EngineSourceMapper(self._scheduler)
     self._workspace = workspace or ScmWorkspace(scm)
     self._changes_since = changes_since
     self._diffspec = diffspec
+    self._dependee_index = dependee_index
 
   def changed_files(self, changes_since=None, diffspec=None):
     """Determines the files changed according to SCM/workspace and options."""
@@ -222,6 +251,16 @@ class ChangeCalculator(object):
     if changed_request.include_dependees not in ('direct', 'transitive'):
       return
 
+    if self._dependee_index:
+      self._dependee_index.refresh()
+      if changed_request.include_dependees == 'direct':
+        dependees = self._dependee_index.dependees_of_addresses(changed_addresses)
+      else:
+        dependees = self._dependee_index.transitive_dependees_of_addresses(changed_addresses)
+      for address in dependees:
+        yield address
+      return
+
     # TODO: For dependee finding, we technically only need to parse all build files to collect target
     # dependencies. But in order to fully validate the graph and account for the fact that deleted
     # targets do not show up as changed roots, we use the `TransitiveHydratedTargets` product.
@@ -250,14 +289,16 @@ class OwnerCalculator(object):
   to --owner-of
   """
 
-  def __init__(self, scheduler, symbol_table):
+  def __init__(self, scheduler, symbol_table, source_mapper=None):
     """
     :param scheduler: The `Scheduler` instance to use for computing file to target mapping
     :param symbol_table: The symbol table.
+    :param source_mapper: An optional `SourceMapper` to use to compute the owners of files.
+                          Defaults to an `EngineSourceMapper`.
     """
     self._scheduler = scheduler
     self._symbol_table = symbol_table
-    self._mapper = EngineSourceMapper(self._scheduler)
+    self._mapper = source_mapper or EngineSourceMapper(self._scheduler)
 
   def iter_owner_target_addresses(self, owned_files):
     """Given an list of owned files, compute and yield all affected target addresses"""
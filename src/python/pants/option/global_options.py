@@ -67,6 +67,7 @@ class ExecutionOptions(datatype([
   'remote_store_chunk_bytes',
   'remote_store_chunk_upload_timeout_seconds',
   'process_execution_parallelism',
+  'process_execution_local_cache',
 ])):
   """A collection of all options related to (remote) execution of processes.
 
@@ -76,13 +77,19 @@ class ExecutionOptions(datatype([
 
   @classmethod
   def from_bootstrap_options(cls, bootstrap_options):
-    cls(
+    """Returns the ExecutionOptions set by the given global bootstrap options.
+
+    N.B. This previously returned None, so the scheduler was always created with
+    `DEFAULT_EXECUTION_OPTIONS` and the remote execution options were ignored.
+    """
+    return cls(
       remote_store_server=bootstrap_options.remote_store_server,
       remote_execution_server=bootstrap_options.remote_execution_server,
       remote_store_thread_count=bootstrap_options.remote_store_thread_count,
       remote_store_chunk_bytes=bootstrap_options.remote_store_chunk_bytes,
       remote_store_chunk_upload_timeout_seconds=bootstrap_options.remote_store_chunk_upload_timeout_seconds,
       process_execution_parallelism=bootstrap_options.process_execution_parallelism,
+      process_execution_local_cache=bootstrap_options.process_execution_local_cache,
     )
 
 
@@ -93,12 +100,14 @@ DEFAULT_EXECUTION_OPTIONS = ExecutionOptions(
     remote_store_chunk_bytes=1024*1024,
     remote_store_chunk_upload_timeout_seconds=60,
     process_execution_parallelism=multiprocessing.cpu_count()*2,
+    process_execution_local_cache=False,
   )
 
 
 class GlobalOptionsRegistrar(SubsystemClientMixin, Optionable):
   options_scope = GLOBAL_SCOPE
   options_scope_category = ScopeInfo.GLOBAL
+  options_registration_is_pure = True
 
   @classmethod
   def register_bootstrap_options(cls, register):
@@ -169,6 +178,12 @@ class GlobalOptionsRegistrar(SubsystemClientMixin, Optionable):
     register('--pants-workdir', advanced=True, metavar='<dir>',
              default=os.path.join(buildroot, '.pants.d'),
              help='Write intermediate output files to this dir.')
+    register('--options-registry-snapshot', advanced=True, type=bool, default=False,
+             help='Snapshot the options registered by subsystems and tasks under the workdir, and '
+                  'restore them in later runs rather than executing their registration. Only '
+                  'subsystems and tasks that declare their registration to be free of side effects '
+                  'are snapshotted. Snapshots are keyed by the pants version, these bootstrap '
+                  'options and the mtimes of the registering modules.')
     register('--pants-supportdir', advanced=True, metavar='<dir>',
              default=os.path.join(buildroot, 'build-support'),
              help='Use support files from this dir.')
@@ -252,6 +267,12 @@ class GlobalOptionsRegistrar(SubsystemClientMixin, Optionable):
     register('--binaries-fetch-timeout-secs', type=int, default=30, advanced=True, daemon=False,
              help='Timeout in seconds for URL reads when fetching binary tools from the '
                   'repos specified by --baseurls.')
+    register('--binaries-fetch-concurrency', type=int, default=8, advanced=True, daemon=False,
+             help='The maximum number of binary tools to fetch concurrently when prefetching.')
+    register('--binaries-prefetch', type=bool, default=False, advanced=True, daemon=False,
+             help='Before running the requested goals, concurrently fetch the binary tools of '
+                  'every subsystem that the goals use, rather than fetching each one on first '
+                  'use.')
     register('--binaries-path-by-id', type=dict, advanced=True,
              help=("Maps output of uname for a machine to a binary search path: "
                    "(sysname, id) -> (os, arch), e.g. {('darwin', '15'): ('mac', '10.11'), "
@@ -271,6 +292,18 @@ class GlobalOptionsRegistrar(SubsystemClientMixin, Optionable):
              help='The directory to log pantsd output to.')
     register('--pantsd-fs-event-workers', advanced=True, type=int, default=4,
              help='The number of workers to use for the filesystem event service executor pool.')
+    register('--pantsd-fs-event-settle-secs', advanced=True, type=float, default=0.05,
+             help='The window (in seconds) in which filesystem events for a subscription are merged '
+                  'before being delivered, so that bursts of changes cause one invalidation. If 0, '
+                  'events are delivered as they arrive.')
+    register('--pantsd-runner-pool-size', advanced=True, type=int, default=2,
+             help='The number of pre-forked runners that pantsd keeps ready to adopt client '
+                  'requests, so that concurrent clients do not wait on one another to fork. If 0, '
+                  'pantsd forks a runner per request.')
+    register('--pantsd-build-graph-cache-size', advanced=True, type=int, default=0,
+             help='The number of BuildGraphs, for distinct target roots, that pantsd constructs '
+                  'and keeps warm for later runs with the same target roots. Each may be as large '
+                  'as the graph for `::`. If 0, every run constructs its own BuildGraph.')
     register('--pantsd-invalidation-globs', advanced=True, type=list, fromfile=True, default=[],
              help='Filesystem events matching any of these globs will trigger a daemon restart.')
 
@@ -292,6 +325,15 @@ class GlobalOptionsRegistrar(SubsystemClientMixin, Optionable):
     # all caches), and needs to be parsed out early, so we make it a bootstrap option.
     register('--build-file-imports', choices=['allow', 'warn', 'error'], default='warn',
       help='Whether to allow import statements in BUILD files')
+    register('--build-file-cache', advanced=True, type=bool, default=False,
+             help='Persist the objects parsed from BUILD files under the workdir, and reuse them '
+                  'in later runs for BUILD files whose content has not changed. BUILD files that '
+                  'import modules or use macros or context aware object factories are always '
+                  're-parsed.')
+    register('--build-file-parse-workers', advanced=True, type=int, default=0,
+             help='If greater than zero, parse BUILD files in this many forked worker processes '
+                  'rather than in the pants process. This allows BUILD file parsing to scale with '
+                  'the number of cores on cold runs. Not supported with --enable-pantsd.')
 
     register('--remote-store-server', advanced=True,
              help='host:port of grpc server to use as remote execution file store.')
@@ -311,6 +353,12 @@ class GlobalOptionsRegistrar(SubsystemClientMixin, Optionable):
     # lookups via CacheSetup in TaskBase.
     register('--process-execution-parallelism', type=int, default=multiprocessing.cpu_count(),
              help='Number of concurrent processes that may be executed either locally and remotely.')
+    register('--process-execution-local-cache', type=bool, advanced=True,
+             default=DEFAULT_EXECUTION_OPTIONS.process_execution_local_cache,
+             help='Cache the results of successful process executions in a local database under '
+                  '~/.cache/pants, so that identical processes are not re-run by later pants runs. '
+                  'When the pantsd store GC runs, or when the database is full, the oldest entries '
+                  'are evicted first until the database is below a target size.')
 
   @classmethod
   def register_options(cls, register):
@@ -345,6 +393,16 @@ class GlobalOptionsRegistrar(SubsystemClientMixin, Optionable):
     register('--max-subprocess-args', advanced=True, type=int, default=100, recursive=True,
              help='Used to limit the number of arguments passed to some subprocesses by breaking '
              'the command up into multiple invocations.')
+    register('--dependee-index', advanced=True, type=bool, default=False,
+             help='Answer dependee queries (for the dependees goal and for '
+                  '--changed-include-dependees) using a reverse dependency index persisted in the '
+                  'workdir, which is incrementally updated as BUILD files change, rather than by '
+                  'hydrating every target in the repo.')
+    register('--owner-index', advanced=True, type=bool, default=False,
+             help='Answer source file ownership queries (for --owner-of, --changed-* and the '
+                  'list-owners goal) using an index of target sources persisted in the workdir, '
+                  'which is incrementally updated as BUILD files change, rather than by hydrating '
+                  'the targets in every ancestor directory of each file.')
     register('--lock', advanced=True, type=bool, default=True,
              help='Use a global lock to exclude other versions of pants from running during '
                   'critical operations.')
@@ -28,6 +28,13 @@ class Optionable(AbstractClass):
   deprecated_options_scope = None
   deprecated_options_scope_removal_version = None
 
+  # Whether `register_options` has no effects other than registering options, so that it may be
+  # skipped in favor of restoring its registrations from an options registry snapshot (see
+  # `pants.init.options_registry_snapshot`). Each class that defines `register_options` must opt in
+  # itself, since an override may have effects that its bases do not: class-level effects of
+  # registration belong in `options_registered` instead, which is never skipped.
+  options_registration_is_pure = True
+
   _scope_name_component_re = re.compile(r'^(?:[a-z0-9])+(?:-(?:[a-z0-9])+)*$')
 
   @classmethod
@@ -69,6 +76,14 @@ class Optionable(AbstractClass):
     Subclasses may override and call register(*args, **kwargs).
     """
 
+  @classmethod
+  def options_registered(cls):
+    """Called once this optionable's options are registered, or restored from a snapshot.
+
+    Subclasses may override to set up class-level state that depends on their registration, and
+    should call super.
+    """
+
   @classmethod
   def register_options_on_scope(cls, options):
     """Trigger registration of this optionable's options.
@@ -76,6 +91,7 @@ class Optionable(AbstractClass):
     Subclasses should not generally need to override this method.
     """
     cls.register_options(options.registration_function_for_optionable(cls))
+    cls.options_registered()
 
   def __init__(self):
     # Check that the instance's class defines options_scope.
@@ -73,6 +73,11 @@ class OptionsBootstrapper(object):
     self._full_options = {}  # We memoize the full options here.
     self._option_tracker = OptionTracker()
 
+  @property
+  def args(self):
+    """The full command line args that options are bootstrapped from."""
+    return self._args
+
   def produce_and_set_bootstrap_options(self):
     """Cooperatively populates the internal bootstrap_options cache with
     a producer of `FileContent`."""
@@ -190,31 +195,58 @@ class OptionsBootstrapper(object):
                                                option_tracker=self._option_tracker)
     return self._full_options[key]
 
-  def verify_configs_against_options(self, options):
-    """Verify all loaded configs have correct scopes and options.
-
-    :param options: Fully bootstrapped valid options.
-    :return: None.
-    """
-    error_log = []
+  def _config_scopes(self):
+    """Yields (config, section, scope) for each section of the loaded configs."""
     for config in self._post_bootstrap_config.configs():
       for section in config.sections():
         if section == GLOBAL_SCOPE_CONFIG_SECTION:
           scope = GLOBAL_SCOPE
         else:
           scope = section
-        try:
-          valid_options_under_scope = set(options.for_scope(scope))
-        # Only catch ConfigValidationError. Other exceptions will be raised directly.
-        except Config.ConfigValidationError:
-          error_log.append("Invalid scope [{}] in {}".format(section, config.configpath))
-        else:
-          # All the options specified under [`section`] in `config` excluding bootstrap defaults.
-          all_options_under_scope = (set(config.configparser.options(section)) -
-                                     set(config.configparser.defaults()))
-          for option in all_options_under_scope:
-            if option not in valid_options_under_scope:
-              error_log.append("Invalid option '{}' under [{}] in {}".format(option, section, config.configpath))
+        yield config, section, scope
+
+  def unknown_config_scopes(self, options, ignore_unknown_scope=None):
+    """Returns the scopes of config sections that `options` does not know about.
+
+    :param options: Fully bootstrapped valid options.
+    :param ignore_unknown_scope: An optional predicate for unknown scopes to leave out.
+    :returns: A set of scopes.
+    """
+    unknown_scopes = set()
+    for _, _, scope in self._config_scopes():
+      try:
+        options.for_scope(scope)
+      except Config.ConfigValidationError:
+        if not (ignore_unknown_scope and ignore_unknown_scope(scope)):
+          unknown_scopes.add(scope)
+    return unknown_scopes
+
+  def verify_configs_against_options(self, options, ignore_unknown_scope=None):
+    """Verify all loaded configs have correct scopes and options.
+
+    :param options: Fully bootstrapped valid options.
+    :param ignore_unknown_scope: An optional predicate for config sections whose scopes `options`
+                                 does not know about, which returns True for scopes that should be
+                                 allowed, e.g. because they belong to goals that were not loaded
+                                 for this run.
+    :return: None.
+    """
+    error_log = []
+    for config, section, scope in self._config_scopes():
+      try:
+        valid_options_under_scope = set(options.for_scope(scope))
+      # Only catch ConfigValidationError. Other exceptions will be raised directly.
+      except Config.ConfigValidationError:
+        if ignore_unknown_scope and ignore_unknown_scope(scope):
+          continue
+        error_log.append("Invalid scope [{}] in {}".format(section, config.configpath))
+      else:
+        # All the options specified under [`section`] in `config` excluding bootstrap defaults.
+        all_options_under_scope = (set(config.configparser.options(section)) -
+                                   set(config.configparser.defaults()))
+        for option in all_options_under_scope:
+          if option not in valid_options_under_scope:
+            error_log.append("Invalid option '{}' under [{}] in {}".format(option, section, config.configpath))
 
     if error_log:
       for error in error_log:
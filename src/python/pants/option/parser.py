@@ -328,6 +328,33 @@ class Parser(object):
         raise OptionAlreadyRegistered(self.scope, arg)
     self._known_args.update(args)
 
+  def registrations(self):
+    """Returns the (args, kwargs) pairs of the options registered directly on this parser.
+
+    Unlike `option_registrations_iter`, the kwargs are exactly as stored at registration time.
+    """
+    return list(self._option_registrations)
+
+  def restore_registrations(self, registrations):
+    """Registers options from (args, kwargs) pairs previously returned by `registrations`.
+
+    The pairs are assumed to have been valid registrations for this parser, and so are not checked
+    again.
+    """
+    if not registrations:
+      return
+    if self._frozen:
+      raise FrozenRegistration(self.scope, registrations[0][0][0])
+
+    ancestor = self._parent_parser
+    while ancestor:
+      ancestor._freeze()
+      ancestor = ancestor._parent_parser
+
+    for args, kwargs in registrations:
+      self._option_registrations.append((args, kwargs))
+      self._known_args.update(args)
+
   def _check_deprecated(self, dest, kwargs):
     """Checks option for deprecation and issues a warning/error if necessary."""
     removal_version = kwargs.get('removal_version', None)
@@ -28,6 +28,7 @@ from pants.pantsd.process_manager import FingerprintedProcessManager
 from pants.pantsd.service.fs_event_service import FSEventService
 from pants.pantsd.service.pailgun_service import PailgunService
 from pants.pantsd.service.scheduler_service import SchedulerService
+from pants.pantsd.service.stats_spool_service import StatsSpoolService
 from pants.pantsd.service.store_gc_service import StoreGCService
 from pants.pantsd.watchman_launcher import WatchmanLauncher
 from pants.util.collections import combined_dict
@@ -165,7 +166,8 @@ class PantsDaemon(FingerprintedProcessManager):
       fs_event_service = FSEventService(
         watchman,
         build_root,
-        bootstrap_options.pantsd_fs_event_workers
+        bootstrap_options.pantsd_fs_event_workers,
+        bootstrap_options.pantsd_fs_event_settle_secs
       )
 
       pidfile_absolute = PantsDaemon.metadata_file_path('pantsd', 'pid', bootstrap_options.pants_subprocessdir)
@@ -185,6 +187,7 @@ class PantsDaemon(FingerprintedProcessManager):
         build_root,
         bootstrap_options.pantsd_invalidation_globs,
         pidfile,
+        build_graph_cache_size=bootstrap_options.pantsd_build_graph_cache_size,
       )
 
       pailgun_service = PailgunService(
@@ -192,14 +195,18 @@ class PantsDaemon(FingerprintedProcessManager):
         exiter_class=DaemonExiter,
         runner_class=DaemonPantsRunner,
         target_roots_calculator=TargetRootsCalculator,
-        scheduler_service=scheduler_service
+        scheduler_service=scheduler_service,
+        runner_pool_size=bootstrap_options.pantsd_runner_pool_size
       )
 
       store_gc_service = StoreGCService(legacy_graph_scheduler.scheduler)
 
+      stats_spool_service = StatsSpoolService()
+
       return (
         # Services.
-        (fs_event_service, scheduler_service, pailgun_service, store_gc_service),
+        (fs_event_service, scheduler_service, pailgun_service, store_gc_service,
+         stats_spool_service),
         # Port map.
         dict(pailgun=pailgun_service.pailgun_port)
       )
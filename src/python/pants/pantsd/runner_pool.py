@@ -0,0 +1,179 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import datetime
+import logging
+import os
+import socket
+import threading
+from collections import deque
+from multiprocessing import Pipe
+from multiprocessing.reduction import recv_handle, send_handle
+
+from pants.pantsd.process_manager import ProcessManager
+
+
+logger = logging.getLogger(__name__)
+
+
+class PooledRunner(ProcessManager):
+  """A daemonized process, forked ahead of time, that waits to adopt a single pailgun request.
+
+  The pailgun request is sent over a pipe as the tuple `(arguments, environment)`, followed by the
+  file descriptor of the connected client socket.
+  """
+
+  def __init__(self, generation, handler, inherited_conns, metadata_base_dir=None):
+    """
+    :param int generation: The invalidation generation of the daemon at fork time.
+    :param func handler: A function of `(socket, arguments, environment)` to call in the forked
+                         process to handle an adopted request.
+    :param list inherited_conns: The pipes of other pooled runners, which are closed post-fork.
+    :param string metadata_base_dir: The ProcessManager metadata base dir.
+    """
+    super(PooledRunner, self).__init__(name=self._make_identity(),
+                                       metadata_base_dir=metadata_base_dir)
+    self.generation = generation
+    self._handler = handler
+    self._inherited_conns = inherited_conns
+    self._conn, self._child_conn = Pipe()
+
+  def _make_identity(self):
+    return 'pantsd-pooled-runner-{}'.format(
+      datetime.datetime.now().strftime('%Y-%m-%dT%H_%M_%S_%f'))
+
+  def start(self):
+    """Forks the runner."""
+    self.daemonize(write_pid=False)
+    self._child_conn.close()
+
+  def post_fork_child(self):
+    """Post-fork child process callback executed via ProcessManager.daemonize()."""
+    # N.B. The daemon retires a runner by closing its end of the pipe, so for that to be seen here
+    # no other process may hold it open.
+    for conn in self._inherited_conns:
+      conn.close()
+    self._conn.close()
+
+    try:
+      arguments, environment = self._child_conn.recv()
+      fd = recv_handle(self._child_conn)
+    except (EOFError, IOError):
+      # Retired.
+      return
+    finally:
+      self._child_conn.close()
+
+    sock = socket.fromfd(fd, socket.AF_INET, socket.SOCK_STREAM)
+    os.close(fd)
+    self._handler(sock, arguments, environment)
+
+  @property
+  def conn(self):
+    return self._conn
+
+  def adopt(self, sock, arguments, environment):
+    """Hands the given request to the runner.
+
+    :raises: `IOError` or `OSError` if the runner has exited.
+    """
+    try:
+      self._conn.send((arguments, environment))
+      send_handle(self._conn, sock.fileno(), None)
+    finally:
+      self._conn.close()
+
+  def retire(self):
+    """Causes the runner to exit without handling a request."""
+    self._conn.close()
+
+
+class PreforkedRunnerPool(object):
+  """A pool of pre-forked runners that stand ready to adopt incoming pailgun requests.
+
+  Forking a runner per request (under the daemon's fork lock) serializes concurrent clients on the
+  fork and on the runner's post-fork initialization. A pooled runner is forked ahead of time, so
+  handing it a request costs a write to a pipe.
+
+  A runner sees the daemon's state as of when it was forked, so runners forked before the latest
+  invalidation (as reported by `generation_fn`) are retired rather than handed requests.
+  """
+
+  def __init__(self, size, fork_lock, pre_fork, handler, generation_fn, metadata_base_dir=None):
+    """
+    :param int size: The number of idle runners to keep.
+    :param threading.RLock fork_lock: The lock to hold while forking runners.
+    :param func pre_fork: A function to call (with the fork lock held) before forking a runner.
+    :param func handler: A function of `(socket, arguments, environment)` to call in a runner to
+                         handle an adopted request.
+    :param func generation_fn: A function returning the current invalidation generation.
+    :param string metadata_base_dir: The ProcessManager metadata base dir.
+    """
+    self._size = size
+    self._fork_lock = fork_lock
+    self._pre_fork = pre_fork
+    self._handler = handler
+    self._generation_fn = generation_fn
+    self._metadata_base_dir = metadata_base_dir
+    self._lock = threading.Lock()
+    self._idle = deque()
+
+  def __len__(self):
+    with self._lock:
+      return len(self._idle)
+
+  def _is_stale(self, runner):
+    return runner.generation != self._generation_fn()
+
+  def fill(self):
+    """Retires stale runners, and forks new runners until the pool is full."""
+    self.retire_stale()
+    while len(self) < self._size:
+      with self._fork_lock:
+        self._pre_fork()
+        with self._lock:
+          inherited_conns = [r.conn for r in self._idle]
+        runner = PooledRunner(self._generation_fn(), self._handler, inherited_conns,
+                              metadata_base_dir=self._metadata_base_dir)
+        runner.start()
+      with self._lock:
+        self._idle.append(runner)
+
+  def retire_stale(self):
+    """Retires runners that were forked before the latest invalidation."""
+    with self._lock:
+      fresh = deque()
+      for runner in self._idle:
+        if self._is_stale(runner):
+          runner.retire()
+        else:
+          fresh.append(runner)
+      self._idle = fresh
+
+  def adopt(self, sock, arguments, environment):
+    """Hands the given request to an idle runner, if a fresh one is available.
+
+    :returns: True if a runner adopted the request, and False otherwise.
+    """
+    with self._lock:
+      while self._idle:
+        runner = self._idle.popleft()
+        if self._is_stale(runner):
+          runner.retire()
+          continue
+        try:
+          runner.adopt(sock, arguments, environment)
+          return True
+        except (IOError, OSError) as e:
+          logger.warning('pooled runner failed to adopt request, retiring it: {!r}'.format(e))
+      return False
+
+  def shutdown(self):
+    """Retires all idle runners."""
+    with self._lock:
+      while self._idle:
+        self._idle.popleft().retire()
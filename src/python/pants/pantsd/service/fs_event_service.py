@@ -7,7 +7,9 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 
 import logging
 import os
+import threading
 import traceback
+from collections import Counter
 
 from concurrent.futures import ThreadPoolExecutor
 
@@ -21,18 +23,24 @@ class FSEventService(PantsService):
   This is the primary service coupling to watchman and is responsible for subscribing to and
   reading events from watchman's UNIX socket and firing callbacks in pantsd. Callbacks are
   executed in a configurable threadpool but are generally expected to be short-lived.
+
+  Given a settle window, the events for a subscription that arrive within the window of its first
+  event are merged (with duplicate files removed) and delivered to its callback once, so that e.g.
+  a `git checkout` causes one invalidation rather than many.
   """
 
   ZERO_DEPTH = ['depth', 'eq', 0]
 
   PANTS_PID_SUBSCRIPTION_NAME = 'pantsd_pid'
 
-  def __init__(self, watchman, build_root, worker_count):
+  def __init__(self, watchman, build_root, worker_count, settle_secs=0):
     """
     :param Watchman watchman: The Watchman instance as provided by the WatchmanLauncher subsystem.
     :param str build_root: The current build root.
     :param int worker_count: The total number of workers to use for the internally managed
                              ThreadPoolExecutor.
+    :param float settle_secs: The window in which to merge the events for a subscription. If 0,
+                              each event is delivered as it arrives.
     """
     super(FSEventService, self).__init__()
     self._logger = logging.getLogger(__name__)
@@ -41,6 +49,15 @@ class FSEventService(PantsService):
     self._worker_count = worker_count
     self._executor = None
     self._handlers = {}
+    self._settle_secs = settle_secs
+
+    # Guards the state below, which is shared with the threads that deliver merged events.
+    self._lock = threading.Lock()
+    # Future -> handler name, for callbacks that have been submitted to the executor.
+    self._futures = {}
+    # Handler name -> (merged event, set of its files), for events within their settle window.
+    self._pending_events = {}
+    self._metrics = Counter()
 
   def setup(self, lifecycle_lock, fork_lock, executor=None):
     super(FSEventService, self).setup(lifecycle_lock, fork_lock)
@@ -48,6 +65,7 @@ class FSEventService(PantsService):
 
   def terminate(self):
     """An extension of PantsService.terminate() that shuts down the executor if so configured."""
+    self._logger.info('filesystem event metrics: {}'.format(self.metrics()))
     if self._executor:
       self._logger.info('shutting down threadpool')
       self._executor.shutdown()
@@ -121,6 +139,73 @@ class FSEventService(PantsService):
     """Fire an event callback for a given handler."""
     return self._handlers[handler_name].callback(event_data)
 
+  def metrics(self):
+    """Returns counters for the events received from watchman so far.
+
+    - `events_received`: The number of events received.
+    - `callbacks_fired`: The number of callbacks fired for them.
+    - `events_coalesced`: The number of events that were merged into an earlier event.
+    - `duplicate_files`: The number of files that were dropped from merged events as duplicates.
+    """
+    with self._lock:
+      metrics = dict.fromkeys(('events_received', 'callbacks_fired', 'events_coalesced',
+                               'duplicate_files'), 0)
+      metrics.update(self._metrics)
+      return metrics
+
+  def _submit(self, handler_name, event_data):
+    future = self._executor.submit(self.fire_callback, handler_name, event_data)
+    with self._lock:
+      self._futures[future] = handler_name
+      self._metrics['callbacks_fired'] += 1
+
+  def _deliver(self, handler_name, event_data):
+    """Delivers an event to its handler, after merging it with others in the settle window."""
+    with self._lock:
+      self._metrics['events_received'] += 1
+      pending = self._pending_events.get(handler_name)
+      # The initial event for a subscription lists all files rather than changes, and so is never
+      # merged (and neither are events without files).
+      mergeable = (self._settle_secs > 0 and
+                   'files' in event_data and
+                   not event_data.get('is_fresh_instance'))
+      if mergeable and pending:
+        merged_event, files = pending
+        self._metrics['events_coalesced'] += 1
+        for f in event_data['files']:
+          if f in files:
+            self._metrics['duplicate_files'] += 1
+          else:
+            files.add(f)
+            merged_event['files'].append(f)
+        # Otherwise, the latest event's fields (e.g. its clock) win.
+        merged_event.update((k, v) for k, v in event_data.items() if k != 'files')
+        return
+      if mergeable:
+        self._pending_events[handler_name] = (dict(event_data, files=list(event_data['files'])),
+                                              set(event_data['files']))
+        timer = threading.Timer(self._settle_secs, self._deliver_pending, args=(handler_name,))
+        timer.daemon = True
+        timer.start()
+        return
+
+    # Preserve the order of events for the handler.
+    self._deliver_pending(handler_name)
+    self._submit(handler_name, event_data)
+
+  def _deliver_pending(self, handler_name):
+    with self._lock:
+      merged_event, _ = self._pending_events.pop(handler_name, (None, None))
+    if merged_event is None or self.is_killed:
+      return
+    self._logger.debug('delivering {} files for {} after settling'
+                       .format(len(merged_event['files']), handler_name))
+    try:
+      self._submit(handler_name, merged_event)
+    except RuntimeError:
+      # The executor was shut down by a concurrent `terminate`.
+      self._logger.debug('dropping settled event for {} on shutdown'.format(handler_name))
+
   def run(self):
     """Main service entrypoint. Called via Thread.start() via PantsDaemon.run()."""
 
@@ -130,7 +215,6 @@ class FSEventService(PantsService):
     # Enable watchman for the build root.
     self._watchman.watch_project(self._build_root)
 
-    futures = {}
     id_counter = 0
     subscriptions = self._handlers.values()
 
@@ -141,12 +225,13 @@ class FSEventService(PantsService):
 
       if event_data:
         # As we receive events from watchman, submit them asynchronously to the executor.
-        future = self._executor.submit(self.fire_callback, handler_name, event_data)
-        futures[future] = handler_name
+        self._deliver(handler_name, event_data)
 
       # Process and log results for completed futures.
-      for completed_future in [_future for _future in futures if _future.done()]:
-        handler_name = futures.pop(completed_future)
+      with self._lock:
+        completed = [(future, self._futures.pop(future))
+                     for future in list(self._futures) if future.done()]
+      for completed_future, handler_name in completed:
         id_counter += 1
 
         try:
@@ -6,21 +6,35 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import logging
+import Queue
 import select
 import sys
+import threading
 import traceback
 from contextlib import contextmanager
 
 from pants.init.options_initializer import BuildConfigInitializer, OptionsInitializer
 from pants.option.options_bootstrapper import OptionsBootstrapper
 from pants.pantsd.pailgun_server import PailgunServer
+from pants.pantsd.runner_pool import PreforkedRunnerPool
 from pants.pantsd.service.pants_service import PantsService
 
 
+class _AdoptedRun(object):
+  """Stands in for the runner of a request that was adopted by a pre-forked runner."""
+
+  def run(self):
+    pass
+
+
 class PailgunService(PantsService):
   """A service that runs the Pailgun server."""
 
-  def __init__(self, bind_addr, exiter_class, runner_class, target_roots_calculator, scheduler_service):
+  # The interval at which the runner pool is checked for stale or missing runners, in seconds.
+  RUNNER_POOL_POLL_SECS = 1
+
+  def __init__(self, bind_addr, exiter_class, runner_class, target_roots_calculator, scheduler_service,
+               runner_pool_size=0):
     """
     :param tuple bind_addr: The (hostname, port) tuple to bind the Pailgun server to.
     :param class exiter_class: The `Exiter` class to be used for Pailgun runs.
@@ -29,6 +43,8 @@ class PailgunService(PantsService):
       root parsing.
     :param SchedulerService scheduler_service: The SchedulerService instance for access to the
                                                resident scheduler.
+    :param int runner_pool_size: The number of pre-forked runners to keep ready to adopt requests.
+                                 If 0, a runner is forked per request instead.
     """
     super(PailgunService, self).__init__()
     self._bind_addr = bind_addr
@@ -40,6 +56,23 @@ class PailgunService(PantsService):
     self._logger = logging.getLogger(__name__)
     self._pailgun = None
 
+    self._runner_pool_size = runner_pool_size
+    self._runner_pool = None
+    # Arguments of requests adopted by pooled runners, for which to warm the product graph.
+    self._warm_requests = Queue.Queue()
+
+  def setup(self, lifecycle_lock, fork_lock):
+    """Service setup."""
+    super(PailgunService, self).setup(lifecycle_lock, fork_lock)
+    if self._runner_pool_size > 0:
+      self._runner_pool = PreforkedRunnerPool(
+        self._runner_pool_size,
+        fork_lock=fork_lock,
+        pre_fork=self._scheduler_service.pre_fork,
+        handler=self._run_adopted_request,
+        generation_fn=lambda: self._scheduler_service.invalidation_generation
+      )
+
   @property
   def pailgun(self):
     if not self._pailgun:
@@ -50,46 +83,65 @@ class PailgunService(PantsService):
   def pailgun_port(self):
     return self.pailgun.server_port
 
-  def _setup_pailgun(self):
-    """Sets up a PailgunServer instance."""
-    # Constructs and returns a runnable PantsRunner.
-    def runner_factory(sock, arguments, environment):
-      exiter = self._exiter_class(sock)
-      graph_helper = None
-      deferred_exc = None
+  def _create_options(self, arguments):
+    options_bootstrapper = OptionsBootstrapper(args=arguments)
+    build_config = BuildConfigInitializer.get(options_bootstrapper)
+    return OptionsInitializer.create(options_bootstrapper, build_config)
 
-      self._logger.debug('execution commandline: %s', arguments)
-      options_bootstrapper = OptionsBootstrapper(args=arguments)
-      build_config = BuildConfigInitializer.get(options_bootstrapper)
-      options = OptionsInitializer.create(options_bootstrapper, build_config)
+  def _create_runner(self, sock, arguments, environment):
+    """Constructs and returns a runnable PantsRunner."""
+    exiter = self._exiter_class(sock)
+    graph_helper = None
+    deferred_exc = None
 
-      graph_helper, target_roots = None, None
-      try:
-        self._logger.debug('warming the product graph via %s', self._scheduler_service)
-        # N.B. This call is made in the pre-fork daemon context for reach and reuse of the
-        # resident scheduler.
-        graph_helper, target_roots = self._scheduler_service.warm_product_graph(
-          options,
-          self._target_roots_calculator
-        )
-      except Exception:
-        deferred_exc = sys.exc_info()
-        self._logger.warning(
-          'encountered exception during SchedulerService.warm_product_graph(), deferring:\n%s',
-          ''.join(traceback.format_exception(*deferred_exc))
-        )
-
-      return self._runner_class(
-        sock,
-        exiter,
-        arguments,
-        environment,
-        target_roots,
-        graph_helper,
-        self.fork_lock,
-        deferred_exc
+    self._logger.debug('execution commandline: %s', arguments)
+    options = self._create_options(arguments)
+
+    graph_helper, target_roots = None, None
+    try:
+      self._logger.debug('warming the product graph via %s', self._scheduler_service)
+      # N.B. This call is made in the pre-fork daemon context for reach and reuse of the
+      # resident scheduler.
+      graph_helper, target_roots = self._scheduler_service.warm_product_graph(
+        options,
+        self._target_roots_calculator
+      )
+    except Exception:
+      deferred_exc = sys.exc_info()
+      self._logger.warning(
+        'encountered exception during SchedulerService.warm_product_graph(), deferring:\n%s',
+        ''.join(traceback.format_exception(*deferred_exc))
       )
 
+    return self._runner_class(
+      sock,
+      exiter,
+      arguments,
+      environment,
+      target_roots,
+      graph_helper,
+      self.fork_lock,
+      deferred_exc
+    )
+
+  def _run_adopted_request(self, sock, arguments, environment):
+    """Runs a request in a pooled runner that adopted it."""
+    # The runner has no use for the daemon's listening socket.
+    self.pailgun.server_close()
+    # The runner was already forked, so rather than forking again, run in this process.
+    self._create_runner(sock, arguments, environment).post_fork_child()
+
+  def _setup_pailgun(self):
+    """Sets up a PailgunServer instance."""
+    def runner_factory(sock, arguments, environment):
+      if self._runner_pool is not None and self._runner_pool.adopt(sock, arguments, environment):
+        self._logger.debug('request adopted by a pooled runner: %s', arguments)
+        # The pooled runner doesn't share its product graph with the daemon, so warm the
+        # daemon's product graph for the request in the background, for runners forked later.
+        self._warm_requests.put(arguments)
+        return _AdoptedRun()
+      return self._create_runner(sock, arguments, environment)
+
     # Plumb the daemon's lifecycle lock to the `PailgunServer` to safeguard teardown.
     @contextmanager
     def lifecycle_lock():
@@ -98,10 +150,38 @@ class PailgunService(PantsService):
 
     return PailgunServer(self._bind_addr, runner_factory, lifecycle_lock)
 
+  def _maintain_runner_pool(self):
+    """Keeps the runner pool full of fresh runners, and warms the product graph for adoptions."""
+    while not self.is_killed:
+      try:
+        arguments = self._warm_requests.get(timeout=self.RUNNER_POOL_POLL_SECS)
+      except Queue.Empty:
+        pass
+      else:
+        try:
+          self._scheduler_service.warm_product_graph(self._create_options(arguments),
+                                                     self._target_roots_calculator)
+        except Exception as e:
+          # The pooled runner that adopted the request will have reported the failure.
+          self._logger.debug('failed to warm the product graph for {}: {!r}'.format(arguments, e))
+
+      # Runners forked before watchman is running could miss invalidations.
+      if self.is_killed or not self._scheduler_service.watchman_is_running():
+        continue
+      try:
+        self._runner_pool.fill()
+      except Exception:
+        self._logger.warning('failed to fill the runner pool:\n{}'.format(traceback.format_exc()))
+
   def run(self):
     """Main service entrypoint. Called via Thread.start() via PantsDaemon.run()."""
     self._logger.info('starting pailgun server on port {}'.format(self.pailgun_port))
 
+    if self._runner_pool is not None:
+      pool_thread = threading.Thread(target=self._maintain_runner_pool, name='pailgun-runner-pool')
+      pool_thread.daemon = True
+      pool_thread.start()
+
     try:
       # Manually call handle_request() in a loop vs serve_forever() for interruptability.
       while not self.is_killed:
@@ -116,4 +196,7 @@ class PailgunService(PantsService):
     if self.pailgun:
       self.pailgun.server_close()
 
+    if self._runner_pool is not None:
+      self._runner_pool.shutdown()
+
     super(PailgunService, self).terminate()
@@ -9,12 +9,36 @@ import logging
 import os
 import Queue
 import threading
+from collections import OrderedDict
 
 from twitter.common.dirutil import Fileset
 
 from pants.pantsd.service.pants_service import PantsService
 
 
+class _ForkLockedSchedulerSession(object):
+  """A SchedulerSession that holds the fork lock only while it executes requests.
+
+  Instantiating and indexing targets is most of the cost of constructing a BuildGraph, and needn't
+  block forks.
+  """
+
+  def __init__(self, scheduler_session, fork_lock):
+    self._scheduler_session = scheduler_session
+    self._fork_lock = fork_lock
+
+  def __getattr__(self, name):
+    return getattr(self._scheduler_session, name)
+
+  def execute(self, execution_request):
+    with self._fork_lock:
+      return self._scheduler_session.execute(execution_request)
+
+  def product_request(self, product, subjects):
+    with self._fork_lock:
+      return self._scheduler_session.product_request(product, subjects)
+
+
 class SchedulerService(PantsService):
   """The pantsd scheduler service.
 
@@ -32,6 +56,7 @@ class SchedulerService(PantsService):
     build_root,
     invalidation_globs,
     pantsd_pidfile,
+    build_graph_cache_size=0,
   ):
     """
     :param FSEventService fs_event_service: An unstarted FSEventService instance for setting up
@@ -41,6 +66,8 @@ class SchedulerService(PantsService):
     :param str build_root: The current build root.
     :param list invalidation_globs: A list of `globs` that when encountered in filesystem event
                                     subscriptions will tear down the daemon.
+    :param int build_graph_cache_size: The maximum number of warm BuildGraphs to hold, for distinct
+                                       sets of target roots. If 0, no BuildGraphs are constructed.
     """
     super(SchedulerService, self).__init__()
     self._fs_event_service = fs_event_service
@@ -54,6 +81,13 @@ class SchedulerService(PantsService):
     self._event_queue = Queue.Queue(maxsize=self.QUEUE_SIZE)
     self._watchman_is_running = threading.Event()
     self._invalidating_files = set()
+    self._invalidation_generation = 0
+    self._build_graph_cache_size = build_graph_cache_size
+    # Target roots key -> (BuildGraph, AddressMapper), in least to most recently used order.
+    self._build_graphs = OrderedDict()
+    # Guards the BuildGraphs and the invalidation generation, since BuildGraphs are constructed
+    # without holding the fork lock.
+    self._build_graphs_lock = threading.Lock()
 
   @staticmethod
   def _combined_invalidating_fileset_from_globs(glob_strs, root):
@@ -119,6 +153,11 @@ class SchedulerService(PantsService):
 
     with self.fork_lock:
       self._scheduler.invalidate_files(files)
+      with self._build_graphs_lock:
+        self._invalidation_generation += 1
+        # BuildGraphs are cheap to reconstruct from a warm product graph, so rather than
+        # determining which of them the files affect, drop them all.
+        self._build_graphs.clear()
 
   def _process_event_queue(self):
     """File event notification queue processor."""
@@ -150,6 +189,19 @@ class SchedulerService(PantsService):
 
     self._event_queue.task_done()
 
+  @property
+  def invalidation_generation(self):
+    """The number of filesystem events that have invalidated the product graph so far."""
+    return self._invalidation_generation
+
+  def watchman_is_running(self):
+    """Returns True once the initial watchman event has been processed."""
+    return self._watchman_is_running.is_set()
+
+  def pre_fork(self):
+    """Prepares the captive scheduler to be used by a process forked from the daemon."""
+    self._scheduler.pre_fork()
+
   def product_graph_len(self):
     """Provides the size of the captive product graph.
 
@@ -160,6 +212,10 @@ class SchedulerService(PantsService):
   def warm_product_graph(self, options, target_roots_calculator):
     """Runs an execution request against the captive scheduler given a set of input specs to warm.
 
+    If enabled, a BuildGraph is also constructed for the target roots (or reused, if one was
+    constructed for the same target roots since the last filesystem change), so that forked runs
+    needn't construct it themselves.
+
     :returns: `(LegacyGraphSession, TargetRoots)`
     """
     # If any nodes exist in the product graph, wait for the initial watchman event to avoid
@@ -179,7 +235,50 @@ class SchedulerService(PantsService):
         tags=tuple(options.for_global_scope().tag) if options.for_global_scope().tag else tuple()
       )
       session.warm_product_graph(target_roots)
-      return session, target_roots
+      generation = self._invalidation_generation
+
+    if self._build_graph_cache_size > 0:
+      session = self._with_warm_build_graph(session, target_roots, generation)
+    return session, target_roots
+
+  @staticmethod
+  def _target_roots_key(target_roots):
+    return tuple((tuple(spec.dependencies), tuple(spec.tags or ()),
+                  tuple(spec.exclude_patterns or ()))
+                 for spec in target_roots.specs or ())
+
+  def _with_warm_build_graph(self, session, target_roots, generation):
+    """Returns a session that uses a warm BuildGraph for the given target roots.
+
+    N.B. Must be called without the fork_lock held, which is only taken while the BuildGraph
+    executes requests against the scheduler.
+
+    :param int generation: The invalidation generation that the product graph was warmed at. A
+                           BuildGraph constructed after a later invalidation is used, but not kept.
+    """
+    key = self._target_roots_key(target_roots)
+    with self._build_graphs_lock:
+      build_graph_and_mapper = self._build_graphs.pop(key, None)
+      if build_graph_and_mapper is not None:
+        self._build_graphs[key] = build_graph_and_mapper
+        return session.with_build_graph(target_roots, *build_graph_and_mapper)
+
+    locked_session = session._replace(
+      scheduler_session=_ForkLockedSchedulerSession(session.scheduler_session, self.fork_lock))
+    try:
+      build_graph_and_mapper = locked_session.create_build_graph(target_roots, self._build_root)
+    except Exception as e:
+      # The run will fail (or not) in the same way when it constructs the BuildGraph itself.
+      self._logger.warn('failed to construct a warm BuildGraph for {}: {!r}'
+                        .format(target_roots, e))
+      return session
+
+    with self._build_graphs_lock:
+      if generation == self._invalidation_generation:
+        while len(self._build_graphs) >= self._build_graph_cache_size:
+          self._build_graphs.popitem(last=False)
+        self._build_graphs[key] = build_graph_and_mapper
+    return session.with_build_graph(target_roots, *build_graph_and_mapper)
 
   def run(self):
     """Main service entrypoint."""
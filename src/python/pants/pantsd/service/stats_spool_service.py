@@ -0,0 +1,39 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import logging
+
+from pants.goal.run_tracker import RunTracker
+from pants.goal.stats_spool import StatsSpool
+from pants.pantsd.service.pants_service import PantsService
+
+
+class StatsSpoolService(PantsService):
+  """Stats Spool Service.
+
+  This service periodically uploads run stats that runs spooled but could not upload, e.g. because
+  the stats endpoint was unreachable at the time.
+  """
+
+  _DRAIN_INTERVAL_SECONDS = 5 * 60
+  _UPLOAD_TIMEOUT_SECONDS = 2
+
+  def __init__(self, spool_dir=None):
+    """
+    :param string spool_dir: The stats spool dir to drain. Defaults to the spool of all runs.
+    """
+    super(StatsSpoolService, self).__init__()
+    self._spool = StatsSpool(spool_dir or StatsSpool.default_dir(), RunTracker.post_stats)
+    self._logger = logging.getLogger(__name__)
+
+  def run(self):
+    """Main service entrypoint. Called via Thread.start() via PantsDaemon.run()."""
+    while not self.is_killed:
+      uploaded = self._spool.drain(self._UPLOAD_TIMEOUT_SECONDS)
+      if uploaded:
+        self._logger.debug('uploaded {} spooled stats'.format(uploaded))
+      self._kill_switch.wait(self._DRAIN_INTERVAL_SECONDS)
@@ -6,6 +6,11 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import errno
+import sys
+import threading
+from multiprocessing.pool import ThreadPool
+
+import six
 
 from pants.util.process_handler import subprocess
 
@@ -16,43 +21,163 @@ class Xargs(object):
   Specifically allows encapsulated commands to be passed very large argument lists by chunking up
   the argument lists into a minimal set and then invoking the encapsulated command against each
   chunk in turn.
+
+  If a maximum number of arguments or bytes per chunk is given, the argument list is chunked up
+  front, and with a `parallelism` greater than 1 (like `xargs -P`), the chunks are executed
+  concurrently.
   """
 
   @classmethod
-  def subprocess(cls, cmd, **kwargs):
+  def subprocess(cls, cmd, max_args=None, max_bytes=None, parallelism=1, **kwargs):
     """Creates an xargs engine that uses subprocess.call to execute the given cmd array with extra
     arg chunks.
+
+    If chunks are executed concurrently, the output of each chunk is buffered, and written to the
+    `stdout` and `stderr` given in kwargs (or to `sys.stdout` and `sys.stderr`) in the order of the
+    chunks. As with `subprocess`, `stderr=subprocess.STDOUT` merges stderr into stdout.
     """
+    if parallelism > 1:
+      return _BufferedSubprocessXargs(cmd, kwargs, max_args, max_bytes, parallelism)
+
     def call(args):
       return subprocess.call(cmd + args, **kwargs)
-    return cls(call)
+    return cls(call, max_args=max_args, max_bytes=max_bytes)
 
-  def __init__(self, cmd):
+  def __init__(self, cmd, max_args=None, max_bytes=None, parallelism=1, initializer=None):
     """Creates an xargs engine that calls cmd with argument chunks.
 
     :param cmd: A function that can execute a command line in the form of a list of strings
       passed as its sole argument.
+    :param int max_args: The maximum number of arguments to pass to a single execution of cmd.
+    :param int max_bytes: The maximum total size in bytes of the arguments passed to a single
+      execution of cmd. The size of a non-string argument is that of its string representation.
+    :param int parallelism: The maximum number of chunks to execute concurrently.
+    :param initializer: An optional function to call in each thread that chunks are concurrently
+      executed in; for example, to register the thread with a RunTracker.
     """
     self._cmd = cmd
+    self._max_args = max_args
+    self._max_bytes = max_bytes
+    self._parallelism = parallelism
+    self._initializer = initializer
 
   def _split_args(self, args):
     half = len(args) // 2
     return args[:half], args[half:]
 
+  @staticmethod
+  def _arg_size(arg):
+    if not isinstance(arg, bytes):
+      arg = six.text_type(arg).encode('utf-8')
+    # Account for the separating NUL.
+    return len(arg) + 1
+
+  def _chunk_args(self, args):
+    """Returns the given args split into chunks that respect the configured maximums."""
+    if not (self._max_args or self._max_bytes):
+      return [args]
+    chunks = []
+    chunk = []
+    chunk_bytes = 0
+    for arg in args:
+      arg_bytes = self._arg_size(arg) if self._max_bytes else 0
+      if chunk and ((self._max_args and len(chunk) >= self._max_args) or
+                    (self._max_bytes and chunk_bytes + arg_bytes > self._max_bytes)):
+        chunks.append(chunk)
+        chunk = []
+        chunk_bytes = 0
+      chunk.append(arg)
+      chunk_bytes += arg_bytes
+    chunks.append(chunk)
+    return chunks
+
   def execute(self, args):
     """Executes the configured cmd passing args in one or more rounds xargs style.
 
+    If chunks are executed serially, execution stops at the first chunk that fails. If they are
+    executed concurrently, all chunks are executed.
+
     :param list args: Extra arguments to pass to cmd.
+    :returns: 0 if all chunks succeeded, or else the exit code of the first chunk that failed.
     """
-    all_args = list(args)
+    chunks = self._chunk_args(list(args))
+    if self._parallelism <= 1 or len(chunks) == 1:
+      for chunk in chunks:
+        result = self._finish(self._execute_chunk(chunk))
+        if result != 0:
+          return result
+      return 0
+
+    pool = ThreadPool(processes=min(self._parallelism, len(chunks)), initializer=self._initializer)
+    try:
+      result = 0
+      # Results are consumed in the order of the chunks.
+      for chunk_result in pool.imap(self._execute_chunk, chunks):
+        chunk_result = self._finish(chunk_result)
+        if result == 0:
+          result = chunk_result
+      return result
+    finally:
+      pool.terminate()
+      pool.join()
+
+  def _execute_chunk(self, args):
+    return self._call(args)
+
+  def _call(self, args):
     try:
-      return self._cmd(all_args)
+      return self._cmd(args)
     except OSError as e:
       if errno.E2BIG == e.errno:
-        args1, args2 = self._split_args(all_args)
-        result = self.execute(args1)
+        args1, args2 = self._split_args(args)
+        result = self._call(args1)
         if result != 0:
           return result
-        return self.execute(args2)
+        return self._call(args2)
       else:
         raise e
+
+  def _finish(self, chunk_result):
+    """Returns the exit code of the result of a chunk, in the order of the chunks."""
+    return chunk_result
+
+
+class _BufferedSubprocessXargs(Xargs):
+  """Executes a cmd array in subprocesses concurrently, writing their output in chunk order."""
+
+  def __init__(self, cmd, kwargs, max_args, max_bytes, parallelism):
+    self._local = threading.local()
+    self._stdout = kwargs.pop('stdout', None) or sys.stdout
+    stderr = kwargs.pop('stderr', None)
+    merge_stderr = stderr == subprocess.STDOUT
+    self._stderr = None if merge_stderr else (stderr or sys.stderr)
+
+    def call(args):
+      process = subprocess.Popen(cmd + args,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT if merge_stderr else subprocess.PIPE,
+                                 **kwargs)
+      output, errors = process.communicate()
+      self._local.outputs.append(output)
+      self._local.errors.append(errors or b'')
+      return process.returncode
+
+    super(_BufferedSubprocessXargs, self).__init__(call,
+                                                   max_args=max_args,
+                                                   max_bytes=max_bytes,
+                                                   parallelism=parallelism)
+
+  def _execute_chunk(self, args):
+    # A chunk may be executed in more than one process if it is too big, so buffer all of them.
+    self._local.outputs = outputs = []
+    self._local.errors = errors = []
+    result = self._call(args)
+    return result, b''.join(outputs), b''.join(errors)
+
+  def _finish(self, chunk_result):
+    result, output, errors = chunk_result
+    for stream, data in ((self._stdout, output), (self._stderr, errors)):
+      if stream is not None and data:
+        stream.write(data)
+        stream.flush()
+    return result
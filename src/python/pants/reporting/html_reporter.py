@@ -6,15 +6,17 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import cgi
+import logging
 import os
 import re
+import threading
 import time
 import uuid
-from collections import defaultdict, namedtuple
+from collections import OrderedDict, defaultdict, namedtuple
 from textwrap import dedent
 
 from six import string_types
-from six.moves import range
+from six.moves import queue, range
 
 from pants.base.build_environment import get_buildroot
 from pants.base.mustache import MustacheRenderer
@@ -26,6 +28,54 @@ from pants.reporting.reporting_utils import items_to_report_element
 from pants.util.dirutil import safe_mkdir
 
 
+logger = logging.getLogger(__name__)
+
+
+class _WriterThread(threading.Thread):
+  """Performs the file writes of an HtmlReporter, in the order they were requested.
+
+  All writes requested since the thread last woke up are coalesced: each file is flushed once per
+  batch, and only the latest overwrite of each file in a batch is rendered.
+  """
+
+  # The maximum number of pending writes. Once this many are pending, requesting a write blocks.
+  _MAX_PENDING = 10000
+
+  # A sentinel that requests the thread to exit once all prior writes are done.
+  _STOP = object()
+
+  def __init__(self, reporter):
+    super(_WriterThread, self).__init__(name='html-report-writer')
+    self.daemon = True
+    self._reporter = reporter
+    self._queue = queue.Queue(maxsize=self._MAX_PENDING)
+
+  def put(self, *op):
+    self._queue.put(op)
+
+  def stop(self):
+    """Waits for all pending writes to be done, and stops the thread."""
+    self._queue.put((self._STOP,))
+    self.join()
+
+  def run(self):
+    stopped = False
+    while not stopped:
+      # Block for the first write of a batch, then take whatever else is already pending.
+      batch = [self._queue.get()]
+      while len(batch) < self._MAX_PENDING:
+        try:
+          batch.append(self._queue.get_nowait())
+        except queue.Empty:
+          break
+      stopped = batch[-1][0] is self._STOP
+      try:
+        self._reporter._write_batch([op for op in batch if op[0] is not self._STOP])
+      except Exception:
+        # The writer must keep draining the queue, or requesters could block forever.
+        logger.exception('Failed to write to the html report.')
+
+
 class HtmlReporter(Reporter):
   """HTML reporting to files.
 
@@ -37,6 +87,9 @@ class HtmlReporter(Reporter):
   significantly faster, and profiles showed that the difference was non-trivial in short
   pants runs.
 
+  All file writes are made by a single background thread, so that reporting does not block the
+  threads that do the work being reported on.
+
   TODO: The entire HTML reporting system, and the pants server that backs it, should be
   rewritten to use some modern webapp framework, instead of this combination of server-side
   ad-hoc templates and client-side spaghetti code.
@@ -71,6 +124,9 @@ class HtmlReporter(Reporter):
     # which can noticeably slow down short pants runs with many workunits.
     self._last_overwrite_time = {}
 
+    # Performs all of the writes to the files above.
+    self._writer = None
+
   def report_path(self):
     """The path to the main report file."""
     return os.path.join(self._html_dir, 'build.html')
@@ -79,9 +135,13 @@ class HtmlReporter(Reporter):
     """Implementation of Reporter callback."""
     safe_mkdir(os.path.dirname(self._html_dir))
     self._report_file = open(self.report_path(), 'w')
+    self._writer = _WriterThread(self)
+    self._writer.start()
 
   def close(self):
     """Implementation of Reporter callback."""
+    # Drain all pending writes before closing the files they write to.
+    self._writer.stop()
     self._report_file.close()
     # Make sure everything's closed.
     for files in self._output_files.values():
@@ -304,22 +364,11 @@ class HtmlReporter(Reporter):
                     lambda: render_cache_stats(self.run_tracker.artifact_cache_stats),
                     force=force_overwrite)
 
-    for f in self._output_files[workunit.id].values():
-      f.close()
+    self._writer.put('close_outputs', workunit.id)
 
   def handle_output(self, workunit, label, s):
     """Implementation of Reporter callback."""
-    if os.path.exists(self._html_dir):  # Make sure we're not immediately after a clean-all.
-      path = os.path.join(self._html_dir, '{}.{}'.format(workunit.id, label))
-      output_files = self._output_files[workunit.id]
-      if path not in output_files:
-        f = open(path, 'w')
-        output_files[path] = f
-      else:
-        f = output_files[path]
-      f.write(self._htmlify_text(s).encode('utf-8'))
-      # We must flush in the same thread as the write.
-      f.flush()
+    self._writer.put('output', workunit.id, label, s)
 
   _log_level_css_map = {
     Report.FATAL: 'fatal',
@@ -430,9 +479,7 @@ class HtmlReporter(Reporter):
 
   def _emit(self, s):
     """Append content to the main report file."""
-    if os.path.exists(self._html_dir):  # Make sure we're not immediately after a clean-all.
-      self._report_file.write(s)
-      self._report_file.flush()  # We must flush in the same thread as the write.
+    self._writer.put('emit', s)
 
   def _overwrite(self, filename, func, force=False):
     """Overwrite a file with the specified contents.
@@ -440,17 +487,74 @@ class HtmlReporter(Reporter):
     Write times are tracked, too-frequent overwrites are skipped, for performance reasons.
 
     :param filename: The path under the html dir to write to.
-    :param func: A no-arg function that returns the contents to write.
+    :param func: A no-arg function that returns the contents to write. It is called on the writer
+                 thread, and only if the overwrite is not skipped.
     :param force: Whether to force a write now, regardless of the last overwrite time.
     """
+    self._writer.put('overwrite', filename, func, force)
+
+  def _write_batch(self, batch):
+    """Performs a batch of writes on the writer thread.
+
+    Each write is attempted independently, so that a failed write does not drop the rest of the
+    batch (and in particular, the closing of output files).
+    """
+    if not os.path.exists(self._html_dir):  # Make sure we're not immediately after a clean-all.
+      return
+
+    dirty_files = set()
+    overwrites = OrderedDict()  # filename -> (func, force)
+    for op in batch:
+      try:
+        self._write_op(op, dirty_files, overwrites)
+      except Exception:
+        logger.exception('Failed to {} to the html report.'.format(op[0]))
+
+    # We must flush in the same thread as the write.
+    for f in dirty_files:
+      try:
+        f.flush()
+      except Exception:
+        logger.exception('Failed to flush {} in the html report.'.format(f.name))
+
     now = int(time.time() * 1000)
-    last_overwrite_time = self._last_overwrite_time.get(filename) or now
-    # Overwrite only once per second.
-    if (now - last_overwrite_time >= 1000) or force:
-      if os.path.exists(self._html_dir):  # Make sure we're not immediately after a clean-all.
-        with open(os.path.join(self._html_dir, filename), 'w') as f:
-          f.write(func())
-      self._last_overwrite_time[filename] = now
+    for filename, (func, force) in overwrites.items():
+      last_overwrite_time = self._last_overwrite_time.get(filename) or now
+      # Overwrite only once per second.
+      if (now - last_overwrite_time >= 1000) or force:
+        try:
+          with open(os.path.join(self._html_dir, filename), 'w') as f:
+            f.write(func())
+        except Exception:
+          logger.exception('Failed to overwrite {} in the html report.'.format(filename))
+        self._last_overwrite_time[filename] = now
+
+  def _write_op(self, op, dirty_files, overwrites):
+    kind = op[0]
+    if kind == 'emit':
+      self._report_file.write(op[1])
+      dirty_files.add(self._report_file)
+    elif kind == 'output':
+      _, workunit_id, label, s = op
+      path = os.path.join(self._html_dir, '{}.{}'.format(workunit_id, label))
+      output_files = self._output_files[workunit_id]
+      f = output_files.get(path)
+      if f is None:
+        f = open(path, 'w')
+        output_files[path] = f
+      f.write(self._htmlify_text(s).encode('utf-8'))
+      dirty_files.add(f)
+    elif kind == 'close_outputs':
+      for f in self._output_files[op[1]].values():
+        dirty_files.discard(f)
+        try:
+          f.close()
+        except Exception:
+          logger.exception('Failed to close {} in the html report.'.format(f.name))
+    elif kind == 'overwrite':
+      _, filename, func, force = op
+      _, previously_forced = overwrites.pop(filename, (None, False))
+      overwrites[filename] = (func, force or previously_forced)
 
   def _htmlify_text(self, s):
     """Make text HTML-friendly."""
@@ -18,6 +18,7 @@ from pants.reporting.quiet_reporter import QuietReporter
 from pants.reporting.report import Report
 from pants.reporting.reporter import ReporterDestination
 from pants.reporting.reporting_server import ReportingServerManager
+from pants.reporting.trace_reporter import TraceReporter
 from pants.subsystem.subsystem import Subsystem
 from pants.util.dirutil import relative_symlink, safe_mkdir
 
@@ -35,6 +36,10 @@ class Reporting(Subsystem):
              help='Write reports to this dir.')
     register('--template-dir', advanced=True, metavar='<dir>', default=None,
              help='Find templates for rendering in this dir.')
+    register('--chrome-trace', type=bool,
+             help='Write the timeline of all workunits in the run to trace.json in the reports dir '
+                  'for the run, in the Chrome trace-event format. Load it in chrome://tracing or '
+                  'another trace viewer.')
     register('--console-label-format', advanced=True, type=dict,
              default=PlainTextReporter.LABEL_FORMATTING,
              help='Controls the printing of workunit labels to the console.  Workunit types are '
@@ -81,6 +86,12 @@ class Reporting(Subsystem):
     html_reporter = HtmlReporter(run_tracker, html_reporter_settings)
     report.add_reporter('html', html_reporter)
 
+    if self.get_options().chrome_trace:
+      trace_reporter_settings = TraceReporter.Settings(log_level=Report.INFO,
+                                                       trace_file=os.path.join(run_dir, 'trace.json'))
+      report.add_reporter('trace', TraceReporter(run_tracker, trace_reporter_settings))
+      run_tracker.run_info.add_info('chrome_trace', trace_reporter_settings.trace_file)
+
     # Add some useful RunInfo.
     run_tracker.run_info.add_info('default_report', html_reporter.report_path())
     port = ReportingServerManager().socket
@@ -0,0 +1,106 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+from pants.base.workunit import WorkUnit, WorkUnitLabel
+from pants.reporting.reporter import Reporter
+from pants.util.dirutil import safe_file_dump
+
+
+class TraceReporter(Reporter):
+  """Writes every workunit as an event in the Chrome trace-event JSON format.
+
+  The resulting file can be loaded into a trace viewer (such as chrome://tracing or Perfetto) to
+  see when each workunit ran, on which thread, and so where a run lacked parallelism.
+
+  Each workunit is recorded against the thread that started it, along with its labels, outcome
+  and command line. Task workunits are additionally annotated with the number of artifact cache
+  hits and misses that occurred while they ran.
+  """
+
+  # Reporting settings.
+  #   trace_file: The path to write the trace to.
+  Settings = namedtuple('Settings', Reporter.Settings._fields + ('trace_file',))
+
+  def __init__(self, run_tracker, settings):
+    super(TraceReporter, self).__init__(run_tracker, settings)
+    self._pid = os.getpid()
+    # Chrome expects small integer thread ids, so threads are numbered in order of appearance.
+    self._tids = {}
+    self._thread_names = {}
+    # workunit id -> (tid, cache hits, cache misses) at the start of the workunit.
+    self._started = {}
+    self._events = []
+
+  def _tid(self):
+    thread = threading.current_thread()
+    tid = self._tids.get(thread.ident)
+    if tid is None:
+      tid = len(self._tids)
+      self._tids[thread.ident] = tid
+      self._thread_names[tid] = thread.name
+    return tid
+
+  def _cache_counts(self):
+    stats = self.run_tracker.artifact_cache_stats
+    if stats is None:
+      return 0, 0
+    stats = stats.stats_per_cache.values()
+    return sum(len(s.hit_targets) for s in stats), sum(len(s.miss_targets) for s in stats)
+
+  def start_workunit(self, workunit):
+    """Implementation of Reporter callback."""
+    hits, misses = self._cache_counts()
+    self._started[workunit.id] = (self._tid(), hits, misses)
+
+  def end_workunit(self, workunit):
+    """Implementation of Reporter callback."""
+    started = self._started.pop(workunit.id, None)
+    if started is None:
+      return
+    tid, start_hits, start_misses = started
+
+    args = {
+      'path': workunit.path(),
+      'outcome': WorkUnit.outcome_string(workunit.outcome()),
+    }
+    if workunit.labels:
+      args['labels'] = sorted(workunit.labels)
+    if workunit.cmd:
+      args['cmd'] = workunit.cmd
+    if workunit.has_label(WorkUnitLabel.TASK):
+      hits, misses = self._cache_counts()
+      args['cache_hits'] = hits - start_hits
+      args['cache_misses'] = misses - start_misses
+
+    start_us = int(workunit.start_time * 1000000)
+    self._events.append({
+      'name': workunit.name,
+      'cat': ','.join(sorted(workunit.labels)) or 'workunit',
+      'ph': 'X',
+      'ts': start_us,
+      'dur': max(0, int(time.time() * 1000000) - start_us),
+      'pid': self._pid,
+      'tid': tid,
+      'args': args,
+    })
+
+  def close(self):
+    """Implementation of Reporter callback."""
+    metadata = [{'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                 'args': {'name': name}}
+                for tid, name in sorted(self._thread_names.items())]
+    trace = {
+      'traceEvents': metadata + self._events,
+      'displayTimeUnit': 'ms',
+    }
+    safe_file_dump(self.settings.trace_file, json.dumps(trace))
@@ -5,8 +5,11 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import functools
+import itertools
 import logging
 import os
+import shutil
 from abc import abstractmethod
 from collections import OrderedDict
 
@@ -14,12 +17,15 @@ from twitter.common.collections import OrderedSet
 
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import TaskError
+from pants.base.execution_graph import ExecutionFailure, ExecutionGraph, Job
+from pants.base.worker_pool import WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.address import Address
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.source.wrapped_globs import EagerFilesetWithSpec, FilesetRelPathWrapper
 from pants.task.task import Task
-from pants.util.dirutil import fast_relpath, safe_delete, safe_walk
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import fast_relpath, safe_delete, safe_mkdir_for, safe_walk
 
 
 logger = logging.getLogger(__name__)
@@ -38,6 +44,11 @@ class SimpleCodegenTask(Task):
   # E.g., JavaThriftLibrary. If not provided, the subclass must implement is_gentarget.
   gentarget_type = None
 
+  # Concurrent invocations can't share a nailgun server, which runs each tool main in one JVM, so
+  # generators that run in one (see `NailgunTask`) use a single worker. Subclasses which run their
+  # tools in subprocesses when there are several workers may override to use them all.
+  runs_concurrent_workers_in_subprocesses = False
+
   def __init__(self, context, workdir):
     """
     Add pass-thru Task Constructor for public API visibility.
@@ -65,6 +76,15 @@ class SimpleCodegenTask(Task):
                    'allowed, the logic of find_sources will associate generated sources with '
                    'the least-dependent targets that generate them.',
               advanced=True)
+    register('--worker-count', type=int, default=1, advanced=True,
+             help='The number of concurrent workers to generate code with. Targets are generated '
+                  'in dependency order, and synthetic targets are injected in the same order as '
+                  'when generating serially. The default of 1 generates targets one at a time.')
+    register('--max-batch-size', type=int, default=1, advanced=True,
+             help='For generators that support it, the maximum number of targets to generate in '
+                  'a single invocation of the generator. Only targets with compatible options are '
+                  'batched together, and generated sources are still cached per target. The '
+                  'default of 1 disables batching.')
 
   @classmethod
   def get_fingerprint_strategy(cls):
@@ -159,6 +179,36 @@ class SimpleCodegenTask(Task):
     else:
       raise NotImplementedError
 
+  def codegen_batch_key(self, target):
+    """Returns a key for the targets that may be generated together with the given target.
+
+    Subclasses whose generator can generate code for many targets in a single invocation may
+    override this method, along with `execute_codegen_batch`, to opt in to batching. Targets with
+    equal keys (for example, those with the same language and compiler options) may then be passed
+    to a single call to `execute_codegen_batch`: see the `--max-batch-size` option.
+
+    :API: public
+
+    :param Target target: The target to be generated.
+    :return: A hashable key, or None if the target must be generated alone.
+    """
+    return None
+
+  def execute_codegen_batch(self, targets, batch_workdir):
+    """Generate code for the given targets in a single invocation of the generator.
+
+    Only called for targets which share a `codegen_batch_key`.
+
+    :API: public
+
+    :param list targets: The targets to generate code for.
+    :param string batch_workdir: A clean directory into which to generate code.
+    :return: A dict from each target to the paths (relative to `batch_workdir`) of the sources
+             generated for it. These are moved into the target's own workdir, so that the results
+             for each target are cached separately.
+    """
+    raise NotImplementedError
+
   def ignore_dup(self, tgt1, tgt2, rel_src):
     """Subclasses can override to omit a specific generated source file from dup checking."""
     return False
@@ -213,23 +263,148 @@ class SimpleCodegenTask(Task):
                           fingerprint_strategy=self.get_fingerprint_strategy()) as invalidation_check:
 
       with self.context.new_workunit(name='execute', labels=[WorkUnitLabel.MULTITOOL]):
-        for vt in invalidation_check.all_vts:
-          # Build the target and handle duplicate sources.
-          if not vt.valid:
-            if self._do_validate_sources_present(vt.target):
-              self.execute_codegen(vt.target, vt.results_dir)
-              self._handle_duplicate_sources(vt.target, vt.results_dir)
-            vt.update()
-
-          self._inject_synthetic_target(
-            vt.target,
-            vt.results_dir,
-            vt.cache_key,
-          )
+        if self.get_options().worker_count > 1 or self.get_options().max_batch_size > 1:
+          self._execute_scheduled(invalidation_check.all_vts)
+        else:
+          for vt in invalidation_check.all_vts:
+            self._execute_and_inject(vt)
         self._mark_transitive_invalidation_hashes_dirty(
           vt.target.address for vt in invalidation_check.all_vts
         )
 
+  def _execute_and_inject(self, vt):
+    generated = not vt.valid and self._do_validate_sources_present(vt.target)
+    if generated:
+      self.execute_codegen(vt.target, vt.results_dir)
+    self._finalize_and_inject(vt, generated)
+
+  def _finalize_and_inject(self, vt, generated):
+    # Handle duplicate sources for a built target, and then inject its synthetic target.
+    if generated:
+      self._handle_duplicate_sources(vt.target, vt.results_dir)
+    if not vt.valid:
+      vt.update()
+    self._inject_synthetic_target(
+      vt.target,
+      vt.results_dir,
+      vt.cache_key,
+    )
+
+  def _execute_scheduled(self, all_vts):
+    """Generates code for the invalid targets of the given vts on a pool of workers.
+
+    Each target is generated once the targets it depends on have been generated, optionally in
+    batches (see `codegen_batch_key`). Duplicate source handling and synthetic target injection
+    both read and mutate the build graph, so they happen on the main thread once generation
+    completes, in the (topological) order of `all_vts`: the results are thus the same as when
+    generating serially.
+
+    :param list all_vts: The VersionedTargets to generate code for, in topological order.
+    """
+    # Validate on the main thread, so that errors for missing sources are raised before any work is
+    # started, and in a deterministic order.
+    to_generate = OrderedDict((vt.target, vt) for vt in all_vts
+                              if not vt.valid and self._do_validate_sources_present(vt.target))
+    generated = set()
+
+    gen_dependencies = {}
+    for target in to_generate:
+      dependencies = set()
+      target.walk(lambda t: dependencies.add(t) if t in to_generate else None)
+      dependencies.discard(target)
+      gen_dependencies[target] = dependencies
+
+    units = self._codegen_units(to_generate, gen_dependencies)
+    unit_keys = {}
+    for unit in units:
+      key = unit[0].target.address.spec
+      unit_keys.update((vt.target, key if len(unit) == 1 else 'batch({})'.format(key))
+                       for vt in unit)
+
+    def job_for(unit):
+      dependencies = set(unit_keys[d] for vt in unit for d in gen_dependencies[vt.target])
+      key = unit_keys[unit[0].target]
+      dependencies.discard(key)
+      if len(unit) == 1:
+        fn = functools.partial(self.execute_codegen, unit[0].target, unit[0].results_dir)
+      else:
+        fn = functools.partial(self._execute_codegen_batch, unit)
+      return Job(key=key,
+                 fn=fn,
+                 dependencies=sorted(dependencies),
+                 on_success=functools.partial(generated.update, [vt.target for vt in unit]))
+
+    def finalize(vts):
+      for vt in vts:
+        self._finalize_and_inject(vt, generated=vt.target in generated)
+
+    if to_generate:
+      with self.context.new_workunit('codegen-pool-bootstrap') as workunit:
+        worker_pool = WorkerPool(workunit.parent,
+                                 self.context.run_tracker,
+                                 self._worker_count())
+      try:
+        ExecutionGraph([job_for(unit) for unit in units]).execute(worker_pool, self.context.log)
+      except ExecutionFailure as e:
+        # Keep the results for the targets that were generated before the first failure, so that
+        # they need not be generated again.
+        finalize(itertools.takewhile(lambda vt: vt.target not in to_generate or
+                                                vt.target in generated,
+                                     all_vts))
+        raise TaskError('Code generation failure: {}'.format(e))
+      finally:
+        worker_pool.shutdown()
+    finalize(all_vts)
+
+  def _worker_count(self):
+    worker_count = self.get_options().worker_count
+    if (worker_count > 1 and self.get_options().get('use_nailgun') and
+        not self.runs_concurrent_workers_in_subprocesses):
+      self.context.log.warn('{} runs its generator in nailgun, so is using 1 worker rather than {}. '
+                            'Pass --no-use-nailgun to use them all.'
+                            .format(type(self).__name__, worker_count))
+      return 1
+    return worker_count
+
+  def _codegen_units(self, to_generate, gen_dependencies):
+    """Partitions the vts to generate into lists of vts to generate in one invocation.
+
+    Targets are only batched with targets at the same depth in the graph of targets to generate,
+    which guarantees that the dependencies between batches are acyclic.
+    """
+    max_batch_size = self.get_options().max_batch_size
+    depths = {}
+    batches = OrderedDict()
+    units = []
+    for target, vt in to_generate.items():
+      depths[target] = 1 + max([depths[d] for d in gen_dependencies[target]] or [-1])
+      batch_key = self.codegen_batch_key(target) if max_batch_size > 1 else None
+      if batch_key is None:
+        units.append([vt])
+        continue
+      batch = batches.setdefault((batch_key, depths[target]), [])
+      if len(batch) == max_batch_size:
+        units.append(batch)
+        batch = batches[(batch_key, depths[target])] = []
+      batch.append(vt)
+    units.extend(batches.values())
+    return units
+
+  def _execute_codegen_batch(self, vts):
+    with temporary_dir(root_dir=self.workdir) as batch_workdir:
+      generated = self.execute_codegen_batch([vt.target for vt in vts], batch_workdir)
+      moved = {}
+      for vt in vts:
+        for path in generated.get(vt.target, ()):
+          dest = os.path.join(vt.results_dir, path)
+          safe_mkdir_for(dest)
+          if path in moved:
+            # The source was generated for more than one target.
+            shutil.copy2(moved[path], dest)
+          else:
+            shutil.move(os.path.join(batch_workdir, path), dest)
+            moved[path] = dest
+
   def _mark_transitive_invalidation_hashes_dirty(self, addresses):
     self.context.build_graph.walk_transitive_dependee_graph(
       addresses,
@@ -111,6 +111,18 @@ class TaskBase(SubsystemClientMixin, Optionable, AbstractClass):
     """
     return False
 
+  @classmethod
+  def requires_other_goals(cls):
+    """Whether running this task may require goals other than its own to be loaded.
+
+    Tasks registered lazily (see `TaskRegistrar`) are only loaded when their goal is requested.
+    Tasks that require products from other goals, or that inspect all goals or their options,
+    need all goals to be loaded. By default this is assumed of any task that overrides `prepare`.
+
+    :API: public
+    """
+    return cls.prepare.__func__ is not TaskBase.prepare.__func__
+
   @classmethod
   def _scoped_options(cls, options):
     return options[cls.options_scope]
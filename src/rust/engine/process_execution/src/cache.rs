@@ -0,0 +1,649 @@
+use std::collections::BinaryHeap;
+use std::io::{self, Read};
+use std::path::Path;
+use std::sync::Arc;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::time;
+
+use boxfuture::{BoxFuture, Boxable};
+use byteorder::{ByteOrder, LittleEndian, ReadBytesExt, WriteBytesExt};
+use bytes::Bytes;
+use digest::{Digest as DigestTrait, FixedOutput};
+use fs::{self, ResettablePool, Store};
+use futures::{future, Future};
+use hashing::{Digest, Fingerprint};
+use lmdb::{Database, DatabaseFlags, Environment, Transaction, WriteFlags, NO_SYNC, NO_TLS};
+use lmdb::Error::{MapFull, NotFound};
+use resettable::Resettable;
+use sha2::Sha256;
+
+use super::{ExecuteProcessRequest, ExecuteProcessResult};
+
+// Mixed into every key, and bumped whenever the encoding of keys or values changes, so that entries
+// written by an older version are never decoded.
+const CACHE_VERSION: u8 = 2;
+
+// The map size is a bound on the size of the database, rather than an amount of space which is
+// allocated up front.
+const MAX_CACHE_SIZE_BYTES: usize = 1024 * 1024 * 1024;
+
+// The size which garbage collection shrinks the database to. If the database fills up between
+// collections, it is shrunk to half of this before the write is retried.
+pub const CACHE_GC_TARGET_BYTES: usize = 256 * 1024 * 1024;
+
+///
+/// A CommandRunner wrapper that caches the results of successful process executions in a local
+/// LMDB database, keyed by a digest of the entire ExecuteProcessRequest (except its description).
+///
+/// Because the database outlives any one Scheduler, a request which was already run on this
+/// machine is served from the cache rather than run again, even in a new pants run. Only the
+/// result is cached: its output directory is expected to be in the Store, and entries whose output
+/// directory is no longer in the Store are treated as misses.
+///
+/// Each entry records when it was written, and `garbage_collect` removes the oldest entries first.
+///
+#[derive(Clone)]
+pub struct CommandRunner {
+  inner: Arc<Box<super::CommandRunner>>,
+  store: Store,
+  pool: Arc<ResettablePool>,
+  db: Resettable<Result<Arc<(Environment, Database)>, String>>,
+  hits: Arc<AtomicUsize>,
+  misses: Arc<AtomicUsize>,
+}
+
+impl CommandRunner {
+  pub fn new<P: AsRef<Path>>(
+    inner: Box<super::CommandRunner>,
+    path: P,
+    store: Store,
+    pool: Arc<ResettablePool>,
+  ) -> CommandRunner {
+    let root = path.as_ref().to_owned();
+    CommandRunner {
+      inner: Arc::new(inner),
+      store: store,
+      pool: pool,
+      db: Resettable::new(move || Self::open(&root).map(|db| Arc::new(db))),
+      hits: Arc::new(AtomicUsize::new(0)),
+      misses: Arc::new(AtomicUsize::new(0)),
+    }
+  }
+
+  fn open(root: &Path) -> Result<(Environment, Database), String> {
+    fs::safe_create_dir_all_ioerror(root).map_err(|e| {
+      format!(
+        "Error making directory for process execution cache at {:?}: {:?}",
+        root, e
+      )
+    })?;
+    // See the Store's ShardedLmdb for the rationale for these flags. As with the Store, losing
+    // recent writes on a system crash only costs us cache misses.
+    let env = Environment::new()
+      .set_flags(NO_SYNC | NO_TLS)
+      .set_map_size(MAX_CACHE_SIZE_BYTES)
+      .open(root)
+      .map_err(|e| {
+        format!(
+          "Error making env for process execution cache at {:?}: {}",
+          root, e
+        )
+      })?;
+    let database = env.create_db(None, DatabaseFlags::empty()).map_err(|e| {
+      format!(
+        "Error creating/opening process execution cache database at {:?}: {}",
+        root, e
+      )
+    })?;
+    Ok((env, database))
+  }
+
+  ///
+  /// The number of requests which were served from the cache.
+  ///
+  pub fn hits(&self) -> usize {
+    self.hits.load(Ordering::SeqCst)
+  }
+
+  ///
+  /// The number of requests which were not in the cache, and so were run by the inner runner.
+  ///
+  pub fn misses(&self) -> usize {
+    self.misses.load(Ordering::SeqCst)
+  }
+
+  fn lookup(&self, key: Fingerprint) -> BoxFuture<Option<ExecuteProcessResult>, String> {
+    let db = self.db.clone();
+    let store = self.store.clone();
+    self
+      .pool
+      .spawn_fn(move || {
+        let db = db.get()?;
+        let (ref env, database) = *db;
+        let txn = env
+          .begin_ro_txn()
+          .map_err(|err| format!("Failed to begin read transaction: {}", err))?;
+        match txn.get(database, &key) {
+          Ok(bytes) => decode_result(bytes).map(Some),
+          Err(NotFound) => Ok(None),
+          Err(err) => Err(format!(
+            "Error loading process execution cache entry {}: {}",
+            key, err
+          )),
+        }
+      })
+      .and_then(move |maybe_result| match maybe_result {
+        Some(result) => store
+          .expand_directory(result.output_directory)
+          .then(move |expanded| Ok::<_, String>(expanded.ok().map(|_| result)))
+          .to_boxed(),
+        None => future::ok(None).to_boxed(),
+      })
+      .to_boxed()
+  }
+
+  fn record(&self, key: Fingerprint, result: &ExecuteProcessResult) -> BoxFuture<(), String> {
+    let db = self.db.clone();
+    let bytes = encode_result(result, now_unix_timestamp());
+    self
+      .pool
+      .spawn_fn(move || {
+        let db = db.get()?;
+        let (ref env, database) = *db;
+        let put = || {
+          env.begin_rw_txn().and_then(|mut txn| {
+            txn.put(database, &key, &bytes, WriteFlags::empty())?;
+            txn.commit()
+          })
+        };
+        let stored = match put() {
+          Err(MapFull) => {
+            // Make room by dropping the oldest entries, rather than failing every later write.
+            shrink(env, database, CACHE_GC_TARGET_BYTES / 2)?;
+            put()
+          }
+          res => res,
+        };
+        stored.map_err(|err| {
+          format!(
+            "Error storing process execution cache entry {}: {}",
+            key, err
+          )
+        })
+      })
+      .to_boxed()
+  }
+
+  ///
+  /// Removes the least recently recorded entries until the entries in the cache total no more than
+  /// `target_bytes`.
+  ///
+  pub fn garbage_collect(&self, target_bytes: usize) -> Result<(), String> {
+    let db = self.db.get()?;
+    let (ref env, database) = *db;
+    let size = shrink(env, database, target_bytes)?;
+    if size > target_bytes {
+      return Err(format!(
+        "Process execution cache garbage collection attempted to target {} bytes but could only \
+         shrink to {} bytes",
+        target_bytes, size
+      ));
+    }
+    Ok(())
+  }
+
+  fn run_and_record(
+    &self,
+    key: Fingerprint,
+    req: ExecuteProcessRequest,
+  ) -> BoxFuture<ExecuteProcessResult, String> {
+    self.misses.fetch_add(1, Ordering::SeqCst);
+    let runner = self.clone();
+    self
+      .inner
+      .run(req)
+      .and_then(move |result| {
+        // Failures may be caused by the environment rather than the request, so are not cached.
+        if result.exit_code != 0 {
+          return future::ok(result).to_boxed();
+        }
+        runner
+          .record(key, &result)
+          .then(move |recorded| {
+            if let Err(err) = recorded {
+              warn!("Failed to cache process execution result: {}", err);
+            }
+            Ok::<_, String>(result)
+          })
+          .to_boxed()
+      })
+      .to_boxed()
+  }
+}
+
+impl super::CommandRunner for CommandRunner {
+  fn run(&self, req: ExecuteProcessRequest) -> BoxFuture<ExecuteProcessResult, String> {
+    let key = fingerprint_request(&req);
+    let runner = self.clone();
+    self
+      .lookup(key)
+      .then(move |lookup_result| match lookup_result {
+        Ok(Some(result)) => {
+          runner.hits.fetch_add(1, Ordering::SeqCst);
+          future::ok(result).to_boxed()
+        }
+        Ok(None) => runner.run_and_record(key, req),
+        Err(err) => {
+          warn!("Failed to read process execution cache: {}", err);
+          runner.run_and_record(key, req)
+        }
+      })
+      .to_boxed()
+  }
+
+  ///
+  /// LMDB Environments aren't safe to be re-used after forking (see `Store::reset_prefork`), so the
+  /// database is dropped before forking, and re-opened on next use.
+  ///
+  fn reset_prefork(&self) {
+    self.db.reset();
+    self.inner.reset_prefork();
+  }
+}
+
+#[derive(Eq, PartialEq, Ord, PartialOrd)]
+struct AgedEntry {
+  // recorded_seconds_ago must be the first field for the Ord implementation.
+  recorded_seconds_ago: u64,
+  key: Vec<u8>,
+  size_bytes: usize,
+}
+
+///
+/// Deletes the oldest entries in the database until they total no more than `target_bytes`, and
+/// returns the resulting total.
+///
+fn shrink(env: &Environment, database: Database, target_bytes: usize) -> Result<usize, String> {
+  let now = now_unix_timestamp();
+  let mut used_bytes: usize = 0;
+  let mut entries_by_age = BinaryHeap::new();
+  {
+    let txn = env
+      .begin_ro_txn()
+      .map_err(|err| format!("Error beginning transaction to garbage collect: {}", err))?;
+    let mut cursor = txn
+      .open_ro_cursor(database)
+      .map_err(|err| format!("Failed to open lmdb read cursor: {}", err))?;
+    for (key, bytes) in cursor.iter() {
+      used_bytes += key.len() + bytes.len();
+      // Entries which cannot be decoded are treated as the oldest, so that they are collected first.
+      let recorded_seconds_ago = decode_recorded_at(bytes)
+        .map(|recorded_at| now.saturating_sub(recorded_at))
+        .unwrap_or(u64::max_value());
+      entries_by_age.push(AgedEntry {
+        recorded_seconds_ago: recorded_seconds_ago,
+        key: key.to_vec(),
+        size_bytes: key.len() + bytes.len(),
+      });
+    }
+  }
+  if used_bytes <= target_bytes {
+    return Ok(used_bytes);
+  }
+
+  env
+    .begin_rw_txn()
+    .and_then(|mut txn| {
+      while used_bytes > target_bytes {
+        match entries_by_age.pop() {
+          Some(entry) => {
+            txn
+              .del(database, &entry.key, None)
+              .or_else(|err| match err {
+                NotFound => Ok(()),
+                err => Err(err),
+              })?;
+            used_bytes -= entry.size_bytes;
+          }
+          None => break,
+        }
+      }
+      txn.commit()
+    })
+    .map_err(|err| format!("Error garbage collecting process execution cache: {}", err))?;
+  Ok(used_bytes)
+}
+
+fn now_unix_timestamp() -> u64 {
+  time::SystemTime::now()
+    .duration_since(time::UNIX_EPOCH)
+    .map(|d| d.as_secs())
+    .unwrap_or(0)
+}
+
+///
+/// Computes the cache key for a request: every field which may affect the result is hashed, each
+/// one length-prefixed so that distinct requests cannot produce the same stream of bytes.
+///
+fn fingerprint_request(req: &ExecuteProcessRequest) -> Fingerprint {
+  let mut hasher = Sha256::default();
+  hasher.input(&[CACHE_VERSION]);
+
+  hash_u64(&mut hasher, req.argv.len() as u64);
+  for arg in &req.argv {
+    hash_bytes(&mut hasher, arg.as_bytes());
+  }
+
+  hash_u64(&mut hasher, req.env.len() as u64);
+  for (name, value) in &req.env {
+    hash_bytes(&mut hasher, name.as_bytes());
+    hash_bytes(&mut hasher, value.as_bytes());
+  }
+
+  hasher.input(&req.input_files.0.as_bytes()[..]);
+  hash_u64(&mut hasher, req.input_files.1 as u64);
+
+  for paths in &[&req.output_files, &req.output_directories] {
+    hash_u64(&mut hasher, paths.len() as u64);
+    for path in paths.iter() {
+      hash_bytes(&mut hasher, path.to_string_lossy().as_bytes());
+    }
+  }
+
+  hash_u64(&mut hasher, req.timeout.as_secs());
+  hash_u64(&mut hasher, req.timeout.subsec_nanos() as u64);
+
+  Fingerprint::from_bytes_unsafe(hasher.fixed_result().as_slice())
+}
+
+fn hash_u64(hasher: &mut Sha256, n: u64) {
+  let mut buf = [0; 8];
+  LittleEndian::write_u64(&mut buf, n);
+  hasher.input(&buf);
+}
+
+fn hash_bytes(hasher: &mut Sha256, bytes: &[u8]) {
+  hash_u64(hasher, bytes.len() as u64);
+  hasher.input(bytes);
+}
+
+///
+/// Encodes a result as the unix timestamp at which it was recorded, its exit code, its output
+/// directory digest, then its length-prefixed stdout and stderr.
+///
+fn encode_result(result: &ExecuteProcessResult, recorded_at: u64) -> Vec<u8> {
+  let mut bytes = Vec::with_capacity(68 + result.stdout.len() + result.stderr.len());
+  // Writes to a Vec cannot fail.
+  bytes.write_u64::<LittleEndian>(recorded_at).unwrap();
+  bytes.write_i32::<LittleEndian>(result.exit_code).unwrap();
+  bytes.extend_from_slice(&result.output_directory.0.as_bytes()[..]);
+  bytes
+    .write_u64::<LittleEndian>(result.output_directory.1 as u64)
+    .unwrap();
+  for output in &[&result.stdout, &result.stderr] {
+    bytes.write_u64::<LittleEndian>(output.len() as u64).unwrap();
+    bytes.extend_from_slice(output);
+  }
+  bytes
+}
+
+fn decode_result(mut bytes: &[u8]) -> Result<ExecuteProcessResult, String> {
+  let len = bytes.len();
+  let corrupt = |err: io::Error| {
+    format!(
+      "LMDB corruption: Process execution cache entry of {} bytes was not valid: {}",
+      len, err
+    )
+  };
+
+  let _recorded_at = bytes.read_u64::<LittleEndian>().map_err(&corrupt)?;
+  let exit_code = bytes.read_i32::<LittleEndian>().map_err(&corrupt)?;
+  let mut fingerprint = [0; 32];
+  bytes.read_exact(&mut fingerprint).map_err(&corrupt)?;
+  let size = bytes.read_u64::<LittleEndian>().map_err(&corrupt)?;
+  let stdout = read_output(&mut bytes).map_err(&corrupt)?;
+  let stderr = read_output(&mut bytes).map_err(&corrupt)?;
+
+  Ok(ExecuteProcessResult {
+    stdout: stdout,
+    stderr: stderr,
+    exit_code: exit_code,
+    output_directory: Digest(Fingerprint::from_bytes_unsafe(&fingerprint), size as usize),
+  })
+}
+
+fn decode_recorded_at(mut bytes: &[u8]) -> io::Result<u64> {
+  bytes.read_u64::<LittleEndian>()
+}
+
+fn read_output<'a>(bytes: &mut &'a [u8]) -> io::Result<Bytes> {
+  let len = bytes.read_u64::<LittleEndian>()? as usize;
+  let remaining: &'a [u8] = *bytes;
+  if len > remaining.len() {
+    return Err(io::Error::new(
+      io::ErrorKind::UnexpectedEof,
+      "truncated process output",
+    ));
+  }
+  let (output, rest) = remaining.split_at(len);
+  *bytes = rest;
+  Ok(Bytes::from(output))
+}
+
+#[cfg(test)]
+mod tests {
+  use boxfuture::{BoxFuture, Boxable};
+  use bytes::Bytes;
+  use fs;
+  use futures::{future, Future};
+  use hashing::{Digest, Fingerprint};
+  use lmdb::{Transaction, WriteFlags};
+  use std::collections::{BTreeMap, BTreeSet};
+  use std::path::Path;
+  use std::sync::Arc;
+  use std::sync::atomic::{AtomicUsize, Ordering};
+  use std::time::Duration;
+  use super::{decode_result, encode_result, shrink, CommandRunner};
+  use super::super::{CommandRunner as CommandRunnerTrait, ExecuteProcessRequest,
+                     ExecuteProcessResult};
+  use tempfile::TempDir;
+  use testutil::owned_string_vec;
+
+  ///
+  /// A CommandRunner which counts the requests it runs, and always returns the same result.
+  ///
+  struct CountingCommandRunner {
+    result: ExecuteProcessResult,
+    runs: Arc<AtomicUsize>,
+  }
+
+  impl CommandRunnerTrait for CountingCommandRunner {
+    fn run(&self, _req: ExecuteProcessRequest) -> BoxFuture<ExecuteProcessResult, String> {
+      self.runs.fetch_add(1, Ordering::SeqCst);
+      future::ok(self.result.clone()).to_boxed()
+    }
+
+    fn reset_prefork(&self) {}
+  }
+
+  struct CacheDirs {
+    cache_dir: TempDir,
+    store_dir: TempDir,
+    runs: Arc<AtomicUsize>,
+  }
+
+  impl CacheDirs {
+    fn new() -> CacheDirs {
+      CacheDirs {
+        cache_dir: TempDir::new().unwrap(),
+        store_dir: TempDir::new().unwrap(),
+        runs: Arc::new(AtomicUsize::new(0)),
+      }
+    }
+
+    ///
+    /// Creates a fresh caching runner (as a new Scheduler would) over the same directories.
+    ///
+    fn runner(&self, result: ExecuteProcessResult) -> CommandRunner {
+      let pool = Arc::new(fs::ResettablePool::new("test-pool-".to_string()));
+      let store = fs::Store::local_only(self.store_dir.path(), pool.clone()).unwrap();
+      let inner = CountingCommandRunner {
+        result: result,
+        runs: self.runs.clone(),
+      };
+      CommandRunner::new(Box::new(inner), self.cache_dir.path(), store, pool)
+    }
+
+    fn runs(&self) -> usize {
+      self.runs.load(Ordering::SeqCst)
+    }
+  }
+
+  fn echo_request() -> ExecuteProcessRequest {
+    ExecuteProcessRequest {
+      argv: owned_string_vec(&["/bin/echo", "-n", "foo"]),
+      env: BTreeMap::new(),
+      input_files: fs::EMPTY_DIGEST,
+      output_files: BTreeSet::new(),
+      output_directories: BTreeSet::new(),
+      timeout: Duration::from_millis(1000),
+      description: "echo foo".to_string(),
+    }
+  }
+
+  fn echo_result(exit_code: i32) -> ExecuteProcessResult {
+    ExecuteProcessResult {
+      stdout: Bytes::from("foo"),
+      stderr: Bytes::from("some\nerrors"),
+      exit_code: exit_code,
+      output_directory: fs::EMPTY_DIGEST,
+    }
+  }
+
+  fn unknown_directory_digest() -> Digest {
+    Digest(
+      Fingerprint::from_hex_string(
+        "0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef",
+      ).unwrap(),
+      80,
+    )
+  }
+
+  #[test]
+  fn cached_across_runners() {
+    let dirs = CacheDirs::new();
+
+    {
+      let first = dirs.runner(echo_result(0));
+      assert_eq!(first.run(echo_request()).wait(), Ok(echo_result(0)));
+      assert_eq!((first.hits(), first.misses()), (0, 1));
+    }
+
+    let second = dirs.runner(echo_result(0));
+    assert_eq!(second.run(echo_request()).wait(), Ok(echo_result(0)));
+    assert_eq!((second.hits(), second.misses()), (1, 0));
+
+    assert_eq!(dirs.runs(), 1);
+  }
+
+  #[test]
+  fn different_requests_not_shared() {
+    let dirs = CacheDirs::new();
+    let runner = dirs.runner(echo_result(0));
+
+    let mut with_env = echo_request();
+    with_env.env.insert("FOO".to_string(), "bar".to_string());
+    let mut with_output = echo_request();
+    with_output.output_files.insert(Path::new("foo").to_owned());
+
+    for req in vec![echo_request(), with_env, with_output] {
+      runner.run(req).wait().unwrap();
+    }
+    assert_eq!(dirs.runs(), 3);
+
+    // The description is only for humans, so does not affect the key.
+    let mut redescribed = echo_request();
+    redescribed.description = "a different description".to_string();
+    runner.run(redescribed).wait().unwrap();
+    assert_eq!(dirs.runs(), 3);
+    assert_eq!((runner.hits(), runner.misses()), (1, 3));
+  }
+
+  #[test]
+  fn failures_not_cached() {
+    let dirs = CacheDirs::new();
+    for _ in 0..2 {
+      let runner = dirs.runner(echo_result(1));
+      assert_eq!(runner.run(echo_request()).wait(), Ok(echo_result(1)));
+    }
+    assert_eq!(dirs.runs(), 2);
+  }
+
+  #[test]
+  fn missing_output_directory_is_a_miss() {
+    let dirs = CacheDirs::new();
+    let mut result = echo_result(0);
+    result.output_directory = unknown_directory_digest();
+
+    for _ in 0..2 {
+      let runner = dirs.runner(result.clone());
+      assert_eq!(runner.run(echo_request()).wait(), Ok(result.clone()));
+      assert_eq!((runner.hits(), runner.misses()), (0, 1));
+    }
+    assert_eq!(dirs.runs(), 2);
+  }
+
+  #[test]
+  fn garbage_collect_everything() {
+    let dirs = CacheDirs::new();
+    let runner = dirs.runner(echo_result(0));
+    runner.run(echo_request()).wait().unwrap();
+    runner.garbage_collect(0).unwrap();
+    runner.run(echo_request()).wait().unwrap();
+    assert_eq!((runner.hits(), runner.misses()), (0, 2));
+    assert_eq!(dirs.runs(), 2);
+  }
+
+  #[test]
+  fn shrink_removes_oldest_first() {
+    let dirs = CacheDirs::new();
+    let runner = dirs.runner(echo_result(0));
+    let db = runner.db.get().unwrap();
+    let (ref env, database) = *db;
+
+    let old_key = [0; 32];
+    let new_key = [1; 32];
+    let old_bytes = encode_result(&echo_result(0), 1);
+    let new_bytes = encode_result(&echo_result(0), 2);
+    {
+      let mut txn = env.begin_rw_txn().unwrap();
+      txn
+        .put(database, &old_key, &old_bytes, WriteFlags::empty())
+        .unwrap();
+      txn
+        .put(database, &new_key, &new_bytes, WriteFlags::empty())
+        .unwrap();
+      txn.commit().unwrap();
+    }
+
+    let entry_size = new_key.len() + new_bytes.len();
+    assert_eq!(shrink(env, database, entry_size), Ok(entry_size));
+
+    let txn = env.begin_ro_txn().unwrap();
+    assert!(txn.get(database, &old_key).is_err());
+    assert_eq!(txn.get(database, &new_key), Ok(&new_bytes[..]));
+  }
+
+  #[test]
+  fn result_roundtrips() {
+    let mut result = echo_result(-3);
+    result.output_directory = unknown_directory_digest();
+    assert_eq!(decode_result(&encode_result(&result, 1234)), Ok(result));
+  }
+
+  #[test]
+  fn truncated_result_is_an_error() {
+    let bytes = encode_result(&echo_result(0), 1234);
+    assert!(decode_result(&bytes[..bytes.len() - 1]).is_err());
+  }
+}
@@ -2,6 +2,7 @@ extern crate async_semaphore;
 extern crate bazel_protos;
 #[macro_use]
 extern crate boxfuture;
+extern crate byteorder;
 extern crate bytes;
 extern crate digest;
 extern crate fs;
@@ -9,6 +10,7 @@ extern crate futures;
 extern crate futures_timer;
 extern crate grpcio;
 extern crate hashing;
+extern crate lmdb;
 #[macro_use]
 extern crate log;
 #[cfg(test)]
@@ -30,6 +32,7 @@ use std::sync::Arc;
 
 use async_semaphore::AsyncSemaphore;
 
+pub mod cache;
 pub mod local;
 pub mod remote;
 
@@ -37,7 +37,8 @@ pub struct Core {
   pub runtime: Resettable<Arc<Runtime>>,
   pub store: Store,
   pub vfs: PosixFS,
-  pub command_runner: BoundedCommandRunner,
+  pub command_runner: Box<CommandRunner>,
+  pub process_execution_cache: Option<process_execution::cache::CommandRunner>,
 }
 
 impl Core {
@@ -54,6 +55,7 @@ impl Core {
     remote_store_chunk_bytes: usize,
     remote_store_chunk_upload_timeout: Duration,
     process_execution_parallelism: usize,
+    process_execution_local_cache: bool,
   ) -> Core {
     let mut snapshots_dir = PathBuf::from(work_dir);
     snapshots_dir.push("snapshots");
@@ -63,10 +65,11 @@ impl Core {
       Arc::new(Runtime::new().unwrap_or_else(|e| panic!("Could not initialize Runtime: {:?}", e)))
     });
 
-    let store_path = match std::env::home_dir() {
-      Some(home_dir) => home_dir.join(".cache").join("pants").join("lmdb_store"),
+    let cache_dir = match std::env::home_dir() {
+      Some(home_dir) => home_dir.join(".cache").join("pants"),
       None => panic!("Could not find home dir"),
     };
+    let store_path = cache_dir.join("lmdb_store");
 
     let store = safe_create_dir_all_ioerror(&store_path)
       .map_err(|e| format!("Error making directory {:?}: {:?}", store_path, e))
@@ -97,8 +100,27 @@ impl Core {
         )),
       };
 
-    let command_runner =
-      BoundedCommandRunner::new(underlying_command_runner, process_execution_parallelism);
+    let bounded_command_runner: Box<CommandRunner> = Box::new(BoundedCommandRunner::new(
+      underlying_command_runner,
+      process_execution_parallelism,
+    ));
+
+    // The cache is consulted before acquiring one of the bounded slots, so that hits never wait on
+    // processes which are actually running.
+    let process_execution_cache = if process_execution_local_cache {
+      Some(process_execution::cache::CommandRunner::new(
+        bounded_command_runner,
+        cache_dir.join("lmdb_process_execution_cache"),
+        store.clone(),
+        fs_pool.clone(),
+      ))
+    } else {
+      None
+    };
+    let command_runner: Box<CommandRunner> = match process_execution_cache {
+      Some(ref cache) => Box::new(cache.clone()),
+      None => bounded_command_runner,
+    };
 
     let rule_graph = RuleGraph::new(&tasks, root_subject_types);
 
@@ -116,6 +138,7 @@ impl Core {
         panic!("Could not initialize VFS: {:?}", e);
       }),
       command_runner: command_runner,
+      process_execution_cache: process_execution_cache,
     }
   }
 
@@ -143,6 +143,11 @@ impl Scheduler {
     );
     m.insert("preceding_graph_size", session.preceding_graph_size as i64);
     m.insert("resulting_graph_size", self.core.graph.len() as i64);
+    // NB: Process execution cache counts are for the lifetime of the Scheduler, not the Session.
+    if let Some(ref cache) = self.core.process_execution_cache {
+      m.insert("process_execution_cache_hits", cache.hits() as i64);
+      m.insert("process_execution_cache_misses", cache.misses() as i64);
+    }
     m
   }
 
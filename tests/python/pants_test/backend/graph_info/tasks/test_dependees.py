@@ -15,9 +15,11 @@ from pants.backend.jvm.targets.scala_jar_dependency import ScalaJarDependency
 from pants.backend.python.targets.python_library import PythonLibrary
 from pants.backend.python.targets.python_tests import PythonTests
 from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.build_graph.remote_sources import RemoteSources
 from pants.build_graph.resources import Resources
 from pants.build_graph.target import Target
 from pants.java.jar.jar_dependency import JarDependency
+from pants.option.scope import GLOBAL_SCOPE
 from pants_test.task_test_base import ConsoleTaskTestBase
 
 
@@ -36,6 +38,7 @@ class BaseReverseDepmapTest(ConsoleTaskTestBase):
         'java_thrift_library': JavaThriftLibrary,
         'python_library': PythonLibrary,
         'python_tests': PythonTests,
+        'remote_sources': RemoteSources,
         'resources': Resources,
       },
       objects={
@@ -78,6 +81,15 @@ class BaseReverseDepmapTest(ConsoleTaskTestBase):
       )
     """))
 
+    # The dependency of a remote_sources target on its sources_target is implicit.
+    self.add_to_build_file('resources/a', dedent("""
+      remote_sources(
+        name='a_remote',
+        dest=resources,
+        sources_target=':a_resources',
+      )
+    """))
+
     self.add_to_build_file('src/java/a', dedent("""
       java_library(
         name='a_java',
@@ -276,6 +288,7 @@ class ReverseDepmapTest(BaseReverseDepmapTest):
 
   def test_resources_dependees(self):
     self.assert_console_output(
+      'resources/a:a_remote',
       'src/java/a:a_java',
        targets=[self.target('resources/a:a_resources')]
     )
@@ -287,3 +300,20 @@ class ReverseDepmapTest(BaseReverseDepmapTest):
       'overlaps:three',
       targets=[self.target('common/a')]
     )
+
+
+class IndexedReverseDepmapTest(ReverseDepmapTest):
+  """Runs the ReverseDepmapTest cases against a DependeeIndex rather than the BuildGraph."""
+
+  def setUp(self):
+    super(IndexedReverseDepmapTest, self).setUp()
+    self.set_options_for_scope(GLOBAL_SCOPE, dependee_index=True)
+
+  def execute_console_task(self, **kwargs):
+    kwargs.setdefault('scheduler', self.scheduler)
+    return super(IndexedReverseDepmapTest, self).execute_console_task(**kwargs)
+
+  def test_index_updated_on_change(self):
+    self.assert_console_output('overlaps:two', targets=[self.target('common/c')])
+    self.add_to_build_file('overlaps', "python_library(name='six', dependencies=['common/c'])\n")
+    self.assert_console_output('overlaps:six', 'overlaps:two', targets=[self.target('common/c')])
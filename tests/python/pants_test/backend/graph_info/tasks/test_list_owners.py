@@ -12,6 +12,7 @@ from pants.backend.graph_info.tasks.list_owners import ListOwners
 from pants.backend.python.targets.python_library import PythonLibrary
 from pants.base.exceptions import TaskError
 from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.option.scope import GLOBAL_SCOPE
 from pants_test.task_test_base import ConsoleTaskTestBase
 
 
@@ -113,3 +114,22 @@ class ListOwnersTest(ConsoleTaskTestBase):
       passthru_args=['a/a.txt', 'a/b.txt'],
       options={'output_format': 'json'}
     )
+
+
+class IndexedListOwnersTest(ListOwnersTest):
+  """Runs the ListOwnersTest cases against a SourceOwnerIndex rather than the BuildGraph."""
+
+  def setUp(self):
+    super(IndexedListOwnersTest, self).setUp()
+    self.set_options_for_scope(GLOBAL_SCOPE, owner_index=True)
+
+  def execute_console_task(self, **kwargs):
+    kwargs.setdefault('scheduler', self.scheduler)
+    return super(IndexedListOwnersTest, self).execute_console_task(**kwargs)
+
+  def test_build_file(self):
+    self.assert_console_output('a:b', 'a:c', 'a:h', passthru_args=['a/BUILD'])
+
+  def test_deleted_source(self):
+    self.add_to_build_file('a/c', "python_library(name='globbed', sources=globs('*.java'))\n")
+    self.assert_console_output('a/c:globbed', passthru_args=['a/c/Deleted.java'])
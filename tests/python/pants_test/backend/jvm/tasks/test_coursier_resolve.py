@@ -23,6 +23,7 @@ from pants.backend.jvm.tasks.coursier_resolve import (CoursierResolve,
 from pants.base.exceptions import TaskError
 from pants.java.jar.exclude import Exclude
 from pants.java.jar.jar_dependency import JarDependency
+from pants.java.jar.jar_dependency_utils import M2Coordinate
 from pants.task.task import Task
 from pants.util.contextutil import temporary_dir, temporary_file_path
 from pants_test.jvm.jvm_tool_task_test_base import JvmToolTaskTestBase
@@ -216,6 +217,49 @@ class CoursierResolveTest(JvmToolTaskTestBase):
       task.execute()
       task.runjava.assert_not_called()
 
+  def test_changed_targets_with_same_jars_do_not_invoke_coursier(self):
+    junit_jar_lib = self._make_junit_target()
+    with self._temp_workdir():
+      self.execute(self.context(target_roots=[junit_jar_lib]))
+
+      # A different target with the same jars is invalid, but its resolve result is cached.
+      other_jar_lib = self.make_target('//:other', JarLibrary,
+                                       jars=[JarDependency('junit', 'junit', rev='4.12')])
+      context = self.context(target_roots=[other_jar_lib])
+      task = self.create_task(context)
+      task.runjava = MagicMock()
+      task.execute()
+      task.runjava.assert_not_called()
+
+      jar_cp = context.products.get_data('compile_classpath').get_for_target(other_jar_lib)
+      self.assertEquals(2, len(jar_cp))
+
+  def test_resolution_key_ignores_order(self):
+    jars = [JarDependency('org.a', 'a', rev='1', excludes=[Exclude('org.x'), Exclude('org.y')]),
+            JarDependency('org.b', 'b', rev='2')]
+    reordered_jars = [JarDependency('org.b', 'b', rev='2'),
+                      JarDependency('org.a', 'a', rev='1', excludes=[Exclude('org.y'),
+                                                                     Exclude('org.x')])]
+    excludes = [Exclude('org.e', 'e'), Exclude('org.f')]
+
+    def key(jars, global_excludes):
+      return CoursierResolve._resolution_key('coursier.jar', ['fetch'], jars, global_excludes, [])
+
+    self.assertEqual(key(jars, excludes), key(reordered_jars, list(reversed(excludes))))
+    self.assertNotEqual(key(jars, excludes), key(jars[:1], excludes))
+    self.assertNotEqual(key(jars, excludes), key(jars, excludes[:1]))
+
+  def test_resolution_key_none_if_dynamic(self):
+    def key(jars, pinned_coords=()):
+      return CoursierResolve._resolution_key('coursier.jar', ['fetch'], jars, [], pinned_coords)
+
+    self.assertIsNotNone(key([JarDependency('org.a', 'a', rev='1.0')]))
+    for rev in ('1.0-SNAPSHOT', 'latest.integration', '[1.0,2.0)', '1.+'):
+      self.assertIsNone(key([JarDependency('org.a', 'a', rev=rev)]))
+      self.assertIsNone(key([JarDependency('org.a', 'a', rev='1.0')],
+                            [M2Coordinate('org.b', 'b', rev=rev)]))
+    self.assertIsNone(key([JarDependency('org.a', 'a', rev='1.0', url='file:///tmp/a.jar')]))
+
   def test_when_invalid_artifact_symlink_should_trigger_resolve(self):
     jar_lib = self._make_junit_target()
     with self._temp_workdir():
@@ -0,0 +1,61 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+
+from pants.backend.jvm.subsystems.shader import Shading
+from pants.backend.jvm.tasks.shaded_jar_store import ShadedJarStore
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class ShadedJarStoreTest(unittest.TestCase):
+  def test_key(self):
+    with temporary_dir() as tmpdir:
+      jar_a = os.path.join(tmpdir, 'a.jar')
+      jar_b = os.path.join(tmpdir, 'b.jar')
+      safe_file_dump(jar_a, 'a')
+      safe_file_dump(jar_b, 'b')
+      rule = Shading.create_exclude('org.pantsbuild.tools.**')
+
+      def key(classpath=(jar_a, jar_b), main='org.pantsbuild.Main', rules=(rule,),
+              shader_fingerprint='shader'):
+        return ShadedJarStore.key(list(classpath), main, list(rules), shader_fingerprint)
+
+      self.assertEqual(key(), key())
+      self.assertNotEqual(key(), key(classpath=(jar_b, jar_a)))
+      self.assertNotEqual(key(), key(main='org.pantsbuild.Other'))
+      self.assertNotEqual(key(), key(rules=()))
+      self.assertNotEqual(key(), key(shader_fingerprint='other'))
+
+      # The key depends on the contents of the classpath, rather than on its paths.
+      original_key = key()
+      safe_file_dump(jar_b, 'c')
+      self.assertNotEqual(original_key, key())
+
+  def test_add_and_materialize(self):
+    with temporary_dir() as tmpdir:
+      store = ShadedJarStore(os.path.join(tmpdir, 'store'))
+      shaded_jar = os.path.join(tmpdir, 'workdir1', 'shaded.jar')
+      other_jar = os.path.join(tmpdir, 'workdir2', 'shaded.jar')
+
+      self.assertFalse(store.materialize('key', other_jar))
+      self.assertFalse(os.path.exists(other_jar))
+
+      safe_file_dump(shaded_jar, 'shaded')
+      store.add('key', shaded_jar)
+      self.assertEqual(['key.jar'], os.listdir(os.path.join(tmpdir, 'store')))
+
+      self.assertTrue(store.materialize('key', other_jar))
+      with open(other_jar) as fp:
+        self.assertEqual('shaded', fp.read())
+
+      # An existing jar is replaced.
+      self.assertTrue(store.materialize('key', shaded_jar))
+      with open(shaded_jar) as fp:
+        self.assertEqual('shaded', fp.read())
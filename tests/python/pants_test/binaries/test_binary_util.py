@@ -5,13 +5,20 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import BaseHTTPServer
 import logging
+import multiprocessing
 import os
+import SocketServer
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 
 import mock
 
-from pants.binaries.binary_util import (BinaryRequest, BinaryToolFetcher, BinaryToolUrlGenerator,
-                                        BinaryUtil)
+from pants.binaries.binary_util import (BinaryFetchRequest, BinaryRequest, BinaryToolFetcher,
+                                        BinaryToolUrlGenerator, BinaryUtil)
 from pants.net.http.fetcher import Fetcher
 from pants.util.contextutil import temporary_dir
 from pants.util.dirutil import safe_open
@@ -82,13 +89,14 @@ class BinaryUtilTest(TestBase):
 
   @classmethod
   def _gen_binary_util(cls, baseurls=[], path_by_id=None, allow_external_binary_tool_downloads=True,
-                       uname_func=None, **kwargs):
+                       uname_func=None, fetch_concurrency=1, **kwargs):
     return BinaryUtil(
       baseurls=baseurls,
       binary_tool_fetcher=cls._gen_binary_tool_fetcher(**kwargs),
       path_by_id=path_by_id,
       allow_external_binary_tool_downloads=allow_external_binary_tool_downloads,
-      uname_func=uname_func)
+      uname_func=uname_func,
+      fetch_concurrency=fetch_concurrency)
 
   @classmethod
   def _read_file(cls, file_path):
@@ -333,3 +341,105 @@ class BinaryUtilTest(TestBase):
       "external_url_generator=ExternalUrlGenerator(<example __str__()>), archiver=None): "
       "--binaries-baseurls is empty.")
     self.assertIn(expected_msg, the_raised_exception_message)
+
+  @contextmanager
+  def _slow_binary_server(self, latency_secs):
+    """Serves the path of each request as its content, after a delay.
+
+    Yields the server's base url, the number of requests for each path (shared with any processes
+    forked while it is serving), and the current and maximum number of requests in flight.
+    """
+    manager = multiprocessing.Manager()
+    requests = manager.dict()
+    requests_lock = manager.Lock()
+    in_flight = Counter()
+    in_flight_lock = threading.Lock()
+
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+      def do_GET(handler):
+        with requests_lock:
+          requests[handler.path] = requests.get(handler.path, 0) + 1
+        with in_flight_lock:
+          in_flight['current'] += 1
+          in_flight['max'] = max(in_flight['max'], in_flight['current'])
+        try:
+          time.sleep(latency_secs)
+          handler.send_response(200)
+          handler.send_header('Content-Length', str(len(handler.path)))
+          handler.end_headers()
+          handler.wfile.write(handler.path)
+        finally:
+          with in_flight_lock:
+            in_flight['current'] -= 1
+
+      def log_message(handler, *args):
+        pass
+
+    class Server(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+      daemon_threads = True
+
+    server = Server(('localhost', 0), Handler)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+    try:
+      yield 'http://localhost:{}'.format(server.server_address[1]), requests, in_flight
+    finally:
+      server.shutdown()
+      server.server_close()
+      manager.shutdown()
+
+  def test_prefetch(self):
+    with self._slow_binary_server(latency_secs=0.2) as (baseurl, requests, in_flight):
+      with temporary_dir() as bootstrap_dir:
+        binary_util = self._gen_binary_util(baseurls=[baseurl],
+                                            bootstrap_dir=bootstrap_dir,
+                                            fetcher=Fetcher('/'),
+                                            ignore_cached_download=False,
+                                            fetch_concurrency=4)
+        binary_requests = [binary_util._make_deprecated_script_request('bin/tool', '1.0', name)
+                           for name in ('a', 'b', 'c', 'd', 'a')]
+        paths = binary_util.prefetch(binary_requests)
+
+        self.assertEqual([os.path.join(bootstrap_dir, 'bin/tool/1.0', name)
+                          for name in ('a', 'b', 'c', 'd', 'a')],
+                         paths)
+        self.assertEqual('/bin/tool/1.0/b', self._read_file(paths[1]))
+        # Each binary was downloaded exactly once, and downloads overlapped.
+        self.assertEqual({'/bin/tool/1.0/{}'.format(name): 1 for name in ('a', 'b', 'c', 'd')},
+                         dict(requests))
+        self.assertGreater(in_flight['max'], 1)
+
+        # Binaries that were already fetched are not fetched again.
+        binary_util.prefetch(binary_requests)
+        self.assertEqual(4, sum(requests.values()))
+
+  def test_prefetch_error(self):
+    with temporary_dir() as invalid_local_files:
+      binary_util = self._gen_binary_util(baseurls=[invalid_local_files], fetch_concurrency=2)
+      binary_request = binary_util._make_deprecated_script_request('bin/tool', '1.0', 'missing')
+      with self.assertRaises(BinaryUtil.BinaryResolutionError):
+        binary_util.prefetch([binary_request])
+
+  def test_concurrent_processes_fetch_once(self):
+    with self._slow_binary_server(latency_secs=0.2) as (baseurl, requests, _):
+      with temporary_dir() as bootstrap_dir:
+        fetch_request = BinaryFetchRequest(download_path='bin/tool/1.0/tool',
+                                           urls=[baseurl + '/bin/tool/1.0/tool'])
+
+        def fetch():
+          fetcher = self._gen_binary_tool_fetcher(bootstrap_dir=bootstrap_dir,
+                                                  fetcher=Fetcher('/'),
+                                                  ignore_cached_download=False)
+          fetcher.fetch_binary(fetch_request)
+
+        processes = [multiprocessing.Process(target=fetch) for _ in range(3)]
+        for process in processes:
+          process.start()
+        for process in processes:
+          process.join()
+
+        self.assertEqual([0, 0, 0], [process.exitcode for process in processes])
+        self.assertEqual({'/bin/tool/1.0/tool': 1}, dict(requests))
+        self.assertEqual('/bin/tool/1.0/tool',
+                         self._read_file(os.path.join(bootstrap_dir, 'bin/tool/1.0/tool')))
@@ -0,0 +1,144 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import argparse
+import multiprocessing
+import random
+import resource
+import time
+from collections import defaultdict
+
+from twitter.common.collections import OrderedSet
+
+from pants.build_graph.address import Address
+from pants.build_graph.compact_graph import CompactGraph
+from pants.build_graph.mutable_build_graph import MutableBuildGraph
+from pants.build_graph.target import Target
+
+
+# NB: These aren't tests themselves: run them with `./pants run` on the `build_graph_benchmark`
+# binary target.
+
+
+def generate_edges(size, fanout, seed=0):
+  """Returns the edges of a random DAG of `size` nodes, with an average out-degree of `fanout`.
+
+  Edges only point from higher to lower node ids, and mostly to nearby ids, which roughly matches
+  the locality of dependencies in real repos.
+  """
+  rnd = random.Random(seed)
+  edges = []
+  for i in range(1, size):
+    for j in set(max(0, i - 1 - int(rnd.expovariate(1.0 / 50))) for _ in range(fanout)):
+      edges.append((i, j))
+  return edges
+
+
+def _max_rss_kb():
+  return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _timed(func):
+  start = time.time()
+  result = func()
+  return result, time.time() - start
+
+
+def _measure_storage(size, fanout, kind):
+  """Returns the kilobytes of RSS growth and seconds taken to store the edges of a random graph."""
+  edges = generate_edges(size, fanout)
+  addresses = [Address('src/{}'.format(i % 1000), 't{}'.format(i)) for i in range(size)]
+  before = _max_rss_kb()
+  start = time.time()
+  if kind == 'dict':
+    # The representation BuildGraph used prior to CompactGraph.
+    dependencies = defaultdict(OrderedSet)
+    dependees = defaultdict(set)
+    for src, dst in edges:
+      dependencies[addresses[src]].add(addresses[dst])
+      dependees[addresses[dst]].add(addresses[src])
+  else:
+    graph = CompactGraph()
+    for address in addresses:
+      graph.add_node(address)
+    for src, dst in edges:
+      graph.add_edge(src, dst)
+  elapsed = time.time() - start
+  return _max_rss_kb() - before, elapsed
+
+
+def _measure_in_child(queue, *args):
+  queue.put(_measure_storage(*args))
+
+
+def measure_storage(size, fanout, kind):
+  """Measures storage in a child process, so that memory freed by the parent is not reused.
+
+  For the same reason, this should be called before the parent allocates large structures.
+  """
+  queue = multiprocessing.Queue()
+  process = multiprocessing.Process(target=_measure_in_child, args=(queue, size, fanout, kind))
+  process.start()
+  result = queue.get()
+  process.join()
+  return result
+
+
+def measure_traversals(size, edges, roots):
+  """Returns a list of (name, seconds) pairs for traversals of a BuildGraph with the given edges."""
+  # Targets are injected directly, so no BUILD files are ever read via the address mapper.
+  build_graph = MutableBuildGraph(address_mapper=None)
+  addresses = [Address('src/{}'.format(i % 1000), 't{}'.format(i)) for i in range(size)]
+  for address in addresses:
+    build_graph.inject_target(Target(name=address.target_name,
+                                     address=address,
+                                     build_graph=build_graph))
+  for src, dst in edges:
+    build_graph.inject_dependency(addresses[src], addresses[dst])
+
+  top = [addresses[size - 1 - i] for i in range(roots)]
+  bottom = [addresses[i] for i in range(roots)]
+  timings = []
+  for name, func in [
+      ('dependency walk', lambda: build_graph.transitive_subgraph_of_addresses(top)),
+      ('dependency walk (bfs)', lambda: build_graph.transitive_subgraph_of_addresses_bfs(top)),
+      ('dependee walk', lambda: build_graph.transitive_dependees_of_addresses(bottom)),
+      ('dependency closure bitset', lambda: build_graph.transitive_closure_bitset(top)),
+      ('dependee closure bitset',
+       lambda: build_graph.transitive_closure_bitset(bottom, dependees=True)),
+  ]:
+    result, elapsed = _timed(func)
+    timings.append(('{} ({} targets)'.format(name, len(result)), elapsed))
+  return timings
+
+
+def main():
+  parser = argparse.ArgumentParser(description='Benchmarks BuildGraph storage and traversals.')
+  parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000],
+                      help='The numbers of targets to benchmark.')
+  parser.add_argument('--fanout', type=int, default=8,
+                      help='The average number of dependencies per target.')
+  parser.add_argument('--roots', type=int, default=10,
+                      help='The number of roots to walk from.')
+  args = parser.parse_args()
+
+  print('Dependency storage:')
+  for size in args.sizes:
+    for kind in ('dict', 'compact'):
+      rss_kb, elapsed = measure_storage(size, args.fanout, kind)
+      print('  {:>6} targets, {:>7}: {:>8.1f} MB, {:.3f}s'
+            .format(size, kind, rss_kb / 1024, elapsed))
+
+  for size in args.sizes:
+    edges = generate_edges(size, args.fanout)
+    print('Traversals of {} targets with {} dependencies:'.format(size, len(edges)))
+    for name, elapsed in measure_traversals(size, edges, args.roots):
+      print('  {}: {:.3f}s'.format(name, elapsed))
+
+
+if __name__ == '__main__':
+  main()
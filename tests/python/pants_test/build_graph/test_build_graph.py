@@ -5,6 +5,7 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import sys
 import unittest
 from collections import defaultdict
 
@@ -147,6 +148,37 @@ class BuildGraphTest(TestBase):
     assertDependencyWalk(a, [a, b, c, d, e])
     assertDependencyWalk(a, [c, d, b, e, a], postorder=True)
 
+  def test_walk_deep_graph(self):
+    # Walks are iterative, and so are not limited by the recursion limit.
+    depth = sys.getrecursionlimit() * 2
+    targets = [self.make_target('deep:0')]
+    for i in range(1, depth):
+      targets.append(self.make_target('deep:{}'.format(i), dependencies=[targets[-1]]))
+
+    closure = self.build_graph.transitive_subgraph_of_addresses([targets[-1].address],
+                                                                postorder=True)
+    self.assertEquals(targets, list(closure))
+    dependees = self.build_graph.transitive_dependees_of_addresses([targets[0].address])
+    self.assertEquals(targets, list(dependees))
+
+  def test_transitive_closure_bitset(self):
+    a = self.make_target('a')
+    b = self.make_target('b', dependencies=[a])
+    c = self.make_target('c', dependencies=[a])
+    d = self.make_target('d', dependencies=[b, c])
+
+    b_closure = self.build_graph.transitive_closure_bitset([b.address])
+    c_closure = self.build_graph.transitive_closure_bitset([c.address])
+    self.assertEquals([a, b], self.build_graph.targets_of_bitset(b_closure))
+    self.assertEquals([a], self.build_graph.targets_of_bitset(b_closure & c_closure))
+    self.assertEquals([a.address, b.address, c.address],
+                      self.build_graph.addresses_of_bitset(b_closure | c_closure))
+
+    a_dependees = self.build_graph.transitive_closure_bitset([a.address], dependees=True)
+    self.assertEquals([b, c, d],
+                      self.build_graph.targets_of_bitset(
+                        a_dependees - self.build_graph.bitset_of_addresses([a.address])))
+
   def test_target_closure(self):
     a = self.make_target('a')
     self.assertEquals([a], a.closure())
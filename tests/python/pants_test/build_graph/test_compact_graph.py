@@ -0,0 +1,119 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import unittest
+
+from pants.build_graph.compact_graph import Bitset, CompactGraph, _AdjacencyArrays
+
+
+class BitsetTest(unittest.TestCase):
+
+  def test_from_ids(self):
+    bitset = Bitset.from_ids([5, 0, 64, 5])
+    self.assertEqual([0, 5, 64], list(bitset))
+    self.assertEqual(3, len(bitset))
+    self.assertIn(64, bitset)
+    self.assertNotIn(1, bitset)
+    self.assertNotIn(-1, bitset)
+
+  def test_empty(self):
+    self.assertFalse(Bitset.from_ids([]))
+    self.assertEqual([], list(Bitset()))
+    self.assertEqual(0, len(Bitset.from_marks(bytearray(10))))
+
+  def test_operators(self):
+    a = Bitset.from_ids([1, 2, 3])
+    b = Bitset.from_ids([3, 4])
+    self.assertEqual(Bitset.from_ids([1, 2, 3, 4]), a | b)
+    self.assertEqual(Bitset.from_ids([3]), a & b)
+    self.assertEqual(Bitset.from_ids([1, 2]), a - b)
+
+
+class AdjacencyArraysTest(unittest.TestCase):
+
+  def test_rows_across_compression(self):
+    adjacency = _AdjacencyArrays()
+    adjacency.append(0, 1)
+    adjacency.append(2, 0)
+    adjacency.compress()
+    adjacency.append(0, 2)
+    adjacency.append(5, 1)
+    self.assertEqual([1, 2], list(adjacency.row(0)))
+    self.assertEqual([], list(adjacency.row(1)))
+    self.assertEqual([0], list(adjacency.row(2)))
+    self.assertEqual([1], list(adjacency.row(5)))
+    self.assertEqual([], list(adjacency.row(6)))
+    adjacency.compress()
+    self.assertEqual([1, 2], list(adjacency.row(0)))
+    self.assertEqual([1], list(adjacency.row(5)))
+    self.assertEqual(4, len(adjacency))
+
+  def test_amortized_compression(self):
+    adjacency = _AdjacencyArrays()
+    for i in range(5000):
+      adjacency.append(i % 100, i)
+    self.assertEqual(list(range(7, 5000, 100)), list(adjacency.row(7)))
+    self.assertEqual(5000, len(adjacency))
+
+  def test_contains(self):
+    for indexed in (False, True):
+      adjacency = _AdjacencyArrays(indexed=indexed)
+      for j in range(2000):
+        adjacency.append(0, j)
+      adjacency.append(1, 0)
+      self.assertTrue(adjacency.contains(0, 0))
+      self.assertTrue(adjacency.contains(0, 1999))
+      self.assertFalse(adjacency.contains(0, 2000))
+      self.assertTrue(adjacency.contains(1, 0))
+      self.assertFalse(adjacency.contains(1, 1))
+      self.assertFalse(adjacency.contains(2, 0))
+
+
+class CompactGraphTest(unittest.TestCase):
+
+  def setUp(self):
+    self.graph = CompactGraph()
+    self.a, self.b, self.c, self.d = (self.graph.add_node(n) for n in 'abcd')
+    self.graph.add_edge(self.a, self.b)
+    self.graph.add_edge(self.a, self.c)
+    self.graph.add_edge(self.c, self.d)
+
+  def test_nodes(self):
+    self.assertEqual(self.b, self.graph.add_node('b'))
+    self.assertEqual('c', self.graph.node(self.graph.node_id('c')))
+    self.assertIsNone(self.graph.maybe_node_id('e'))
+    self.assertEqual(4, len(self.graph))
+
+  def test_edges(self):
+    self.assertFalse(self.graph.add_edge(self.a, self.b))
+    self.assertEqual([self.b, self.c], list(self.graph.successors(self.a)))
+    self.assertEqual([self.a], list(self.graph.predecessors(self.c)))
+    self.assertEqual(3, self.graph.edge_count)
+
+  def test_duplicate_edges_of_many_successors(self):
+    graph = CompactGraph()
+    src = graph.add_node('src')
+    dsts = [graph.add_node(i) for i in range(5000)]
+    for dst in dsts:
+      self.assertTrue(graph.add_edge(src, dst))
+    for dst in dsts:
+      self.assertFalse(graph.add_edge(src, dst))
+    self.assertEqual(dsts, list(graph.successors(src)))
+    self.assertEqual(5000, graph.edge_count)
+
+  def test_closure(self):
+    self.assertEqual(Bitset.from_ids([self.a, self.b, self.c, self.d]),
+                     self.graph.closure([self.a]))
+    self.assertEqual(Bitset.from_ids([self.c, self.d]), self.graph.closure([self.c]))
+    self.assertEqual(Bitset.from_ids([self.a, self.c, self.d]),
+                     self.graph.closure([self.d], reverse=True))
+
+  def test_deep_closure(self):
+    graph = CompactGraph()
+    for i in range(20000):
+      graph.add_edge(graph.add_node(i), graph.add_node(i + 1))
+    self.assertEqual(20001, len(graph.closure([graph.node_id(0)])))
@@ -0,0 +1,110 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import unittest
+
+from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.engine.legacy.parse_cache import CachingParser
+from pants.engine.legacy.parser import LegacyPythonCallbacksParser
+from pants.engine.legacy.structs import TargetAdaptor
+from pants.engine.parser import SymbolTable
+from pants.util.contextutil import temporary_dir
+
+
+class TargetTable(SymbolTable):
+  def table(self):
+    return {'target': TargetAdaptor}
+
+
+class OtherTargetTable(SymbolTable):
+  def table(self):
+    return {'target': TargetAdaptor, 'other_target': TargetAdaptor}
+
+
+def context_aware_object_factory(parse_context):
+  def create(name):
+    return parse_context.create_object('target', name=name)
+  return create
+
+
+class CachingParserTest(unittest.TestCase):
+
+  def _parser(self, symbol_table=None, **alias_kwargs):
+    return LegacyPythonCallbacksParser(symbol_table or TargetTable(),
+                                       BuildFileAliases(**alias_kwargs),
+                                       build_file_imports_behavior='allow')
+
+  def _names(self, objects):
+    return sorted(obj.name for obj in objects)
+
+  def test_reuse_across_parsers(self):
+    content = b"target(name='a')\ntarget(name='b', sources=globs('*.py'))\n"
+    with temporary_dir() as cache_dir:
+      first = CachingParser(self._parser(), cache_dir)
+      self.assertEqual(['a', 'b'], self._names(first.parse('src/BUILD', content)))
+      self.assertEqual((0, 1), (first.hits, first.misses))
+
+      second = CachingParser(self._parser(), cache_dir)
+      objects = second.parse('src/BUILD', content)
+      self.assertEqual(['a', 'b'], self._names(objects))
+      self.assertTrue(all(isinstance(obj, TargetAdaptor) for obj in objects))
+      self.assertEqual((1, 0), (second.hits, second.misses))
+
+      # The same content at a different path is a different entry.
+      second.parse('other/BUILD', content)
+      self.assertEqual((1, 1), (second.hits, second.misses))
+
+  def test_evicts_other_content_of_path(self):
+    with temporary_dir() as cache_dir:
+      parser = CachingParser(self._parser(), cache_dir)
+      parser.parse('src/BUILD', b"target(name='a')\n")
+      parser.parse('src/BUILD', b"target(name='b')\n")
+      parser.parse('other/BUILD', b"target(name='a')\n")
+      self.assertEqual((0, 3), (parser.hits, parser.misses))
+
+      # Only the latest content of each path is kept.
+      parser.parse('src/BUILD', b"target(name='b')\n")
+      parser.parse('src/BUILD', b"target(name='a')\n")
+      parser.parse('other/BUILD', b"target(name='a')\n")
+      self.assertEqual((2, 4), (parser.hits, parser.misses))
+
+  def test_parse_cacheable(self):
+    parser = self._parser()
+    objects, cacheable = parser.parse_cacheable('src/BUILD', b"target(name='a')\n")
+    self.assertEqual(['a'], self._names(objects))
+    self.assertTrue(cacheable)
+    objects, cacheable = parser.parse_cacheable('src/BUILD', b"target(name=eval('str')('a'))\n")
+    self.assertEqual(['a'], self._names(objects))
+    self.assertFalse(cacheable)
+
+  def test_symbol_table_change_invalidates(self):
+    content = b"target(name='a')\n"
+    with temporary_dir() as cache_dir:
+      CachingParser(self._parser(), cache_dir).parse('src/BUILD', content)
+      parser = CachingParser(self._parser(symbol_table=OtherTargetTable()), cache_dir)
+      parser.parse('src/BUILD', content)
+      self.assertEqual((0, 1), (parser.hits, parser.misses))
+
+  def test_imports_not_cached(self):
+    content = b"import os\ntarget(name=os.path.basename('a'))\n"
+    with temporary_dir() as cache_dir:
+      for _ in range(2):
+        parser = CachingParser(self._parser(), cache_dir)
+        self.assertEqual(['a'], self._names(parser.parse('src/BUILD', content)))
+        self.assertEqual((0, 1), (parser.hits, parser.misses))
+
+  def test_context_aware_object_factories_not_cached(self):
+    factories = {'make_target': context_aware_object_factory}
+    underlying = self._parser(context_aware_object_factories=factories)
+    self.assertFalse(underlying.is_cacheable(b"make_target('a')\n"))
+    self.assertFalse(underlying.is_cacheable(b"[make_target(n) for n in ['a', 'b']]\n"))
+    self.assertTrue(underlying.is_cacheable(b"target(name='a')\n"))
+
+  def test_uncacheable_builtins(self):
+    parser = self._parser()
+    self.assertFalse(parser.is_cacheable(b"target(name=open('NAME').read())\n"))
+    self.assertFalse(parser.is_cacheable(b"target(name=(lambda: eval('1'))())\n"))
@@ -0,0 +1,84 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import multiprocessing
+import unittest
+from multiprocessing.pool import ThreadPool
+
+from pants.build_graph.build_file_aliases import BuildFileAliases
+from pants.engine.legacy.parse_pool import ProcessPoolParser
+from pants.engine.legacy.parser import LegacyPythonCallbacksParser
+from pants.engine.legacy.structs import TargetAdaptor
+from pants.engine.parser import ParseError, SymbolTable
+
+
+class TargetTable(SymbolTable):
+  def table(self):
+    return {'target': TargetAdaptor}
+
+
+class ProcessPoolParserTest(unittest.TestCase):
+
+  def setUp(self):
+    underlying = LegacyPythonCallbacksParser(TargetTable(),
+                                             BuildFileAliases(),
+                                             build_file_imports_behavior='allow')
+    self.parser = ProcessPoolParser(underlying, workers=2)
+
+  def tearDown(self):
+    self.parser.close()
+
+  def test_parse(self):
+    objects = self.parser.parse('src/BUILD', b"target(name='a')\ntarget(sources=globs('*.py'))\n")
+    self.assertEqual(['a', 'src'], sorted(obj.name for obj in objects))
+    self.assertTrue(all(isinstance(obj, TargetAdaptor) for obj in objects))
+
+  def test_parse_cacheable(self):
+    objects, cacheable = self.parser.parse_cacheable('src/BUILD', b"target(name='a')\n")
+    self.assertEqual(['a'], [obj.name for obj in objects])
+    self.assertTrue(cacheable)
+    objects, cacheable = self.parser.parse_cacheable('src/BUILD',
+                                                     b"target(name='a', callback=lambda: 42)\n")
+    self.assertEqual(42, objects[0].callback())
+    self.assertTrue(cacheable)
+
+  def test_concurrent_parses(self):
+    def parse(i):
+      objects = self.parser.parse('src/{}/BUILD'.format(i), b"target(name='t')\n")
+      return [obj.name for obj in objects]
+    pool = ThreadPool(4)
+    try:
+      self.assertEqual([['t']] * 16, pool.map(parse, range(16)))
+    finally:
+      pool.close()
+      pool.join()
+
+  def test_error(self):
+    with self.assertRaisesRegexp(ParseError, "name 'missing' is not defined"):
+      self.parser.parse('src/BUILD', b"missing(name='a')\n")
+
+  def test_unpicklable_objects_parsed_locally(self):
+    objects = self.parser.parse('src/BUILD', b"target(name='a', callback=lambda: 42)\n")
+    self.assertEqual(42, objects[0].callback())
+
+  def test_parse_in_forked_process(self):
+    queue = multiprocessing.Queue()
+
+    def parse_in_child():
+      objects = self.parser.parse('src/BUILD', b"target(name='a')\n")
+      queue.put([obj.name for obj in objects])
+
+    process = multiprocessing.Process(target=parse_in_child)
+    process.daemon = True
+    process.start()
+    self.assertEqual(['a'], queue.get(timeout=30))
+    process.join()
+
+  def test_close_idempotent(self):
+    self.parser.close()
+    self.parser.close()
+    self.assertEqual('a', self.parser.parse('src/BUILD', b"target(name='a')\n")[0].name)
@@ -5,11 +5,17 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import importlib
+import os
+import sys
 import unittest
+from textwrap import dedent
 
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.engine.legacy.parser import LegacyPythonCallbacksParser
 from pants.engine.parser import EmptyTable
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
 
 
 class LegacyPythonCallbacksParserTest(unittest.TestCase):
@@ -22,3 +28,33 @@ class LegacyPythonCallbacksParserTest(unittest.TestCase):
     # But the imported module should not be visible as a symbol in further parses.
     with self.assertRaises(NameError):
       parser.parse('/dev/null', '''os.path.join('x', 'y')''')
+
+  def test_fingerprint_covers_plugin_modules(self):
+    with temporary_dir() as plugin_dir:
+      plugin_path = os.path.join(plugin_dir, 'fake_parser_plugin.py')
+      safe_file_dump(plugin_path, dedent("""
+        class Plugin(object):
+          pass
+        """))
+      sys.path.insert(0, plugin_dir)
+      try:
+        plugin = importlib.import_module('fake_parser_plugin')
+      finally:
+        sys.path.remove(plugin_dir)
+      self.addCleanup(sys.modules.pop, 'fake_parser_plugin', None)
+
+      def fingerprint():
+        aliases = BuildFileAliases(objects={'plugin': plugin.Plugin})
+        return LegacyPythonCallbacksParser(EmptyTable(), aliases, 'allow').fingerprint
+
+      unchanged = fingerprint()
+      self.assertEqual(unchanged, fingerprint())
+
+      # Edit the plugin, as a user would edit an in-repo plugin between runs.
+      safe_file_dump(plugin_path, dedent("""
+        class Plugin(object):
+          fields = ()
+        """))
+      mtime = os.path.getmtime(plugin_path) + 10
+      os.utime(plugin_path, (mtime, mtime))
+      self.assertNotEqual(unchanged, fingerprint())
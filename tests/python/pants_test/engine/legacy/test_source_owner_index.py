@@ -0,0 +1,42 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import unittest
+
+from pants.build_graph.address import Address, BuildFileAddress
+from pants.engine.legacy.source_owner_index import OwningTarget, SourceOwnerIndex
+from pants.engine.legacy.structs import Globs, JavaLibraryAdaptor, TargetAdaptor
+
+
+class SourceOwnerIndexRecordTest(unittest.TestCase):
+
+  def setUp(self):
+    self.index = SourceOwnerIndex(scheduler=None)
+    self.build_file_address = BuildFileAddress(rel_path='src/java/BUILD', target_name='lib')
+
+  def record_for(self, struct):
+    return self.index._record_for(self.build_file_address, struct)
+
+  def test_sources_globs(self):
+    struct = TargetAdaptor(name='lib',
+                           sources=Globs('*.java', exclude=[['Skip.java']], spec_path='src/java'))
+    self.assertEqual(OwningTarget(Address('src/java', 'lib'),
+                                  'src/java/BUILD',
+                                  None,
+                                  ('src/java/*.java',),
+                                  ('src/java/Skip.java',)),
+                     self.record_for(struct))
+
+  def test_default_sources(self):
+    record = self.record_for(JavaLibraryAdaptor(name='lib'))
+    self.assertEqual(('src/java/*.java',), record.globs)
+    self.assertEqual(('src/java/*Test.java',), record.exclude_globs)
+
+  def test_source(self):
+    record = self.record_for(TargetAdaptor(name='lib', source='Main.java'))
+    self.assertEqual('src/java/Main.java', record.source)
+    self.assertEqual((), record.globs)
@@ -48,7 +48,8 @@ class SchedulerTestBase(object):
                    rules=None,
                    project_tree=None,
                    work_dir=None,
-                   include_trace_on_error=True):
+                   include_trace_on_error=True,
+                   execution_options=None):
     """Creates a SchedulerSession for a Scheduler with the given Rules installed."""
     rules = rules or []
     work_dir = work_dir or self._create_work_dir()
@@ -57,7 +58,7 @@ class SchedulerTestBase(object):
                           project_tree,
                           work_dir,
                           rules,
-                          DEFAULT_EXECUTION_OPTIONS,
+                          execution_options or DEFAULT_EXECUTION_OPTIONS,
                           include_trace_on_error=include_trace_on_error)
     return scheduler.new_session()
 
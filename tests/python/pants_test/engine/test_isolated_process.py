@@ -14,6 +14,8 @@ from pants.engine.fs import (EMPTY_DIRECTORY_DIGEST, DirectoryDigest, FileConten
 from pants.engine.isolated_process import ExecuteProcessRequest, ExecuteProcessResult
 from pants.engine.rules import RootRule, rule
 from pants.engine.selectors import Get, Select
+from pants.option.global_options import DEFAULT_EXECUTION_OPTIONS
+from pants.util.contextutil import temporary_dir
 from pants.util.objects import TypeCheckError, datatype
 from pants_test.engine.scheduler_test_base import SchedulerTestBase
 
@@ -354,6 +356,46 @@ class IsolatedProcessTest(SchedulerTestBase, unittest.TestCase):
       (FileContent("roland", "European Burmese"),)
     )
 
+  def test_result_cached_across_schedulers(self):
+    execution_options = DEFAULT_EXECUTION_OPTIONS._replace(process_execution_local_cache=True)
+    with temporary_dir() as spawn_dir:
+      # Each spawn of the process appends to this log: since the log's path is unique to this test
+      # run, the request has never been cached before.
+      spawn_log = os.path.join(spawn_dir, 'spawns')
+      request = ExecuteProcessRequest.create_with_empty_snapshot(
+        ("/bin/bash", "-c", "echo spawned >> {}; echo -n 'European Burmese'".format(spawn_log)),
+        dict(),
+        tuple(),
+      )
+
+      for expected_hits, expected_misses in [(0, 1), (1, 0)]:
+        scheduler = self.mk_scheduler_in_example_fs((), execution_options=execution_options)
+        result = self.execute_expecting_one_result(scheduler, ExecuteProcessResult, request).value
+        self.assertEqual('European Burmese', result.stdout)
+        metrics = scheduler.metrics()
+        self.assertEqual(expected_hits, metrics['process_execution_cache_hits'])
+        self.assertEqual(expected_misses, metrics['process_execution_cache_misses'])
+
+      with open(spawn_log, 'r') as fp:
+        self.assertEqual(['spawned\n'], fp.readlines())
+
+  def test_result_not_cached_by_default(self):
+    with temporary_dir() as spawn_dir:
+      spawn_log = os.path.join(spawn_dir, 'spawns')
+      request = ExecuteProcessRequest.create_with_empty_snapshot(
+        ("/bin/bash", "-c", "echo spawned >> {}".format(spawn_log)),
+        dict(),
+        tuple(),
+      )
+
+      for _ in range(2):
+        scheduler = self.mk_scheduler_in_example_fs(())
+        self.execute_expecting_one_result(scheduler, ExecuteProcessResult, request)
+        self.assertNotIn('process_execution_cache_hits', scheduler.metrics())
+
+      with open(spawn_log, 'r') as fp:
+        self.assertEqual(['spawned\n'] * 2, fp.readlines())
+
   def test_exercise_python_side_of_timeout_implementation(self):
     # Local execution currently doesn't support timeouts,
     # but this allows us to ensure that all of the setup
@@ -412,6 +454,8 @@ class IsolatedProcessTest(SchedulerTestBase, unittest.TestCase):
       tar.extractall(test_fs)
     return fs_tree
 
-  def mk_scheduler_in_example_fs(self, rules):
+  def mk_scheduler_in_example_fs(self, rules, execution_options=None):
     rules = list(rules) + create_fs_rules() + [RootRule(ExecuteProcessRequest)]
-    return self.mk_scheduler(rules=rules, project_tree=self.mk_example_fs_tree())
+    return self.mk_scheduler(rules=rules,
+                             project_tree=self.mk_example_fs_tree(),
+                             execution_options=execution_options)
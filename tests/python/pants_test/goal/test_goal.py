@@ -0,0 +1,79 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import unittest
+
+from pants.goal.goal import Goal
+from pants.goal.task_registrar import TaskRegistrar
+from pants.task.task import Task
+
+
+class EagerTask(Task):
+  """An eagerly registered task."""
+
+
+class LazyTask(Task):
+  """A lazily registered task."""
+
+
+class GoalTest(unittest.TestCase):
+  def setUp(self):
+    Goal.clear()
+
+  def tearDown(self):
+    Goal.clear()
+
+  def test_lazy_task_registration(self):
+    TaskRegistrar('eager', EagerTask).install()
+    lazy = TaskRegistrar('lazy', 'pants_test.goal.test_goal:LazyTask', serialize=False)
+    lazy.install()
+
+    goal = Goal.by_name('lazy')
+    self.assertTrue(goal.active)
+    self.assertFalse(goal.loaded)
+    self.assertFalse(lazy.loaded)
+    self.assertFalse(Goal.all_loaded())
+    self.assertEqual(['lazy'], goal.ordered_task_names())
+    self.assertEqual([Goal.by_name('eager').task_type_by_name('eager')],
+                     list(Goal.get_optionables()))
+
+    Goal.load(['lazy'])
+    self.assertTrue(goal.loaded)
+    self.assertTrue(Goal.all_loaded())
+    self.assertIs(LazyTask, lazy.task_type)
+    task_type = goal.task_type_by_name('lazy')
+    self.assertTrue(issubclass(task_type, LazyTask))
+    self.assertEqual('lazy', task_type.options_scope)
+    self.assertIn(task_type, list(Goal.get_optionables()))
+
+  def test_lazy_goal_loaded_on_demand(self):
+    TaskRegistrar('lazy', 'pants_test.goal.test_goal:LazyTask').install()
+    goal = Goal.by_name('lazy')
+    self.assertEqual('A lazily registered task.', goal.description)
+    self.assertTrue(goal.serialize)
+    self.assertTrue(goal.has_task_of_type(LazyTask))
+    self.assertTrue(goal.loaded)
+
+  def test_uninstall_unloaded_task(self):
+    TaskRegistrar('eager', EagerTask).install('goal')
+    TaskRegistrar('lazy', 'pants_test.goal.test_goal:LazyTask').install('goal')
+    goal = Goal.by_name('goal')
+    goal.uninstall_task('lazy')
+    self.assertTrue(goal.loaded)
+    self.assertEqual(['eager'], goal.ordered_task_names())
+
+  def test_is_unloaded_scope(self):
+    TaskRegistrar('eager', EagerTask).install('compile')
+    TaskRegistrar('lazy', 'pants_test.goal.test_goal:LazyTask').install('test')
+
+    for scope in ('test', 'test.lazy', 'cache.test', 'cache.test.lazy'):
+      self.assertTrue(Goal.is_unloaded_scope(scope), scope)
+    for scope in ('compile', 'compile.eager', 'test.other', 'unknown', 'latest'):
+      self.assertFalse(Goal.is_unloaded_scope(scope), scope)
+
+    Goal.load(['test'])
+    self.assertFalse(Goal.is_unloaded_scope('test.lazy'))
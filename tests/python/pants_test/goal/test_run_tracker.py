@@ -10,8 +10,14 @@ import json
 import threading
 import urlparse
 
+import mock
+
+from pants.base.worker_pool import SubprocPool
+from pants.base.workunit import WorkUnit
+from pants.goal.aggregated_timings import AggregatedTimings
 from pants.goal.run_tracker import RunTracker
-from pants.util.contextutil import temporary_file_path
+from pants.util.contextutil import temporary_dir, temporary_file_path
+from pants_test.subsystem.subsystem_util import init_subsystem
 from pants_test.test_base import TestBase
 
 
@@ -47,6 +53,30 @@ class RunTrackerTest(TestBase):
     server.shutdown()
     server.server_close()
 
+  def test_current_workunits_of_ended_parents_removed(self):
+    init_subsystem(RunTracker)
+    run_tracker = RunTracker.global_instance()
+    # Don't leave the RunTracker's subprocess pool (and its threads) behind for other tests.
+    self.addCleanup(SubprocPool.shutdown, True)
+    run_tracker.report = mock.Mock()
+    run_tracker.cumulative_timings = AggregatedTimings()
+    run_tracker.self_timings = AggregatedTimings()
+    with temporary_dir() as run_info_dir:
+      parent = WorkUnit(run_info_dir=run_info_dir, parent=None, name='pool')
+      parent.start()
+
+      def register():
+        run_tracker.register_thread(parent)
+      threads = [threading.Thread(target=register) for _ in range(3)]
+      for thread in threads:
+        thread.start()
+        thread.join()
+      self.assertEqual({thread.ident: parent for thread in threads},
+                       run_tracker.current_workunits())
+
+      run_tracker.end_workunit(parent)
+      self.assertEqual({}, run_tracker.current_workunits())
+
   def test_write_stats_to_json_file(self):
     # Set up
     stats = {'stats': {'foo': 'bar', 'baz': 42}}
@@ -0,0 +1,95 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import threading
+import time
+import unittest
+
+from pants.base.workunit import WorkUnit, WorkUnitLabel
+from pants.goal.sampling_profiler import SamplingProfiler
+from pants.util.contextutil import temporary_dir
+
+
+class FakeRunTracker(object):
+  def __init__(self):
+    self.workunits = {}
+
+  def current_workunits(self):
+    return dict(self.workunits)
+
+
+class SamplingProfilerTest(unittest.TestCase):
+  def setUp(self):
+    self.run_tracker = FakeRunTracker()
+    self.root = WorkUnit('/tmp', None, 'all')
+    self.goal = WorkUnit('/tmp', self.root, 'compile', labels=[WorkUnitLabel.GOAL])
+    self.task = WorkUnit('/tmp', self.goal, 'zinc', labels=[WorkUnitLabel.TASK])
+    self.tool = WorkUnit('/tmp', self.task, 'javac', labels=[WorkUnitLabel.COMPILER])
+
+  def test_sample_attributes_to_enclosing_task(self):
+    self.run_tracker.workunits[threading.current_thread().ident] = self.tool
+    profiler = SamplingProfiler(self.run_tracker)
+    profiler.sample()
+
+    samples = profiler.collapsed_stacks()
+    self.assertEqual(['all:compile:zinc'], samples.keys())
+    (stack, count), = samples['all:compile:zinc'].items()
+    self.assertEqual(1, count)
+    self.assertTrue(stack.startswith('[all];[compile];[zinc];[javac];'))
+    self.assertIn('test_sample_attributes_to_enclosing_task', stack)
+
+  def test_sample_outside_of_task(self):
+    self.run_tracker.workunits[threading.current_thread().ident] = self.goal
+    profiler = SamplingProfiler(self.run_tracker)
+    profiler.sample()
+    self.assertEqual(['all:compile'], profiler.collapsed_stacks().keys())
+
+  def test_sample_unattributed(self):
+    profiler = SamplingProfiler(self.run_tracker)
+    profiler.sample()
+    self.assertEqual([SamplingProfiler.UNATTRIBUTED], profiler.collapsed_stacks().keys())
+
+  def test_sampler_thread_samples_other_threads(self):
+    stop = threading.Event()
+
+    def busy():
+      self.run_tracker.workunits[threading.current_thread().ident] = self.task
+      while not stop.is_set():
+        time.sleep(0.001)
+
+    busy_thread = threading.Thread(target=busy)
+    busy_thread.start()
+    # When not started on the main thread, a background thread samples.
+    profiler = SamplingProfiler(self.run_tracker, interval_secs=0.001)
+    starter = threading.Thread(target=profiler.start)
+    starter.start()
+    starter.join()
+    time.sleep(0.1)
+    profiler.stop()
+    stop.set()
+    busy_thread.join()
+
+    stacks = profiler.collapsed_stacks()['all:compile:zinc']
+    self.assertTrue(any('busy (' in stack for stack in stacks))
+    self.assertFalse(any('_sample_periodically' in stack
+                         for task_stacks in profiler.collapsed_stacks().values()
+                         for stack in task_stacks))
+
+  def test_write(self):
+    self.run_tracker.workunits[threading.current_thread().ident] = self.tool
+    profiler = SamplingProfiler(self.run_tracker)
+    profiler.sample()
+    profiler.sample()
+    with temporary_dir() as tmpdir:
+      combined_path = profiler.write(tmpdir)
+      self.assertEqual(os.path.join(tmpdir, 'combined.folded'), combined_path)
+      self.assertEqual(['all.compile.zinc.folded', 'combined.folded'], sorted(os.listdir(tmpdir)))
+      with open(combined_path) as fp:
+        lines = fp.read().splitlines()
+      self.assertEqual(1, len(lines))
+      self.assertTrue(lines[0].endswith(' 2'))
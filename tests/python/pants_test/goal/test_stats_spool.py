@@ -0,0 +1,126 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import BaseHTTPServer
+import json
+import threading
+import time
+import unittest
+import urlparse
+
+from pants.goal.run_tracker import RunTracker
+from pants.goal.stats_spool import StatsSpool, main
+from pants.util.contextutil import temporary_dir
+
+
+class FlakyStatsServer(object):
+  """A local stats endpoint that alternately fails and succeeds, starting with a failure."""
+
+  def __init__(self):
+    self.requests = []
+    self.uploaded = []
+    server = self
+
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+      def do_POST(handler):
+        length = int(handler.headers['Content-Length'])
+        post_data = urlparse.parse_qs(handler.rfile.read(length).decode('utf-8'))
+        stats = {k: json.loads(v[0]) for k, v in post_data.items()}
+        server.requests.append(stats)
+        if len(server.requests) % 2:
+          handler.send_response(500)
+        else:
+          server.uploaded.append(stats)
+          handler.send_response(200)
+        handler.end_headers()
+
+      def log_message(handler, *args):
+        pass
+
+    self._server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), Handler)
+    host, port = self._server.server_address
+    self.url = 'http://{}:{}/upload'.format(host, port)
+
+  def __enter__(self):
+    thread = threading.Thread(target=self._server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return self
+
+  def __exit__(self, *args):
+    self._server.shutdown()
+    self._server.server_close()
+
+
+class StatsSpoolTest(unittest.TestCase):
+  def drain(self, spool, max_attempts):
+    return spool.drain(timeout=5, max_attempts=max_attempts, backoff_secs=0)
+
+  def test_drain_retries(self):
+    with temporary_dir() as spool_dir, FlakyStatsServer() as server:
+      spool = StatsSpool(spool_dir, RunTracker.post_stats)
+      spool.add(server.url, {'run': 1})
+      spool.add(server.url, {'run': 2})
+
+      self.assertEqual(2, self.drain(spool, max_attempts=2))
+      self.assertEqual([], spool.entries())
+      self.assertEqual(4, len(server.requests))
+      self.assertEqual([{'run': 1}, {'run': 2}], server.uploaded)
+
+  def test_failed_uploads_left_for_later_drain(self):
+    with temporary_dir() as spool_dir, FlakyStatsServer() as server:
+      spool = StatsSpool(spool_dir, RunTracker.post_stats)
+      spool.add(server.url, {'run': 1})
+      spool.add(server.url, {'run': 2})
+
+      # The first upload fails, so the remaining stats for the url are not attempted.
+      self.assertEqual(0, self.drain(spool, max_attempts=1))
+      self.assertEqual(1, len(server.requests))
+      self.assertEqual(2, len(spool.entries()))
+
+      self.assertEqual(1, self.drain(spool, max_attempts=1))
+      self.assertEqual(1, len(spool.entries()))
+
+      self.assertEqual(1, self.drain(spool, max_attempts=1))
+      self.assertEqual([], spool.entries())
+      self.assertEqual([{'run': 1}, {'run': 2}], server.uploaded)
+
+  def test_max_entries(self):
+    with temporary_dir() as spool_dir:
+      spool = StatsSpool(spool_dir, RunTracker.post_stats, max_entries=2)
+      entries = [spool.add('http://unused', {'run': i}) for i in range(3)]
+      self.assertEqual(entries[1:], spool.entries())
+
+  def test_unreadable_entry_discarded(self):
+    with temporary_dir() as spool_dir, FlakyStatsServer() as server:
+      spool = StatsSpool(spool_dir, RunTracker.post_stats)
+      corrupt_entry = spool.add(server.url, {'run': 1})
+      with open(corrupt_entry, 'w') as fp:
+        fp.write('{')
+      self.assertEqual(0, self.drain(spool, max_attempts=1))
+      self.assertEqual([], spool.entries())
+      self.assertEqual([], server.requests)
+
+  def test_drain_in_background(self):
+    with temporary_dir() as spool_dir, FlakyStatsServer() as server:
+      spool = StatsSpool(spool_dir, RunTracker.post_stats)
+      spool.add(server.url, {'run': 1})
+      spool.drain_in_background(timeout=5, max_attempts=2)
+
+      deadline = time.time() + 30
+      while spool.entries() and time.time() < deadline:
+        time.sleep(0.1)
+      self.assertEqual([], spool.entries())
+      self.assertEqual([{'run': 1}], server.uploaded)
+
+  def test_main(self):
+    with temporary_dir() as spool_dir, FlakyStatsServer() as server:
+      spool = StatsSpool(spool_dir, RunTracker.post_stats)
+      spool.add(server.url, {'run': 1})
+      main(['--timeout', '5', '--max-attempts', '2', spool_dir])
+      self.assertEqual([], spool.entries())
+      self.assertEqual([{'run': 1}], server.uploaded)
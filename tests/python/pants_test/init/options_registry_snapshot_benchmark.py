@@ -0,0 +1,62 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import argparse
+import time
+
+from pants.init.options_initializer import BuildConfigInitializer, OptionsInitializer
+from pants.option.options_bootstrapper import OptionsBootstrapper
+from pants.util.contextutil import temporary_dir
+
+
+# NB: These aren't tests themselves: run them with `./pants run` on the
+# `options_registry_snapshot_benchmark` binary target.
+
+
+def _bootstrapper(workdir, snapshot, goals):
+  args = ['./pants', '--pants-workdir={}'.format(workdir)]
+  args.append('--options-registry-snapshot' if snapshot else '--no-options-registry-snapshot')
+  return OptionsBootstrapper(args=args + goals)
+
+
+def measure_option_construction(goals, snapshot, iterations):
+  """Returns the seconds taken by each of `iterations` constructions of the full options.
+
+  With `snapshot` set, every construction after the first restores registrations from the snapshot
+  that the first one saved.
+  """
+  timings = []
+  with temporary_dir() as workdir:
+    build_configuration = BuildConfigInitializer.get(_bootstrapper(workdir, snapshot, goals))
+    for _ in range(iterations):
+      options_bootstrapper = _bootstrapper(workdir, snapshot, goals)
+      start = time.time()
+      OptionsInitializer.create(options_bootstrapper, build_configuration, init_subsystems=False)
+      timings.append(time.time() - start)
+  return timings
+
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Benchmarks options construction with and without an options registry snapshot.')
+  parser.add_argument('--iterations', type=int, default=10,
+                      help='The number of times to construct the options.')
+  parser.add_argument('goals', nargs='*', default=['list'],
+                      help='The goals to construct options for.')
+  args = parser.parse_args()
+
+  for name, snapshot in [('cold (no snapshot)', False), ('snapshot', True)]:
+    timings = measure_option_construction(args.goals, snapshot, args.iterations)
+    print('{}:'.format(name))
+    print('  first: {:.3f}s'.format(timings[0]))
+    if len(timings) > 1:
+      rest = timings[1:]
+      print('  rest:  {:.3f}s mean, {:.3f}s min'.format(sum(rest) / len(rest), min(rest)))
+
+
+if __name__ == '__main__':
+  main()
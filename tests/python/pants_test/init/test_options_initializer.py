@@ -8,8 +8,21 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
 import unittest
 
 from pants.base.exceptions import BuildConfigurationError
+from pants.goal.goal import Goal
+from pants.goal.task_registrar import TaskRegistrar
 from pants.init.options_initializer import BuildConfigInitializer, OptionsInitializer
 from pants.option.options_bootstrapper import OptionsBootstrapper
+from pants.task.task import Task
+
+
+class SimpleTask(Task):
+  pass
+
+
+class PreparingTask(Task):
+  @classmethod
+  def prepare(cls, options, round_manager):
+    round_manager.require_data('product')
 
 
 class OptionsInitializerTest(unittest.TestCase):
@@ -19,3 +32,34 @@ class OptionsInitializerTest(unittest.TestCase):
 
     with self.assertRaises(BuildConfigurationError):
       OptionsInitializer.create(options_bootstrapper, build_config)
+
+
+class LoadGoalsTest(unittest.TestCase):
+  def setUp(self):
+    Goal.clear()
+    for name in ('a', 'b', 'c'):
+      TaskRegistrar(name, 'pants_test.init.test_options_initializer:SimpleTask').install()
+    TaskRegistrar('prep', 'pants_test.init.test_options_initializer:PreparingTask').install()
+
+  def tearDown(self):
+    Goal.clear()
+
+  def assert_loaded(self, expected_goal_names, *args):
+    OptionsInitializer._load_goals(OptionsBootstrapper(args=['./pants'] + list(args)))
+    self.assertEqual(sorted(expected_goal_names),
+                     sorted(goal.name for goal in Goal.all() if goal.loaded))
+
+  def test_requested_goals(self):
+    self.assert_loaded(['a', 'b'], 'a', 'b', 'src/python::')
+
+  def test_scoped_flags(self):
+    self.assert_loaded(['a', 'c'], '--c-level=debug', 'a')
+
+  def test_requires_other_goals(self):
+    self.assert_loaded(['a', 'b', 'c', 'prep'], 'prep')
+
+  def test_help(self):
+    self.assert_loaded(['a', 'b', 'c', 'prep'], 'a', '-h')
+    Goal.clear()
+    TaskRegistrar('a', 'pants_test.init.test_options_initializer:SimpleTask').install()
+    self.assert_loaded(['a'])
@@ -0,0 +1,145 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+
+from pants.init.options_registry_snapshot import OptionsRegistrySnapshot
+from pants.option.config import Config
+from pants.option.option_tracker import OptionTracker
+from pants.option.optionable import Optionable
+from pants.option.options import Options
+from pants.option.scope import ScopeInfo
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class FakeSubsystem(Optionable):
+  options_scope = 'fake'
+  options_scope_category = ScopeInfo.SUBSYSTEM
+  deprecated_options_scope = 'old-fake'
+  deprecated_options_scope_removal_version = '9999.9.9.dev0'
+  options_registration_is_pure = True
+
+  @classmethod
+  def register_options(cls, register):
+    register('--foo', type=int, default=1, help='Foo.')
+    register('--bar', type=list, default=['a'], fingerprint=True, help='Bar.')
+    register('--baz', type=bool, help='Baz.')
+
+
+registered_side_effects = []
+executed_registrations = []
+
+
+class SideEffectsSubsystem(Optionable):
+  options_scope = 'side-effects'
+  options_scope_category = ScopeInfo.SUBSYSTEM
+  options_registration_is_pure = True
+
+  @classmethod
+  def register_options(cls, register):
+    executed_registrations.append(cls)
+    register('--qux', default='q', help='Qux.')
+
+  @classmethod
+  def options_registered(cls):
+    super(SideEffectsSubsystem, cls).options_registered()
+    registered_side_effects.append(cls)
+
+
+class UnmarkedSubsystem(SideEffectsSubsystem):
+  options_scope = 'unmarked'
+
+  @classmethod
+  def register_options(cls, register):
+    super(UnmarkedSubsystem, cls).register_options(register)
+    register('--quux', type=int, default=0, help='Quux.')
+
+
+OPTIONABLES = [FakeSubsystem, SideEffectsSubsystem, UnmarkedSubsystem]
+KNOWN_SCOPE_INFOS = [ScopeInfo('', ScopeInfo.GLOBAL)] + [
+  si for optionable in OPTIONABLES for si in optionable.known_scope_infos()
+]
+
+
+class OptionsRegistrySnapshotTest(unittest.TestCase):
+  def setUp(self):
+    del registered_side_effects[:]
+    del executed_registrations[:]
+
+  def create_options(self, args=()):
+    return Options.create(env={},
+                          config=Config.load([]),
+                          known_scope_infos=KNOWN_SCOPE_INFOS,
+                          args=['./pants'] + list(args),
+                          option_tracker=OptionTracker())
+
+  def register(self, options, registrations=None, snapshot=None):
+    restored = []
+    for optionable in OPTIONABLES:
+      if registrations is not None and snapshot.restore(options, optionable, registrations):
+        restored.append(optionable)
+      else:
+        optionable.register_options_on_scope(options)
+    return restored
+
+  def test_restore(self):
+    with temporary_dir() as snapshot_dir:
+      snapshot = OptionsRegistrySnapshot(snapshot_dir)
+      registered = self.create_options()
+      self.register(registered)
+      snapshot.save('key', registered, OPTIONABLES)
+
+      registrations = snapshot.load('key')
+      self.assertIsNotNone(registrations)
+      self.assertNotIn('unmarked', registrations)
+      self.assertEqual([SideEffectsSubsystem, UnmarkedSubsystem], registered_side_effects)
+      del registered_side_effects[:]
+      del executed_registrations[:]
+      restored = self.create_options(['--fake-foo=3', '--side-effects-qux=r', '--unmarked-quux=2'])
+      self.assertEqual([FakeSubsystem, SideEffectsSubsystem],
+                       self.register(restored, registrations, snapshot))
+      # Only the unmarked subsystem's registration is executed, but the class-level effects of
+      # registration run for the restored subsystem too.
+      self.assertEqual([UnmarkedSubsystem], executed_registrations)
+      self.assertEqual([SideEffectsSubsystem, UnmarkedSubsystem], registered_side_effects)
+
+      fake_options = restored.for_scope('fake')
+      self.assertEqual(3, fake_options.foo)
+      self.assertEqual(['a'], fake_options.bar)
+      self.assertFalse(fake_options.baz)
+      self.assertEqual('r', restored.for_scope('side-effects').qux)
+      self.assertEqual(2, restored.for_scope('unmarked').quux)
+      for scope in ('fake', 'old-fake'):
+        self.assertEqual(registered.get_parser(scope).registrations(),
+                         restored.get_parser(scope).registrations())
+      self.assertEqual(registered.get_fingerprintable_for_scope('fake'),
+                       restored.get_fingerprintable_for_scope('fake'))
+
+  def test_load_missing_or_corrupt(self):
+    with temporary_dir() as snapshot_dir:
+      snapshot = OptionsRegistrySnapshot(snapshot_dir)
+      self.assertIsNone(snapshot.load('key'))
+
+      snapshot.save('key', self.create_options(), [])
+      snapshot_path = os.path.join(snapshot_dir, OptionsRegistrySnapshot._SNAPSHOT_VERSION,
+                                   'key.pickle')
+      self.assertTrue(os.path.isfile(snapshot_path))
+      safe_file_dump(snapshot_path, 'not a pickle')
+      self.assertIsNone(snapshot.load('key'))
+      self.assertFalse(os.path.exists(snapshot_path))
+
+  def test_key(self):
+    bootstrap_option_values = {'backend_packages': ['pants.backend.python'], 'plugins': []}
+    key = OptionsRegistrySnapshot.key(bootstrap_option_values, KNOWN_SCOPE_INFOS)
+    self.assertEqual(key, OptionsRegistrySnapshot.key(dict(bootstrap_option_values),
+                                                      list(reversed(KNOWN_SCOPE_INFOS))))
+    with_plugin = dict(bootstrap_option_values, plugins=['p'])
+    self.assertNotEqual(key, OptionsRegistrySnapshot.key(with_plugin, KNOWN_SCOPE_INFOS))
+    self.assertNotEqual(key, OptionsRegistrySnapshot.key(bootstrap_option_values,
+                                                         KNOWN_SCOPE_INFOS[:-1]))
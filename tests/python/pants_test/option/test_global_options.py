@@ -0,0 +1,28 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import unittest
+
+from pants.option.global_options import DEFAULT_EXECUTION_OPTIONS, ExecutionOptions
+from pants.option.scope import GLOBAL_SCOPE
+from pants_test.option.util.fakes import create_options_for_optionables
+
+
+class ExecutionOptionsTest(unittest.TestCase):
+  def test_from_bootstrap_options(self):
+    options = create_options_for_optionables([], options={
+      GLOBAL_SCOPE: {
+        'remote_store_server': ['localhost:1234'],
+        'process_execution_parallelism': 3,
+        'process_execution_local_cache': True,
+      }
+    })
+    execution_options = ExecutionOptions.from_bootstrap_options(options.for_global_scope())
+    self.assertEqual(DEFAULT_EXECUTION_OPTIONS._replace(remote_store_server=['localhost:1234'],
+                                                        process_execution_parallelism=3,
+                                                        process_execution_local_cache=True),
+                     execution_options)
@@ -10,6 +10,7 @@ import unittest
 from textwrap import dedent
 
 from pants.base.build_environment import get_buildroot
+from pants.option.config import Config
 from pants.option.options_bootstrapper import OptionsBootstrapper
 from pants.option.scope import ScopeInfo
 from pants.util.contextutil import temporary_dir, temporary_file, temporary_file_path
@@ -216,6 +217,30 @@ class BootstrapOptionsTest(unittest.TestCase):
       self.assertIs(opts4, opts5)
       self.assertIsNot(opts1, opts5)
 
+  def test_verify_configs_ignoring_unknown_scopes(self):
+    with temporary_file() as fp:
+      fp.write(dedent("""
+        [foo]
+
+        [unloaded]
+
+        [invalid]
+      """))
+      fp.close()
+      bootstrapper = OptionsBootstrapper(env={'PANTS_CONFIG_FILES': "['{}']".format(fp.name)},
+                                         args=[])
+      options = bootstrapper.get_full_options(known_scope_infos=[ScopeInfo('', ScopeInfo.GLOBAL),
+                                                                 ScopeInfo('foo', ScopeInfo.TASK)])
+      is_unloaded = lambda scope: scope == 'unloaded'
+
+      self.assertEqual({'unloaded', 'invalid'}, bootstrapper.unknown_config_scopes(options))
+      self.assertEqual({'invalid'},
+                       bootstrapper.unknown_config_scopes(options, ignore_unknown_scope=is_unloaded))
+      with self.assertRaises(Config.ConfigValidationError):
+        bootstrapper.verify_configs_against_options(options, ignore_unknown_scope=is_unloaded)
+      bootstrapper.verify_configs_against_options(
+        options, ignore_unknown_scope=lambda scope: scope in ('unloaded', 'invalid'))
+
   def test_bootstrap_short_options(self):
     def parse_options(*args):
       full_args = list(args) + self._config_path(None)
@@ -189,6 +189,7 @@ def create_options_for_optionables(optionables,
 
   for optionable in optionables:
     optionable.register_options(register_func(optionable.options_scope))
+    optionable.options_registered()
 
   if options:
     for scope, opts in options.items():
@@ -0,0 +1,65 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import argparse
+import os
+import time
+
+from pants.base.build_environment import get_buildroot
+from pants.util.process_handler import subprocess
+
+
+# NB: These aren't tests themselves: run them with `./pants run` on the `pantsd_list_benchmark`
+# binary target.
+
+
+def _pants(build_graph_cache_size, args):
+  command = [os.path.join(get_buildroot(), 'pants'),
+             '--enable-pantsd',
+             '--pantsd-build-graph-cache-size={}'.format(build_graph_cache_size)] + args
+  with open(os.devnull, 'w') as devnull:
+    subprocess.check_call(command, cwd=get_buildroot(), stdout=devnull)
+
+
+def measure_noop_list(build_graph_cache_size, spec, iterations):
+  """Returns the seconds taken by each of `iterations` runs of `list` for `spec` under pantsd.
+
+  The first run starts the daemon, and nothing changes between runs, so every later run is a no-op
+  that is served from a warm product graph (and, with a non-zero `build_graph_cache_size`, from a
+  warm BuildGraph).
+  """
+  timings = []
+  try:
+    for _ in range(iterations):
+      start = time.time()
+      _pants(build_graph_cache_size, ['list', spec])
+      timings.append(time.time() - start)
+  finally:
+    _pants(build_graph_cache_size, ['kill-pantsd'])
+  return timings
+
+
+def main():
+  parser = argparse.ArgumentParser(
+    description='Benchmarks no-op `list` runs under pantsd, with and without warm BuildGraphs.')
+  parser.add_argument('--iterations', type=int, default=10,
+                      help='The number of times to run `list`.')
+  parser.add_argument('spec', nargs='?', default='::',
+                      help='The target spec to list.')
+  args = parser.parse_args()
+
+  for name, build_graph_cache_size in [('cold BuildGraph', 0), ('warm BuildGraph', 1)]:
+    timings = measure_noop_list(build_graph_cache_size, args.spec, args.iterations)
+    print('{}:'.format(name))
+    print('  first: {:.3f}s'.format(timings[0]))
+    if len(timings) > 1:
+      rest = timings[1:]
+      print('  rest:  {:.3f}s mean, {:.3f}s min'.format(sum(rest) / len(rest), min(rest)))
+
+
+if __name__ == '__main__':
+  main()
@@ -5,6 +5,7 @@
 from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
                         unicode_literals, with_statement)
 
+import time
 from collections import namedtuple
 from contextlib import contextmanager
 
@@ -92,3 +93,61 @@ class TestFSEventService(TestBase):
       self.mock_watchman.subscribed.return_value = self.FAKE_EVENT_STREAM
       self.service.run()
       assert not mock_callback.called
+
+
+class TestFSEventServiceSettling(TestBase):
+  BUILD_ROOT = '/build_root'
+  SETTLE_SECS = 0.01
+
+  def setUp(self):
+    super(TestFSEventServiceSettling, self).setUp()
+    self.mock_watchman = mock.create_autospec(Watchman, spec_set=True)
+    self.service = FSEventService(self.mock_watchman, self.BUILD_ROOT, 1,
+                                  settle_secs=self.SETTLE_SECS)
+    self.service.setup(None, None, executor=TestExecutor())
+    self.service.register_all_files_handler(lambda x: None, name='test')
+    self.service.register_all_files_handler(lambda x: None, name='test2')
+    self.service.fire_callback = mock.Mock(return_value=None)
+
+  def run_events(self, *events):
+    self.mock_watchman.subscribed.return_value = list(events)
+    self.service.run()
+
+  def await_callbacks(self, count):
+    deadline = time.time() + 10
+    while self.service.fire_callback.call_count < count and time.time() < deadline:
+      time.sleep(self.SETTLE_SECS)
+    # Allow for any unexpected further callbacks.
+    time.sleep(self.SETTLE_SECS * 5)
+    return self.service.fire_callback.call_args_list
+
+  @staticmethod
+  def event(name, files, **kwargs):
+    return name, dict(subscription=name, files=files, **kwargs)
+
+  def test_coalesces_events(self):
+    self.run_events(self.event('test', ['a/BUILD', 'b/BUILD'], clock='c:1'),
+                    (None, None),
+                    self.event('test', ['b/BUILD', 'c/BUILD'], clock='c:2'))
+    self.assertEqual(
+      [mock.call('test', dict(subscription='test', files=['a/BUILD', 'b/BUILD', 'c/BUILD'],
+                              clock='c:2'))],
+      self.await_callbacks(1))
+    self.assertEqual(dict(events_received=2, callbacks_fired=1, events_coalesced=1,
+                          duplicate_files=1),
+                     self.service.metrics())
+
+  def test_coalesces_per_handler(self):
+    self.run_events(self.event('test', ['a/BUILD']), self.event('test2', ['b/BUILD']))
+    self.assertEqual({('test', ('a/BUILD',)), ('test2', ('b/BUILD',))},
+                     {(c[0][0], tuple(c[0][1]['files'])) for c in self.await_callbacks(2)})
+    self.assertEqual(0, self.service.metrics()['events_coalesced'])
+
+  def test_does_not_coalesce_fresh_instance(self):
+    self.run_events(self.event('test', ['a/BUILD', 'b/BUILD'], is_fresh_instance=True),
+                    self.event('test', ['b/BUILD']))
+    self.assertEqual(
+      [mock.call('test', dict(subscription='test', files=['a/BUILD', 'b/BUILD'],
+                              is_fresh_instance=True)),
+       mock.call('test', dict(subscription='test', files=['b/BUILD']))],
+      self.await_callbacks(2))
@@ -0,0 +1,115 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import threading
+import unittest
+
+import mock
+
+from pants.base.specs import SingleAddress, Specs
+from pants.base.target_roots import TargetRoots
+from pants.pantsd.service.scheduler_service import (SchedulerService,
+                                                     _ForkLockedSchedulerSession)
+
+
+def target_roots(*directories):
+  return TargetRoots([Specs(tuple(SingleAddress(d, d) for d in directories))])
+
+
+class TestSchedulerService(unittest.TestCase):
+  def setUp(self):
+    self.mock_graph_helper = mock.Mock()
+    self.mock_graph_helper.scheduler.graph_len.return_value = 0
+    self.mock_session = self.mock_graph_helper.new_session.return_value
+    self.mock_session._replace.return_value = self.mock_session
+    self.mock_session.create_build_graph.side_effect = lambda roots, build_root: (mock.Mock(),
+                                                                                  mock.Mock())
+    self.mock_target_roots_calculator = mock.Mock()
+    self.fork_lock = threading.Lock()
+    self.service = self.create_service(build_graph_cache_size=2)
+    self.options = mock.Mock()
+    self.options.for_global_scope.return_value.exclude_target_regexp = []
+    self.options.for_global_scope.return_value.tag = []
+
+  def create_service(self, **kwargs):
+    service = SchedulerService(fs_event_service=mock.Mock(),
+                               legacy_graph_scheduler=self.mock_graph_helper,
+                               build_root='/build_root',
+                               invalidation_globs=None,
+                               pantsd_pidfile=None,
+                               **kwargs)
+    service.setup(threading.RLock(), self.fork_lock)
+    return service
+
+  def warm(self, roots):
+    self.mock_target_roots_calculator.create.return_value = roots
+    session, returned_roots = self.service.warm_product_graph(self.options,
+                                                              self.mock_target_roots_calculator)
+    self.assertIs(roots, returned_roots)
+    self.mock_session.with_build_graph.assert_called_with(roots, mock.ANY, mock.ANY)
+    self.assertIs(self.mock_session.with_build_graph.return_value, session)
+    return self.mock_session.with_build_graph.call_args[0][1]
+
+  def test_build_graph_reused(self):
+    build_graph = self.warm(target_roots('a'))
+    self.assertIs(build_graph, self.warm(target_roots('a')))
+    self.assertIsNot(build_graph, self.warm(target_roots('b')))
+    self.assertEqual(2, self.mock_session.create_build_graph.call_count)
+    self.mock_session.create_build_graph.assert_called_with(target_roots('b'), '/build_root')
+
+  def test_build_graph_invalidated_by_file_events(self):
+    build_graph = self.warm(target_roots('a'))
+    self.service._handle_batch_event(['a/BUILD'])
+    self.mock_graph_helper.scheduler.invalidate_files.assert_called_once_with(['a/BUILD'])
+    self.assertIsNot(build_graph, self.warm(target_roots('a')))
+
+  def test_build_graph_invalidated_during_construction(self):
+    def create_build_graph(roots, build_root):
+      self.service._handle_batch_event(['a/BUILD'])
+      return mock.Mock(), mock.Mock()
+    self.mock_session.create_build_graph.side_effect = create_build_graph
+    build_graph = self.warm(target_roots('a'))
+    self.assertIsNot(build_graph, self.warm(target_roots('a')))
+
+  def test_build_graph_constructed_without_fork_lock(self):
+    def create_build_graph(roots, build_root):
+      self.assertTrue(self.fork_lock.acquire(False))
+      self.fork_lock.release()
+      return mock.Mock(), mock.Mock()
+    self.mock_session.create_build_graph.side_effect = create_build_graph
+    self.warm(target_roots('a'))
+    scheduler_session = self.mock_session._replace.call_args[1]['scheduler_session']
+    self.assertIsInstance(scheduler_session, _ForkLockedSchedulerSession)
+
+  def test_fork_locked_scheduler_session(self):
+    mock_scheduler_session = mock.Mock()
+    mock_scheduler_session.product_request.side_effect = (
+      lambda product, subjects: self.assertFalse(self.fork_lock.acquire(False)))
+    locked_session = _ForkLockedSchedulerSession(mock_scheduler_session, self.fork_lock)
+    locked_session.product_request(str, [])
+    self.assertTrue(self.fork_lock.acquire(False))
+    self.fork_lock.release()
+    self.assertIs(mock_scheduler_session.symbol_table, locked_session.symbol_table)
+
+  def test_build_graph_cache_size(self):
+    build_graph = self.warm(target_roots('a'))
+    for i in range(2):
+      self.warm(target_roots('b{}'.format(i)))
+    self.assertIsNot(build_graph, self.warm(target_roots('a')))
+
+  def test_build_graph_disabled_by_default(self):
+    service = self.create_service()
+    self.mock_target_roots_calculator.create.return_value = target_roots('a')
+    session, _ = service.warm_product_graph(self.options, self.mock_target_roots_calculator)
+    self.assertIs(self.mock_session, session)
+    self.mock_session.create_build_graph.assert_not_called()
+
+  def test_build_graph_failure(self):
+    self.mock_session.create_build_graph.side_effect = Exception('bad BUILD file')
+    self.mock_target_roots_calculator.create.return_value = target_roots('a')
+    session, _ = self.service.warm_product_graph(self.options, self.mock_target_roots_calculator)
+    self.assertIs(self.mock_session, session)
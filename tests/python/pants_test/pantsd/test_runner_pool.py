@@ -0,0 +1,78 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import json
+import socket
+import threading
+import unittest
+
+from pants.pantsd.runner_pool import PreforkedRunnerPool
+from pants.util.dirutil import safe_mkdtemp, safe_rmtree
+
+
+def echo_request(sock, arguments, environment):
+  sock.sendall(json.dumps([arguments, environment]).encode('utf-8'))
+  sock.close()
+
+
+class TestPreforkedRunnerPool(unittest.TestCase):
+  def setUp(self):
+    self.generation = 0
+    self.pre_forks = 0
+    self.subprocess_dir = safe_mkdtemp()
+    self.pool = PreforkedRunnerPool(2,
+                                    fork_lock=threading.RLock(),
+                                    pre_fork=self._pre_fork,
+                                    handler=echo_request,
+                                    generation_fn=lambda: self.generation,
+                                    metadata_base_dir=self.subprocess_dir)
+
+  def tearDown(self):
+    self.pool.shutdown()
+    safe_rmtree(self.subprocess_dir)
+
+  def _pre_fork(self):
+    self.pre_forks += 1
+
+  def _adopt(self, arguments):
+    server_sock, client_sock = socket.socketpair()
+    try:
+      adopted = self.pool.adopt(server_sock, arguments, {'A': '1'})
+      server_sock.close()
+      if not adopted:
+        return None
+      received = b''
+      while True:
+        data = client_sock.recv(4096)
+        if not data:
+          return json.loads(received.decode('utf-8'))
+        received += data
+    finally:
+      client_sock.close()
+
+  def test_adopt(self):
+    self.pool.fill()
+    self.assertEqual(2, len(self.pool))
+    self.assertEqual(2, self.pre_forks)
+    self.assertEqual([['./pants', 'list'], {'A': '1'}], self._adopt(['./pants', 'list']))
+    self.assertEqual([['./pants', 'test'], {'A': '1'}], self._adopt(['./pants', 'test']))
+    self.assertEqual(0, len(self.pool))
+    self.assertIsNone(self._adopt(['./pants', 'list']))
+
+  def test_stale_runners_retired(self):
+    self.pool.fill()
+    self.generation += 1
+    self.assertIsNone(self._adopt(['./pants', 'list']))
+    self.assertEqual(0, len(self.pool))
+
+    self.pool.fill()
+    self.assertEqual(2, len(self.pool))
+    self.generation += 1
+    self.pool.fill()
+    self.assertEqual(2, len(self.pool))
+    self.assertEqual(6, self.pre_forks)
+    self.assertEqual([['./pants'], {'A': '1'}], self._adopt(['./pants']))
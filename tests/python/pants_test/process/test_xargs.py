@@ -6,12 +6,16 @@ from __future__ import (absolute_import, division, generators, nested_scopes, pr
                         unicode_literals, with_statement)
 
 import errno
+import io
 import os
+import sys
+import threading
 import unittest
 
 import mock
 
 from pants.process.xargs import Xargs
+from pants.util.process_handler import subprocess
 
 
 class XargsTest(unittest.TestCase):
@@ -97,3 +101,92 @@ class XargsTest(unittest.TestCase):
                       mock.call(['one', 'two']),
                       mock.call(['three', 'four'])],
                      self.call.mock_calls)
+
+  def test_execute_chunked_max_args(self):
+    self.call.return_value = 0
+    xargs = Xargs(self.call, max_args=2)
+
+    self.assertEqual(0, xargs.execute(['one', 'two', 'three', 'four', 'five']))
+
+    self.assertEqual([mock.call(['one', 'two']),
+                      mock.call(['three', 'four']),
+                      mock.call(['five'])],
+                     self.call.mock_calls)
+
+  def test_execute_chunked_max_bytes(self):
+    self.call.return_value = 0
+    # Each arg is counted with its separator.
+    xargs = Xargs(self.call, max_bytes=8)
+
+    self.assertEqual(0, xargs.execute(['one', 'two', 'three', 'four']))
+
+    self.assertEqual([mock.call(['one', 'two']),
+                      mock.call(['three']),
+                      mock.call(['four'])],
+                     self.call.mock_calls)
+
+  def test_execute_chunked_fail_fast(self):
+    self.call.side_effect = (0, 42)
+    xargs = Xargs(self.call, max_args=1)
+
+    self.assertEqual(42, xargs.execute(['one', 'two', 'three']))
+
+    self.assertEqual([mock.call(['one']), mock.call(['two'])], self.call.mock_calls)
+
+  def test_execute_parallel(self):
+    calls = []
+    lock = threading.Lock()
+    initialized = threading.local()
+
+    def call(args):
+      self.assertTrue(initialized.value)
+      with lock:
+        calls.append(args)
+      return {'two': 42, 'four': 43}.get(args[0], 0)
+
+    def initializer():
+      initialized.value = True
+
+    xargs = Xargs(call, max_args=1, parallelism=3, initializer=initializer)
+
+    # All chunks are executed, and the first failure in chunk order is returned.
+    self.assertEqual(42, xargs.execute(['one', 'two', 'three', 'four']))
+    self.assertEqual([['four'], ['one'], ['three'], ['two']], sorted(calls))
+
+  def test_execute_parallel_raise(self):
+    exception = Exception()
+    self.call.side_effect = exception
+    xargs = Xargs(self.call, max_args=1, parallelism=2)
+
+    with self.assertRaises(Exception) as raised:
+      xargs.execute(['one', 'two'])
+    self.assertIs(exception, raised.exception)
+
+  def test_subprocess_parallel_output_in_order(self):
+    stdout = io.BytesIO()
+    # The first chunk finishes last.
+    script = 'import sys, time; time.sleep(0.2 if sys.argv[1] == "a" else 0); print(sys.argv[1:])'
+    xargs = Xargs.subprocess([sys.executable, '-c', script],
+                             max_args=2, parallelism=3, stdout=stdout)
+
+    self.assertEqual(0, xargs.execute(['a', 'b', 'c', 'd', 'e']))
+    self.assertEqual(["['a', 'b']", "['c', 'd']", "['e']"],
+                     stdout.getvalue().decode('utf-8').splitlines())
+
+  def _execute_parallel_subprocess(self, stderr):
+    script = ('import sys; sys.stdout.write("out\\n"); sys.stdout.flush(); '
+              'sys.stderr.write("err\\n")')
+    stdout = io.BytesIO()
+    xargs = Xargs.subprocess([sys.executable, '-c', script], max_args=1, parallelism=2,
+                             stdout=stdout, stderr=stderr)
+    self.assertEqual(0, xargs.execute(['a', 'b']))
+    return stdout.getvalue().decode('utf-8')
+
+  def test_subprocess_parallel_stderr(self):
+    stderr = io.BytesIO()
+    self.assertEqual('out\nout\n', self._execute_parallel_subprocess(stderr))
+    self.assertEqual('err\nerr\n', stderr.getvalue().decode('utf-8'))
+
+  def test_subprocess_parallel_stderr_to_stdout(self):
+    self.assertEqual('out\nerr\nout\nerr\n',
+                     self._execute_parallel_subprocess(stderr=subprocess.STDOUT))
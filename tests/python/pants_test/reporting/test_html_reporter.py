@@ -0,0 +1,95 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import os
+import unittest
+
+import mock
+
+from pants.base.workunit import WorkUnit, WorkUnitLabel
+from pants.goal.aggregated_timings import AggregatedTimings
+from pants.goal.artifact_cache_stats import ArtifactCacheStats
+from pants.reporting.html_reporter import HtmlReporter
+from pants.reporting.report import Report
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import read_file
+
+
+class HtmlReporterTest(unittest.TestCase):
+
+  def _reporter(self, tmpdir):
+    run_tracker = mock.Mock()
+    run_tracker.cumulative_timings = AggregatedTimings()
+    run_tracker.self_timings = AggregatedTimings()
+    run_tracker.artifact_cache_stats = ArtifactCacheStats(os.path.join(tmpdir, 'stats'))
+    run_tracker.is_under_main_root.return_value = True
+    html_dir = os.path.join(tmpdir, 'html')
+    os.mkdir(html_dir)
+    return run_tracker, html_dir, HtmlReporter(run_tracker,
+                                               HtmlReporter.Settings(log_level=Report.INFO,
+                                                                     html_dir=html_dir,
+                                                                     template_dir=None))
+
+  def test_writes(self):
+    with temporary_dir() as tmpdir:
+      run_tracker, html_dir, reporter = self._reporter(tmpdir)
+      reporter.open()
+
+      root = WorkUnit(run_info_dir=tmpdir, parent=None, name='all')
+      root.start()
+      reporter.start_workunit(root)
+      tool = WorkUnit(run_info_dir=tmpdir, parent=root, name='javac',
+                      labels=[WorkUnitLabel.TOOL], cmd='javac Foo.java')
+      tool.start()
+      reporter.start_workunit(tool)
+      reporter.handle_output(tool, 'stdout', b'one\n')
+      reporter.handle_output(tool, 'stdout', b'two <&>\n')
+      run_tracker.cumulative_timings.add_timing('all:javac', 1.5, is_tool=True)
+      tool.set_outcome(WorkUnit.SUCCESS)
+      reporter.end_workunit(tool)
+      reporter.do_handle_log(root, Report.INFO, 'Compiled 1 target.')
+      root.set_outcome(WorkUnit.SUCCESS)
+      reporter.end_workunit(root)
+      reporter.close()
+
+      report = read_file(reporter.report_path())
+      fragments = ['id="{}"'.format(root.id),
+                   'id="{}"'.format(tool.id),
+                   "'{}_stdout'".format(tool.id),
+                   "$('#{}-timer').html(".format(tool.id),
+                   'Compiled 1 target.',
+                   "$('#{}-timer').html(".format(root.id)]
+      positions = [report.index(fragment) for fragment in fragments]
+      self.assertEqual(sorted(positions), positions)
+
+      self.assertEqual('one</br>two &lt;&amp;&gt;</br>',
+                       read_file(os.path.join(html_dir, '{}.stdout'.format(tool.id))))
+      # The root workunit forces a final overwrite of the stats.
+      self.assertIn('all:javac', read_file(os.path.join(html_dir, 'cumulative_timings')))
+      self.assertIn('No artifact cache use.',
+                    read_file(os.path.join(html_dir, 'artifact_cache_stats')))
+
+  def test_failed_write_does_not_drop_batch(self):
+    with temporary_dir() as tmpdir:
+      _, html_dir, reporter = self._reporter(tmpdir)
+      reporter.open()
+      try:
+        def fail():
+          raise IOError('Failed to render.')
+
+        reporter._write_batch([('output', 'w1', 'stdout', b'one\n'),
+                               ('overwrite', 'failing', fail, True),
+                               ('output', 'w1', 'stderr', None),
+                               ('close_outputs', 'w1'),
+                               ('overwrite', 'succeeding', lambda: 'rendered', True)])
+        output_files = reporter._output_files['w1'].values()
+        self.assertEqual(2, len(output_files))
+        self.assertTrue(all(f.closed for f in output_files))
+        self.assertEqual('one</br>', read_file(os.path.join(html_dir, 'w1.stdout')))
+        self.assertEqual('rendered', read_file(os.path.join(html_dir, 'succeeding')))
+      finally:
+        reporter.close()
@@ -0,0 +1,81 @@
+# coding=utf-8
+# Copyright 2018 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+from __future__ import (absolute_import, division, generators, nested_scopes, print_function,
+                        unicode_literals, with_statement)
+
+import json
+import os
+import threading
+import unittest
+
+import mock
+
+from pants.base.workunit import WorkUnit, WorkUnitLabel
+from pants.goal.artifact_cache_stats import ArtifactCacheStats
+from pants.reporting.report import Report
+from pants.reporting.trace_reporter import TraceReporter
+from pants.util.contextutil import temporary_dir
+
+
+class TraceReporterTest(unittest.TestCase):
+
+  def test_trace(self):
+    with temporary_dir() as tmpdir:
+      run_tracker = mock.Mock()
+      run_tracker.artifact_cache_stats = ArtifactCacheStats(os.path.join(tmpdir, 'stats'))
+      trace_file = os.path.join(tmpdir, 'trace.json')
+      reporter = TraceReporter(run_tracker, TraceReporter.Settings(log_level=Report.INFO,
+                                                                   trace_file=trace_file))
+
+      def workunit(parent, name, labels=None, cmd=''):
+        unit = WorkUnit(run_info_dir=tmpdir, parent=parent, name=name, labels=labels, cmd=cmd)
+        unit.start()
+        return unit
+
+      root = workunit(None, 'all')
+      reporter.start_workunit(root)
+      task = workunit(root, 'compile', labels=[WorkUnitLabel.TASK])
+      reporter.start_workunit(task)
+
+      tool = workunit(task, 'javac', labels=[WorkUnitLabel.TOOL], cmd='javac Foo.java')
+
+      def run_tool():
+        reporter.start_workunit(tool)
+        tool.set_outcome(WorkUnit.FAILURE)
+        reporter.end_workunit(tool)
+      thread = threading.Thread(target=run_tool, name='worker')
+      thread.start()
+      thread.join()
+
+      target = mock.Mock()
+      target.address.reference.return_value = 'src/java:foo'
+      run_tracker.artifact_cache_stats.add_hits('compile', [target, target])
+      run_tracker.artifact_cache_stats.add_misses('compile', [target], None)
+      task.set_outcome(WorkUnit.SUCCESS)
+      reporter.end_workunit(task)
+      root.set_outcome(WorkUnit.SUCCESS)
+      reporter.end_workunit(root)
+      reporter.close()
+
+      with open(trace_file, 'r') as fp:
+        trace = json.load(fp)
+
+    events = {e['name']: e for e in trace['traceEvents'] if e['ph'] == 'X'}
+    self.assertEqual({'all', 'compile', 'javac'}, set(events))
+    thread_names = {e['tid']: e['args']['name']
+                    for e in trace['traceEvents'] if e['ph'] == 'M'}
+    self.assertEqual('worker', thread_names[events['javac']['tid']])
+    self.assertEqual(events['all']['tid'], events['compile']['tid'])
+    self.assertNotEqual(events['all']['tid'], events['javac']['tid'])
+
+    self.assertEqual({'path': 'all:compile:javac',
+                      'outcome': 'FAILURE',
+                      'labels': ['TOOL'],
+                      'cmd': 'javac Foo.java'},
+                     events['javac']['args'])
+    self.assertEqual(2, events['compile']['args']['cache_hits'])
+    self.assertEqual(1, events['compile']['args']['cache_misses'])
+    self.assertNotIn('cache_hits', events['all']['args'])
+    self.assertLessEqual(events['all']['ts'], events['compile']['ts'])
@@ -66,6 +66,7 @@ class DummyGen(SimpleCodegenTask):
     self._test_case = None
     self.setup_for_testing(None)
     self.execution_counts = 0
+    self.batch_sizes = []
 
   def setup_for_testing(self, test_case):
     """Gets this dummy generator class ready for testing.
@@ -92,6 +93,18 @@ class DummyGen(SimpleCodegenTask):
         f.write('public class {0} '.format(class_name))
         f.write('{\n\\\\ ... nothing ... \n}\n')
 
+  def codegen_batch_key(self, target):
+    return 'dummy'
+
+  def execute_codegen_batch(self, targets, batch_workdir):
+    self.batch_sizes.append(len(targets))
+    generated = {}
+    for target in targets:
+      self.execute_codegen(target, batch_workdir)
+      generated[target] = [os.path.relpath(path, batch_workdir)
+                           for path in self._dummy_sources_to_generate(target, batch_workdir)]
+    return generated
+
   def _dummy_sources_to_generate(self, target, target_workdir):
     for source in target.sources_relative_to_buildroot():
       source = os.path.join(self._test_case.build_root, source)
@@ -169,6 +182,58 @@ class SimpleCodegenTaskTest(TaskTestBase):
       'had the wrong number of executions!\n  expected: {}\n  got: {}'
         .format(expected_execution_count, task.execution_counts))
 
+  def test_parallel_codegen_in_dependency_order(self):
+    self.add_to_build_file('gen-lib', dedent("""
+      dummy_library(name='a', sources=['org/pantsbuild/example/a.dummy'])
+      dummy_library(name='b', sources=['org/pantsbuild/example/b.dummy'], dependencies=[':a'])
+      dummy_library(name='c', sources=['org/pantsbuild/example/c.dummy'], dependencies=[':a'])
+      dummy_library(name='d', sources=['org/pantsbuild/example/d.dummy'], dependencies=[':b', ':c'])
+    """))
+    for name in 'abcd':
+      self.create_file('gen-lib/org/pantsbuild/example/{}.dummy'.format(name),
+                       'org.pantsbuild.example {}'.format(name.upper()))
+
+    task = self._create_dummy_task(target_roots=[self.target('gen-lib:d')], worker_count=2)
+    task.execute()
+
+    self.assertEqual(4, task.execution_counts)
+    synthetic_specs = [self.build_graph.get_target(address).derived_from.address.spec
+                       for address in self.build_graph.synthetic_addresses]
+    self.assertEqual(['gen-lib:a', 'gen-lib:b', 'gen-lib:c', 'gen-lib:d'], sorted(synthetic_specs))
+
+  def test_batched_codegen(self):
+    self.add_to_build_file('gen-lib', dedent("""
+      dummy_library(name='a', sources=['org/pantsbuild/example/a.dummy'])
+      dummy_library(name='b', sources=['org/pantsbuild/example/b.dummy'])
+      dummy_library(name='c', sources=['org/pantsbuild/example/c.dummy'])
+      dummy_library(name='d', sources=['org/pantsbuild/example/d.dummy'], dependencies=[':a'])
+    """))
+    for name in 'abcd':
+      self.create_file('gen-lib/org/pantsbuild/example/{}.dummy'.format(name),
+                       'org.pantsbuild.example {}'.format(name.upper()))
+
+    targets = [self.target('gen-lib:{}'.format(name)) for name in 'abcd']
+    task = self._create_dummy_task(target_roots=targets, max_batch_size=2)
+    task.execute()
+
+    # Targets are only batched with targets at the same depth, so `d` is generated alone.
+    self.assertEqual([2], task.batch_sizes)
+    self.assertEqual(4, task.execution_counts)
+    for target in targets:
+      synthetic_target = next(self.build_graph.get_target(address)
+                              for address in self.build_graph.synthetic_addresses
+                              if self.build_graph.get_target(address).derived_from == target)
+      sources = synthetic_target.sources_relative_to_buildroot()
+      self.assertEqual(1, len(sources))
+      self.assertTrue(sources[0].endswith(
+        'org/pantsbuild/example/{}'.format(target.address.target_name.upper())))
+
+  def test_parallel_codegen_duplicates_fail(self):
+    targets = self._get_duplication_test_targets()
+    task = self._create_dummy_task(target_roots=targets, worker_count=2)
+    with self.assertRaises(SimpleCodegenTask.DuplicateSourceError):
+      task.execute()
+
   def _get_duplication_test_targets(self):
     self.add_to_build_file('gen-parent', dedent("""
       dummy_library(name='gen-parent',
@@ -520,3 +585,31 @@ class ExportSimpleCodegenTaskTest(TaskTestBase):
     self.assertEqual(
       self.synthetic_target_for('fleem').dependencies[0].address.spec,
       'marionette:no-strings')
+
+
+class NailgunDummyGen(DummyGen):
+
+  @classmethod
+  def register_options(cls, register):
+    super(NailgunDummyGen, cls).register_options(register)
+    register('--use-nailgun', type=bool, default=True, help='Use nailgun.')
+
+
+class NailgunSimpleCodegenTaskTest(TaskTestBase):
+
+  @classmethod
+  def task_type(cls):
+    return NailgunDummyGen
+
+  def test_nailgun_uses_one_worker(self):
+    self.set_options(worker_count=2)
+    task = self.create_task(self.context())
+    self.assertEqual(1, task._worker_count())
+
+    task.runs_concurrent_workers_in_subprocesses = True
+    self.assertEqual(2, task._worker_count())
+
+  def test_subprocesses_use_all_workers(self):
+    self.set_options(worker_count=2, use_nailgun=False)
+    task = self.create_task(self.context())
+    self.assertEqual(2, task._worker_count())